@@ -50,6 +50,7 @@ if TYPE_CHECKING:
 
 	# from browser_use.agent.service import Agent
 	from browser_use.agent.views import ActionModel, ActionResult, AgentHistoryList
+	from browser_use.batch import BatchRunner, BatchTask
 	from browser_use.browser import BrowserProfile, BrowserSession
 	from browser_use.browser import BrowserSession as Browser
 	from browser_use.code_use.service import CodeAgent
@@ -79,6 +80,9 @@ _LAZY_IMPORTS = {
 	'ActionModel': ('browser_use.agent.views', 'ActionModel'),
 	'ActionResult': ('browser_use.agent.views', 'ActionResult'),
 	'AgentHistoryList': ('browser_use.agent.views', 'AgentHistoryList'),
+	# Batch runs on a shared browser pool
+	'BatchRunner': ('browser_use.batch.service', 'BatchRunner'),
+	'BatchTask': ('browser_use.batch.views', 'BatchTask'),
 	'BrowserSession': ('browser_use.browser', 'BrowserSession'),
 	'Browser': ('browser_use.browser', 'BrowserSession'),  # Alias for BrowserSession
 	'BrowserProfile': ('browser_use.browser', 'BrowserProfile'),
@@ -136,6 +140,8 @@ __all__ = [
 	'ActionResult',
 	'ActionModel',
 	'AgentHistoryList',
+	'BatchRunner',
+	'BatchTask',
 	# Chat models
 	'ChatOpenAI',
 	'ChatGoogle',
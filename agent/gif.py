@@ -5,11 +5,14 @@ import io
 import logging
 import os
 import platform
+from abc import ABC, abstractmethod
+from fractions import Fraction
 from typing import TYPE_CHECKING
 
 from browser_use.agent.views import AgentHistoryList
 from browser_use.browser.views import PLACEHOLDER_4PX_SCREENSHOT
 from browser_use.config import CONFIG
+from browser_use.screenshots.service import load_screenshot
 
 if TYPE_CHECKING:
 	from PIL import Image, ImageFont
@@ -47,33 +50,20 @@ def create_history_gif(
 	margin: int = 40,
 	line_spacing: float = 1.5,
 ) -> None:
-	"""Create a GIF from the agent's history with overlaid task and goal text."""
-	if not history.history:
-		logger.warning('No history to create GIF from')
-		return
-
-	from PIL import Image, ImageFont
+	"""Create a GIF from the agent's history with overlaid task and goal text.
 
-	images = []
-
-	# if history is empty, we can't create a gif
+	Writes an animated WebP or an MP4 video (requires PyAV) instead if `output_path` ends with `.webp` / `.mp4`.
+	"""
 	if not history.history:
 		logger.warning('No history to create GIF from')
 		return
 
-	# Get all screenshots from history (including None placeholders)
-	screenshots = history.screenshots(return_none_if_not_screenshot=True)
-
-	if not screenshots:
-		logger.warning('No screenshots found in history')
-		return
+	from PIL import Image, ImageFont
 
-	# Find the first non-placeholder screenshot
-	# A screenshot is considered a placeholder if:
-	# 1. It's the exact 4px placeholder for about:blank pages, OR
-	# 2. It comes from a new tab page (chrome://newtab/, about:blank, etc.)
+	# Screenshots are resolved one at a time from their stored paths, only the first real one is needed up front
 	first_real_screenshot = None
-	for screenshot in screenshots:
+	for item in history.history:
+		screenshot = load_screenshot(item.state.screenshot_path)
 		if screenshot and screenshot != PLACEHOLDER_4PX_SCREENSHOT:
 			first_real_screenshot = screenshot
 			break
@@ -136,17 +126,11 @@ def create_history_gif(
 		except Exception as e:
 			logger.warning(f'Could not load logo: {e}')
 
-	# Create task frame if requested
-	if show_task and task:
-		# Find the first non-placeholder screenshot for the task frame
-		first_real_screenshot = None
-		for item in history.history:
-			screenshot_b64 = item.state.get_screenshot()
-			if screenshot_b64 and screenshot_b64 != PLACEHOLDER_4PX_SCREENSHOT:
-				first_real_screenshot = screenshot_b64
-				break
-
-		if first_real_screenshot:
+	# Frames are decoded, overlaid and encoded one at a time, so memory stays bounded for any number of steps
+	writer = _create_animation_writer(output_path)
+	try:
+		# Create task frame if requested
+		if show_task and task:
 			task_frame = _create_task_frame(
 				task,
 				first_real_screenshot,
@@ -155,56 +139,50 @@ def create_history_gif(
 				logo,
 				line_spacing,
 			)
-			images.append(task_frame)
-		else:
-			logger.warning('No real screenshots found for task frame, skipping task frame')
-
-	# Process each history item with its corresponding screenshot
-	for i, (item, screenshot) in enumerate(zip(history.history, screenshots), 1):
-		if not screenshot:
-			continue
-
-		# Skip placeholder screenshots from about:blank pages
-		# These are 4x4 white PNGs encoded as a specific base64 string
-		if screenshot == PLACEHOLDER_4PX_SCREENSHOT:
-			logger.debug(f'Skipping placeholder screenshot from about:blank page at step {i}')
-			continue
-
-		# Skip screenshots from new tab pages
-		from browser_use.utils import is_new_tab_page
-
-		if is_new_tab_page(item.state.url):
-			logger.debug(f'Skipping screenshot from new tab page ({item.state.url}) at step {i}')
-			continue
-
-		# Convert base64 screenshot to PIL Image
-		img_data = base64.b64decode(screenshot)
-		image = Image.open(io.BytesIO(img_data))
-
-		if show_goals and item.model_output:
-			image = _add_overlay_to_image(
-				image=image,
-				step_number=i,
-				goal_text=item.model_output.current_state.next_goal,
-				regular_font=regular_font,  # type: ignore
-				title_font=title_font,  # type: ignore
-				margin=margin,
-				logo=logo,
-			)
+			writer.add_frame(task_frame, duration)
+
+		# Process each history item with its corresponding screenshot
+		for i, item in enumerate(history.history, 1):
+			screenshot = load_screenshot(item.state.screenshot_path)
+			if not screenshot:
+				continue
+
+			# Skip placeholder screenshots from about:blank pages
+			# These are 4x4 white PNGs encoded as a specific base64 string
+			if screenshot == PLACEHOLDER_4PX_SCREENSHOT:
+				logger.debug(f'Skipping placeholder screenshot from about:blank page at step {i}')
+				continue
 
-		images.append(image)
-
-	if images:
-		# Save the GIF
-		images[0].save(
-			output_path,
-			save_all=True,
-			append_images=images[1:],
-			duration=duration,
-			loop=0,
-			optimize=False,
+			# Skip screenshots from new tab pages
+			from browser_use.utils import is_new_tab_page
+
+			if is_new_tab_page(item.state.url):
+				logger.debug(f'Skipping screenshot from new tab page ({item.state.url}) at step {i}')
+				continue
+
+			# Convert base64 screenshot to PIL Image
+			img_data = base64.b64decode(screenshot)
+			image = Image.open(io.BytesIO(img_data))
+
+			if show_goals and item.model_output:
+				image = _add_overlay_to_image(
+					image=image,
+					step_number=i,
+					goal_text=item.model_output.current_state.next_goal,
+					regular_font=regular_font,  # type: ignore
+					title_font=title_font,  # type: ignore
+					margin=margin,
+					logo=logo,
+				)
+
+			writer.add_frame(image, duration)
+	finally:
+		writer.close()
+
+	if writer.frame_count:
+		logger.info(
+			f'Created {writer.format} at {output_path} ({writer.frame_count} frames, {writer.merged_frames} duplicate frames merged)'
 		)
-		logger.info(f'Created GIF at {output_path}')
 	else:
 		logger.warning('No images found in history to create GIF')
 
@@ -422,3 +400,251 @@ def _wrap_text(text: str, font: ImageFont.FreeTypeFont, max_width: int) -> str:
 		lines.append(' '.join(current_line))
 
 	return '\n'.join(lines)
+
+
+class _AnimationWriter(ABC):
+	"""Streams frames to an animation file as they are added.
+
+	Consecutive identical frames are merged into one longer frame, and for formats that support it only the region
+	that changed since the previous frame is encoded. Only the previous frame and the not yet written frame are kept
+	in memory. The output file is created with the first frame.
+	"""
+
+	format = 'animation'
+	supports_partial_frames = True
+
+	def __init__(self, output_path: str):
+		self.output_path = output_path
+		self.size: tuple[int, int] | None = None
+		self.frame_count = 0
+		self.merged_frames = 0
+		self._opened = False  # set once _open completed, only then is there a file to finish
+		self._previous: Image.Image | None = None
+		# (frame or changed region of it, offset, duration in ms), written once the next different frame arrives
+		self._pending: tuple[Image.Image, tuple[int, int], int] | None = None
+
+	def add_frame(self, image: Image.Image, duration: int) -> None:
+		from PIL import ImageChops
+
+		image = image.convert('RGB')
+		if self.size is None:
+			self.size = image.size
+			self._open()
+			self._opened = True
+		elif image.size != self.size:
+			image = image.resize(self.size)
+
+		region, offset = image, (0, 0)
+		if self._previous is not None and self._pending is not None:
+			bbox = ImageChops.difference(image, self._previous).getbbox()
+			if bbox is None:
+				frame, pending_offset, pending_duration = self._pending
+				self._pending = (frame, pending_offset, pending_duration + duration)
+				self.merged_frames += 1
+				return
+			if self.supports_partial_frames:
+				bbox = self._align_bbox(bbox)
+				region, offset = image.crop(bbox), (bbox[0], bbox[1])
+
+		self._write_pending()
+		self._pending = (region, offset, duration)
+		self._previous = image
+
+	def close(self) -> None:
+		if self._opened:
+			self._write_pending()
+			self._finish()
+		self._previous = None
+
+	def _write_pending(self) -> None:
+		if self._pending is not None:
+			self._write_frame(*self._pending)
+			self.frame_count += 1
+			self._pending = None
+
+	def _align_bbox(self, bbox: tuple[int, int, int, int]) -> tuple[int, int, int, int]:
+		return bbox
+
+	@abstractmethod
+	def _open(self) -> None:
+		"""Create the output file, once the frame size is known"""
+		pass
+
+	@abstractmethod
+	def _write_frame(self, frame: Image.Image, offset: tuple[int, int], duration: int) -> None:
+		"""Write a frame (or the changed region of it at `offset`) shown for `duration` ms"""
+		pass
+
+	@abstractmethod
+	def _finish(self) -> None:
+		"""Complete and close the output file"""
+		pass
+
+
+class _GifWriter(_AnimationWriter):
+	"""GIF with a local palette per frame, using Pillow's frame-level GIF encoder.
+
+	That encoder (`GifImagePlugin.getheader` / `getdata`) is not a documented Pillow API. If it is missing, the full
+	frames are kept and written at the end with `Image.save(save_all=True)`, which needs more memory.
+	"""
+
+	format = 'GIF'
+
+	def _open(self) -> None:
+		from PIL import GifImagePlugin
+
+		self._file = open(self.output_path, 'wb')
+		self._header_written = False
+		self._streaming = callable(getattr(GifImagePlugin, 'getheader', None)) and callable(getattr(GifImagePlugin, 'getdata', None))
+		self.supports_partial_frames = self._streaming
+		self._frames: list[tuple[Image.Image, int]] = []
+
+	def _write_frame(self, frame: Image.Image, offset: tuple[int, int], duration: int) -> None:
+		from PIL import GifImagePlugin, Image
+
+		# GIF delays are stored in 1/100 s in 16 bits
+		duration = min(duration, 655_350)
+		if not self._streaming:
+			self._frames.append((frame, duration))
+			return
+
+		paletted = frame.convert('P', palette=Image.Palette.ADAPTIVE)
+		if not self._header_written:
+			header, _ = GifImagePlugin.getheader(paletted, info={'loop': 0, 'duration': duration})
+			self._file.write(b''.join(header))
+			self._header_written = True
+
+		# disposal 1 keeps the previous frame, so a partial frame is drawn over it
+		for chunk in GifImagePlugin.getdata(paletted, offset, duration=duration, disposal=1, include_color_table=True):
+			self._file.write(chunk)
+
+	def _finish(self) -> None:
+		if self._streaming:
+			self._file.write(b';')  # trailer
+		elif self._frames:
+			frames = [frame for frame, _ in self._frames]
+			frames[0].save(
+				self._file,
+				format='GIF',
+				save_all=True,
+				append_images=frames[1:],
+				duration=[duration for _, duration in self._frames],
+				loop=0,
+			)
+			self._frames = []
+		self._file.close()
+
+
+class _WebPWriter(_AnimationWriter):
+	"""Animated WebP, muxed frame by frame: each frame is encoded by Pillow as a still WebP and stored as an ANMF chunk."""
+
+	format = 'WebP'
+
+	def __init__(self, output_path: str, quality: int = 80):
+		super().__init__(output_path)
+		self.quality = quality
+
+	def _align_bbox(self, bbox: tuple[int, int, int, int]) -> tuple[int, int, int, int]:
+		# frame offsets are stored divided by 2
+		return (bbox[0] - bbox[0] % 2, bbox[1] - bbox[1] % 2, bbox[2], bbox[3])
+
+	def _open(self) -> None:
+		assert self.size is not None
+		width, height = self.size
+		self._file = open(self.output_path, 'wb')
+		self._file.write(b'RIFF' + (0).to_bytes(4, 'little') + b'WEBP')  # size is patched in _finish
+		# VP8X with the animation flag, canvas size minus one
+		self._write_chunk(b'VP8X', b'\x02\x00\x00\x00' + (width - 1).to_bytes(3, 'little') + (height - 1).to_bytes(3, 'little'))
+		# ANIM: white background, loop forever
+		self._write_chunk(b'ANIM', b'\xff\xff\xff\xff' + (0).to_bytes(2, 'little'))
+
+	def _write_chunk(self, fourcc: bytes, data: bytes) -> None:
+		self._file.write(fourcc + len(data).to_bytes(4, 'little') + data + (b'\x00' if len(data) % 2 else b''))
+
+	def _write_frame(self, frame: Image.Image, offset: tuple[int, int], duration: int) -> None:
+		buffer = io.BytesIO()
+		frame.save(buffer, format='WEBP', quality=self.quality)
+		still = buffer.getvalue()
+
+		# keep the bitstream chunks (ALPH, VP8 / VP8L) of the still image
+		bitstream = b''
+		position = 12
+		while position + 8 <= len(still):
+			fourcc = still[position : position + 4]
+			chunk_size = int.from_bytes(still[position + 4 : position + 8], 'little')
+			chunk_end = position + 8 + chunk_size + chunk_size % 2
+			if fourcc in (b'ALPH', b'VP8 ', b'VP8L'):
+				bitstream += still[position:chunk_end]
+			position = chunk_end
+
+		header = (
+			(offset[0] // 2).to_bytes(3, 'little')
+			+ (offset[1] // 2).to_bytes(3, 'little')
+			+ (frame.width - 1).to_bytes(3, 'little')
+			+ (frame.height - 1).to_bytes(3, 'little')
+			+ min(duration, 0xFFFFFF).to_bytes(3, 'little')
+			+ b'\x02'  # no blending (frames are opaque), no disposal
+		)
+		self._write_chunk(b'ANMF', header + bitstream)
+
+	def _finish(self) -> None:
+		riff_size = self._file.tell() - 8
+		self._file.seek(4)
+		self._file.write(riff_size.to_bytes(4, 'little'))
+		self._file.close()
+
+
+class _MP4Writer(_AnimationWriter):
+	"""H.264 MP4 through the optional PyAV encoder, with variable frame timing so merged frames cost nothing."""
+
+	format = 'MP4'
+	supports_partial_frames = False
+
+	def _open(self) -> None:
+		try:
+			import av
+		except ImportError:
+			raise ImportError('PyAV not available. Please install it (`pip install av`) to export agent history as MP4.')
+
+		assert self.size is not None
+		# yuv420p needs even dimensions
+		self._even_size = (self.size[0] - self.size[0] % 2, self.size[1] - self.size[1] % 2)
+		self._container = av.open(self.output_path, mode='w')
+		self._stream = self._container.add_stream('libx264', rate=1000)
+		self._stream.width, self._stream.height = self._even_size
+		self._stream.pix_fmt = 'yuv420p'
+		self._stream.time_base = Fraction(1, 1000)
+		self._timestamp = 0
+		self._last_frame: Image.Image | None = None
+
+	def _encode(self, frame: Image.Image, timestamp: int) -> None:
+		import av
+
+		video_frame = av.VideoFrame.from_image(frame.crop((0, 0, *self._even_size)))
+		video_frame.pts = timestamp
+		video_frame.time_base = self._stream.time_base
+		for packet in self._stream.encode(video_frame):
+			self._container.mux(packet)
+
+	def _write_frame(self, frame: Image.Image, offset: tuple[int, int], duration: int) -> None:
+		self._encode(frame, self._timestamp)
+		self._timestamp += duration
+		self._last_frame = frame
+
+	def _finish(self) -> None:
+		if self._last_frame is not None and self._timestamp > 1:
+			# repeat the last frame at the end, so it is shown for its full duration
+			self._encode(self._last_frame, self._timestamp - 1)
+		for packet in self._stream.encode():
+			self._container.mux(packet)
+		self._container.close()
+
+
+def _create_animation_writer(output_path: str) -> _AnimationWriter:
+	"""Pick the writer by file extension (GIF for anything that is not .webp / .mp4)."""
+	suffix = os.path.splitext(output_path)[1].lower()
+	if suffix == '.webp':
+		return _WebPWriter(output_path)
+	if suffix == '.mp4':
+		return _MP4Writer(output_path)
+	return _GifWriter(output_path)
@@ -3,6 +3,7 @@ from __future__ import annotations
 import logging
 from typing import Literal
 
+from browser_use.agent.message_manager.utils import CHARS_PER_TOKEN, estimate_tokens
 from browser_use.agent.message_manager.views import (
 	HistoryItem,
 )
@@ -15,17 +16,29 @@ from browser_use.agent.views import (
 )
 from browser_use.browser.views import BrowserStateSummary
 from browser_use.filesystem.file_system import FileSystem
+from browser_use.llm.base import BaseChatModel
 from browser_use.llm.messages import (
 	BaseMessage,
 	ContentPartImageParam,
 	ContentPartTextParam,
 	SystemMessage,
+	UserMessage,
 )
 from browser_use.observability import observe_debug
-from browser_use.utils import match_url_with_domain_pattern, time_execution_sync
+from browser_use.utils import match_url_with_domain_pattern, time_execution_async, time_execution_sync
 
 logger = logging.getLogger(__name__)
 
+# max_history_tokens compaction: once the history is over budget, roll the oldest items into the summary until it is
+# back under this share of the budget (so compaction doesn't run every step), keeping the most recent items verbatim
+HISTORY_COMPACTION_TARGET = 0.7
+HISTORY_SUMMARY_SHARE = 0.3  # share of the budget the summary itself may take
+MIN_RECENT_HISTORY_ITEMS = 3
+
+HISTORY_SUMMARY_PROMPT = """You condense the earlier steps of a browser automation agent into a summary that replaces them in its context.
+Keep everything the agent still needs to finish the task: progress made, facts and values found, URLs, files written, and what failed.
+Merge the previous summary (if any) with the new steps. Answer with the summary only, at most {max_words} words."""
+
 
 # ========== Logging Helper Functions ==========
 # These functions are used ONLY for formatting debug log output.
@@ -110,6 +123,8 @@ class MessageManager:
 		include_tool_call_examples: bool = False,
 		include_recent_events: bool = False,
 		sample_images: list[ContentPartTextParam | ContentPartImageParam] | None = None,
+		max_history_tokens: int | None = None,
+		history_summarizer_llm: BaseChatModel | None = None,
 	):
 		self.task = task
 		self.state = state
@@ -122,14 +137,18 @@ class MessageManager:
 		self.include_tool_call_examples = include_tool_call_examples
 		self.include_recent_events = include_recent_events
 		self.sample_images = sample_images
+		self.max_history_tokens = max_history_tokens
+		self.history_summarizer_llm = history_summarizer_llm
 
 		assert max_history_items is None or max_history_items > 5, 'max_history_items must be None or greater than 5'
+		assert max_history_tokens is None or max_history_tokens >= 1000, 'max_history_tokens must be None or at least 1000'
 
 		# Store settings as direct attributes instead of in a settings object
 		self.include_attributes = include_attributes or []
 		self.sensitive_data = sensitive_data
 		self.last_input_messages = []
 		self.last_state_message_text: str | None = None
+		self.last_prompt_tokens_estimate: int | None = None
 		# Only initialize messages if state is empty
 		if len(self.state.history.get_messages()) == 0:
 			self._set_message_with_type(self.system_prompt, 'system')
@@ -137,31 +156,132 @@ class MessageManager:
 	@property
 	def agent_history_description(self) -> str:
 		"""Build agent history description from list of items, respecting max_history_items limit"""
-		if self.max_history_items is None:
-			# Include all items
-			return '\n'.join(item.to_string() for item in self.state.agent_history_items)
+		return '\n'.join(self.agent_history_blocks)
 
-		total_items = len(self.state.agent_history_items)
+	@property
+	def agent_history_blocks(self) -> list[str]:
+		"""The blocks of the agent history description (one per item), respecting max_history_items limit"""
+		items = [item.to_string() for item in self.state.agent_history_items]
 
-		# If we have fewer items than the limit, just return all items
-		if total_items <= self.max_history_items:
-			return '\n'.join(item.to_string() for item in self.state.agent_history_items)
+		# Items rolled out by max_history_tokens are summarized right after the first item (initialization)
+		summary = []
+		if self.state.history_summary_items:
+			summary.append(f'<sys>Summary of {self.state.history_summary_items} earlier steps:\n{self.history_summary_text}</sys>')
+
+		# If there is no limit or we have fewer items than the limit, include all items
+		if self.max_history_items is None or len(items) <= self.max_history_items:
+			return items[:1] + summary + items[1:]
 
 		# We have more items than the limit, so we need to omit some
-		omitted_count = total_items - self.max_history_items
+		omitted_count = len(items) - self.max_history_items
 
 		# Show first item + omitted message + most recent (max_history_items - 1) items
 		# The omitted message doesn't count against the limit, only real history items do
 		recent_items_count = self.max_history_items - 1  # -1 for first item
 
-		items_to_include = [
-			self.state.agent_history_items[0].to_string(),  # Keep first item (initialization)
-			f'<sys>[... {omitted_count} previous steps omitted...]</sys>',
-		]
+		items_to_include = items[:1] + summary + [f'<sys>[... {omitted_count} previous steps omitted...]</sys>']
 		# Add most recent items
-		items_to_include.extend([item.to_string() for item in self.state.agent_history_items[-recent_items_count:]])
+		items_to_include.extend(items[-recent_items_count:])
+
+		return items_to_include
 
-		return '\n'.join(items_to_include)
+	@property
+	def history_summary_text(self) -> str:
+		"""The summary of the rolled out history items: the LLM summary, then the extractive lines of later items"""
+		parts = [self.state.history_summary] if self.state.history_summary else []
+		if self.state.history_summary_lines_dropped:
+			parts.append(f'[... {self.state.history_summary_lines_dropped} earliest steps dropped from the summary ...]')
+		parts.extend(self.state.history_summary_lines)
+		return '\n'.join(parts)
+
+	@property
+	def history_tokens_estimate(self) -> int:
+		"""Estimated tokens of the history items and their summary"""
+		return estimate_tokens(self.history_summary_text) + sum(item.estimated_tokens for item in self.state.agent_history_items)
+
+	def _history_items_to_compact(self) -> int:
+		"""Number of oldest history items (after the first) to roll into the summary, 0 while within max_history_tokens"""
+		if self.max_history_tokens is None:
+			return 0
+
+		total = self.history_tokens_estimate
+		if total <= self.max_history_tokens:
+			return 0
+
+		target = self.max_history_tokens * HISTORY_COMPACTION_TARGET
+		compactable = self.state.agent_history_items[1 : max(1, len(self.state.agent_history_items) - MIN_RECENT_HISTORY_ITEMS)]
+		count = 0
+		for item in compactable:
+			if total <= target:
+				break
+			total -= item.estimated_tokens
+			count += 1
+		return count
+
+	def _pop_history_items(self, count: int) -> list[HistoryItem]:
+		rolled = self.state.agent_history_items[1 : 1 + count]
+		del self.state.agent_history_items[1 : 1 + count]
+		return rolled
+
+	def _set_history_summary(self, rolled: list[HistoryItem], summary: str | None = None) -> None:
+		"""Add the rolled items to the history summary: one extractive line per item, or an LLM summary replacing it"""
+		assert self.max_history_tokens is not None
+		max_chars = int(self.max_history_tokens * HISTORY_SUMMARY_SHARE) * CHARS_PER_TOKEN
+
+		if summary is None:
+			lines = self.state.history_summary_lines
+			lines.extend(item.to_summary_line() for item in rolled)
+			budget = max_chars - len(self.state.history_summary)
+			while len(lines) > 1 and sum(len(line) + 1 for line in lines) > budget:
+				lines.pop(0)
+				self.state.history_summary_lines_dropped += 1
+		else:
+			# the LLM summary covers the previous summary and its extractive lines
+			self.state.history_summary = summary[:max_chars] + '...' if len(summary) > max_chars else summary
+			self.state.history_summary_lines = []
+			self.state.history_summary_lines_dropped = 0
+
+		self.state.history_summary_items += len(rolled)
+		logger.debug(
+			f'Compacted {len(rolled)} history items into the summary '
+			f'({self.state.history_summary_items} items summarized, ~{self.history_tokens_estimate} history tokens)'
+		)
+
+	async def compact_history(self) -> None:
+		"""
+		Roll the oldest history items into the history summary when the history exceeds `max_history_tokens`.
+
+		Uses `history_summarizer_llm` for the summary if set, falling back to the extractive summary if it fails.
+		Called by `create_state_messages` once the latest step is added to the history.
+		"""
+		count = self._history_items_to_compact()
+		if not count:
+			return
+
+		rolled = self._pop_history_items(count)
+		summary = None
+		if self.history_summarizer_llm is not None:
+			try:
+				summary = await self._summarize_history(rolled)
+			except Exception as e:
+				logger.warning(f'History summarizer failed, using extractive summary: {type(e).__name__}: {e}')
+		self._set_history_summary(rolled, summary)
+
+	async def _summarize_history(self, rolled: list[HistoryItem]) -> str:
+		assert self.history_summarizer_llm is not None and self.max_history_tokens is not None
+		max_words = int(self.max_history_tokens * HISTORY_SUMMARY_SHARE * 0.75)
+		steps = '\n'.join(item.to_string() for item in rolled)
+		response = await self.history_summarizer_llm.ainvoke(
+			[
+				SystemMessage(content=HISTORY_SUMMARY_PROMPT.format(max_words=max_words)),
+				UserMessage(
+					content=f'<task>\n{self.task}\n</task>\n'
+					f'<previous_summary>\n{self.history_summary_text}\n</previous_summary>\n'
+					f'<steps>\n{steps}\n</steps>'
+				),
+			]
+		)
+		return response.completion.strip()
 
 	def add_new_task(self, new_task: str) -> None:
 		new_task = '<follow_up_user_request> ' + new_task.strip() + ' </follow_up_user_request>'
@@ -279,8 +399,8 @@ class MessageManager:
 		return ''
 
 	@observe_debug(ignore_input=True, ignore_output=True, name='create_state_messages')
-	@time_execution_sync('--create_state_messages')
-	def create_state_messages(
+	@time_execution_async('--create_state_messages')
+	async def create_state_messages(
 		self,
 		browser_state_summary: BrowserStateSummary,
 		model_output: AgentOutput | None = None,
@@ -299,6 +419,9 @@ class MessageManager:
 		# First, update the agent history items with the latest step results
 		self._update_agent_history_description(model_output, result, step_info)
 
+		# Keep the history within max_history_tokens
+		await self.compact_history()
+
 		# Use the passed sensitive_data parameter, falling back to instance variable
 		effective_sensitive_data = sensitive_data if sensitive_data is not None else self.sensitive_data
 		if effective_sensitive_data is not None:
@@ -342,7 +465,7 @@ class MessageManager:
 		state_message = AgentMessagePrompt(
 			browser_state_summary=browser_state_summary,
 			file_system=self.file_system,
-			agent_history_description=self.agent_history_description,
+			agent_history_blocks=self.agent_history_blocks,
 			read_state_description=self.state.read_state_description,
 			task=self.task,
 			include_attributes=self.include_attributes,
@@ -406,6 +529,7 @@ class MessageManager:
 		# Log message history for debugging
 		logger.debug(self._log_history_lines())
 		self.last_input_messages = self.state.history.get_messages()
+		self.last_prompt_tokens_estimate = sum(estimate_tokens(message.text) for message in self.last_input_messages)
 		return self.last_input_messages
 
 	def _set_message_with_type(self, message: BaseMessage, message_type: Literal['system', 'state']) -> None:
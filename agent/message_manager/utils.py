@@ -11,6 +11,13 @@ from browser_use.llm.messages import BaseMessage
 
 logger = logging.getLogger(__name__)
 
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+	"""Rough token count of a text (~4 characters per token), good enough for context budgeting"""
+	return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
 
 async def save_conversation(
 	input_messages: list[BaseMessage],
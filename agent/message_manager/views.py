@@ -2,8 +2,9 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
+from browser_use.agent.message_manager.utils import estimate_tokens
 from browser_use.llm.messages import (
 	BaseMessage,
 )
@@ -25,6 +26,9 @@ class HistoryItem(BaseModel):
 
 	model_config = ConfigDict(arbitrary_types_allowed=True)
 
+	# history items are never modified once added, so the rendered string is computed once
+	_rendered: str | None = PrivateAttr(default=None)
+
 	def model_post_init(self, __context) -> None:
 		"""Validate that error and system_message are not both provided"""
 		if self.error is not None and self.system_message is not None:
@@ -32,6 +36,33 @@ class HistoryItem(BaseModel):
 
 	def to_string(self) -> str:
 		"""Get string representation of the history item"""
+		if self._rendered is None:
+			self._rendered = self._render()
+		return self._rendered
+
+	@property
+	def estimated_tokens(self) -> int:
+		"""Estimated tokens of the item in the agent history description"""
+		return estimate_tokens(self.to_string())
+
+	def to_summary_line(self, max_chars: int = 200) -> str:
+		"""One-line extractive summary of the item, used when it is rolled out of the history into the summary"""
+		if self.system_message:
+			return ' '.join(self.system_message.split())
+
+		if self.error:
+			text = self.error
+		else:
+			results = (self.action_results or '').removeprefix('Result\n')
+			text = ' | '.join(part for part in (self.memory or self.next_goal, results.replace('\n', '; ')) if part)
+
+		text = ' '.join(text.split())
+		if len(text) > max_chars:
+			text = text[: max_chars - 3] + '...'
+		step_str = f'step {self.step_number}' if self.step_number is not None else 'step_unknown'
+		return f'{step_str}: {text}'
+
+	def _render(self) -> str:
 		step_str = 'step' if self.step_number is not None else 'step_unknown'
 
 		if self.error:
@@ -92,5 +123,9 @@ class MessageManagerState(BaseModel):
 		default_factory=lambda: [HistoryItem(step_number=0, system_message='Agent initialized')]
 	)
 	read_state_description: str = ''
+	history_summary: str = ''  # summary by history_summarizer_llm of the earliest items rolled out of agent_history_items
+	history_summary_lines: list[str] = Field(default_factory=list)  # one extractive line per rolled item not in history_summary
+	history_summary_lines_dropped: int = 0  # extractive lines dropped to keep the summary within its share of the budget
+	history_summary_items: int = 0  # number of history items covered by history_summary and history_summary_lines
 
 	model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -0,0 +1,374 @@
+"""
+Offline end-to-end benchmark of the agent loops, measuring the framework's own overhead per step.
+
+Runs `Agent.run` and `CodeAgent.run` against a scripted stand-in LLM (answers instantly with a valid response) and a
+browser stand-in that serves a recorded page (see `browser_use.dom.recording`) as the browser state of every step, so
+what is left is the framework: browser state serialization, message building, schema validation of the model output,
+action dispatch, history bookkeeping and event dispatch.
+
+Every run happens in a fresh process and reports:
+- steps per second over the whole run
+- the time per step phase from the step metadata (`phase_seconds`), for the first and the last tenth of the steps,
+  so the phases that get slower as the run gets longer stand out. `finalize` is the time between the end of a step's
+  metadata and the start of the next step (history item, step events, file system state).
+- peak RSS of the process and (in a second run with tracemalloc) the peak and retained Python allocations
+
+Usage:
+	python -m browser_use.agent.playground.agent_loop_benchmark [--agents agent code] [--steps 10 100 500]
+
+	# only the framework, the serialized DOM of the page is computed once and reused by every step
+	python -m browser_use.agent.playground.agent_loop_benchmark --dom cached
+
+	# actions executed while the (scripted) model output is streamed, see Agent(stream_actions=True)
+	python -m browser_use.agent.playground.agent_loop_benchmark --agents agent --stream-actions
+
+	# a recorded page instead of the synthetic one (record with dom_pipeline_benchmark --record)
+	python -m browser_use.agent.playground.agent_loop_benchmark --fixture tmp/github.json.gz --save tmp/agent_loop.json
+"""
+
+import os
+
+# no telemetry or cloud events from benchmark runs (read when browser_use is imported)
+os.environ.setdefault('ANONYMIZED_TELEMETRY', 'false')
+os.environ.setdefault('BROWSER_USE_CLOUD_SYNC', 'false')
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Literal, TypeVar, overload
+
+from pydantic import BaseModel
+from uuid_extensions import uuid7str
+
+from browser_use.browser.profile import BrowserProfile
+from browser_use.browser.views import PLACEHOLDER_4PX_SCREENSHOT, BrowserStateSummary, TabInfo
+from browser_use.dom.playground.dom_pipeline_benchmark import generate_recording
+from browser_use.dom.recording import RecordedPage, ReplayBrowserSession
+from browser_use.dom.service import DomService
+from browser_use.dom.views import SerializedDOMState
+from browser_use.llm.messages import BaseMessage
+from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeStreamChunk, ChatInvokeUsage
+
+T = TypeVar('T', bound=BaseModel)
+
+AgentKind = Literal['agent', 'code']
+
+# region - stand-ins
+
+
+@dataclass
+class ScriptedChatModel:
+	"""Stand-in LLM that answers every agent step instantly, with `done` on step `steps`.
+
+	Agent steps append a line to a file (a real action that needs no browser), CodeAgent steps append to a list in
+	the namespace. Structured responses are parsed from JSON like the providers do, usage is estimated from the input.
+	"""
+
+	steps: int
+	model: str = 'scripted'
+	calls: int = 0
+	_verified_api_keys: bool = field(default=True, repr=False)
+
+	@property
+	def provider(self) -> str:
+		return 'scripted'
+
+	@property
+	def name(self) -> str:
+		return self.model
+
+	@property
+	def model_name(self) -> str:
+		return self.model
+
+	def _agent_output_json(self, output_format: type[BaseModel]) -> str:
+		step = self.calls
+		if step >= self.steps:
+			action: dict[str, Any] = {'done': {'text': f'Collected {step - 1} notes', 'success': True}}
+		else:
+			action = {'write_file': {'file_name': 'notes.md', 'content': f'- note {step}', 'append': True}}
+		brain = {
+			'thinking': f'Step {step}: keep collecting notes until step {self.steps}.',
+			'evaluation_previous_goal': 'Success',
+			'memory': f'{step - 1} notes collected so far.',
+			'next_goal': 'Finish the task.' if step >= self.steps else f'Append note {step}.',
+		}
+		output = {key: value for key, value in brain.items() if key in output_format.model_fields}
+		output['action'] = [action]
+		return json.dumps(output)
+
+	def _code(self) -> str:
+		step = self.calls
+		if step >= self.steps:
+			return f"Done.\n\n```python\nawait done(text=f'Collected {{len(notes)}} notes', success=True)\n```"
+		if step == 1:
+			return 'Start collecting.\n\n```python\nnotes = []\nprint(len(notes))\n```'
+		return f"Next note.\n\n```python\nnotes.append({{'step': {step}}})\nprint(len(notes))\n```"
+
+	@overload
+	async def ainvoke(self, messages: list[BaseMessage], output_format: None = None) -> ChatInvokeCompletion[str]: ...
+
+	@overload
+	async def ainvoke(self, messages: list[BaseMessage], output_format: type[T]) -> ChatInvokeCompletion[T]: ...
+
+	async def ainvoke(
+		self, messages: list[BaseMessage], output_format: type[T] | None = None, **kwargs: Any
+	) -> ChatInvokeCompletion[T] | ChatInvokeCompletion[str]:
+		self.calls += 1
+		if output_format is None:
+			completion: Any = self._code()
+		else:
+			completion = output_format.model_validate_json(self._agent_output_json(output_format))
+		return ChatInvokeCompletion(completion=completion, usage=self._usage(messages))
+
+	async def astream(self, messages: list[BaseMessage], output_format: type[T]) -> AsyncIterator[ChatInvokeStreamChunk]:
+		"""The structured response in pieces of 16 characters, for the `stream_actions` mode"""
+		self.calls += 1
+		text = self._agent_output_json(output_format)
+		for start in range(0, len(text), 16):
+			yield ChatInvokeStreamChunk(text=text[start : start + 16])
+		yield ChatInvokeStreamChunk(usage=self._usage(messages))
+
+	def _usage(self, messages: list[BaseMessage]) -> ChatInvokeUsage:
+		prompt_tokens = sum(len(message.text) for message in messages) // 4
+		return ChatInvokeUsage(
+			prompt_tokens=prompt_tokens,
+			prompt_cached_tokens=None,
+			prompt_cache_creation_tokens=None,
+			prompt_image_tokens=None,
+			completion_tokens=50,
+			total_tokens=prompt_tokens + 50,
+		)
+
+
+class ScriptedChatBrowserUse(ScriptedChatModel):
+	"""CodeAgent only accepts ChatBrowserUse models (checked by class name)."""
+
+
+class RecordedBrowserSession(ReplayBrowserSession):
+	"""Browser stand-in for the agent loops: the current page is a `RecordedPage`, whatever the agent does.
+
+	With `reuse_dom_state`, the page is serialized once and every step gets the same DOM state (framework overhead
+	only), otherwise every state capture runs the full DOM pipeline on the recording.
+	"""
+
+	def __init__(self, page: RecordedPage, reuse_dom_state: bool = False):
+		super().__init__(page)
+		self.id = uuid7str()
+		self.cdp_url: str | None = None
+		self.browser_profile = BrowserProfile(headless=True, keep_alive=False, wait_between_actions=0)
+		self.downloaded_files: list[str] = []
+		self.reuse_dom_state = reuse_dom_state
+		self.dom_service = DomService(self, cross_origin_iframes=len(page.targets) > 1)  # type: ignore[arg-type]
+		self._dom_state: SerializedDOMState | None = None
+		self._replay_evaluate = self.cdp_client.send.Runtime.evaluate
+		self.cdp_client.send.Runtime.evaluate = self._evaluate
+
+	async def _evaluate(self, params: Any = None, session_id: str | None = None) -> dict[str, Any]:
+		# CodeAgent reads the title for its history
+		if params and params.get('expression') == 'document.title':
+			return {'result': {'value': self.page.title}}
+		return await self._replay_evaluate(params, session_id=session_id)
+
+	async def start(self) -> None:
+		pass
+
+	async def stop(self) -> None:
+		pass
+
+	async def kill(self) -> None:
+		pass
+
+	async def get_browser_state_summary(
+		self, include_screenshot: bool = True, include_recent_events: bool = False, **kwargs: Any
+	) -> BrowserStateSummary:
+		if self._dom_state is None or not self.reuse_dom_state:
+			previous_state = self._cached_browser_state_summary.dom_state if self._cached_browser_state_summary else None
+			self._dom_state, _, _ = await self.dom_service.get_serialized_dom_tree(previous_cached_state=previous_state)
+
+		state = BrowserStateSummary(
+			dom_state=self._dom_state,
+			url=self.page.url,
+			title=self.page.title,
+			tabs=[TabInfo(target_id=self.page.main_target_id, url=self.page.url, title=self.page.title)],
+			screenshot=PLACEHOLDER_4PX_SCREENSHOT if include_screenshot else None,
+			pixels_above=0,
+			pixels_below=0,
+		)
+		self._cached_browser_state_summary = state
+		return state
+
+
+# endregion - stand-ins
+
+# region - benchmark
+
+
+async def run_agent(
+	kind: AgentKind, page: RecordedPage, steps: int, reuse_dom_state: bool, workdir: Path, stream_actions: bool = False
+) -> list[Any]:
+	"""Run one agent loop for `steps` steps, returns the step metadata of every step."""
+	browser_session = RecordedBrowserSession(page, reuse_dom_state=reuse_dom_state)
+	task = 'Collect one note per step, call done once all notes are collected.'
+
+	if kind == 'agent':
+		from browser_use.agent.service import Agent
+
+		agent = Agent(
+			task=task,
+			llm=ScriptedChatModel(steps=steps),
+			browser_session=browser_session,  # type: ignore[arg-type]
+			file_system_path=str(workdir / 'agent'),
+			stream_actions=stream_actions,
+		)
+		history = await agent.run(max_steps=steps)
+		assert history.is_done(), f'Agent stopped after {len(history.history)} steps without calling done'
+		return [item.metadata for item in history.history if item.metadata]
+
+	from browser_use.code_use.service import CodeAgent
+	from browser_use.filesystem.file_system import FileSystem
+
+	code_agent = CodeAgent(
+		task=task,
+		llm=ScriptedChatBrowserUse(steps=steps),
+		browser_session=browser_session,  # type: ignore[arg-type]
+		file_system=FileSystem(base_dir=workdir / 'code'),
+		max_steps=steps,
+	)
+	await code_agent.run()
+	assert code_agent.namespace.get('_task_done'), f'CodeAgent stopped after {len(code_agent.complete_history)} steps'
+	return [item.metadata for item in code_agent.complete_history if item.metadata]
+
+
+def step_phases_ms(metadata: list[Any]) -> list[dict[str, float]]:
+	"""Milliseconds of each phase of every step, plus finalize and the unaccounted rest."""
+	steps = []
+	for index, step in enumerate(metadata):
+		phases = {phase: seconds * 1000 for phase, seconds in step.phase_seconds.items()}
+		phases['other'] = (step.duration_seconds - sum(step.phase_seconds.values())) * 1000
+		if index + 1 < len(metadata):
+			phases['finalize'] = (metadata[index + 1].step_start_time - step.step_end_time) * 1000
+		steps.append(phases)
+	return steps
+
+
+def mean_phases(steps: list[dict[str, float]]) -> dict[str, float]:
+	phases = list(dict.fromkeys(phase for step in steps for phase in step))
+	return {phase: statistics.fmean(step[phase] for step in steps if phase in step) for phase in phases}
+
+
+def peak_rss_bytes() -> int:
+	# ru_maxrss is in KiB on Linux and in bytes on macOS
+	return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+
+
+def run_worker(
+	kind: AgentKind, page: RecordedPage, steps: int, reuse_dom_state: bool, trace_allocations: bool, stream_actions: bool = False
+) -> dict[str, Any]:
+	"""One benchmark run in a fresh process (for a meaningful peak RSS)."""
+	logging.getLogger('browser_use').setLevel(logging.WARNING)
+	rss_before = peak_rss_bytes()
+
+	with tempfile.TemporaryDirectory(prefix='agent_loop_benchmark_') as workdir:
+		if trace_allocations:
+			tracemalloc.start()
+		start = time.perf_counter()
+		try:
+			metadata = asyncio.run(run_agent(kind, page, steps, reuse_dom_state, Path(workdir), stream_actions))
+			elapsed = time.perf_counter() - start
+			if trace_allocations:
+				retained, peak = tracemalloc.get_traced_memory()
+		finally:
+			if trace_allocations:
+				tracemalloc.stop()
+
+	if trace_allocations:
+		return {'peak_alloc_mib': peak / 2**20, 'retained_kib_per_step': retained / 2**10 / max(len(metadata), 1)}
+
+	phases = step_phases_ms(metadata)
+	tenth = max(len(phases) // 10, 1)
+	result: dict[str, Any] = {
+		'steps': len(metadata),
+		'seconds': elapsed,
+		'steps_per_second': len(metadata) / elapsed,
+		'peak_rss_mib': peak_rss_bytes() / 2**20,
+		'rss_growth_mib': (peak_rss_bytes() - rss_before) / 2**20,
+	}
+	result['step_ms_median'] = statistics.median(step.duration_seconds for step in metadata) * 1000
+	result['first_tenth_ms'] = mean_phases(phases[:tenth])
+	# without the final (done) step, it has no finalize and a different action
+	result['last_tenth_ms'] = mean_phases(phases[-tenth - 1 : -1] or phases[-1:])
+	return result
+
+
+def run_in_subprocess(*args: Any) -> dict[str, Any]:
+	with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+		return pool.submit(run_worker, *args).result()
+
+
+def print_results(name: str, result: dict[str, Any]) -> None:
+	print(
+		f'\n{name}: {result["steps"]} steps in {result["seconds"]:.2f}s = {result["steps_per_second"]:.1f} steps/s '
+		f'(median step {result["step_ms_median"]:.1f} ms), peak RSS {result["peak_rss_mib"]:.0f} MiB '
+		f'(+{result["rss_growth_mib"]:.0f} MiB during the run)'
+	)
+	if 'peak_alloc_mib' in result:
+		print(
+			f'  allocations: peak {result["peak_alloc_mib"]:.1f} MiB, '
+			f'retained {result["retained_kib_per_step"]:.1f} KiB per step'
+		)
+
+	first, last = result['first_tenth_ms'], result['last_tenth_ms']
+	print(f'  {"phase (ms per step)":<24} {"first 10%":>10} {"last 10%":>10} {"growth":>8}')
+	for phase in dict.fromkeys([*last, *first]):
+		before, after = first.get(phase, 0.0), last.get(phase, 0.0)
+		growth = f'{after / before:7.1f}x' if before > 0.01 else f'{"-":>8}'
+		print(f'  {phase:<24} {before:10.2f} {after:10.2f} {growth}')
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--agents', nargs='+', choices=['agent', 'code'], default=['agent', 'code'])
+	parser.add_argument('--steps', nargs='+', type=int, default=[10, 100, 500])
+	parser.add_argument('--dom', choices=['replay', 'cached'], default='replay', help='run the DOM pipeline every step or once')
+	parser.add_argument('--page-nodes', type=int, default=1_000, help='size of the synthetic page')
+	parser.add_argument('--fixture', type=Path, help='recorded page to use instead of the synthetic one')
+	parser.add_argument('--stream-actions', action='store_true', help='stream the model output and act on it (Agent only)')
+	parser.add_argument('--no-allocations', action='store_true', help='skip the tracemalloc runs')
+	parser.add_argument('--save', type=Path, help='write the results as JSON')
+	args = parser.parse_args()
+
+	page = RecordedPage.load(args.fixture) if args.fixture else generate_recording(args.page_nodes)
+	reuse_dom_state = args.dom == 'cached'
+	print(f'Page: {page.url} ({page.total_nodes} nodes), DOM pipeline: {args.dom}')
+
+	results: dict[str, Any] = {}
+	for kind in args.agents:
+		for steps in args.steps:
+			name = f'{"Agent" if kind == "agent" else "CodeAgent"} x{steps}'
+			result = run_in_subprocess(kind, page, steps, reuse_dom_state, False, args.stream_actions)
+			if not args.no_allocations:
+				result.update(run_in_subprocess(kind, page, steps, reuse_dom_state, True, args.stream_actions))
+			results[name] = result
+			print_results(name, result)
+
+	if args.save:
+		args.save.parent.mkdir(parents=True, exist_ok=True)
+		args.save.write_text(json.dumps(results, indent=2))
+		print(f'\nSaved results to {args.save}')
+
+
+if __name__ == '__main__':
+	main()
@@ -84,10 +84,15 @@ class AgentMessagePrompt:
 		vision_detail_level: Literal['auto', 'low', 'high'] = 'auto',
 		include_recent_events: bool = False,
 		sample_images: list[ContentPartTextParam | ContentPartImageParam] | None = None,
+		agent_history_blocks: list[str] | None = None,
 	):
 		self.browser_state: 'BrowserStateSummary' = browser_state_summary
 		self.file_system: 'FileSystem | None' = file_system
 		self.agent_history_description: str | None = agent_history_description
+		# history items as separate blocks, so each step's history is a prefix of the next step's (for prompt caching)
+		if agent_history_blocks is None:
+			agent_history_blocks = [agent_history_description.strip('\n')] if agent_history_description else []
+		self.agent_history_blocks: list[str] = agent_history_blocks
 		self.read_state_description: str | None = read_state_description
 		self.task: str | None = task
 		self.include_attributes = include_attributes
@@ -181,6 +186,9 @@ class AgentMessagePrompt:
 		if page_stats['total_elements'] < 10:
 			stats_text += 'Page appears empty (SPA not loaded?) - '
 		stats_text += f'{page_stats["links"]} links, {page_stats["interactive_elements"]} interactive, '
+		selector_map_diff = self.browser_state.dom_state.selector_map_diff
+		if selector_map_diff is not None and selector_map_diff.new_backend_node_ids:
+			stats_text += f'{len(selector_map_diff.new_backend_node_ids)} new since last step, '
 		stats_text += f'{page_stats["iframes"]} iframes, {page_stats["scroll_containers"]} scroll containers'
 		if page_stats['shadow_open'] > 0 or page_stats['shadow_closed'] > 0:
 			stats_text += f', {page_stats["shadow_open"]} shadow(open), {page_stats["shadow_closed"]} shadow(closed)'
@@ -287,9 +295,6 @@ Available tabs:
 			_todo_contents = '[empty todo.md, fill it when applicable]'
 
 		agent_state = f"""
-<user_request>
-{self.task}
-</user_request>
 <file_system>
 {self.file_system.describe() if self.file_system else 'No file system available'}
 </file_system>
@@ -308,7 +313,14 @@ Available tabs:
 
 	@observe_debug(ignore_input=True, ignore_output=True, name='get_user_message')
 	def get_user_message(self, use_vision: bool = True) -> UserMessage:
-		"""Get complete state as a single cached message"""
+		"""
+		Get complete state as a single cached message.
+
+		The content is laid out from most to least stable, so consecutive steps share the longest possible prompt prefix
+		for provider prompt caching (OpenAI / Gemini prefix caching, Anthropic cache breakpoints):
+		the user request, then the agent history (one part per item, only appended to between steps),
+		then everything that changes every step (agent state, browser state, screenshots).
+		"""
 		# Don't pass screenshot to model if page is a new tab page, step is 0, and there's only one tab
 		if (
 			is_new_tab_page(self.browser_state.url)
@@ -318,12 +330,17 @@ Available tabs:
 		):
 			use_vision = False
 
-		# Build complete state description
-		state_description = (
-			'<agent_history>\n'
-			+ (self.agent_history_description.strip('\n') if self.agent_history_description else '')
-			+ '\n</agent_history>\n\n'
-		)
+		# Stable prefix: the user request, then the agent history with a cache breakpoint after each of them
+		content_parts: list[ContentPartTextParam | ContentPartImageParam] = [
+			ContentPartTextParam(text=f'<user_request>\n{self.task}\n</user_request>', cache=True),
+			ContentPartTextParam(text='<agent_history>'),
+		]
+		content_parts.extend(ContentPartTextParam(text=block) for block in self.agent_history_blocks)
+		assert isinstance(content_parts[-1], ContentPartTextParam)
+		content_parts[-1].cache = True
+
+		# Volatile part
+		state_description = '</agent_history>\n\n'
 		state_description += '<agent_state>\n' + self._get_agent_state_description().strip('\n') + '\n</agent_state>\n'
 		state_description += '<browser_state>\n' + self._get_browser_state_description().strip('\n') + '\n</browser_state>\n'
 		# Only add read_state if it has content
@@ -336,10 +353,9 @@ Available tabs:
 			state_description += self.page_filtered_actions + '\n'
 			state_description += '</page_specific_actions>\n'
 
-		if use_vision is True and self.screenshots:
-			# Start with text description
-			content_parts: list[ContentPartTextParam | ContentPartImageParam] = [ContentPartTextParam(text=state_description)]
+		content_parts.append(ContentPartTextParam(text=state_description))
 
+		if use_vision is True and self.screenshots:
 			# Add sample images
 			content_parts.extend(self.sample_images)
 
@@ -365,6 +381,4 @@ Available tabs:
 					)
 				)
 
-			return UserMessage(content=content_parts, cache=True)
-
-		return UserMessage(content=state_description, cache=True)
+		return UserMessage(content=content_parts, cache=True)
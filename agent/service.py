@@ -6,7 +6,8 @@ import logging
 import re
 import tempfile
 import time
-from collections.abc import Awaitable, Callable
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Generic, Literal, TypeVar
@@ -24,6 +25,8 @@ from browser_use.agent.cloud_events import (
 from browser_use.agent.message_manager.utils import save_conversation
 from browser_use.llm.base import BaseChatModel
 from browser_use.llm.messages import BaseMessage, ContentPartImageParam, ContentPartTextParam, UserMessage
+from browser_use.llm.streaming import StructuredOutputStream, supports_streaming
+from browser_use.llm.views import ChatInvokeUsage
 from browser_use.tokens.service import TokenCost
 
 load_dotenv()
@@ -56,6 +59,7 @@ from browser_use.agent.views import (
 from browser_use.browser.session import DEFAULT_BROWSER_PROFILE
 from browser_use.browser.views import BrowserStateSummary
 from browser_use.config import CONFIG
+from browser_use.dom.service import DOM_CAPTURE_RETRY_TIMEOUT, DOM_CAPTURE_TIMEOUT, DomService
 from browser_use.dom.views import DOMInteractedElement
 from browser_use.filesystem.file_system import FileSystem
 from browser_use.observability import observe, observe_debug
@@ -119,6 +123,32 @@ Context = TypeVar('Context')
 
 AgentHookFunc = Callable[['Agent'], Awaitable[None]]
 
+# Longest a step waits for the state prefetched by the previous step (from the start of the capture), the CDP requests
+# of the DOM capture are bounded by the DOM timeouts, the rest covers the screenshot and the serialization
+STATE_PREFETCH_TIMEOUT = DOM_CAPTURE_TIMEOUT + DOM_CAPTURE_RETRY_TIMEOUT + 5.0
+
+
+@dataclass
+class _StatePrefetch:
+	"""Browser state of the next step, captured in the background while the current step is wrapped up."""
+
+	target_id: str | None
+	previous_state: BrowserStateSummary | None  # cached state before the prefetch, restored if it is discarded
+	started_at: float
+	task: 'asyncio.Task[BrowserStateSummary] | None' = None
+	capture_seconds: float = 0.0
+	document_state: str | None = None  # `DomService.get_document_state` right after the capture
+
+
+async def _iterate_actions(actions: list[ActionModel] | AsyncIterator[ActionModel]) -> AsyncIterator[ActionModel]:
+	"""Iterate a list of actions and actions streamed from the model alike"""
+	if isinstance(actions, list):
+		for action in actions:
+			yield action
+	else:
+		async for action in actions:
+			yield action
+
 
 class Agent(Generic[Context, AgentStructuredOutput]):
 	@time_execution_sync('--init')
@@ -163,6 +193,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		use_thinking: bool = True,
 		flash_mode: bool = False,
 		max_history_items: int | None = None,
+		max_history_tokens: int | None = None,
+		history_summarizer_llm: BaseChatModel | None = None,
 		page_extraction_llm: BaseChatModel | None = None,
 		injected_agent_state: AgentState | None = None,
 		source: str | None = None,
@@ -178,6 +210,10 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		include_recent_events: bool = False,
 		sample_images: list[ContentPartTextParam | ContentPartImageParam] | None = None,
 		final_response_after_failure: bool = True,
+		prefetch_next_state: bool = False,
+		stream_actions: bool = False,
+		screenshot_format: Literal['png', 'webp', 'avif'] = 'png',
+		screenshot_dedup_distance: int | None = None,
 		_url_shortening_limit: int = 25,
 		**kwargs,
 	):
@@ -276,18 +312,38 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			use_thinking=use_thinking,
 			flash_mode=flash_mode,
 			max_history_items=max_history_items,
+			max_history_tokens=max_history_tokens,
+			history_summarizer_llm=history_summarizer_llm,
 			page_extraction_llm=page_extraction_llm,
 			calculate_cost=calculate_cost,
 			include_tool_call_examples=include_tool_call_examples,
 			llm_timeout=llm_timeout,
 			step_timeout=step_timeout,
 			final_response_after_failure=final_response_after_failure,
+			prefetch_next_state=prefetch_next_state,
+			stream_actions=stream_actions,
+			screenshot_format=screenshot_format,
+			screenshot_dedup_distance=screenshot_dedup_distance,
 		)
 
+		# Pipelined step mode: next browser state captured in the background, see _start_state_prefetch()
+		self._state_prefetch: _StatePrefetch | None = None
+		self._state_prefetch_hit: bool | None = None
+		self._state_prefetch_saved_seconds = 0.0
+
+		# Usage of the step's LLM call, for the per-step prompt cache accounting in StepMetadata
+		self._step_llm_usage: ChatInvokeUsage | None = None
+		self._step_phase_seconds: dict[str, float] = {}
+		# Time to first action: from the start of the step's LLM call to the start of its first action
+		self._step_llm_started_at: float | None = None
+		self._step_first_action_seconds: float | None = None
+
 		# Token cost service
 		self.token_cost_service = TokenCost(include_cost=calculate_cost)
 		self.token_cost_service.register_llm(llm)
 		self.token_cost_service.register_llm(page_extraction_llm)
+		if history_summarizer_llm is not None:
+			self.token_cost_service.register_llm(history_summarizer_llm)
 
 		# Initialize state
 		self.state = injected_agent_state or AgentState()
@@ -360,6 +416,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			include_attributes=self.settings.include_attributes,
 			sensitive_data=sensitive_data,
 			max_history_items=self.settings.max_history_items,
+			max_history_tokens=self.settings.max_history_tokens,
+			history_summarizer_llm=self.settings.history_summarizer_llm,
 			vision_detail_level=self.settings.vision_detail_level,
 			include_tool_call_examples=self.settings.include_tool_call_examples,
 			include_recent_events=self.include_recent_events,
@@ -560,15 +618,20 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		try:
 			from browser_use.screenshots.service import ScreenshotService
 
-			self.screenshot_service = ScreenshotService(self.agent_directory)
+			self.screenshot_service = ScreenshotService(
+				self.agent_directory,
+				image_format=self.settings.screenshot_format,
+				perceptual_dedup_distance=self.settings.screenshot_dedup_distance,
+			)
 			logger.debug(f'📸 Screenshot service initialized in: {self.agent_directory}/screenshots')
 		except Exception as e:
 			logger.error(f'📸 Failed to initialize screenshot service: {e}.')
 			raise e
 
-	def save_file_system_state(self) -> None:
+	async def save_file_system_state(self) -> None:
 		"""Save current file system state to agent state"""
 		if self.file_system:
+			await self.file_system.flush()
 			self.state.file_system_state = self.file_system.get_state()
 		else:
 			logger.error('💾 File system is not set up. Cannot save state.')
@@ -602,21 +665,20 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		# Initially only include actions with no filters
 		self.ActionModel = self.tools.registry.create_action_model()
 		# Create output model with the dynamic actions
-		if self.settings.flash_mode:
-			self.AgentOutput = AgentOutput.type_with_custom_actions_flash_mode(self.ActionModel)
-		elif self.settings.use_thinking:
-			self.AgentOutput = AgentOutput.type_with_custom_actions(self.ActionModel)
-		else:
-			self.AgentOutput = AgentOutput.type_with_custom_actions_no_thinking(self.ActionModel)
+		self.AgentOutput = self._agent_output_type(self.ActionModel)
 
 		# used to force the done action when max_steps is reached
 		self.DoneActionModel = self.tools.registry.create_action_model(include_actions=['done'])
+		self.DoneAgentOutput = self._agent_output_type(self.DoneActionModel)
+
+	def _agent_output_type(self, action_model: type[ActionModel]) -> type[AgentOutput]:
+		"""Output model of the configured output mode (memoized per action model)"""
 		if self.settings.flash_mode:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions_flash_mode(self.DoneActionModel)
+			return AgentOutput.type_with_custom_actions_flash_mode(action_model)
 		elif self.settings.use_thinking:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions(self.DoneActionModel)
+			return AgentOutput.type_with_custom_actions(action_model)
 		else:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions_no_thinking(self.DoneActionModel)
+			return AgentOutput.type_with_custom_actions_no_thinking(action_model)
 
 	def add_new_task(self, new_task: str) -> None:
 		"""Add a new task to the agent, keeping the same task_id as tasks are continuous"""
@@ -661,6 +723,12 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		# Initialize timing first, before any exceptions can occur
 
 		self.step_start_time = time.time()
+		self._state_prefetch_hit = None
+		self._state_prefetch_saved_seconds = 0.0
+		self._step_llm_usage = None
+		self._step_phase_seconds = {}
+		self._step_llm_started_at = None
+		self._step_first_action_seconds = None
 
 		browser_state_summary = None
 
@@ -669,11 +737,22 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			browser_state_summary = await self._prepare_context(step_info)
 
 			# Phase 2: Get model output and execute actions
-			await self._get_next_action(browser_state_summary)
-			await self._execute_actions()
+			phase_start = time.time()
+			if self.settings.stream_actions and supports_streaming(self.llm):
+				await self._stream_next_actions(browser_state_summary)
+				phase_start = self._record_step_phase('stream_actions', phase_start)
+			else:
+				await self._get_next_action(browser_state_summary)
+				phase_start = self._record_step_phase('get_next_action', phase_start)
+				await self._execute_actions()
+				phase_start = self._record_step_phase('execute_actions', phase_start)
+
+			# Pipelined mode: capture the next state while post-processing, history and events run
+			self._start_state_prefetch()
 
 			# Phase 3: Post-processing
 			await self._post_process()
+			self._record_step_phase('post_process', phase_start)
 
 		except Exception as e:
 			# Handle ALL exceptions in one place
@@ -687,14 +766,17 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		# step_start_time is now set in step() method
 
 		assert self.browser_session is not None, 'BrowserSession is not set up'
+		phase_start = time.time()
 
 		self.logger.debug(f'🌐 Step {self.state.n_steps}: Getting browser state...')
 		# Always take screenshots for all steps
-		self.logger.debug('📸 Requesting browser state with include_screenshot=True')
-		browser_state_summary = await self.browser_session.get_browser_state_summary(
-			include_screenshot=True,  # always capture even if use_vision=False so that cloud sync is useful (it's fast now anyway)
-			include_recent_events=self.include_recent_events,
-		)
+		browser_state_summary = await self._take_prefetched_state()
+		if browser_state_summary is None:
+			self.logger.debug('📸 Requesting browser state with include_screenshot=True')
+			browser_state_summary = await self.browser_session.get_browser_state_summary(
+				include_screenshot=True,  # always capture even if use_vision=False so that cloud sync is useful (it's fast now anyway)
+				include_recent_events=self.include_recent_events,
+			)
 		if browser_state_summary.screenshot:
 			self.logger.debug(f'📸 Got browser state WITH screenshot, length: {len(browser_state_summary.screenshot)}')
 		else:
@@ -702,6 +784,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 		# Check for new downloads after getting browser state (catches PDF auto-downloads and previous step downloads)
 		await self._check_and_update_downloads(f'Step {self.state.n_steps}: after getting browser state')
+		phase_start = self._record_step_phase('browser_state', phase_start)
 
 		self._log_step_context(browser_state_summary)
 		await self._check_stop_or_pause()
@@ -716,7 +799,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		# Page-specific actions will be included directly in the browser_state message
 		self.logger.debug(f'💬 Step {self.state.n_steps}: Creating state messages for context...')
 
-		self._message_manager.create_state_messages(
+		# Also summarizes old history items (history_summarizer_llm) once the history exceeds max_history_tokens
+		await self._message_manager.create_state_messages(
 			browser_state_summary=browser_state_summary,
 			model_output=self.state.last_model_output,
 			result=self.state.last_result,
@@ -729,16 +813,113 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 		await self._force_done_after_last_step(step_info)
 		await self._force_done_after_failure()
+		self._record_step_phase('prepare_context', phase_start)
+		return browser_state_summary
+
+	def _record_step_phase(self, phase: str, phase_start: float) -> float:
+		"""Record the time since `phase_start` for a phase of the current step and return the end of the phase"""
+		phase_end = time.time()
+		self._step_phase_seconds[phase] = self._step_phase_seconds.get(phase, 0.0) + phase_end - phase_start
+		return phase_end
+
+	def _start_state_prefetch(self) -> None:
+		"""Start capturing the next step's browser state in the background (`prefetch_next_state` mode)."""
+		if not self.settings.prefetch_next_state or self.browser_session is None:
+			return
+		if self.state.last_result and self.state.last_result[-1].is_done:
+			return
+
+		self._cancel_state_prefetch()
+		prefetch = _StatePrefetch(
+			target_id=self.browser_session.agent_focus.target_id if self.browser_session.agent_focus else None,
+			previous_state=self.browser_session._cached_browser_state_summary,
+			started_at=time.time(),
+		)
+		prefetch.task = asyncio.create_task(self._capture_prefetched_state(prefetch), name=f'agent_state_prefetch_{self.id[-4:]}')
+		self._state_prefetch = prefetch
+
+	async def _capture_prefetched_state(self, prefetch: _StatePrefetch) -> BrowserStateSummary:
+		assert self.browser_session is not None, 'BrowserSession is not set up'
+		browser_state_summary = await self.browser_session.get_browser_state_summary(
+			include_screenshot=True,
+			include_recent_events=self.include_recent_events,
+		)
+		prefetch.capture_seconds = time.time() - prefetch.started_at
+		# read after the capture: changes made while capturing (e.g. highlights) are part of the captured state
+		prefetch.document_state = await self._get_document_state()
+		return browser_state_summary
+
+	async def _get_document_state(self) -> str | None:
+		assert self.browser_session is not None, 'BrowserSession is not set up'
+		try:
+			cdp_session = await self.browser_session.get_or_create_cdp_session(focus=False)
+			return await DomService.get_document_state(cdp_session)
+		except Exception as e:
+			self.logger.debug(f'🔮 Could not read the document state: {type(e).__name__}: {e}')
+			return None
+
+	async def _take_prefetched_state(self) -> BrowserStateSummary | None:
+		"""Return the prefetched browser state if the page has not navigated or changed since it was captured."""
+		prefetch, self._state_prefetch = self._state_prefetch, None
+		if prefetch is None or prefetch.task is None:
+			return None
+		assert self.browser_session is not None, 'BrowserSession is not set up'
+
+		wait_start = time.time()
+		timed_out = False
+		try:
+			remaining = STATE_PREFETCH_TIMEOUT - (wait_start - prefetch.started_at)
+			browser_state_summary = await asyncio.wait_for(prefetch.task, timeout=max(remaining, 0.0))
+		except TimeoutError:
+			# a hung capture must not stall the step, it is cancelled and the state captured again
+			browser_state_summary = None
+			timed_out = True
+			self.logger.debug(f'🔮 State prefetch did not finish within {STATE_PREFETCH_TIMEOUT:.0f}s')
+		except Exception as e:
+			browser_state_summary = None
+			self.logger.debug(f'🔮 State prefetch failed: {type(e).__name__}: {e}')
+		document_state = await self._get_document_state() if browser_state_summary else None
+		overhead = time.time() - wait_start
+
+		current_target_id = self.browser_session.agent_focus.target_id if self.browser_session.agent_focus else None
+		if browser_state_summary is None:
+			reason = 'capture timed out' if timed_out else 'capture failed'
+		elif current_target_id != prefetch.target_id:
+			reason = 'focused tab changed'
+		elif document_state is None or document_state != prefetch.document_state:
+			reason = 'page navigated or changed since the capture'
+		else:
+			reason = None
+
+		if reason:
+			self.logger.debug(f'🔮 Discarding prefetched browser state: {reason}')
+			# the next capture must diff against the state the model actually saw
+			self.browser_session._cached_browser_state_summary = prefetch.previous_state
+			self._state_prefetch_hit = False
+			self._state_prefetch_saved_seconds = -overhead
+			return None
+
+		self._state_prefetch_hit = True
+		self._state_prefetch_saved_seconds = prefetch.capture_seconds - overhead
+		self.logger.debug(f'🔮 Using prefetched browser state, saved {self._state_prefetch_saved_seconds:.2f}s')
 		return browser_state_summary
 
+	def _cancel_state_prefetch(self) -> None:
+		if self._state_prefetch is not None and self._state_prefetch.task is not None:
+			self._state_prefetch.task.cancel()
+		self._state_prefetch = None
+
 	@observe_debug(ignore_input=True, name='get_next_action')
 	async def _get_next_action(self, browser_state_summary: BrowserStateSummary) -> None:
 		"""Execute LLM interaction with retry logic and handle callbacks"""
 		input_messages = self._message_manager.get_messages()
 		self.logger.debug(
-			f'🤖 Step {self.state.n_steps}: Calling LLM with {len(input_messages)} messages (model: {self.llm.model})...'
+			f'🤖 Step {self.state.n_steps}: Calling LLM with {len(input_messages)} messages '
+			f'(~{self._message_manager.last_prompt_tokens_estimate} text tokens, model: {self.llm.model})...'
 		)
 
+		if self._step_llm_started_at is None:  # kept when falling back from a failed stream
+			self._step_llm_started_at = time.time()
 		try:
 			model_output = await asyncio.wait_for(
 				self._get_model_output_with_retry(input_messages), timeout=self.settings.llm_timeout
@@ -775,6 +956,89 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		result = await self.multi_act(self.state.last_model_output.action)
 		self.state.last_result = result
 
+	@observe_debug(ignore_input=True, name='stream_next_actions')
+	async def _stream_next_actions(self, browser_state_summary: BrowserStateSummary) -> None:
+		"""Execute the actions of the model output as they are generated (`stream_actions` mode).
+
+		Each action starts as soon as the model has generated it, while the model is still generating the rest of its
+		output. Callbacks and conversation saving run once the whole output is in. If the stream fails before the first
+		action, the step falls back to a regular LLM call.
+		"""
+		input_messages = self._message_manager.get_messages()
+		self.logger.debug(
+			f'🤖 Step {self.state.n_steps}: Streaming LLM output with {len(input_messages)} messages '
+			f'(~{self._message_manager.last_prompt_tokens_estimate} text tokens, model: {self.llm.model})...'
+		)
+		urls_replaced = self._process_messsages_and_replace_long_urls_shorter_ones(input_messages)
+
+		self._step_llm_started_at = time.time()
+		stream = StructuredOutputStream(self.llm, input_messages, self.AgentOutput, 'action', timeout=self.settings.llm_timeout)
+		streamed_actions: list[ActionModel] = []
+		result: list[ActionResult] | None = None
+
+		async def actions() -> AsyncIterator[ActionModel]:
+			async for action in stream.items():
+				if len(streamed_actions) >= self.settings.max_actions_per_step:
+					break
+				if urls_replaced:
+					self._recursive_process_all_strings_inside_pydantic_model(action, urls_replaced)
+				streamed_actions.append(action)
+				yield action
+
+		try:
+			result = await self.multi_act(actions())
+			response = await stream.completion()
+		except Exception as e:
+			if streamed_actions:
+				# the actions ran, the history and the next prompt must show them instead of the previous step's output
+				self.logger.warning(
+					f'⚠️ Streamed step failed after {len(streamed_actions)} actions started: {type(e).__name__}: {e}'
+				)
+				self.state.last_model_output = self.AgentOutput(action=list(streamed_actions))
+				if result is not None:
+					self.state.last_result = result
+			if isinstance(e, TimeoutError) and stream.timed_out:
+				raise TimeoutError(
+					f'LLM call timed out after {self.settings.llm_timeout} seconds. Keep your thinking and output short.'
+				) from e
+			if streamed_actions or isinstance(e, (InterruptedError, TimeoutError)):
+				raise
+			self.logger.warning(f'⚠️ Streaming the LLM output failed, retrying without streaming: {type(e).__name__}: {e}')
+			await self._get_next_action(browser_state_summary)
+			await self._execute_actions()
+			return
+		finally:
+			await stream.aclose()
+
+		self._step_llm_usage = response.usage
+		if response.usage:
+			# streamed calls bypass the ainvoke wrapper of the token cost service
+			self.token_cost_service.add_usage(self.llm.model, response.usage)
+		if not streamed_actions:
+			# the regular call asks the model again for an action
+			self.logger.warning('Model returned empty action. Retrying without streaming...')
+			await self._get_next_action(browser_state_summary)
+			await self._execute_actions()
+			return
+
+		# the model output was validated as a whole, its actions are the ones that ran (up to max_actions_per_step)
+		parsed: AgentOutput = response.completion
+		if urls_replaced:
+			self._recursive_process_all_strings_inside_pydantic_model(parsed, urls_replaced)
+		parsed.action = parsed.action[: self.settings.max_actions_per_step]
+		self.logger.debug(
+			f'✅ Step {self.state.n_steps}: Streamed LLM response with {len(parsed.action)} actions, '
+			f'first action after {stream.first_item_seconds or 0:.2f}s'
+		)
+		if not (self.state.paused or self.state.stopped):
+			log_response(parsed, self.tools.registry.registry, self.logger)
+		self._log_next_action_summary(parsed)
+
+		self.state.last_model_output = parsed
+		self.state.last_result = result
+
+		await self._handle_post_llm_processing(browser_state_summary, input_messages)
+
 	async def _post_process(self) -> None:
 		"""Handle post-action processing like download tracking and result logging"""
 		assert self.browser_session is not None, 'BrowserSession is not set up'
@@ -842,6 +1106,13 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 				step_number=self.state.n_steps,
 				step_start_time=self.step_start_time,
 				step_end_time=step_end_time,
+				state_prefetch_hit=self._state_prefetch_hit,
+				state_prefetch_saved_seconds=self._state_prefetch_saved_seconds,
+				prompt_tokens_estimate=self._message_manager.last_prompt_tokens_estimate,
+				prompt_tokens=self._step_llm_usage.prompt_tokens if self._step_llm_usage else None,
+				prompt_cached_tokens=self._step_llm_usage.prompt_cached_tokens if self._step_llm_usage else None,
+				phase_seconds=self._step_phase_seconds,
+				first_action_seconds=self._step_first_action_seconds,
 			)
 
 			# Use _make_history_item like main branch
@@ -857,7 +1128,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		self._log_step_completion_summary(self.step_start_time, self.state.last_result)
 
 		# Save file system state after step completion
-		self.save_file_system_state()
+		await self.save_file_system_state()
 
 		# Emit both step created and executed events
 		if browser_state_summary and self.state.last_model_output:
@@ -1193,6 +1464,14 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			response = await self.llm.ainvoke(input_messages, **kwargs)
 			parsed: AgentOutput = response.completion  # type: ignore[assignment]
 
+			self._step_llm_usage = response.usage
+			if response.usage and response.usage.prompt_tokens:
+				cached_tokens = response.usage.prompt_cached_tokens or 0
+				self.logger.debug(
+					f'💾 Prompt cache: {cached_tokens}/{response.usage.prompt_tokens} prompt tokens cached '
+					f'({cached_tokens / response.usage.prompt_tokens:.0%})'
+				)
+
 			# Replace any shortened URLs in the LLM response back to original URLs
 			if urls_replaced:
 				self._recursive_process_all_strings_inside_pydantic_model(parsed, urls_replaced)
@@ -1783,33 +2062,29 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 	@observe_debug(ignore_input=True, ignore_output=True)
 	@time_execution_async('--multi_act')
-	async def multi_act(self, actions: list[ActionModel]) -> list[ActionResult]:
-		"""Execute multiple actions"""
+	async def multi_act(self, actions: list[ActionModel] | AsyncIterator[ActionModel]) -> list[ActionResult]:
+		"""Execute multiple actions, also while they are streamed from the model (total unknown until the stream ends)"""
 		results: list[ActionResult] = []
 		time_elapsed = 0
-		total_actions = len(actions)
+		total_actions = len(actions) if isinstance(actions, list) else None
 
 		assert self.browser_session is not None, 'BrowserSession is not set up'
-		try:
-			if (
-				self.browser_session._cached_browser_state_summary is not None
-				and self.browser_session._cached_browser_state_summary.dom_state is not None
-			):
-				cached_selector_map = dict(self.browser_session._cached_browser_state_summary.dom_state.selector_map)
-				cached_element_hashes = {e.parent_branch_hash() for e in cached_selector_map.values()}
-			else:
-				cached_selector_map = {}
-				cached_element_hashes = set()
-		except Exception as e:
-			self.logger.error(f'Error getting cached selector map: {e}')
-			cached_selector_map = {}
-			cached_element_hashes = set()
+		# The serializer already diffed the selector map against the previous step, no need to re-hash elements here
+		cached_state = self.browser_session._cached_browser_state_summary
+		selector_map_diff = cached_state.dom_state.selector_map_diff if cached_state and cached_state.dom_state else None
+		if selector_map_diff is not None and selector_map_diff.has_changes:
+			self.logger.debug(
+				f'🔀 Selector map changed since last step: {len(selector_map_diff.added)} added, '
+				f'{len(selector_map_diff.removed)} removed, {len(selector_map_diff.rerendered)} re-rendered'
+			)
 
-		for i, action in enumerate(actions):
+		i = -1
+		async for action in _iterate_actions(actions):
+			i += 1
 			if i > 0:
 				# ONLY ALLOW TO CALL `done` IF IT IS A SINGLE ACTION
 				if action.model_dump(exclude_unset=True).get('done') is not None:
-					msg = f'Done action is allowed only as a single action - stopped after action {i} / {total_actions}.'
+					msg = f'Done action is allowed only as a single action - stopped after action {i} / {total_actions or "?"}.'
 					self.logger.debug(msg)
 					break
 
@@ -1828,6 +2103,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 				self._log_action(action, action_name, i + 1, total_actions)
 
 				time_start = time.time()
+				if i == 0 and self._step_llm_started_at is not None and self._step_first_action_seconds is None:
+					self._step_first_action_seconds = time_start - self._step_llm_started_at
 
 				result = await self.tools.act(
 					action=action,
@@ -1843,7 +2120,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 				results.append(result)
 
-				if results[-1].is_done or results[-1].error or i == total_actions - 1:
+				if results[-1].is_done or results[-1].error or (total_actions is not None and i == total_actions - 1):
 					break
 
 			except Exception as e:
@@ -1853,7 +2130,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 		return results
 
-	def _log_action(self, action, action_name: str, action_num: int, total_actions: int) -> None:
+	def _log_action(self, action, action_name: str, action_num: int, total_actions: int | None) -> None:
 		"""Log the action before execution with colored formatting"""
 		# Color definitions
 		blue = '\033[34m'  # Action name
@@ -1861,7 +2138,10 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		reset = '\033[0m'
 
 		# Format action number and name
-		if total_actions > 1:
+		if total_actions is None:
+			# streamed actions, the total is not known yet
+			action_header = f'▶️  [{action_num}] {blue}{action_name}{reset}:'
+		elif total_actions > 1:
 			action_header = f'▶️  [{action_num}/{total_actions}] {blue}{action_name}{reset}:'
 		else:
 			action_header = f'▶️   {blue}{action_name}{reset}:'
@@ -2065,6 +2345,17 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			(None, None),
 		)
 
+		if current_element is None:
+			# histories recorded before the cached 64-bit element hashes store the SHA-256 based ones
+			highlight_index, current_element = next(
+				(
+					(highlight_index, element)
+					for highlight_index, element in browser_state_summary.dom_state.selector_map.items()
+					if element.legacy_element_hash() == historical_element.element_hash
+				),
+				(None, None),
+			)
+
 		if not current_element or highlight_index is None:
 			return None
 
@@ -2158,6 +2449,12 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 	async def close(self):
 		"""Close all resources"""
 		try:
+			self._cancel_state_prefetch()
+
+			# Write pending file system changes to disk
+			if getattr(self, 'file_system', None) is not None:
+				await self.file_system.close()
+
 			# Only close browser if keep_alive is False (or not set)
 			if self.browser_session is not None:
 				if not self.browser_session.browser_profile.keep_alive:
@@ -2188,24 +2485,14 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 	async def _update_action_models_for_page(self, page_url: str) -> None:
 		"""Update action models with page-specific actions"""
-		# Create new action model with current page's filtered actions
+		# Action model with current page's filtered actions (compiled once per set of available actions)
 		self.ActionModel = self.tools.registry.create_action_model(page_url=page_url)
 		# Update output model with the new actions
-		if self.settings.flash_mode:
-			self.AgentOutput = AgentOutput.type_with_custom_actions_flash_mode(self.ActionModel)
-		elif self.settings.use_thinking:
-			self.AgentOutput = AgentOutput.type_with_custom_actions(self.ActionModel)
-		else:
-			self.AgentOutput = AgentOutput.type_with_custom_actions_no_thinking(self.ActionModel)
+		self.AgentOutput = self._agent_output_type(self.ActionModel)
 
 		# Update done action model too
 		self.DoneActionModel = self.tools.registry.create_action_model(include_actions=['done'], page_url=page_url)
-		if self.settings.flash_mode:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions_flash_mode(self.DoneActionModel)
-		elif self.settings.use_thinking:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions(self.DoneActionModel)
-		else:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions_no_thinking(self.DoneActionModel)
+		self.DoneAgentOutput = self._agent_output_type(self.DoneActionModel)
 
 	def get_trace_object(self) -> dict[str, Any]:
 		"""Get the trace and trace_details objects for the agent"""
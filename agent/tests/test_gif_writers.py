@@ -0,0 +1,85 @@
+import pytest
+from PIL import GifImagePlugin, Image
+
+from browser_use.agent.gif import _create_animation_writer, _GifWriter, _MP4Writer, _WebPWriter
+
+SIZE = (64, 48)
+
+
+def make_frames() -> list[tuple[Image.Image, int]]:
+	"""A white frame shown twice, then a red box drawn into it, then a blue box next to that"""
+	white = Image.new('RGB', SIZE, 'white')
+	red = white.copy()
+	red.paste((255, 0, 0), (10, 10, 30, 30))
+	blue = red.copy()
+	blue.paste((0, 0, 255), (40, 20, 60, 40))
+	return [(white, 100), (white.copy(), 100), (red, 200), (blue, 300)]
+
+
+def write(writer) -> None:
+	for image, duration in make_frames():
+		writer.add_frame(image, duration)
+	writer.close()
+
+
+def assert_round_trip(path, tolerance: int = 0) -> None:
+	with Image.open(path) as animation:
+		assert animation.size == SIZE
+		assert animation.n_frames == 3
+		assert animation.info['loop'] == 0
+
+		durations = []
+		for index in range(animation.n_frames):
+			animation.seek(index)
+			animation.load()  # the WebP plugin reads frame info while decoding
+			durations.append(animation.info['duration'])
+		# the repeated white frame is merged into one frame shown twice as long
+		assert durations == [200, 200, 300]
+
+		# partial frames are drawn over the previous ones
+		last = animation.convert('RGB')
+		for position, expected in (((5, 5), (255, 255, 255)), ((20, 20), (255, 0, 0)), ((50, 30), (0, 0, 255))):
+			assert all(abs(a - b) <= tolerance for a, b in zip(last.getpixel(position), expected)), position
+
+
+@pytest.mark.parametrize('suffix, writer_class', [('.gif', _GifWriter), ('.webp', _WebPWriter), ('.mp4', _MP4Writer)])
+def test_writer_is_picked_by_extension(suffix, writer_class):
+	assert type(_create_animation_writer(f'history{suffix}')) is writer_class
+
+
+def test_gif_round_trip(tmp_path):
+	writer = _GifWriter(str(tmp_path / 'history.gif'))
+	write(writer)
+
+	assert writer.frame_count == 3 and writer.merged_frames == 1
+	assert_round_trip(tmp_path / 'history.gif')
+
+
+def test_gif_falls_back_to_image_save(tmp_path, monkeypatch):
+	monkeypatch.delattr(GifImagePlugin, 'getheader')
+	writer = _GifWriter(str(tmp_path / 'history.gif'))
+	write(writer)
+
+	assert not writer.supports_partial_frames
+	assert_round_trip(tmp_path / 'history.gif')
+
+
+def test_webp_round_trip(tmp_path):
+	writer = _WebPWriter(str(tmp_path / 'history.webp'), quality=100)
+	write(writer)
+
+	assert writer.frame_count == 3
+	# lossy encoding shifts colors slightly
+	assert_round_trip(tmp_path / 'history.webp', tolerance=16)
+
+
+def test_mp4_round_trip(tmp_path):
+	av = pytest.importorskip('av')
+	write(_MP4Writer(str(tmp_path / 'history.mp4')))
+
+	with av.open(str(tmp_path / 'history.mp4')) as container:
+		stream = container.streams.video[0]
+		frames = list(container.decode(stream))
+		assert (stream.width, stream.height) == SIZE
+		# the last frame is repeated at the end, so it is shown for its full duration
+		assert [round(float(frame.pts * frame.time_base) * 1000) for frame in frames] == [0, 200, 400, 699]
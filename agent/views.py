@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import json
 import logging
 import traceback
@@ -24,11 +25,14 @@ from browser_use.dom.views import DEFAULT_INCLUDE_ATTRIBUTES, DOMInteractedEleme
 # from browser_use.dom.views import SelectorMap
 from browser_use.filesystem.file_system import FileSystemState
 from browser_use.llm.base import BaseChatModel
+from browser_use.screenshots.service import load_screenshot
 from browser_use.tokens.views import UsageSummary
 from browser_use.tools.registry.views import ActionModel
 
 logger = logging.getLogger(__name__)
 
+AGENT_OUTPUT_CACHE_SIZE = 128  # output models per output mode, one per distinct set of available actions
+
 
 class AgentSettings(BaseModel):
 	"""Configuration options for the Agent"""
@@ -46,6 +50,8 @@ class AgentSettings(BaseModel):
 	use_thinking: bool = True
 	flash_mode: bool = False  # If enabled, disables evaluation_previous_goal and next_goal, and sets use_thinking = False
 	max_history_items: int | None = None
+	max_history_tokens: int | None = None  # Token budget of the agent history, older steps are rolled into a summary
+	history_summarizer_llm: BaseChatModel | None = None  # Summarizes rolled-out history steps (extractive summary if None)
 
 	page_extraction_llm: BaseChatModel | None = None
 	calculate_cost: bool = False
@@ -53,6 +59,10 @@ class AgentSettings(BaseModel):
 	llm_timeout: int = 60  # Timeout in seconds for LLM calls (auto-detected: 30s for gemini, 90s for o3, 60s default)
 	step_timeout: int = 180  # Timeout in seconds for each step
 	final_response_after_failure: bool = True  # If True, attempt one final recovery call after max_failures
+	prefetch_next_state: bool = False  # Capture the next browser state in the background while the step is wrapped up
+	stream_actions: bool = False  # Execute actions while the model is still generating (models with astream, see llm/streaming.py)
+	screenshot_format: Literal['png', 'webp', 'avif'] = 'png'  # Format of stored history screenshots ('png' keeps them as captured)
+	screenshot_dedup_distance: int | None = None  # Reuse stored screenshots within this perceptual hash distance (of 256 bits)
 
 
 class AgentState(BaseModel):
@@ -132,12 +142,26 @@ class StepMetadata(BaseModel):
 	step_start_time: float
 	step_end_time: float
 	step_number: int
+	state_prefetch_hit: bool | None = None  # Whether the step used the state prefetched by the previous step (None: no prefetch)
+	state_prefetch_saved_seconds: float = 0.0  # Wall-clock time the prefetch saved (negative if it cost time)
+	prompt_tokens_estimate: int | None = None  # Estimated text tokens of the step's input messages (images not counted)
+	prompt_tokens: int | None = None  # Prompt tokens of the step's LLM call, as reported by the provider
+	prompt_cached_tokens: int | None = None  # Prompt tokens of the step's LLM call served from the provider's prompt cache
+	phase_seconds: dict[str, float] = Field(default_factory=dict)  # Wall-clock seconds per phase of the step, in phase order
+	first_action_seconds: float | None = None  # Seconds from the start of the LLM call to the start of the first action
 
 	@property
 	def duration_seconds(self) -> float:
 		"""Calculate step duration in seconds"""
 		return self.step_end_time - self.step_start_time
 
+	@property
+	def prompt_cache_hit_ratio(self) -> float | None:
+		"""Share of the step's prompt tokens served from the prompt cache (None if the provider reported no usage)"""
+		if not self.prompt_tokens:
+			return None
+		return (self.prompt_cached_tokens or 0) / self.prompt_tokens
+
 
 class AgentBrain(BaseModel):
 	thinking: str | None = None
@@ -174,7 +198,11 @@ class AgentOutput(BaseModel):
 			next_goal=self.next_goal if self.next_goal else '',
 		)
 
+	# The type_with_custom_actions* variants (the output modes) are memoized by action model: the registry returns the
+	# same action model class for the same set of actions, so page changes reuse the output model and its JSON schema.
+
 	@staticmethod
+	@functools.lru_cache(maxsize=AGENT_OUTPUT_CACHE_SIZE)
 	def type_with_custom_actions(custom_actions: type[ActionModel]) -> type[AgentOutput]:
 		"""Extend actions with custom actions"""
 
@@ -190,6 +218,7 @@ class AgentOutput(BaseModel):
 		return model_
 
 	@staticmethod
+	@functools.lru_cache(maxsize=AGENT_OUTPUT_CACHE_SIZE)
 	def type_with_custom_actions_no_thinking(custom_actions: type[ActionModel]) -> type[AgentOutput]:
 		"""Extend actions with custom actions and exclude thinking field"""
 
@@ -214,6 +243,7 @@ class AgentOutput(BaseModel):
 		return model
 
 	@staticmethod
+	@functools.lru_cache(maxsize=AGENT_OUTPUT_CACHE_SIZE)
 	def type_with_custom_actions_flash_mode(custom_actions: type[ActionModel]) -> type[AgentOutput]:
 		"""Extend actions with custom actions for flash mode - memory and action fields only"""
 
@@ -527,7 +557,8 @@ class AgentHistoryList(BaseModel, Generic[AgentStructuredOutput]):
 		screenshots = []
 
 		for item in history_items:
-			screenshot_b64 = item.state.get_screenshot()
+			# paths resolve lazily through the shared screenshot cache, repeated calls don't re-read the files
+			screenshot_b64 = load_screenshot(item.state.screenshot_path)
 			if screenshot_b64:
 				screenshots.append(screenshot_b64)
 			else:
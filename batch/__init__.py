@@ -0,0 +1,6 @@
+"""Batch runs of many independent agent tasks on a shared browser pool."""
+
+from browser_use.batch.service import BatchRunner, BrowserPool, ProviderConcurrencyLimiter
+from browser_use.batch.views import BatchRunStats, BatchTask, BatchTaskResult
+
+__all__ = ['BatchRunner', 'BrowserPool', 'ProviderConcurrencyLimiter', 'BatchTask', 'BatchTaskResult', 'BatchRunStats']
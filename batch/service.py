@@ -0,0 +1,388 @@
+"""
+Batch runner for many independent `Agent` / `CodeAgent` tasks.
+
+Tasks lease pre-warmed browser sessions from a bounded `BrowserPool`, LLM calls are capped per provider across all
+tasks, and every task's result is streamed as soon as it finishes. Token usage of all tasks is aggregated in one
+`TokenCost`, and the run's throughput and latency percentiles are reported through telemetry.
+"""
+
+import asyncio
+import copy
+import logging
+import time
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any
+
+from browser_use.batch.views import BatchRunStats, BatchTask, BatchTaskResult
+from browser_use.llm.base import BaseChatModel
+from browser_use.telemetry.service import ProductTelemetry
+from browser_use.telemetry.views import BatchRunTelemetryEvent
+from browser_use.tokens.service import TokenCost
+from browser_use.utils import get_browser_use_version
+
+if TYPE_CHECKING:
+	from browser_use.browser import BrowserProfile, BrowserSession
+
+logger = logging.getLogger(__name__)
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+	"""Linearly interpolated `q`-th percentile (0-100) of an ascending list, 0.0 for an empty list"""
+	if not sorted_values:
+		return 0.0
+	rank = (len(sorted_values) - 1) * q / 100
+	lower = int(rank)
+	upper = min(lower + 1, len(sorted_values) - 1)
+	return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+class BrowserPool:
+	"""Bounded pool of long-lived browser sessions that batch tasks lease one at a time.
+
+	Sessions run with `keep_alive=True` so agents leave them open on close. Between leases a session is reset to a
+	single about:blank tab. Tasks that lease the same session share its cookies and storage, use
+	`max_tasks_per_browser=1` for fully isolated tasks. A session is replaced (lazily, on the next lease) after
+	`max_tasks_per_browser` leases or when a lease or reset fails.
+	"""
+
+	def __init__(self, size: int = 4, browser_profile: 'BrowserProfile | None' = None, max_tasks_per_browser: int = 50):
+		if size < 1:
+			raise ValueError('BrowserPool size must be at least 1')
+		self.size = size
+		self.browser_profile = browser_profile
+		self.max_tasks_per_browser = max_tasks_per_browser
+
+		self._slots = asyncio.Semaphore(size)
+		self._idle: list[BrowserSession] = []
+		self._sessions: dict[str, BrowserSession] = {}
+		self._lease_counts: dict[str, int] = {}
+
+	async def start(self) -> None:
+		"""Pre-warm the pool by launching all missing browsers concurrently"""
+		missing = self.size - len(self._sessions)
+		sessions = await asyncio.gather(*(self._create_session() for _ in range(missing)))
+		self._idle.extend(sessions)
+
+	async def _create_session(self) -> 'BrowserSession':
+		from browser_use.browser import BrowserProfile, BrowserSession
+
+		profile = (self.browser_profile or BrowserProfile()).model_copy(update={'keep_alive': True})
+		session = BrowserSession(browser_profile=profile)
+		await session.start()
+		self._sessions[session.id] = session
+		self._lease_counts[session.id] = 0
+		return session
+
+	@asynccontextmanager
+	async def lease(self) -> AsyncIterator['BrowserSession']:
+		"""Lease a browser session for one task, waits while all sessions are in use"""
+		async with self._slots:
+			session = self._idle.pop() if self._idle else await self._create_session()
+			healthy = False
+			try:
+				yield session
+				healthy = True
+			finally:
+				await self._release(session, healthy)
+
+	async def _release(self, session: 'BrowserSession', healthy: bool) -> None:
+		self._lease_counts[session.id] = self._lease_counts.get(session.id, 0) + 1
+		if healthy and self._lease_counts[session.id] < self.max_tasks_per_browser:
+			try:
+				await self._reset_session(session)
+			except Exception as e:
+				logger.debug(f'Replacing browser session {session.id[-4:]}, reset failed: {type(e).__name__}: {e}')
+			else:
+				self._idle.append(session)
+				return
+		await self._discard(session)
+
+	async def _reset_session(self, session: 'BrowserSession') -> None:
+		"""Leave the session on a single fresh about:blank tab"""
+		from browser_use.browser.events import CloseTabEvent, NavigateToUrlEvent
+		from browser_use.dom.markdown_extractor import markdown_cache
+
+		event = session.event_bus.dispatch(NavigateToUrlEvent(url='about:blank', new_tab=True))
+		await event
+		await event.event_result(raise_if_any=True, raise_if_none=False)
+		assert session.agent_focus is not None, 'No focused tab after opening about:blank'
+		blank_target_id = session.agent_focus.target_id
+
+		for tab in await session.get_tabs():
+			if tab.target_id == blank_target_id:
+				continue
+			event = session.event_bus.dispatch(CloseTabEvent(target_id=tab.target_id))
+			await event
+			await event.event_result(raise_if_any=True, raise_if_none=False)
+			markdown_cache.evict_target(tab.target_id)
+
+		# don't hand the next task a browser state captured for the previous one
+		session._cached_browser_state_summary = None
+
+	async def _discard(self, session: 'BrowserSession') -> None:
+		self._sessions.pop(session.id, None)
+		self._lease_counts.pop(session.id, None)
+		try:
+			await session.kill()
+		except Exception as e:
+			logger.debug(f'Failed to kill browser session {session.id[-4:]}: {type(e).__name__}: {e}')
+
+	async def close(self) -> None:
+		"""Kill all browsers of the pool"""
+		sessions = list(self._sessions.values())
+		self._idle.clear()
+		await asyncio.gather(*(self._discard(session) for session in sessions))
+
+
+class ProviderConcurrencyLimiter:
+	"""Caps the in-flight LLM calls per provider (e.g. `{'openai': 16, 'anthropic': 8}`) across all tasks of a batch"""
+
+	def __init__(self, limits: dict[str, int] | None = None, default_limit: int | None = None):
+		self.limits = limits or {}
+		self.default_limit = default_limit
+		self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+	def _semaphore(self, provider: str) -> asyncio.Semaphore | None:
+		limit = self.limits.get(provider, self.default_limit)
+		if limit is None:
+			return None
+		if provider not in self._semaphores:
+			self._semaphores[provider] = asyncio.Semaphore(limit)
+		return self._semaphores[provider]
+
+	def wrap(self, llm: BaseChatModel) -> BaseChatModel:
+		"""
+		Shallow copy of `llm` whose `ainvoke` waits for a slot of its provider
+
+		@dev Every task gets its own copy, so the usage tracking wrappers that each agent's `TokenCost` installs on
+		`ainvoke` don't pile up on the shared instance
+		"""
+		task_llm = copy.copy(llm)
+		semaphore = self._semaphore(llm.provider)
+		if semaphore is None:
+			return task_llm
+
+		original_ainvoke = task_llm.ainvoke
+
+		async def limited_ainvoke(messages, output_format=None, **kwargs):
+			async with semaphore:
+				return await original_ainvoke(messages, output_format, **kwargs)
+
+		setattr(task_llm, 'ainvoke', limited_ainvoke)
+		return task_llm
+
+
+def _history_and_success(agent: Any, output: Any) -> tuple[Any, bool | None]:
+	"""The history of a finished agent run and its self-reported success"""
+	if callable(getattr(output, 'is_successful', None)):
+		# Agent.run returns the AgentHistoryList
+		return output, output.is_successful()
+
+	# CodeAgent.run returns the notebook, the done() result is the last result of its history
+	last_results = agent.complete_history[-1].result if agent.complete_history else []
+	success = last_results[-1].success if last_results and last_results[-1].is_done else None
+	return agent.history, success
+
+
+class BatchRunner:
+	"""
+	Runs many independent agent tasks concurrently on a shared browser pool.
+
+	Example:
+		async with BatchRunner(llm=ChatOpenAI(model='gpt-4.1-mini'), pool_size=8, provider_concurrency={'openai': 16}) as runner:
+			async for result in runner.stream(tasks):
+				print(result.task.task, result.success, result.duration_seconds)
+		print(runner.stats)
+	"""
+
+	def __init__(
+		self,
+		llm: BaseChatModel | None = None,
+		*,
+		agent_class: type | None = None,  # Agent (default) or CodeAgent
+		agent_kwargs: dict[str, Any] | None = None,
+		max_steps: int = 100,
+		browser_pool: BrowserPool | None = None,
+		pool_size: int = 4,
+		browser_profile: 'BrowserProfile | None' = None,
+		max_tasks_per_browser: int = 50,
+		max_concurrency: int | None = None,
+		provider_concurrency: dict[str, int] | None = None,
+		default_provider_concurrency: int | None = None,
+		calculate_cost: bool = False,
+	):
+		"""
+		Args:
+			llm: Default LLM of all tasks (a `BatchTask` can bring its own)
+			agent_class: Agent class to run each task with, `Agent` if not set
+			agent_kwargs: Extra keyword arguments for every agent
+			max_steps: Default step limit of every task
+			browser_pool: Pool to lease browsers from, created from pool_size / browser_profile / max_tasks_per_browser if not set
+			max_concurrency: Number of tasks running at once, defaults to the pool size
+			provider_concurrency: Max in-flight LLM calls per provider, e.g. {'openai': 16}
+			default_provider_concurrency: Max in-flight LLM calls for providers missing from provider_concurrency
+			calculate_cost: Whether to calculate token costs for the aggregate usage
+		"""
+		if agent_class is None:
+			from browser_use.agent.service import Agent
+
+			agent_class = Agent
+
+		self.llm = llm
+		self.agent_class = agent_class
+		self.agent_kwargs = agent_kwargs or {}
+		self.max_steps = max_steps
+		self.calculate_cost = calculate_cost
+
+		self._owns_browser_pool = browser_pool is None
+		self.browser_pool = browser_pool or BrowserPool(
+			size=pool_size, browser_profile=browser_profile, max_tasks_per_browser=max_tasks_per_browser
+		)
+		self.max_concurrency = max_concurrency or self.browser_pool.size
+		self.provider_limiter = ProviderConcurrencyLimiter(provider_concurrency, default_provider_concurrency)
+
+		# usage of all tasks of the batch, next to the per-agent TokenCost of every task
+		# (only summaries are read, so the entry history is bounded for long batches)
+		self.token_cost = TokenCost(include_cost=calculate_cost, max_history_entries=1000)
+		self.telemetry = ProductTelemetry()
+
+		self.results: list[BatchTaskResult] = []
+		self.stats: BatchRunStats | None = None
+
+	async def __aenter__(self) -> 'BatchRunner':
+		await self.browser_pool.start()
+		return self
+
+	async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+		await self.close()
+
+	async def close(self) -> None:
+		"""Close the browser pool (if the runner created it)"""
+		if self._owns_browser_pool:
+			await self.browser_pool.close()
+
+	async def run(self, tasks: Iterable[str | BatchTask]) -> list[BatchTaskResult]:
+		"""Run all tasks and return their results in task order"""
+		results = [result async for result in self.stream(tasks)]
+		return sorted(results, key=lambda result: result.index)
+
+	async def stream(self, tasks: Iterable[str | BatchTask]) -> AsyncIterator[BatchTaskResult]:
+		"""Run all tasks, yielding every result as soon as its task finishes"""
+		batch = [task if isinstance(task, BatchTask) else BatchTask(task=task) for task in tasks]
+		pending: asyncio.Queue[tuple[int, BatchTask]] = asyncio.Queue()
+		for item in enumerate(batch):
+			pending.put_nowait(item)
+		finished: asyncio.Queue[BatchTaskResult] = asyncio.Queue()
+
+		async def worker() -> None:
+			while not pending.empty():
+				index, task = pending.get_nowait()
+				finished.put_nowait(await self._run_task(index, task))
+
+		self.results = []
+		start = time.perf_counter()
+		workers = [asyncio.create_task(worker()) for _ in range(min(self.max_concurrency, len(batch)))]
+		try:
+			for _ in range(len(batch)):
+				result = await finished.get()
+				self.results.append(result)
+				yield result
+		finally:
+			for worker_task in workers:
+				worker_task.cancel()
+			await asyncio.gather(*workers, return_exceptions=True)
+			self.stats = await self._finish_run(time.perf_counter() - start)
+
+	async def _run_task(self, index: int, task: BatchTask) -> BatchTaskResult:
+		result = BatchTaskResult(task=task, index=index)
+		llm = task.llm or self.llm
+		task_llm = self.provider_limiter.wrap(llm) if llm is not None else None
+		if task_llm is not None:
+			self.token_cost.register_llm(task_llm)
+
+		queued_at = time.perf_counter()
+		try:
+			async with self.browser_pool.lease() as browser_session:
+				result.queued_seconds = time.perf_counter() - queued_at
+				result.browser_session_id = browser_session.id
+				result.started_at = time.time()
+				started = time.perf_counter()
+				try:
+					agent = self.agent_class(
+						task=task.task,
+						llm=task_llm,
+						browser_session=browser_session,
+						calculate_cost=self.calculate_cost,
+						**{**self.agent_kwargs, **task.agent_kwargs},
+					)
+					try:
+						output = await agent.run(max_steps=task.max_steps or self.max_steps)
+					finally:
+						await agent.close()
+					result.history, result.success = _history_and_success(agent, output)
+				except Exception as e:
+					result.error = f'{type(e).__name__}: {e}'
+					logger.error(f'❌ Batch task {index} ({task.id[-4:]}) failed: {result.error}')
+				finally:
+					result.duration_seconds = time.perf_counter() - started
+		except Exception as e:
+			# no browser could be leased for the task
+			result.error = f'{type(e).__name__}: {e}'
+			logger.error(f'❌ Batch task {index} ({task.id[-4:]}) could not start: {result.error}')
+		finally:
+			if task_llm is not None:
+				self.token_cost.registered_llms.pop(str(id(task_llm)), None)
+
+		return result
+
+	async def _finish_run(self, wall_seconds: float) -> BatchRunStats:
+		latencies = sorted(result.duration_seconds for result in self.results)
+		queued = sorted(result.queued_seconds for result in self.results)
+		usage = await self.token_cost.get_usage_summary()
+		stats = BatchRunStats(
+			total_tasks=len(self.results),
+			succeeded=sum(1 for result in self.results if result.success and result.error is None),
+			failed=sum(1 for result in self.results if result.failed),
+			wall_seconds=wall_seconds,
+			tasks_per_minute=len(self.results) / wall_seconds * 60 if wall_seconds > 0 else 0.0,
+			latency_mean_seconds=sum(latencies) / len(latencies) if latencies else 0.0,
+			latency_p50_seconds=percentile(latencies, 50),
+			latency_p90_seconds=percentile(latencies, 90),
+			latency_p99_seconds=percentile(latencies, 99),
+			latency_max_seconds=latencies[-1] if latencies else 0.0,
+			queued_p90_seconds=percentile(queued, 90),
+			usage=usage,
+		)
+
+		logger.info(
+			f'📦 Batch finished: {stats.succeeded}/{stats.total_tasks} succeeded, {stats.failed} failed '
+			f'in {stats.wall_seconds:.1f}s ({stats.tasks_per_minute:.1f} tasks/min) | latency '
+			f'p50 {stats.latency_p50_seconds:.1f}s p90 {stats.latency_p90_seconds:.1f}s p99 {stats.latency_p99_seconds:.1f}s'
+		)
+		await self.token_cost.log_usage_summary()
+
+		try:
+			self.telemetry.capture(
+				BatchRunTelemetryEvent(
+					version=get_browser_use_version(),
+					agent_type='code' if self.agent_class.__name__ == 'CodeAgent' else None,
+					model_providers=sorted({llm.provider for llm in (task.task.llm or self.llm for task in self.results) if llm}),
+					pool_size=self.browser_pool.size,
+					max_concurrency=self.max_concurrency,
+					total_tasks=stats.total_tasks,
+					succeeded=stats.succeeded,
+					failed=stats.failed,
+					wall_seconds=stats.wall_seconds,
+					tasks_per_minute=stats.tasks_per_minute,
+					latency_p50_seconds=stats.latency_p50_seconds,
+					latency_p90_seconds=stats.latency_p90_seconds,
+					latency_p99_seconds=stats.latency_p99_seconds,
+					total_tokens=usage.total_tokens,
+					total_cost=usage.total_cost,
+				)
+			)
+		except Exception as e:
+			logger.error(f'Failed to log batch telemetry event: {e}', exc_info=True)
+
+		return stats
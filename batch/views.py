@@ -0,0 +1,60 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel
+from uuid_extensions import uuid7str
+
+from browser_use.tokens.views import UsageSummary
+
+if TYPE_CHECKING:
+	from browser_use.llm.base import BaseChatModel
+
+
+@dataclass
+class BatchTask:
+	"""One task of a batch run, with optional per-task overrides of the runner defaults"""
+
+	task: str
+	id: str = field(default_factory=uuid7str)
+	llm: 'BaseChatModel | None' = None  # defaults to the runner's llm
+	max_steps: int | None = None  # defaults to the runner's max_steps
+	agent_kwargs: dict[str, Any] = field(default_factory=dict)  # merged over the runner's agent_kwargs
+
+
+@dataclass
+class BatchTaskResult:
+	"""Outcome of one batch task, yielded as soon as the task finishes"""
+
+	task: BatchTask
+	index: int  # position of the task in the submitted task list
+	history: Any = None  # AgentHistoryList for Agent, the eval-compatible history for CodeAgent
+	error: str | None = None  # set when the agent raised instead of returning a history
+	success: bool | None = None
+	started_at: float = 0.0
+	duration_seconds: float = 0.0
+	queued_seconds: float = 0.0  # time spent waiting for a browser from the pool
+	browser_session_id: str | None = None
+
+	@property
+	def failed(self) -> bool:
+		return self.error is not None or self.success is False
+
+
+class BatchRunStats(BaseModel):
+	"""Aggregate throughput and latency of a batch run"""
+
+	total_tasks: int = 0
+	succeeded: int = 0
+	failed: int = 0
+	wall_seconds: float = 0.0
+	tasks_per_minute: float = 0.0
+
+	# task latency (agent run time, without pool wait)
+	latency_mean_seconds: float = 0.0
+	latency_p50_seconds: float = 0.0
+	latency_p90_seconds: float = 0.0
+	latency_p99_seconds: float = 0.0
+	latency_max_seconds: float = 0.0
+	queued_p90_seconds: float = 0.0
+
+	usage: UsageSummary | None = None
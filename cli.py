@@ -1683,6 +1683,7 @@ async def run_auth_command():
 			},
 		)
 		await sync_service.handle_event(session_event)
+		await sync_service.flush()
 
 		# Brief delay to ensure session is created in backend before sending task
 		await asyncio.sleep(0.5)
@@ -1701,6 +1702,7 @@ async def run_auth_command():
 			gif_url=None,
 		)
 		await sync_service.handle_event(task_event)
+		await sync_service.flush()
 
 		# Longer delay to ensure task is created in backend before sending step event
 		await asyncio.sleep(1.0)
@@ -1795,6 +1797,7 @@ async def run_auth_command():
 			)
 			print('📤 Sending dummy step event...')
 			await sync_service.handle_event(step_event)
+			await sync_service.flush()
 
 			# Small delay to ensure step is processed before completion
 			await asyncio.sleep(0.5)
@@ -1849,6 +1852,10 @@ async def run_auth_command():
 			except Exception:
 				pass  # Don't fail if we can't send the error event
 		sys.exit(1)
+	finally:
+		if sync_service:
+			# send the queued events and close the pooled connection
+			await sync_service.close()
 
 
 @click.group(invoke_without_command=True)
@@ -4,6 +4,7 @@ import asyncio
 import datetime
 import logging
 import re
+import time
 import traceback
 from pathlib import Path
 from typing import Any
@@ -23,7 +24,7 @@ from browser_use.llm.messages import (
 	ImageURL,
 	UserMessage,
 )
-from browser_use.screenshots.service import ScreenshotService
+from browser_use.screenshots.service import ScreenshotService, load_screenshot
 from browser_use.telemetry.service import ProductTelemetry
 from browser_use.telemetry.views import AgentTelemetryEvent
 from browser_use.tokens.service import TokenCost
@@ -150,6 +151,7 @@ class CodeAgent:
 		self._validation_count = 0  # Track number of validator runs
 		self._last_llm_usage: Any | None = None  # Track last LLM call usage stats
 		self._step_start_time = 0.0  # Track step start time for duration calculation
+		self._step_phase_seconds: dict[str, float] = {}  # Track time per phase of the current step
 		self.usage_summary: UsageSummary | None = None  # Track usage summary across run for history property
 
 		# Initialize screenshot service for eval tracking
@@ -270,6 +272,7 @@ class CodeAgent:
 
 			# Start timing this step
 			self._step_start_time = datetime.datetime.now().timestamp()
+			self._step_phase_seconds = {}
 
 			# Check if we're approaching the step limit or error limit and inject warning
 			steps_remaining = self.max_steps - step - 1
@@ -300,7 +303,9 @@ class CodeAgent:
 				if not self._last_browser_state_text and self.browser_session and self.dom_service:
 					try:
 						logger.debug('🔍 Fetching browser state before LLM call...')
+						phase_start = time.time()
 						browser_state_text, screenshot = await self._get_browser_state()
+						self._record_step_phase('browser_state', phase_start)
 						self._last_browser_state_text = browser_state_text
 						self._last_screenshot = screenshot
 
@@ -316,7 +321,9 @@ class CodeAgent:
 
 				# Get code from LLM (this also adds to self._llm_messages)
 				try:
+					phase_start = time.time()
 					code, full_llm_response = await self._get_code_from_llm()
+					self._record_step_phase('get_next_action', phase_start)
 				except Exception as llm_error:
 					# LLM call failed - count as consecutive error and retry
 					self._consecutive_errors += 1
@@ -364,6 +371,7 @@ class CodeAgent:
 				all_blocks = self.namespace.get('_all_code_blocks', {})
 				python_blocks = [k for k in sorted(all_blocks.keys()) if k.startswith('python_')]
 
+				phase_start = time.time()
 				if len(python_blocks) > 1:
 					# Multiple Python blocks - execute each sequentially
 					output = None
@@ -384,6 +392,7 @@ class CodeAgent:
 				else:
 					# Single Python block - execute normally
 					output, error, _ = await self._execute_code(code)
+				self._record_step_phase('execute_actions', phase_start)
 
 				# Track consecutive errors
 				if error:
@@ -485,7 +494,9 @@ class CodeAgent:
 				# Browser state is now only logged when fetched before LLM call (not after execution)
 
 				# Take screenshot for eval tracking
+				phase_start = time.time()
 				screenshot_path = await self._capture_screenshot(step + 1)
+				self._record_step_phase('screenshot', phase_start)
 
 				# Add step to complete_history for eval system
 				await self._add_step_to_complete_history(
@@ -1066,6 +1077,10 @@ __code_exec_coro__ = __code_exec__()
 		# Check if 'done' was called by looking for a special marker in namespace
 		return self.namespace.get('_task_done', False)
 
+	def _record_step_phase(self, phase: str, phase_start: float) -> None:
+		"""Add the time since `phase_start` to a phase of the current step."""
+		self._step_phase_seconds[phase] = self._step_phase_seconds.get(phase, 0.0) + time.time() - phase_start
+
 	async def _capture_screenshot(self, step_number: int) -> str | None:
 		"""Capture and store screenshot for eval tracking."""
 		if not self.browser_session:
@@ -1134,6 +1149,7 @@ __code_exec_coro__ = __code_exec__()
 			output_tokens=self._last_llm_usage.completion_tokens if self._last_llm_usage else None,
 			step_start_time=self._step_start_time,
 			step_end_time=step_end_time,
+			phase_seconds=self._step_phase_seconds,
 		)
 
 		# Create model output entry using typed model (if there's code to track)
@@ -1295,23 +1311,8 @@ __code_exec_coro__ = __code_exec__()
 
 			def get_screenshot(self) -> str | None:
 				"""Support get_screenshot() calls for state objects."""
-				# Load screenshot from disk and return as base64 string (matching BrowserStateHistory implementation)
-				if not hasattr(self, 'screenshot_path') or not self.screenshot_path:
-					return None
-
-				import base64
-				from pathlib import Path
-
-				path_obj = Path(self.screenshot_path)
-				if not path_obj.exists():
-					return None
-
-				try:
-					with open(path_obj, 'rb') as f:
-						screenshot_data = f.read()
-					return base64.b64encode(screenshot_data).decode('utf-8')
-				except Exception:
-					return None
+				# Load screenshot from disk (or the shared screenshot cache) and return as base64 string
+				return load_screenshot(getattr(self, 'screenshot_path', None))
 
 		class MockAgentHistoryList:
 			def __init__(self, complete_history: list[CodeAgentHistory], usage_summary: UsageSummary | None) -> None:
@@ -1324,6 +1325,9 @@ __code_exec_coro__ = __code_exec__()
 
 	async def close(self) -> None:
 		"""Close the browser session."""
+		# Write pending file system changes to disk
+		await self.file_system.close()
+
 		if self.browser_session:
 			# Check if we should close the browser based on keep_alive setting
 			if not self.browser_session.browser_profile.keep_alive:
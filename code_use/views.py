@@ -114,23 +114,10 @@ class CodeAgentState(BaseModel):
 	screenshot_path: str | None = Field(default=None, description='Path to screenshot file')
 
 	def get_screenshot(self) -> str | None:
-		"""Load screenshot from disk and return as base64 string."""
-		if not self.screenshot_path:
-			return None
+		"""Load screenshot from disk (or the shared screenshot cache) and return as base64 string."""
+		from browser_use.screenshots.service import load_screenshot
 
-		import base64
-		from pathlib import Path
-
-		path_obj = Path(self.screenshot_path)
-		if not path_obj.exists():
-			return None
-
-		try:
-			with open(path_obj, 'rb') as f:
-				screenshot_data = f.read()
-			return base64.b64encode(screenshot_data).decode('utf-8')
-		except Exception:
-			return None
+		return load_screenshot(self.screenshot_path)
 
 
 class CodeAgentStepMetadata(BaseModel):
@@ -142,6 +129,9 @@ class CodeAgentStepMetadata(BaseModel):
 	output_tokens: int | None = Field(default=None, description='Number of output tokens used')
 	step_start_time: float = Field(description='Step start timestamp (Unix time)')
 	step_end_time: float = Field(description='Step end timestamp (Unix time)')
+	phase_seconds: dict[str, float] = Field(
+		default_factory=dict, description='Wall-clock seconds per phase of the step (browser state, LLM call, code execution)'
+	)
 
 	@property
 	def duration_seconds(self) -> float:
@@ -176,6 +176,16 @@ class OldConfig:
 	def WIN_FONT_DIR(self) -> str:
 		return os.getenv('WIN_FONT_DIR', 'C:\\Windows\\Fonts')
 
+	# Compatibility
+	@property
+	def BROWSER_USE_LEGACY_ELEMENT_HASH(self) -> bool:
+		return os.getenv('BROWSER_USE_LEGACY_ELEMENT_HASH', 'false').lower()[:1] in 'ty1'
+
+	# Performance
+	@property
+	def BROWSER_USE_INCREMENTAL_SNAPSHOTS(self) -> bool:
+		return os.getenv('BROWSER_USE_INCREMENTAL_SNAPSHOTS', 'false').lower()[:1] in 'ty1'
+
 
 class FlatEnvConfig(BaseSettings):
 	"""All environment variables in a flat namespace."""
@@ -214,6 +224,12 @@ class FlatEnvConfig(BaseSettings):
 	IS_IN_EVALS: bool = Field(default=False)
 	WIN_FONT_DIR: str = Field(default='C:\\Windows\\Fonts')
 
+	# Compatibility
+	BROWSER_USE_LEGACY_ELEMENT_HASH: bool = Field(default=False)
+
+	# Performance
+	BROWSER_USE_INCREMENTAL_SNAPSHOTS: bool = Field(default=False)
+
 	# MCP-specific env vars
 	BROWSER_USE_CONFIG_PATH: str | None = Field(default=None)
 	BROWSER_USE_HEADLESS: bool | None = Field(default=None)
@@ -1,19 +1,30 @@
 """
 Enhanced snapshot processing for browser-use DOM tree extraction.
 
-This module provides stateless functions for parsing Chrome DevTools Protocol (CDP) DOMSnapshot data
-to extract visibility, clickability, cursor styles, and other layout information.
+This module parses Chrome DevTools Protocol (CDP) DOMSnapshot data into columnar per-document stores
+to extract visibility, clickability, cursor styles, and other layout information on demand.
 """
 
+from collections.abc import Iterator, Mapping
+from typing import Any
+
 from cdp_use.cdp.domsnapshot.commands import CaptureSnapshotReturns
 from cdp_use.cdp.domsnapshot.types import (
+	DocumentSnapshot,
 	LayoutTreeSnapshot,
 	NodeTreeSnapshot,
-	RareBooleanData,
 )
 
 from browser_use.dom.views import DOMRect, EnhancedSnapshotNode
 
+try:
+	import numpy as np  # type: ignore
+
+	NUMPY_AVAILABLE = True
+except ImportError:
+	np = None  # type: ignore
+	NUMPY_AVAILABLE = False
+
 # Only the ESSENTIAL computed styles for interactivity and visibility detection
 REQUIRED_COMPUTED_STYLES = [
 	# Only styles actually accessed in the codebase (prevents Chrome crashes on heavy sites)
@@ -29,10 +40,7 @@ REQUIRED_COMPUTED_STYLES = [
 	'background-color',  # Used for visibility logic
 ]
 
-
-def _parse_rare_boolean_data(rare_data: RareBooleanData, index: int) -> bool | None:
-	"""Parse rare boolean data from snapshot - returns True if index is in the rare data."""
-	return index in rare_data['index']
+_NAN_RECT = [float('nan')] * 4
 
 
 def _parse_computed_styles(strings: list[str], style_indices: list[int]) -> dict[str, str]:
@@ -44,118 +52,318 @@ def _parse_computed_styles(strings: list[str], style_indices: list[int]) -> dict
 	return styles
 
 
+def _build_rect_columns(rects: list[list[float]], scale: float = 1.0) -> Any:
+	"""Pack a list of [x, y, width, height] rects into an (n, 4) array, rows without a full rect are NaN."""
+	if not NUMPY_AVAILABLE:
+		return rects
+
+	if not rects:
+		return np.empty((0, 4), dtype=np.float64)
+
+	try:
+		# fast path: every rect is complete
+		columns = np.asarray(rects, dtype=np.float64)
+		if columns.ndim != 2 or columns.shape[1] < 4:
+			raise ValueError('ragged rects')
+		columns = columns[:, :4]
+	except ValueError:
+		columns = np.array([rect[:4] if len(rect) >= 4 else _NAN_RECT for rect in rects], dtype=np.float64)
+
+	if scale != 1.0:
+		columns /= scale
+	return columns
+
+
+class SnapshotDocumentStore:
+	"""
+	Columnar view on one document of a `DOMSnapshot.captureSnapshot` result.
+
+	Nothing is parsed per node upfront: bounds, client rects and scroll rects are packed into NumPy arrays
+	(falls back to the raw CDP lists if NumPy is not installed), clickability is a set of snapshot indices
+	and computed styles are parsed once per unique style-index tuple. `EnhancedSnapshotNode`s handed out by
+	`SnapshotLookup` read their fields from here on first access.
+	"""
+
+	__slots__ = (
+		'backend_node_to_snapshot_index',
+		'layout_indices',
+		'clickable_indices',
+		'bounds',
+		'client_rects',
+		'scroll_rects',
+		'paint_orders',
+		'styles',
+		'stacking_contexts',
+		'strings',
+		'device_pixel_ratio',
+		'_style_cache',
+	)
+
+	def __init__(
+		self,
+		document: DocumentSnapshot,
+		strings: list[str],
+		device_pixel_ratio: float,
+		style_cache: dict[tuple[int, ...], dict[str, str]],
+	):
+		nodes: NodeTreeSnapshot = document['nodes']
+		layout: LayoutTreeSnapshot = document['layout']
+
+		backend_node_ids = nodes.get('backendNodeId', [])
+		self.backend_node_to_snapshot_index: dict[int, int] = dict(zip(backend_node_ids, range(len(backend_node_ids))))
+
+		# snapshot index -> FIRST layout index that references it (-1 if the node has no layout object)
+		node_indices = layout.get('nodeIndex', []) if layout else []
+		if NUMPY_AVAILABLE:
+			self.layout_indices = np.full(len(backend_node_ids), -1, dtype=np.int64)
+			if node_indices:
+				unique_node_indices, first_layout_indices = np.unique(np.asarray(node_indices), return_index=True)
+				in_range = unique_node_indices < len(backend_node_ids)
+				self.layout_indices[unique_node_indices[in_range]] = first_layout_indices[in_range]
+		else:
+			self.layout_indices = {}
+			for layout_idx, node_index in enumerate(node_indices):
+				self.layout_indices.setdefault(node_index, layout_idx)
+
+		self.clickable_indices: frozenset[int] | None = (
+			frozenset(nodes['isClickable']['index']) if 'isClickable' in nodes else None
+		)
+
+		layout = layout or {}
+		# IMPORTANT: CDP bounds are in device pixels, convert to CSS pixels by dividing by the device pixel ratio
+		self.bounds = _build_rect_columns(layout.get('bounds', []), device_pixel_ratio)
+		self.client_rects = _build_rect_columns(layout.get('clientRects', []))
+		self.scroll_rects = _build_rect_columns(layout.get('scrollRects', []))
+		self.paint_orders = layout.get('paintOrders', [])
+		self.styles = layout.get('styles', [])
+		self.stacking_contexts = layout.get('stackingContexts', [])
+		self.strings = strings
+		self.device_pixel_ratio = device_pixel_ratio
+		self._style_cache = style_cache
+
+	def layout_index(self, snapshot_index: int) -> int:
+		"""Layout index of a snapshot node, or -1 if it has no usable layout data."""
+		if NUMPY_AVAILABLE:
+			layout_idx = int(self.layout_indices[snapshot_index]) if snapshot_index < len(self.layout_indices) else -1
+		else:
+			layout_idx = self.layout_indices.get(snapshot_index, -1)
+
+		# Same as the original per-node parsing: layout data only counts if it has bounds
+		if layout_idx < 0 or layout_idx >= len(self.bounds):
+			return -1
+		return layout_idx
+
+	def rect(self, columns: Any, layout_idx: int, scale: float = 1.0) -> DOMRect | None:
+		if layout_idx < 0 or layout_idx >= len(columns):
+			return None
+
+		if NUMPY_AVAILABLE:
+			x, y, width, height = columns[layout_idx].tolist()
+			if x != x:  # NaN row = incomplete rect
+				return None
+			return DOMRect(x=x, y=y, width=width, height=height)
+
+		rect = columns[layout_idx]
+		if not rect or len(rect) < 4:
+			return None
+		return DOMRect(x=rect[0] / scale, y=rect[1] / scale, width=rect[2] / scale, height=rect[3] / scale)
+
+	def computed_styles(self, layout_idx: int) -> dict[str, str] | None:
+		"""Interned computed styles, the same dict for all nodes with the same styles (copied before handing it to a node)."""
+		if layout_idx < 0 or layout_idx >= len(self.styles):
+			return None
+
+		key = tuple(self.styles[layout_idx])
+		styles = self._style_cache.get(key)
+		if styles is None:
+			styles = _parse_computed_styles(self.strings, self.styles[layout_idx])
+			self._style_cache[key] = styles
+		return styles or None
+
+
+class _LazySnapshotNode(EnhancedSnapshotNode):
+	"""`EnhancedSnapshotNode` whose fields are materialized from a `SnapshotDocumentStore` on first access.
+
+	Unset slots raise AttributeError, which routes the first read of every field through `__getattr__`.
+	The value is then stored in the slot, so later reads (and in-place changes) behave like a regular node.
+	"""
+
+	__slots__ = ('_store', '_snapshot_index')
+
+	def __getattr__(self, name: str) -> Any:
+		if name.startswith('_'):
+			raise AttributeError(name)
+
+		store: SnapshotDocumentStore = object.__getattribute__(self, '_store')
+		snapshot_index: int = object.__getattribute__(self, '_snapshot_index')
+		layout_idx = store.layout_index(snapshot_index)
+
+		if name == 'is_clickable':
+			value = None if store.clickable_indices is None else snapshot_index in store.clickable_indices
+		elif name == 'bounds':
+			value = store.rect(store.bounds, layout_idx, store.device_pixel_ratio)
+		elif name == 'clientRects':
+			value = store.rect(store.client_rects, layout_idx)
+		elif name == 'scrollRects':
+			value = store.rect(store.scroll_rects, layout_idx)
+		elif name == 'computed_styles':
+			# the interned dict is shared, so a caller changing a node's styles must not change other nodes
+			styles = store.computed_styles(layout_idx)
+			value = dict(styles) if styles else None
+		elif name == 'cursor_style':
+			styles = store.computed_styles(layout_idx)
+			value = styles.get('cursor') if styles else None
+		elif name == 'paint_order':
+			value = store.paint_orders[layout_idx] if 0 <= layout_idx < len(store.paint_orders) else None
+		elif name == 'stacking_contexts':
+			value = None
+			if 0 <= layout_idx < len(store.stacking_contexts):
+				value = store.stacking_contexts.get('index', [])[layout_idx]
+		else:
+			raise AttributeError(f'{type(self).__name__!r} object has no attribute {name!r}')
+
+		object.__setattr__(self, name, value)
+		return value
+
+
+class SnapshotLookup(Mapping[int, EnhancedSnapshotNode]):
+	"""Backend node ID -> `EnhancedSnapshotNode`, nodes are created on first lookup and read lazily from the stores."""
+
+	def __init__(self, stores: list[SnapshotDocumentStore]):
+		# Later documents win for duplicate backend node ids (same as building one dict document by document)
+		self._stores = list(reversed(stores))
+		self._nodes: dict[int, EnhancedSnapshotNode] = {}
+
+	def __getitem__(self, backend_node_id: int) -> EnhancedSnapshotNode:
+		node = self._nodes.get(backend_node_id)
+		if node is not None:
+			return node
+
+		for store in self._stores:
+			snapshot_index = store.backend_node_to_snapshot_index.get(backend_node_id)
+			if snapshot_index is not None:
+				node = _LazySnapshotNode.__new__(_LazySnapshotNode)
+				object.__setattr__(node, '_store', store)
+				object.__setattr__(node, '_snapshot_index', snapshot_index)
+				self._nodes[backend_node_id] = node
+				return node
+
+		raise KeyError(backend_node_id)
+
+	def __iter__(self) -> Iterator[int]:
+		seen: set[int] = set()
+		for store in self._stores:
+			for backend_node_id in store.backend_node_to_snapshot_index:
+				if backend_node_id not in seen:
+					seen.add(backend_node_id)
+					yield backend_node_id
+
+	def __len__(self) -> int:
+		return len(set().union(*(store.backend_node_to_snapshot_index for store in self._stores)))
+
+	def __contains__(self, backend_node_id: object) -> bool:
+		return any(backend_node_id in store.backend_node_to_snapshot_index for store in self._stores)
+
+
 def build_snapshot_lookup(
 	snapshot: CaptureSnapshotReturns,
 	device_pixel_ratio: float = 1.0,
-) -> dict[int, EnhancedSnapshotNode]:
-	"""Build a lookup table of backend node ID to enhanced snapshot data with everything calculated upfront."""
-	snapshot_lookup: dict[int, EnhancedSnapshotNode] = {}
+) -> SnapshotLookup:
+	"""Build a lookup table of backend node ID to enhanced snapshot data backed by columnar per-document stores."""
+	style_cache: dict[tuple[int, ...], dict[str, str]] = {}
+	stores = [
+		SnapshotDocumentStore(document, snapshot['strings'], device_pixel_ratio, style_cache)
+		for document in snapshot['documents'] or []
+	]
+	return SnapshotLookup(stores)
+
+
+def viewport_priority(rect: DOMRect, viewport: DOMRect) -> tuple[float, float]:
+	"""Sort key for frames: most visible area in the viewport first, then closest to the viewport."""
+	overlap_width = min(rect.x + rect.width, viewport.x + viewport.width) - max(rect.x, viewport.x)
+	overlap_height = min(rect.y + rect.height, viewport.y + viewport.height) - max(rect.y, viewport.y)
+	visible_area = max(overlap_width, 0.0) * max(overlap_height, 0.0)
+	distance = max(viewport.y - (rect.y + rect.height), rect.y - (viewport.y + viewport.height), 0.0)
+	return -visible_area, distance
+
 
-	if not snapshot['documents']:
-		return snapshot_lookup
+def rank_documents_by_viewport(snapshot: CaptureSnapshotReturns) -> list[int]:
+	"""Indices of the snapshot documents: the main document first, then the iframe documents ordered by
+	`viewport_priority` of their iframe element (clipped by all parent frames) in the main viewport.
 
+	Documents whose iframe element is not found in the snapshot (or has no layout) go last, in document order.
+	"""
+	documents = snapshot['documents'] or []
 	strings = snapshot['strings']
 
-	for document in snapshot['documents']:
-		nodes: NodeTreeSnapshot = document['nodes']
-		layout: LayoutTreeSnapshot = document['layout']
+	# child document index -> (parent document index, index of the iframe node in the parent)
+	owners: dict[int, tuple[int, int]] = {}
+	for document_index, document in enumerate(documents):
+		content_documents = document['nodes'].get('contentDocumentIndex') or {}
+		for node_index, child_document_index in zip(content_documents.get('index', []), content_documents.get('value', [])):
+			owners[child_document_index] = (document_index, node_index)
+
+	# layout rects of the iframe elements and of each document's <html> element (viewport size and scroll)
+	frame_rects: dict[tuple[int, int], DOMRect] = {}
+	html_rects: dict[int, tuple[DOMRect, DOMRect]] = {}
+	wanted_nodes: dict[int, set[int]] = {}
+	for parent_document_index, node_index in owners.values():
+		wanted_nodes.setdefault(parent_document_index, set()).add(node_index)
+	for document_index, document in enumerate(documents):
+		node_names = document['nodes'].get('nodeName', [])
+		html_node_index = next((i for i, name in enumerate(node_names) if 0 <= name < len(strings) and strings[name] == 'HTML'), -1)
+		wanted = wanted_nodes.get(document_index, set())
+		layout = document['layout']
+		bounds = layout.get('bounds', [])
+		client_rects = layout.get('clientRects') or []
+		scroll_rects = layout.get('scrollRects') or []
+		for layout_index, node_index in enumerate(layout.get('nodeIndex', [])):
+			if node_index in wanted and len(bounds[layout_index]) >= 4:
+				frame_rects[(document_index, node_index)] = DOMRect(*bounds[layout_index][:4])
+			elif node_index == html_node_index and layout_index < len(client_rects) and len(client_rects[layout_index]) >= 4:
+				scroll = scroll_rects[layout_index] if layout_index < len(scroll_rects) else []
+				html_rects[document_index] = (
+					DOMRect(*client_rects[layout_index][:4]),
+					DOMRect(*scroll[:4]) if len(scroll) >= 4 else DOMRect(0, 0, 0, 0),
+				)
+
+	# iframe rect of every document in main viewport coordinates, and the part of the viewport its parent frames leave
+	# visible, computed top-down through the frame chain
+	placements: dict[int, tuple[DOMRect, DOMRect] | None] = {}
+
+	def placement(document_index: int) -> tuple[DOMRect, DOMRect] | None:
+		if document_index in placements:
+			return placements[document_index]
+		placements[document_index] = None  # guards against cycles in broken snapshots
+		result = None
+		if document_index == 0:
+			client = html_rects[0][0] if 0 in html_rects else DOMRect(0, 0, float('inf'), float('inf'))
+			viewport = DOMRect(0, 0, client.width, client.height)
+			result = (viewport, viewport)
+		elif owners.get(document_index) in frame_rects:
+			parent_document_index = owners[document_index][0]
+			parent = placement(parent_document_index)
+			if parent is not None:
+				parent_rect, parent_clip = parent
+				parent_scroll = html_rects[parent_document_index][1] if parent_document_index in html_rects else DOMRect(0, 0, 0, 0)
+				frame = frame_rects[owners[document_index]]
+				rect = DOMRect(parent_rect.x + frame.x - parent_scroll.x, parent_rect.y + frame.y - parent_scroll.y, frame.width, frame.height)
+				# the parent document's content is only visible where its own iframe is visible
+				x, y = max(parent_rect.x, parent_clip.x), max(parent_rect.y, parent_clip.y)
+				clip = DOMRect(
+					x,
+					y,
+					max(min(parent_rect.x + parent_rect.width, parent_clip.x + parent_clip.width) - x, 0.0),
+					max(min(parent_rect.y + parent_rect.height, parent_clip.y + parent_clip.height) - y, 0.0),
+				)
+				result = (rect, clip)
+		placements[document_index] = result
+		return result
+
+	def sort_key(document_index: int) -> tuple[int, float, float, int]:
+		document_placement = placement(document_index)
+		if document_placement is None:
+			return (1, 0.0, 0.0, document_index)
+		return (0, *viewport_priority(*document_placement), document_index)
 
-		# Build backend node id to snapshot index lookup
-		backend_node_to_snapshot_index = {}
-		if 'backendNodeId' in nodes:
-			for i, backend_node_id in enumerate(nodes['backendNodeId']):
-				backend_node_to_snapshot_index[backend_node_id] = i
-
-		# PERFORMANCE: Pre-build layout index map to eliminate O(n²) double lookups
-		# Preserve original behavior: use FIRST occurrence for duplicates
-		layout_index_map = {}
-		if layout and 'nodeIndex' in layout:
-			for layout_idx, node_index in enumerate(layout['nodeIndex']):
-				if node_index not in layout_index_map:  # Only store first occurrence
-					layout_index_map[node_index] = layout_idx
-
-		# Build snapshot lookup for each backend node id
-		for backend_node_id, snapshot_index in backend_node_to_snapshot_index.items():
-			is_clickable = None
-			if 'isClickable' in nodes:
-				is_clickable = _parse_rare_boolean_data(nodes['isClickable'], snapshot_index)
-
-			# Find corresponding layout node
-			cursor_style = None
-			is_visible = None
-			bounding_box = None
-			computed_styles = {}
-
-			# Look for layout tree node that corresponds to this snapshot node
-			paint_order = None
-			client_rects = None
-			scroll_rects = None
-			stacking_contexts = None
-			if snapshot_index in layout_index_map:
-				layout_idx = layout_index_map[snapshot_index]
-				if layout_idx < len(layout.get('bounds', [])):
-					# Parse bounding box
-					bounds = layout['bounds'][layout_idx]
-					if len(bounds) >= 4:
-						# IMPORTANT: CDP coordinates are in device pixels, convert to CSS pixels
-						# by dividing by the device pixel ratio
-						raw_x, raw_y, raw_width, raw_height = bounds[0], bounds[1], bounds[2], bounds[3]
-
-						# Apply device pixel ratio scaling to convert device pixels to CSS pixels
-						bounding_box = DOMRect(
-							x=raw_x / device_pixel_ratio,
-							y=raw_y / device_pixel_ratio,
-							width=raw_width / device_pixel_ratio,
-							height=raw_height / device_pixel_ratio,
-						)
-
-					# Parse computed styles for this layout node
-					if layout_idx < len(layout.get('styles', [])):
-						style_indices = layout['styles'][layout_idx]
-						computed_styles = _parse_computed_styles(strings, style_indices)
-						cursor_style = computed_styles.get('cursor')
-
-					# Extract paint order if available
-					if layout_idx < len(layout.get('paintOrders', [])):
-						paint_order = layout.get('paintOrders', [])[layout_idx]
-
-					# Extract client rects if available
-					client_rects_data = layout.get('clientRects', [])
-					if layout_idx < len(client_rects_data):
-						client_rect_data = client_rects_data[layout_idx]
-						if client_rect_data and len(client_rect_data) >= 4:
-							client_rects = DOMRect(
-								x=client_rect_data[0],
-								y=client_rect_data[1],
-								width=client_rect_data[2],
-								height=client_rect_data[3],
-							)
-
-					# Extract scroll rects if available
-					scroll_rects_data = layout.get('scrollRects', [])
-					if layout_idx < len(scroll_rects_data):
-						scroll_rect_data = scroll_rects_data[layout_idx]
-						if scroll_rect_data and len(scroll_rect_data) >= 4:
-							scroll_rects = DOMRect(
-								x=scroll_rect_data[0],
-								y=scroll_rect_data[1],
-								width=scroll_rect_data[2],
-								height=scroll_rect_data[3],
-							)
-
-					# Extract stacking contexts if available
-					if layout_idx < len(layout.get('stackingContexts', [])):
-						stacking_contexts = layout.get('stackingContexts', {}).get('index', [])[layout_idx]
-
-			snapshot_lookup[backend_node_id] = EnhancedSnapshotNode(
-				is_clickable=is_clickable,
-				cursor_style=cursor_style,
-				bounds=bounding_box,
-				clientRects=client_rects,
-				scrollRects=scroll_rects,
-				computed_styles=computed_styles if computed_styles else None,
-				paint_order=paint_order,
-				stacking_contexts=stacking_contexts,
-			)
-
-	return snapshot_lookup
+	return [0] + sorted(range(1, len(documents)), key=sort_key) if documents else []
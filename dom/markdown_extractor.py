@@ -5,16 +5,105 @@ This module provides a unified interface for extracting clean markdown from brow
 used by both the tools service and page actor.
 """
 
+import asyncio
 import re
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
 from browser_use.dom.serializer.html_serializer import HTMLSerializer
 from browser_use.dom.service import DomService
+from browser_use.dom.views import EnhancedDOMTreeNode
 
 if TYPE_CHECKING:
 	from browser_use.browser.session import BrowserSession
 	from browser_use.browser.watchdogs.dom_watchdog import DOMWatchdog
 
+_URL_ENCODING_RE = re.compile(r'%[0-9A-Fa-f]{2}')
+
+# (target id, url, DOM content fingerprint, extract_links, chunk size or None for the single-string form)
+MarkdownCacheKey = tuple[str, str, int, bool, int | None]
+
+
+@dataclass
+class _CachedMarkdown:
+	chunks: list[str]
+	stats: dict[str, Any]
+	chars: int
+
+
+class MarkdownCache:
+	"""Size-bounded LRU cache of extracted markdown, so repeated `extract` calls on an unchanged page skip the
+	HTML serialization, markdownify and cleanup.
+
+	Entries are keyed by target id, URL and the `HTMLSerializer.fingerprint` of the DOM tree. Each tab only keeps
+	entries for its current page state: once a tab shows up with another URL or fingerprint (navigation, DOM
+	changes), its older entries are evicted. On top of that the least recently used entries are dropped when the
+	cache holds more than `max_entries` entries or `max_chars` characters of markdown.
+	"""
+
+	def __init__(self, max_entries: int = 32, max_chars: int = 5_000_000):
+		self.max_entries = max_entries
+		self.max_chars = max_chars
+		self.hits = 0
+		self.misses = 0
+		self._entries: OrderedDict[MarkdownCacheKey, _CachedMarkdown] = OrderedDict()
+		self._page_states: dict[str, tuple[str, int]] = {}  # target id -> (url, fingerprint) of its cached entries
+		self._chars = 0
+
+	def __len__(self) -> int:
+		return len(self._entries)
+
+	def get(self, key: MarkdownCacheKey) -> _CachedMarkdown | None:
+		self._check_page_state(key)
+		entry = self._entries.get(key)
+		if entry is None:
+			self.misses += 1
+			return None
+		self.hits += 1
+		self._entries.move_to_end(key)
+		return entry
+
+	def put(self, key: MarkdownCacheKey, chunks: list[str], stats: dict[str, Any]) -> None:
+		self._check_page_state(key)
+		self._pop(key)
+		entry = _CachedMarkdown(chunks=chunks, stats=dict(stats), chars=sum(len(chunk) for chunk in chunks))
+		if entry.chars > self.max_chars:
+			return
+		self._entries[key] = entry
+		self._chars += entry.chars
+		self._page_states[key[0]] = (key[1], key[2])
+		while len(self._entries) > self.max_entries or self._chars > self.max_chars:
+			self._pop(next(iter(self._entries)))
+
+	def evict_target(self, target_id: str) -> None:
+		"""Drop all entries of one tab, e.g. when it is closed."""
+		for key in [key for key in self._entries if key[0] == target_id]:
+			self._pop(key)
+		self._page_states.pop(target_id, None)
+
+	def clear(self) -> None:
+		self._entries.clear()
+		self._page_states.clear()
+		self._chars = 0
+
+	def stats(self, hit: bool) -> dict[str, Any]:
+		return {'cache_hit': hit, 'cache_hits': self.hits, 'cache_misses': self.misses}
+
+	def _check_page_state(self, key: MarkdownCacheKey) -> None:
+		page_state = self._page_states.get(key[0])
+		if page_state is not None and page_state != (key[1], key[2]):
+			self.evict_target(key[0])
+
+	def _pop(self, key: MarkdownCacheKey) -> None:
+		entry = self._entries.pop(key, None)
+		if entry is not None:
+			self._chars -= entry.chars
+
+
+markdown_cache = MarkdownCache()
+
 
 async def extract_clean_markdown(
 	browser_session: 'BrowserSession | None' = None,
@@ -33,8 +122,10 @@ async def extract_clean_markdown(
 	    target_id: Target ID for the page (required when using dom_service)
 	    extract_links: Whether to preserve links in markdown
 
+	Results are cached per tab in `markdown_cache` while the page (URL and DOM content) is unchanged.
+
 	Returns:
-	    tuple: (clean_markdown_content, content_statistics)
+	    tuple: (clean_markdown_content, content_statistics), the statistics include the cache hit/miss counts
 
 	Raises:
 	    ValueError: If neither browser_session nor (dom_service + target_id) are provided
@@ -46,6 +137,7 @@ async def extract_clean_markdown(
 		# Browser session path (tools service)
 		enhanced_dom_tree = await _get_enhanced_dom_tree_from_browser_session(browser_session)
 		current_url = await browser_session.get_current_page_url()
+		target_id = browser_session.current_target_id
 		method = 'enhanced_dom_tree'
 	elif dom_service is not None and target_id is not None:
 		# DOM service path (page actor)
@@ -57,31 +149,24 @@ async def extract_clean_markdown(
 
 	# Use the HTML serializer with the enhanced DOM tree
 	html_serializer = HTMLSerializer(extract_links=extract_links)
+
+	# Unchanged page: reuse the markdown of an earlier extraction
+	cache_key = (target_id or '', current_url or '', html_serializer.fingerprint(enhanced_dom_tree), extract_links, None)
+	cached = markdown_cache.get(cache_key)
+	if cached is not None:
+		return cached.chunks[0], {**cached.stats, **markdown_cache.stats(hit=True)}
+
 	page_html = html_serializer.serialize(enhanced_dom_tree)
 
 	original_html_length = len(page_html)
 
 	# Use markdownify for clean markdown conversion
-	from markdownify import markdownify as md
-
-	content = md(
-		page_html,
-		heading_style='ATX',  # Use # style headings
-		strip=['script', 'style'],  # Remove these tags
-		bullets='-',  # Use - for unordered lists
-		code_language='',  # Don't add language to code blocks
-		escape_asterisks=False,  # Don't escape asterisks (cleaner output)
-		escape_underscores=False,  # Don't escape underscores (cleaner output)
-		escape_misc=False,  # Don't escape other characters (cleaner output)
-		autolinks=False,  # Don't convert URLs to <> format
-		default_title=False,  # Don't add default title attributes
-		keep_inline_images_in=[],  # Don't keep inline images in any tags (we already filter base64 in HTML)
-	)
+	content = _html_to_markdown(page_html)
 
 	initial_markdown_length = len(content)
 
 	# Minimal cleanup - markdownify already does most of the work
-	content = re.sub(r'%[0-9A-Fa-f]{2}', '', content)  # Remove any remaining URL encoding
+	content = _URL_ENCODING_RE.sub('', content)  # Remove any remaining URL encoding
 
 	# Apply light preprocessing to clean up excessive whitespace
 	content, chars_filtered = _preprocess_markdown_content(content)
@@ -101,9 +186,151 @@ async def extract_clean_markdown(
 	if current_url:
 		stats['url'] = current_url
 
+	markdown_cache.put(cache_key, [content], stats)
+	stats.update(markdown_cache.stats(hit=False))
 	return content, stats
 
 
+async def stream_clean_markdown(
+	browser_session: 'BrowserSession',
+	extract_links: bool = False,
+	chunk_chars: int = 30000,
+	content_stats: dict[str, Any] | None = None,
+) -> AsyncIterator[str]:
+	"""Stream clean markdown of the current page in chunks, see `iter_markdown_chunks`.
+
+	Yields control to the event loop after every chunk, so work started on earlier chunks (e.g. LLM calls)
+	runs while the rest of the page is converted.
+	"""
+	stats = content_stats if content_stats is not None else {}
+	enhanced_dom_tree = await _get_enhanced_dom_tree_from_browser_session(browser_session)
+	current_url = await browser_session.get_current_page_url()
+
+	# Unchanged page: replay the chunks of an earlier extraction
+	fingerprint = HTMLSerializer(extract_links=extract_links).fingerprint(enhanced_dom_tree)
+	cache_key = (browser_session.current_target_id or '', current_url, fingerprint, extract_links, chunk_chars)
+	cached = markdown_cache.get(cache_key)
+	if cached is not None:
+		stats.update(cached.stats, **markdown_cache.stats(hit=True))
+		for chunk in cached.chunks:
+			yield chunk
+			await asyncio.sleep(0)
+		return
+
+	stats.update(url=current_url, **markdown_cache.stats(hit=False))
+	chunks = []
+	for chunk in iter_markdown_chunks(enhanced_dom_tree, extract_links=extract_links, chunk_chars=chunk_chars, content_stats=stats):
+		chunks.append(chunk)
+		yield chunk
+		await asyncio.sleep(0)
+
+	# only cache complete streams, the consumer may stop early
+	markdown_cache.put(cache_key, chunks, stats)
+
+
+def iter_markdown_chunks(
+	enhanced_dom_tree: EnhancedDOMTreeNode,
+	extract_links: bool = False,
+	chunk_chars: int = 30000,
+	content_stats: dict[str, Any] | None = None,
+) -> Iterator[str]:
+	"""Stream clean markdown of an enhanced DOM tree in chunks of up to `chunk_chars` characters.
+
+	Unlike `extract_clean_markdown`, the page is never serialized to one HTML string: the tree is cut into HTML
+	fragments (see `HTMLSerializer.serialize_chunks`) that are converted and cleaned one at a time, and the
+	resulting markdown is packed into chunks at fragment (block element) boundaries. Chunks are produced
+	lazily, so the caller can start processing the first chunks while later ones are still being converted.
+
+	The text matches `extract_clean_markdown`'s up to whitespace at fragment boundaries (tables and lists are
+	converted whole), but it is not character for character the same: character offsets (e.g. the extract
+	action's `start_from_char`) index the concatenated chunks, not `extract_clean_markdown`'s output.
+
+	Args:
+	    enhanced_dom_tree: Root of the tree to extract, e.g. from `_get_enhanced_dom_tree_from_browser_session`
+	    extract_links: Whether to preserve links in markdown
+	    chunk_chars: Maximum chunk length, a single longer paragraph is split at line or word boundaries
+	    content_stats: Optional dict that is filled with the same statistics `extract_clean_markdown` returns
+	        (plus the number of chunks), complete once the iterator is exhausted
+
+	Yields:
+	    str: Non-empty markdown chunks, in document order
+	"""
+	stats = content_stats if content_stats is not None else {}
+	stats.update(
+		method='enhanced_dom_tree_chunks',
+		original_html_chars=0,
+		initial_markdown_chars=0,
+		filtered_chars_removed=0,
+		final_filtered_chars=0,
+		chunks=0,
+	)
+
+	def emit(chunk: str) -> str:
+		stats['final_filtered_chars'] += len(chunk)
+		stats['chunks'] += 1
+		return chunk
+
+	html_serializer = HTMLSerializer(extract_links=extract_links)
+	pending: list[str] = []
+	pending_chars = 0
+	for fragment_html in html_serializer.serialize_chunks(enhanced_dom_tree, max_chars=chunk_chars):
+		stats['original_html_chars'] += len(fragment_html)
+		markdown = _html_to_markdown(fragment_html)
+		stats['initial_markdown_chars'] += len(markdown)
+		markdown, chars_filtered = _preprocess_markdown_content(_URL_ENCODING_RE.sub('', markdown))
+		stats['filtered_chars_removed'] += chars_filtered
+		if not markdown:
+			continue
+
+		for piece in _split_markdown(markdown, chunk_chars):
+			# +2 for the blank line joining two pieces
+			if pending and pending_chars + 2 + len(piece) > chunk_chars:
+				yield emit('\n\n'.join(pending))
+				pending, pending_chars = [], 0
+			pending.append(piece)
+			pending_chars += len(piece) + (2 if pending_chars else 0)
+
+	if pending:
+		yield emit('\n\n'.join(pending))
+
+
+def _split_markdown(content: str, max_chars: int) -> list[str]:
+	"""Split markdown longer than `max_chars` at the last paragraph, line or word break before the limit."""
+	pieces = []
+	while len(content) > max_chars:
+		cut = -1
+		for separator in ('\n\n', '\n', ' '):
+			cut = content.rfind(separator, max_chars // 2, max_chars)
+			if cut > 0:
+				break
+		if cut <= 0:
+			cut = max_chars
+		pieces.append(content[:cut].rstrip())
+		content = content[cut:].lstrip()
+	if content:
+		pieces.append(content)
+	return pieces
+
+
+def _html_to_markdown(html: str) -> str:
+	"""Convert (a fragment of) page HTML to markdown with markdownify."""
+	from markdownify import markdownify as md
+
+	return md(
+		html,
+		heading_style='ATX',  # Use # style headings
+		strip=['script', 'style'],  # Remove these tags
+		bullets='-',  # Use - for unordered lists
+		code_language='',  # Don't add language to code blocks
+		escape_asterisks=False,  # Don't escape asterisks (cleaner output)
+		escape_underscores=False,  # Don't escape underscores (cleaner output)
+		escape_misc=False,  # Don't escape other characters (cleaner output)
+		autolinks=False,  # Don't convert URLs to <> format
+		default_title=False,  # Don't add default title attributes
+		keep_inline_images_in=[],  # Don't keep inline images in any tags (we already filter base64 in HTML)
+	)
+
+
 async def _get_enhanced_dom_tree_from_browser_session(browser_session: 'BrowserSession'):
 	"""Get enhanced DOM tree from browser session via DOMWatchdog."""
 	# Get the enhanced DOM tree from DOMWatchdog
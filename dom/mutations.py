@@ -0,0 +1,397 @@
+"""
+Incremental DOM tree maintenance driven by CDP DOM mutation events.
+
+`DomService` keeps one `DOMMutationJournal` per target when incremental snapshots are enabled (with
+`BROWSER_USE_INCREMENTAL_SNAPSHOTS=true` or `DomService(incremental_snapshots=True)`). The journal
+buffers `DOM.*` mutation events between two snapshots and patches the raw `DOM.getDocument` tree of the
+previous step, so the next step can skip re-fetching the full document and only rebuild the changed nodes.
+The events reach the journals through a `DOMEventDispatcher`, which other `DOM.*` listeners can share.
+"""
+
+import inspect
+import logging
+import weakref
+from collections.abc import Callable
+from typing import Any
+
+from cdp_use.cdp.dom.types import Node
+from cdp_use.cdp.target.types import SessionID, TargetID
+
+from browser_use.dom.views import EnhancedDOMTreeNode
+
+logger = logging.getLogger(__name__)
+
+# CDP DOM events that change the structure or content of the tree we keep
+TRACKED_DOM_EVENTS = [
+	'childNodeInserted',
+	'childNodeRemoved',
+	'attributeModified',
+	'attributeRemoved',
+	'characterDataModified',
+	'setChildNodes',
+	'shadowRootPushed',
+	'shadowRootPopped',
+	'documentUpdated',
+]
+
+# session id -> journals listening on that session (several DomService instances may track the same target)
+_journals_by_session: dict[SessionID, 'weakref.WeakSet[DOMMutationJournal]'] = {}
+
+
+def _dispatch(method: str, event: dict[str, Any], session_id: str | None) -> None:
+	if session_id is None:
+		return
+	for journal in list(_journals_by_session.get(session_id, ())):
+		journal.record(method, event)
+
+
+def _make_handler(method: str):
+	def handler(event: Any, session_id: str | None) -> None:
+		_dispatch(method, event, session_id)
+
+	return handler
+
+
+_HANDLERS = {method: _make_handler(method) for method in TRACKED_DOM_EVENTS}
+
+EventCallback = Callable[[Any, str | None], Any]
+
+
+class DOMEventDispatcher:
+	"""
+	Single owner of the `DOM.*` event handlers of a CDP client, fanning every event out to its subscribers.
+
+	A CDP client holds one handler per event, so components registering on `cdp_client.register.DOM` directly
+	replace each other. Subscribe through `DOMEventDispatcher.for_client(cdp_client)` instead. Handlers that were
+	registered directly before the dispatcher took over an event become its first subscribers.
+	"""
+
+	_dispatchers: 'weakref.WeakKeyDictionary[Any, DOMEventDispatcher]' = weakref.WeakKeyDictionary()
+
+	def __init__(self, cdp_client: Any):
+		self._cdp_client = weakref.ref(cdp_client)
+		self._subscribers: dict[str, list[EventCallback]] = {}
+
+	@classmethod
+	def for_client(cls, cdp_client: Any) -> 'DOMEventDispatcher':
+		dispatcher = cls._dispatchers.get(cdp_client)
+		if dispatcher is None:
+			dispatcher = cls._dispatchers[cdp_client] = cls(cdp_client)
+		return dispatcher
+
+	def subscribe(self, method: str, callback: EventCallback) -> None:
+		"""Call `callback(event, session_id)` for every `DOM.<method>` event, once even if subscribed repeatedly."""
+		subscribers = self._subscribers.get(method)
+		if subscribers is None:
+			cdp_client = self._cdp_client()
+			assert cdp_client is not None, 'CDP client was garbage collected'
+			previous = _registered_handler(cdp_client, f'DOM.{method}')
+			subscribers = self._subscribers[method] = [previous] if previous is not None else []
+			getattr(cdp_client.register.DOM, method)(self._make_handler(method, subscribers))
+		if callback not in subscribers:
+			subscribers.append(callback)
+
+	def unsubscribe(self, method: str, callback: EventCallback) -> None:
+		subscribers = self._subscribers.get(method, [])
+		if callback in subscribers:
+			subscribers.remove(callback)
+
+	@staticmethod
+	def _make_handler(method: str, subscribers: list[EventCallback]):
+		async def handler(event: Any, session_id: str | None) -> None:
+			for callback in list(subscribers):
+				try:
+					result = callback(event, session_id)
+					if inspect.isawaitable(result):
+						await result
+				except Exception as e:
+					# one failing subscriber must not keep the event from the others
+					logger.error(f'Error in DOM.{method} event subscriber {callback!r}: {type(e).__name__}: {e}')
+
+		return handler
+
+
+def _registered_handler(cdp_client: Any, event: str) -> EventCallback | None:
+	"""The handler registered directly on the client for `event`, so taking the event over does not drop it."""
+	try:
+		handlers: dict[str, EventCallback] = cdp_client._event_registry._handlers
+	except AttributeError as e:
+		# replacing handlers we cannot see would silently break other components listening for the event
+		raise RuntimeError(
+			f'Cannot read the registered CDP event handlers of {type(cdp_client).__name__}, unsupported cdp-use version'
+		) from e
+	return handlers.get(event)
+
+
+class DOMMutationJournal:
+	"""
+	Raw DOM tree of one target kept in sync with CDP mutation events.
+
+	Event callbacks only append to a bounded buffer, the actual patching happens in `apply_pending()` right
+	before the enhanced tree is rebuilt. Patching is idempotent, so events that were already contained in a
+	freshly fetched document are safe to replay.
+	"""
+
+	def __init__(self, target_id: TargetID, session_id: SessionID, max_mutations: int = 1000):
+		self.target_id = target_id
+		self.session_id = session_id
+		self.max_mutations = max_mutations
+
+		self.root: Node | None = None
+		self._raw_nodes: dict[int, Node] = {}
+		"""NodeId -> raw CDP node, for every node reachable through children, shadow roots and content documents"""
+		self._pending: list[tuple[str, dict[str, Any]]] = []
+
+		self.invalidated_reason: str | None = 'no document captured yet'
+		self.dirty_node_ids: set[int] = set()
+		"""Node ids whose enhanced node must be rebuilt (inserted subtrees, changed attributes/text)"""
+
+		self.enhanced_nodes: dict[int, EnhancedDOMTreeNode] = {}
+		"""NodeId -> enhanced node from the previous build, copied (never modified) for nodes that did not change"""
+
+		# Baseline mismatch between snapshot and DOM tree node sets, used to detect missed events
+		self.untracked_snapshot_nodes = 0
+		self.stale_tree_nodes = 0
+
+	# region - event subscription
+
+	def subscribe(self, cdp_client: Any) -> None:
+		"""Start receiving DOM mutation events of this journal's session."""
+		_journals_by_session.setdefault(self.session_id, weakref.WeakSet()).add(self)
+		dispatcher = DOMEventDispatcher.for_client(cdp_client)
+		for method, handler in _HANDLERS.items():
+			dispatcher.subscribe(method, handler)
+
+	def unsubscribe(self) -> None:
+		journals = _journals_by_session.get(self.session_id)
+		if journals is not None:
+			journals.discard(self)
+			if not journals:
+				_journals_by_session.pop(self.session_id, None)
+
+	def record(self, method: str, event: dict[str, Any]) -> None:
+		"""Buffer one event. Called from the CDP event loop, so keep it cheap."""
+		if self.invalidated_reason is not None:
+			return
+
+		if method == 'documentUpdated':
+			self.invalidate('document replaced (navigation or document.open)')
+			return
+
+		self._pending.append((method, event))
+		if len(self._pending) > self.max_mutations:
+			self.invalidate(f'more than {self.max_mutations} DOM mutations since last snapshot')
+
+	# endregion - event subscription
+
+	@property
+	def can_patch(self) -> bool:
+		return self.root is not None and self.invalidated_reason is None
+
+	@property
+	def pending_mutations(self) -> int:
+		return len(self._pending)
+
+	def invalidate(self, reason: str) -> None:
+		if self.invalidated_reason is None:
+			logger.debug(f'Incremental DOM tree for target {self.target_id[-4:]} invalidated: {reason}')
+		self.invalidated_reason = reason
+		self._pending.clear()
+
+	def begin_capture(self) -> None:
+		"""Prepare for a full `DOM.getDocument` fetch.
+
+		Buffering restarts before the request is sent, so no event between the response and `reset()` is lost.
+		"""
+		self._pending.clear()
+		self.invalidated_reason = None
+		self.root = None
+		self._raw_nodes = {}
+		self.enhanced_nodes = {}
+
+	def reset(self, root: Node) -> None:
+		"""Adopt a freshly fetched document as the new base tree."""
+		self.root = root
+		self._raw_nodes = {}
+		self._index_subtree(root)
+		self.dirty_node_ids = set()
+
+	def tree_backend_node_ids(self) -> set[int]:
+		return {raw_node['backendNodeId'] for raw_node in self._raw_nodes.values()}
+
+	def apply_pending(self) -> bool:
+		"""Patch the raw tree with all buffered events.
+
+		Returns False if the tree can't be patched reliably anymore and a full rebuild is needed.
+		"""
+		if not self.can_patch:
+			return False
+
+		self.dirty_node_ids = set()
+		pending, self._pending = self._pending, []
+		for method, event in pending:
+			try:
+				applied = getattr(self, f'_on_{method}')(event)
+			except (KeyError, ValueError, TypeError) as e:
+				applied = False
+				logger.debug(f'Failed to apply DOM.{method} event: {type(e).__name__}: {e}')
+
+			if not applied:
+				self.invalidate(f'could not apply DOM.{method} event')
+				return False
+
+		return True
+
+	# region - tree indexing
+
+	@staticmethod
+	def _iter_subtree(node: Node):
+		"""Iterate a raw node and all its descendants (children, shadow roots, content documents)."""
+		stack = [node]
+		while stack:
+			current = stack.pop()
+			yield current
+			stack.extend(current.get('children') or [])
+			stack.extend(current.get('shadowRoots') or [])
+			if current.get('contentDocument'):
+				stack.append(current['contentDocument'])
+
+	def _index_subtree(self, node: Node, parent_id: int | None = None) -> list[int]:
+		if parent_id is not None:
+			node['parentId'] = parent_id
+
+		node_ids = []
+		for current in self._iter_subtree(node):
+			self._raw_nodes[current['nodeId']] = current
+			node_ids.append(current['nodeId'])
+			for child in current.get('children') or []:
+				child['parentId'] = current['nodeId']
+		return node_ids
+
+	def _drop_subtree(self, node: Node) -> None:
+		for current in self._iter_subtree(node):
+			self._raw_nodes.pop(current['nodeId'], None)
+			self.enhanced_nodes.pop(current['nodeId'], None)
+			self.dirty_node_ids.discard(current['nodeId'])
+
+	# endregion - tree indexing
+
+	# region - event handlers (return False if the event can't be applied)
+
+	def _on_childNodeInserted(self, event: dict[str, Any]) -> bool:
+		parent = self._raw_nodes.get(event['parentNodeId'])
+		if parent is None:
+			return False
+
+		node: Node = event['node']
+		if node['nodeId'] in self._raw_nodes:
+			return True  # already part of the tree (event replayed after a full fetch)
+
+		children = parent.setdefault('children', [])
+		previous_node_id = event.get('previousNodeId', 0)
+		insert_at = 0
+		if previous_node_id:
+			insert_at = next((i + 1 for i, child in enumerate(children) if child['nodeId'] == previous_node_id), len(children))
+		children.insert(insert_at, node)
+		parent['childNodeCount'] = len(children)
+
+		self.dirty_node_ids.update(self._index_subtree(node, parent_id=parent['nodeId']))
+		return True
+
+	def _on_childNodeRemoved(self, event: dict[str, Any]) -> bool:
+		parent = self._raw_nodes.get(event['parentNodeId'])
+		node = self._raw_nodes.get(event['nodeId'])
+		if node is None:
+			return True  # already gone
+		if parent is None:
+			return False
+
+		parent['children'] = [child for child in parent.get('children') or [] if child['nodeId'] != event['nodeId']]
+		parent['childNodeCount'] = len(parent['children'])
+		self._drop_subtree(node)
+		return True
+
+	def _on_attributeModified(self, event: dict[str, Any]) -> bool:
+		node = self._raw_nodes.get(event['nodeId'])
+		if node is None:
+			return False
+
+		attributes = node.setdefault('attributes', [])
+		for i in range(0, len(attributes), 2):
+			if attributes[i] == event['name']:
+				attributes[i + 1] = event['value']
+				break
+		else:
+			attributes.extend([event['name'], event['value']])
+
+		self.dirty_node_ids.add(node['nodeId'])
+		return True
+
+	def _on_attributeRemoved(self, event: dict[str, Any]) -> bool:
+		node = self._raw_nodes.get(event['nodeId'])
+		if node is None:
+			return False
+
+		attributes = node.get('attributes') or []
+		for i in range(0, len(attributes), 2):
+			if attributes[i] == event['name']:
+				del attributes[i : i + 2]
+				break
+
+		self.dirty_node_ids.add(node['nodeId'])
+		return True
+
+	def _on_characterDataModified(self, event: dict[str, Any]) -> bool:
+		node = self._raw_nodes.get(event['nodeId'])
+		if node is None:
+			return False
+
+		node['nodeValue'] = event['characterData']
+		self.dirty_node_ids.add(node['nodeId'])
+		return True
+
+	def _on_setChildNodes(self, event: dict[str, Any]) -> bool:
+		parent = self._raw_nodes.get(event['parentId'])
+		if parent is None:
+			return False
+
+		for child in parent.get('children') or []:
+			self._drop_subtree(child)
+
+		parent['children'] = event['nodes']
+		parent['childNodeCount'] = len(event['nodes'])
+		for child in event['nodes']:
+			self.dirty_node_ids.update(self._index_subtree(child, parent_id=parent['nodeId']))
+		return True
+
+	def _on_shadowRootPushed(self, event: dict[str, Any]) -> bool:
+		host = self._raw_nodes.get(event['hostId'])
+		if host is None:
+			return False
+
+		root: Node = event['root']
+		if root['nodeId'] in self._raw_nodes:
+			return True
+
+		host.setdefault('shadowRoots', []).append(root)
+		self.dirty_node_ids.update(self._index_subtree(root))
+		self.dirty_node_ids.add(host['nodeId'])
+		return True
+
+	def _on_shadowRootPopped(self, event: dict[str, Any]) -> bool:
+		host = self._raw_nodes.get(event['hostId'])
+		root = self._raw_nodes.get(event['rootId'])
+		if root is None:
+			return True
+		if host is None:
+			return False
+
+		host['shadowRoots'] = [r for r in host.get('shadowRoots') or [] if r['nodeId'] != event['rootId']]
+		self._drop_subtree(root)
+		self.dirty_node_ids.add(host['nodeId'])
+		return True
+
+	def _on_documentUpdated(self, event: dict[str, Any]) -> bool:
+		return False
+
+	# endregion - event handlers
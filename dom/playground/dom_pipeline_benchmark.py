@@ -0,0 +1,467 @@
+"""
+Offline benchmark suite for the DOM pipeline on recorded CDP snapshots.
+
+Replays page recordings (see `browser_use.dom.recording`) through `DomService` with a `ReplayBrowserSession`
+and reports the time per stage (median over `--repeat` runs) and the peak memory allocated by each stage
+(measured in a separate run with tracemalloc):
+
+	build_snapshot_lookup -> get_dom_tree -> DOMTreeSerializer stages -> llm_representation -> HTMLSerializer
+
+Without `--fixtures` it generates synthetic small / medium / huge pages in the recording format, so the suite
+runs without Chrome. Results can be saved and compared against a baseline to catch regressions before release.
+
+Usage:
+	# run on synthetic pages
+	python -m browser_use.dom.playground.dom_pipeline_benchmark [--pages small medium huge] [--repeat 3]
+
+	# record a real page once (needs Chrome), then benchmark it offline
+	python -m browser_use.dom.playground.dom_pipeline_benchmark --record https://github.com/trending --output tmp/github.json.gz
+	python -m browser_use.dom.playground.dom_pipeline_benchmark --fixtures tmp/github.json.gz
+
+	# compare against a baseline, exits with status 1 if a stage got slower than --max-regression
+	python -m browser_use.dom.playground.dom_pipeline_benchmark --save tmp/baseline.json
+	python -m browser_use.dom.playground.dom_pipeline_benchmark --compare tmp/baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from browser_use.dom.enhanced_snapshot import REQUIRED_COMPUTED_STYLES, build_snapshot_lookup
+from browser_use.dom.recording import RecordedPage, RecordedTarget, ReplayBrowserSession
+from browser_use.dom.serializer.html_serializer import HTMLSerializer
+from browser_use.dom.serializer.serializer import DOMTreeSerializer
+from browser_use.dom.service import DomService
+
+PAGE_SIZES = {'small': 1_000, 'medium': 10_000, 'huge': 100_000}
+
+VIEWPORT = {'width': 1280, 'height': 1100}
+
+# region - synthetic recordings
+
+
+class SyntheticRecordingBuilder:
+	"""Builds the raw `DOM.getDocument`, `DOMSnapshot.captureSnapshot` and AX tree responses of a feed-like page."""
+
+	def __init__(self, seed: int = 42):
+		self.rng = random.Random(seed)
+		self.next_id = 1
+		self.strings: list[str] = []
+		self._string_index: dict[str, int] = {}
+		self.documents: list[dict[str, Any]] = []
+		self.ax_nodes: list[dict[str, Any]] = []
+		self.paint_order = 0
+		self.node_count = 0
+
+	def string(self, value: str) -> int:
+		index = self._string_index.get(value)
+		if index is None:
+			index = self._string_index[value] = len(self.strings)
+			self.strings.append(value)
+		return index
+
+	def new_document(self, url: str) -> int:
+		self.documents.append(
+			{
+				'documentURL': self.string(url),
+				'nodes': {'parentIndex': [], 'nodeType': [], 'nodeName': [], 'backendNodeId': [], 'isClickable': {'index': []}},
+				'layout': {
+					'nodeIndex': [],
+					'styles': [],
+					'bounds': [],
+					'text': [],
+					'stackingContexts': {'index': []},
+					'paintOrders': [],
+					'clientRects': [],
+					'scrollRects': [],
+				},
+			}
+		)
+		return len(self.documents) - 1
+
+	def node(
+		self,
+		parent: dict[str, Any] | None,
+		document: int,
+		node_type: int,
+		node_name: str,
+		attributes: dict[str, str] | None = None,
+		node_value: str = '',
+		bounds: tuple[float, float, float, float] | None = None,
+		display: str = 'block',
+		background: str = 'rgba(0, 0, 0, 0)',
+		cursor: str = 'auto',
+		ax_role: str | None = None,
+		ax_name: str | None = None,
+		shadow_root: bool = False,
+	) -> dict[str, Any]:
+		node_id = self.next_id
+		self.next_id += 1
+		self.node_count += 1
+
+		raw: dict[str, Any] = {
+			'nodeId': node_id,
+			'backendNodeId': node_id,
+			'nodeType': node_type,
+			'nodeName': node_name,
+			'localName': node_name.lower() if node_type == 1 else '',
+			'nodeValue': node_value,
+			'childNodeCount': 0,
+			'children': [],
+		}
+		if attributes:
+			raw['attributes'] = [item for pair in attributes.items() for item in pair]
+		if parent is not None:
+			if shadow_root:
+				raw['shadowRootType'] = 'open'
+				parent.setdefault('shadowRoots', []).append(raw)
+			else:
+				raw['parentId'] = parent['nodeId']
+				parent['children'].append(raw)
+				parent['childNodeCount'] = len(parent['children'])
+
+		snapshot_nodes = self.documents[document]['nodes']
+		snapshot_index = len(snapshot_nodes['backendNodeId'])
+		snapshot_nodes['parentIndex'].append(-1)
+		snapshot_nodes['nodeType'].append(node_type)
+		snapshot_nodes['nodeName'].append(self.string(node_name))
+		snapshot_nodes['backendNodeId'].append(node_id)
+		if cursor == 'pointer':
+			snapshot_nodes['isClickable']['index'].append(snapshot_index)
+
+		if bounds is not None:
+			layout = self.documents[document]['layout']
+			self.paint_order += 1
+			layout['nodeIndex'].append(snapshot_index)
+			layout['bounds'].append(list(bounds))
+			layout['clientRects'].append([0, 0, bounds[2], bounds[3]])
+			layout['scrollRects'].append([0, 0, bounds[2], bounds[3]])
+			layout['paintOrders'].append(self.paint_order)
+			layout['text'].append(-1)
+			style_values = {
+				'display': display,
+				'visibility': 'visible',
+				'opacity': '1',
+				'overflow': 'visible',
+				'overflow-x': 'visible',
+				'overflow-y': 'visible',
+				'cursor': cursor,
+				'pointer-events': 'auto',
+				'position': 'static',
+				'background-color': background,
+			}
+			layout['styles'].append([self.string(style_values[name]) for name in REQUIRED_COMPUTED_STYLES])
+
+		if ax_role is not None:
+			ax_node: dict[str, Any] = {
+				'nodeId': str(node_id),
+				'ignored': False,
+				'role': {'type': 'role', 'value': ax_role},
+				'backendDOMNodeId': node_id,
+			}
+			if ax_name:
+				ax_node['name'] = {'type': 'computedString', 'value': ax_name}
+			self.ax_nodes.append(ax_node)
+
+		return raw
+
+	def element(self, parent: dict[str, Any], document: int, tag: str, bounds=None, **kwargs) -> dict[str, Any]:
+		return self.node(parent, document, 1, tag.upper(), bounds=bounds, **kwargs)
+
+	def text(self, parent: dict[str, Any], document: int, value: str, bounds=None) -> dict[str, Any]:
+		return self.node(parent, document, 3, '#text', node_value=value, bounds=bounds, display='inline')
+
+	def card(self, parent: dict[str, Any], document: int, y: float, index: int) -> float:
+		"""Add one feed card at `y`, returns its height."""
+		rng = self.rng
+		height = rng.uniform(150, 400)
+		white = 'rgb(255, 255, 255)'
+		card = self.element(parent, document, 'article', (240, y, 800, height), attributes={'class': f'card c{index % 7}'}, background=white)
+
+		link = self.element(
+			card, document, 'a', (256, y + 8, 400, 40), attributes={'href': f'/post/{index}'}, cursor='pointer', ax_role='link', ax_name=f'Author {index}'
+		)
+		self.element(link, document, 'img', (256, y + 8, 40, 40), attributes={'alt': 'avatar', 'src': f'/a/{index}.png'}, ax_role='img')
+		self.text(link, document, f'Author {index}', (304, y + 16, 200, 20))
+
+		paragraph = self.element(card, document, 'p', (256, y + 56, 768, height - 120))
+		for line in range(rng.randint(1, 4)):
+			words = ' '.join(rng.choice(('lorem', 'ipsum', 'dolor', 'sit', 'amet')) for _ in range(rng.randint(3, 20)))
+			self.text(paragraph, document, words, (256, y + 56 + line * 20, 700, 20))
+
+		toolbar = self.element(card, document, 'div', (256, y + height - 56, 768, 40), attributes={'role': 'toolbar'})
+		for offset, label in enumerate(('Like', 'Comment', 'Share')):
+			button = self.element(
+				toolbar,
+				document,
+				'button',
+				(256 + offset * 100, y + height - 52, 80, 32),
+				attributes={'aria-label': label, 'type': 'button'},
+				cursor='pointer',
+				background=white,
+				ax_role='button',
+				ax_name=label,
+			)
+			svg = self.element(button, document, 'svg', (260 + offset * 100, y + height - 48, 16, 16))
+			self.element(svg, document, 'path', (260 + offset * 100, y + height - 48, 16, 16))
+
+		if index % 5 == 0:
+			self.element(
+				card,
+				document,
+				'input',
+				(256, y + height - 12, 600, 10),
+				attributes={'type': 'text', 'placeholder': 'Reply', 'name': f'reply-{index}'},
+				cursor='text',
+				ax_role='textbox',
+				ax_name='Reply',
+			)
+		if index % 11 == 0:
+			host = self.element(card, document, 'share-widget', (700, y + 8, 300, 40))
+			shadow_root = self.node(host, document, 11, '#document-fragment', shadow_root=True)
+			self.element(
+				shadow_root, document, 'button', (710, y + 12, 80, 30), attributes={'id': f'w{index}'}, cursor='pointer', ax_role='button'
+			)
+		if index % 13 == 0:
+			# collapsed menu, hidden with display: none
+			menu = self.element(card, document, 'ul', (900, y + 8, 120, 200), attributes={'role': 'menu'}, display='none')
+			for item in range(5):
+				self.element(menu, document, 'li', (900, y + 8 + item * 40, 120, 40), attributes={'role': 'menuitem'}, display='none')
+		if index % 23 == 0:
+			# same-origin iframe, its document is a separate snapshot document
+			iframe = self.element(card, document, 'iframe', (256, y + 100, 400, 60), attributes={'src': '/embed'})
+			frame_document = self.new_document('https://example.com/embed')
+			content_document_index = self.documents[document]['nodes'].setdefault('contentDocumentIndex', {'index': [], 'value': []})
+			content_document_index['index'].append(len(self.documents[document]['nodes']['backendNodeId']) - 1)
+			content_document_index['value'].append(frame_document)
+			content_document = self.node(None, frame_document, 9, '#document')
+			iframe['contentDocument'] = content_document
+			html = self.element(content_document, frame_document, 'html', (0, 0, 400, 60))
+			body = self.element(html, frame_document, 'body', (0, 0, 400, 60))
+			self.element(
+				body, frame_document, 'a', (8, 8, 100, 20), attributes={'href': '/embedded'}, cursor='pointer', ax_role='link', ax_name='Embedded'
+			)
+
+		return height
+
+
+def generate_recording(num_nodes: int, seed: int = 42) -> RecordedPage:
+	"""Synthetic feed page with roughly `num_nodes` DOM nodes, in the recording format."""
+	builder = SyntheticRecordingBuilder(seed)
+	main_document = builder.new_document('https://example.com/feed')
+	document = builder.node(None, main_document, 9, '#document')
+	html = builder.element(document, main_document, 'html', (0, 0, VIEWPORT['width'], VIEWPORT['height']))
+	head = builder.element(html, main_document, 'head')
+	builder.element(head, main_document, 'title')
+	builder.element(head, main_document, 'script', attributes={'src': '/app.js'})
+	body = builder.element(html, main_document, 'body', (0, 0, VIEWPORT['width'], VIEWPORT['height']), background='rgb(250, 250, 250)')
+
+	nav = builder.element(body, main_document, 'nav', (0, 0, VIEWPORT['width'], 64), attributes={'role': 'navigation'}, background='rgb(255, 255, 255)')
+	for item in range(8):
+		builder.element(
+			nav, main_document, 'a', (16 + item * 120, 16, 100, 32), attributes={'href': f'/section/{item}'}, cursor='pointer', ax_role='link'
+		)
+
+	feed = builder.element(body, main_document, 'main', (240, 80, 800, VIEWPORT['height']))
+	y = 80.0
+	index = 0
+	while builder.node_count < num_nodes:
+		y += builder.card(feed, main_document, y, index) + 16
+		index += 1
+
+	target_id = f'SYNTHETIC{num_nodes}'
+	return RecordedPage(
+		url='https://example.com/feed',
+		title=f'Synthetic feed ({num_nodes} nodes)',
+		viewport=dict(VIEWPORT),
+		main_target_id=target_id,
+		targets={
+			target_id: RecordedTarget(
+				snapshot={'documents': builder.documents, 'strings': builder.strings},  # type: ignore[typeddict-item]
+				dom_tree={'root': document},  # type: ignore[typeddict-item]
+				ax_tree={'nodes': builder.ax_nodes},  # type: ignore[typeddict-item]
+				device_pixel_ratio=1.0,
+			)
+		},
+	)
+
+
+# endregion - synthetic recordings
+
+# region - benchmark
+
+
+class StageRecorder:
+	"""Collects the duration and (when tracemalloc is running) the peak allocation of each stage."""
+
+	def __init__(self):
+		self.seconds: dict[str, float] = {}
+		self.peak_bytes: dict[str, int] = {}
+
+	@contextmanager
+	def stage(self, name: str) -> Iterator[None]:
+		tracing = tracemalloc.is_tracing()
+		if tracing:
+			tracemalloc.reset_peak()
+			baseline = tracemalloc.get_traced_memory()[0]
+		start = time.perf_counter()
+		try:
+			yield
+		finally:
+			self.seconds[name] = time.perf_counter() - start
+			if tracing:
+				self.peak_bytes[name] = tracemalloc.get_traced_memory()[1] - baseline
+
+
+async def run_pipeline(page: RecordedPage, recorder: StageRecorder) -> dict[str, int]:
+	"""Run the full DOM pipeline on a recording once, returns some output sizes."""
+	main_target = page.targets[page.main_target_id]
+
+	with recorder.stage('build_snapshot_lookup'):
+		build_snapshot_lookup(main_target.snapshot, main_target.device_pixel_ratio)
+
+	browser_session = ReplayBrowserSession(page)
+	dom_service = DomService(browser_session, cross_origin_iframes=len(page.targets) > 1)  # type: ignore[arg-type]
+	with recorder.stage('get_dom_tree'):
+		enhanced_dom_tree = await dom_service.get_dom_tree(target_id=page.main_target_id)
+
+	with recorder.stage('serialize_accessible_elements'):
+		serialized_dom_state, timing_info = DOMTreeSerializer(
+			enhanced_dom_tree, paint_order_filtering=dom_service.paint_order_filtering
+		).serialize_accessible_elements()
+	for stage, seconds in timing_info.items():
+		if stage != 'serialize_accessible_elements_total':
+			recorder.seconds[f'  {stage}'] = seconds
+
+	with recorder.stage('llm_representation'):
+		llm_representation = serialized_dom_state.llm_representation()
+
+	with recorder.stage('html_serializer'):
+		html = HTMLSerializer(extract_links=True).serialize(enhanced_dom_tree)
+
+	return {
+		'interactive_elements': len(serialized_dom_state.selector_map),
+		'llm_representation_chars': len(llm_representation),
+		'html_chars': len(html),
+	}
+
+
+async def benchmark_page(page: RecordedPage, repeat: int) -> dict[str, Any]:
+	"""Median time per stage over `repeat` runs plus one tracemalloc run for peak memory."""
+	runs: list[StageRecorder] = []
+	sizes: dict[str, int] = {}
+	for _ in range(repeat):
+		recorder = StageRecorder()
+		sizes = await run_pipeline(page, recorder)
+		runs.append(recorder)
+
+	memory_recorder = StageRecorder()
+	tracemalloc.start()
+	try:
+		await run_pipeline(page, memory_recorder)
+	finally:
+		tracemalloc.stop()
+
+	stages = list(runs[0].seconds)
+	return {
+		'nodes': page.total_nodes,
+		**sizes,
+		'ms': {stage: statistics.median(run.seconds[stage] for run in runs) * 1000 for stage in stages},
+		'peak_mib': {stage: peak / 2**20 for stage, peak in memory_recorder.peak_bytes.items()},
+	}
+
+
+def print_results(name: str, result: dict[str, Any], baseline: dict[str, Any] | None, max_regression: float) -> list[str]:
+	"""Print one page's results, returns the stages that regressed compared to the baseline."""
+	print(
+		f'\n{name}: {result["nodes"]} nodes, {result["interactive_elements"]} interactive elements, '
+		f'{result["llm_representation_chars"]} chars for the LLM, {result["html_chars"]} chars of HTML'
+	)
+	print(f'  {"stage":<42} {"ms":>10} {"peak MiB":>10} {"vs baseline":>12}')
+
+	regressions = []
+	for stage, ms in result['ms'].items():
+		peak = result['peak_mib'].get(stage)
+		peak_str = f'{peak:10.1f}' if peak is not None else f'{"-":>10}'
+		delta_str = ''
+		if baseline and stage in baseline.get('ms', {}) and baseline['ms'][stage] > 0:
+			delta = ms / baseline['ms'][stage] - 1
+			delta_str = f'{delta:+11.0%}'
+			if delta > max_regression and not stage.startswith(' '):
+				regressions.append(stage)
+				delta_str += ' !'
+		print(f'  {stage:<42} {ms:10.2f} {peak_str} {delta_str:>12}')
+	return regressions
+
+
+async def record(url: str, output: Path) -> None:
+	"""Record a live page with Chrome into a fixture file."""
+	from browser_use.browser import BrowserProfile, BrowserSession
+	from browser_use.dom.recording import record_page
+
+	browser_session = BrowserSession(browser_profile=BrowserProfile(headless=True))
+	await browser_session.start()
+	try:
+		await browser_session._cdp_navigate(url)
+		await asyncio.sleep(3)
+		page = await record_page(browser_session)
+	finally:
+		await browser_session.kill()
+
+	page.save(output)
+	print(f'Recorded {page.url} ({page.total_nodes} nodes, {len(page.targets)} targets) to {output}')
+
+
+async def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--pages', nargs='+', choices=list(PAGE_SIZES), default=list(PAGE_SIZES), help='synthetic pages to run')
+	parser.add_argument('--fixtures', nargs='+', type=Path, default=[], help='recorded pages to run instead')
+	parser.add_argument('--repeat', type=int, default=3)
+	parser.add_argument('--save', type=Path, help='write the results as JSON')
+	parser.add_argument('--compare', type=Path, help='baseline results JSON to compare against')
+	parser.add_argument('--max-regression', type=float, default=0.25, help='allowed slowdown per stage (0.25 = 25%%)')
+	parser.add_argument('--record', metavar='URL', help='record a live page (needs Chrome) instead of benchmarking')
+	parser.add_argument('--output', type=Path, default=Path('tmp/recorded_page.json.gz'), help='where --record writes to')
+	args = parser.parse_args()
+
+	if args.record:
+		await record(args.record, args.output)
+		return
+
+	if args.fixtures:
+		pages = {path.name: RecordedPage.load(path) for path in args.fixtures}
+	else:
+		pages = {f'{name} (synthetic)': generate_recording(PAGE_SIZES[name]) for name in args.pages}
+
+	baseline = json.loads(args.compare.read_text()) if args.compare else {}
+	results: dict[str, Any] = {}
+	regressions: list[str] = []
+	for name, page in pages.items():
+		results[name] = await benchmark_page(page, args.repeat)
+		regressions += [
+			f'{name}: {stage}' for stage in print_results(name, results[name], baseline.get(name), args.max_regression)
+		]
+
+	if args.save:
+		args.save.parent.mkdir(parents=True, exist_ok=True)
+		args.save.write_text(json.dumps(results, indent=2))
+		print(f'\nSaved results to {args.save}')
+
+	if regressions:
+		print(f'\nStages slower than the baseline by more than {args.max_regression:.0%}:')
+		for regression in regressions:
+			print(f'  {regression}')
+		sys.exit(1)
+
+
+if __name__ == '__main__':
+	asyncio.run(main())
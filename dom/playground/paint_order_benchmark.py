@@ -0,0 +1,106 @@
+"""
+Benchmark the paint order rectangle union on synthetic overlapping-layer pages.
+
+Generates infinite-scroll-feed-like pages (cards with opaque backgrounds, images, text and buttons plus a sticky
+header and a few modal overlays) and runs the same ignore/add loop as `PaintOrderRemover.calculate_paint_order`
+with `RectUnionPure` and `RectUnionGrid`, checking that both ignore exactly the same elements.
+
+Usage:
+	python -m browser_use.dom.playground.paint_order_benchmark [--sizes 1000 10000 100000] [--compare-max 10000]
+"""
+
+import argparse
+import random
+import time
+from collections import defaultdict
+
+from browser_use.dom.serializer.paint_order import Rect, RectUnionGrid, RectUnionPure
+
+VIEWPORT_WIDTH = 1280
+
+
+def generate_feed_page(num_rects: int, seed: int = 42) -> list[tuple[int, Rect, bool]]:
+	"""Return (paint_order, rect, is_opaque) tuples for a synthetic feed page with about `num_rects` elements."""
+	rng = random.Random(seed)
+	elements: list[tuple[int, Rect, bool]] = []
+	paint_order = 1
+	y = 80.0
+
+	# page background
+	elements.append((0, Rect(0, 0, VIEWPORT_WIDTH, num_rects * 40.0), True))
+
+	while len(elements) < num_rects:
+		card_height = rng.uniform(150, 450)
+		card = Rect(240, y, 1040, y + card_height)
+		elements.append((paint_order, card, True))
+
+		# card content: avatar, text lines, image, buttons (some overlapping each other)
+		for _ in range(rng.randint(4, 12)):
+			x1 = rng.uniform(card.x1, card.x2 - 40)
+			y1 = rng.uniform(card.y1, card.y2 - 20)
+			content = Rect(x1, y1, min(card.x2, x1 + rng.uniform(20, 600)), min(card.y2, y1 + rng.uniform(10, 200)))
+			elements.append((paint_order + rng.randint(1, 3), content, rng.random() < 0.4))
+
+		paint_order += 4
+		y += card_height + rng.uniform(8, 24)
+
+	top_paint_order = paint_order + 10
+	# sticky header and a few modal overlays on top of everything
+	elements.append((top_paint_order, Rect(0, 0, VIEWPORT_WIDTH, 64), True))
+	for _ in range(max(1, num_rects // 5000)):
+		modal_y = rng.uniform(0, y)
+		elements.append((top_paint_order + 1, Rect(340, modal_y, 940, modal_y + 500), True))
+
+	return elements[:num_rects]
+
+
+def run_paint_order(elements: list[tuple[int, Rect, bool]], rect_union_factory: type[RectUnionPure]) -> tuple[list[bool], float]:
+	"""Same loop as `PaintOrderRemover.calculate_paint_order`, returns (ignored flags, seconds)."""
+	grouped: defaultdict[int, list[int]] = defaultdict(list)
+	for i, (paint_order, _, _) in enumerate(elements):
+		grouped[paint_order].append(i)
+
+	ignored = [False] * len(elements)
+	start = time.perf_counter()
+	rect_union = rect_union_factory()
+	sorted_groups = sorted(grouped.items(), key=lambda x: -x[0])
+	for group_index, (_, indices) in enumerate(sorted_groups):
+		rects_to_add = []
+		for i in indices:
+			_, rect, is_opaque = elements[i]
+			if rect_union.contains(rect):
+				ignored[i] = True
+			if is_opaque:
+				rects_to_add.append(rect)
+		if group_index == len(sorted_groups) - 1:
+			break
+		for rect in rects_to_add:
+			rect_union.add(rect)
+
+	return ignored, time.perf_counter() - start
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+	parser.add_argument('--compare-max', type=int, default=10_000, help='only run RectUnionPure up to this many rects')
+	args = parser.parse_args()
+
+	print(f'{"rects":>8} | {"pure (s)":>10} | {"grid (s)":>10} | {"speedup":>8} | {"ignored":>8} | same result')
+	for size in args.sizes:
+		elements = generate_feed_page(size)
+		grid_ignored, grid_time = run_paint_order(elements, RectUnionGrid)
+
+		if size <= args.compare_max:
+			pure_ignored, pure_time = run_paint_order(elements, RectUnionPure)
+			pure_str = f'{pure_time:10.3f}'
+			speedup = f'{pure_time / grid_time:7.1f}x' if grid_time > 0 else '-'
+			same = str(pure_ignored == grid_ignored)
+		else:
+			pure_str, speedup, same = f'{"skipped":>10}', f'{"-":>8}', '-'
+
+		print(f'{size:>8} | {pure_str} | {grid_time:10.3f} | {speedup:>8} | {sum(grid_ignored):>8} | {same}')
+
+
+if __name__ == '__main__':
+	main()
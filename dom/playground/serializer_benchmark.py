@@ -0,0 +1,229 @@
+"""
+Benchmark the DOM serialization pipeline (`DOMTreeSerializer`) on synthetic enhanced DOM trees.
+
+Builds feed-like pages (cards with links, buttons, inputs, text, SVG icons, shadow roots and same-origin
+iframes) plus a pathologically deep nesting chain, serializes them the same way `DomService` does and prints
+the per-stage timings from `timing_info`.
+
+Usage:
+	python -m browser_use.dom.playground.serializer_benchmark [--sizes 1000 10000 50000] [--depth 5000] [--repeat 3]
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from browser_use.dom.serializer.serializer import DOMTreeSerializer
+from browser_use.dom.views import DOMRect, EnhancedDOMTreeNode, EnhancedSnapshotNode, NodeType
+
+VIEWPORT_WIDTH = 1280
+VIEWPORT_HEIGHT = 900
+
+
+class SyntheticPageBuilder:
+	"""Creates linked `EnhancedDOMTreeNode`s with snapshot data, like `DomService.get_dom_tree` does."""
+
+	def __init__(self, seed: int = 42):
+		self.rng = random.Random(seed)
+		self.next_id = 1
+		self.paint_order = 1
+		self.node_count = 0
+
+	def node(
+		self,
+		parent: EnhancedDOMTreeNode | None,
+		node_type: NodeType,
+		node_name: str,
+		attributes: dict[str, str] | None = None,
+		bounds: DOMRect | None = None,
+		node_value: str = '',
+		opaque: bool = False,
+		cursor: str | None = None,
+	) -> EnhancedDOMTreeNode:
+		snapshot_node = None
+		if bounds is not None:
+			self.paint_order += 1
+			snapshot_node = EnhancedSnapshotNode(
+				is_clickable=cursor == 'pointer',
+				cursor_style=cursor,
+				bounds=bounds,
+				clientRects=bounds,
+				scrollRects=None,
+				computed_styles={
+					'display': 'block',
+					'visibility': 'visible',
+					'opacity': '1',
+					'background-color': 'rgb(255, 255, 255)' if opaque else 'rgba(0, 0, 0, 0)',
+				},
+				paint_order=self.paint_order,
+				stacking_contexts=None,
+			)
+
+		node = EnhancedDOMTreeNode(
+			node_id=self.next_id,
+			backend_node_id=self.next_id,
+			node_type=node_type,
+			node_name=node_name,
+			node_value=node_value,
+			attributes=attributes or {},
+			is_scrollable=None,
+			is_visible=bounds is not None and bounds.y < VIEWPORT_HEIGHT * 3,
+			absolute_position=bounds,
+			target_id='synthetic-target',
+			frame_id=None,
+			session_id=None,
+			content_document=None,
+			shadow_root_type=None,
+			shadow_roots=None,
+			parent_node=parent,
+			children_nodes=[],
+			ax_node=None,
+			snapshot_node=snapshot_node,
+		)
+		self.next_id += 1
+		self.node_count += 1
+		if parent is not None:
+			if node_type == NodeType.DOCUMENT_FRAGMENT_NODE:
+				parent.shadow_roots = (parent.shadow_roots or []) + [node]
+			else:
+				assert parent.children_nodes is not None
+				parent.children_nodes.append(node)
+		return node
+
+	def element(self, parent: EnhancedDOMTreeNode, tag: str, bounds: DOMRect | None, **kwargs) -> EnhancedDOMTreeNode:
+		return self.node(parent, NodeType.ELEMENT_NODE, tag.upper(), bounds=bounds, **kwargs)
+
+	def text(self, parent: EnhancedDOMTreeNode, value: str, bounds: DOMRect | None) -> EnhancedDOMTreeNode:
+		return self.node(parent, NodeType.TEXT_NODE, '#text', bounds=bounds, node_value=value)
+
+	def document(self) -> tuple[EnhancedDOMTreeNode, EnhancedDOMTreeNode]:
+		"""Return (document, body)."""
+		document = self.node(None, NodeType.DOCUMENT_NODE, '#document')
+		html = self.element(document, 'html', DOMRect(0, 0, VIEWPORT_WIDTH, VIEWPORT_HEIGHT))
+		self.element(html, 'head', None)
+		body = self.element(html, 'body', DOMRect(0, 0, VIEWPORT_WIDTH, VIEWPORT_HEIGHT), opaque=True)
+		return document, body
+
+	def card(self, parent: EnhancedDOMTreeNode, y: float, index: int) -> float:
+		"""Add one feed card at `y`, returns its height."""
+		rng = self.rng
+		height = rng.uniform(150, 400)
+		card = self.element(
+			parent, 'div', DOMRect(240, y, 800, height), attributes={'class': f'card card-{index % 7}'}, opaque=True
+		)
+
+		header = self.element(card, 'a', DOMRect(256, y + 8, 400, 40), attributes={'href': f'/post/{index}'}, cursor='pointer')
+		self.element(header, 'img', DOMRect(256, y + 8, 40, 40), attributes={'alt': 'avatar', 'src': f'/a/{index}.png'})
+		self.text(header, f'Author {index}', DOMRect(304, y + 16, 200, 20))
+		# the button inside the link gets its own index, the span is filtered by the propagating <a> bounds
+		self.element(header, 'span', DOMRect(520, y + 16, 100, 20), cursor='pointer')
+
+		content = self.element(card, 'p', DOMRect(256, y + 56, 768, height - 120))
+		for line in range(rng.randint(1, 4)):
+			self.text(content, f'Post {index} line {line} ' + 'lorem ipsum ' * rng.randint(1, 8), DOMRect(256, y + 56 + line * 20, 700, 20))
+
+		actions = self.element(card, 'div', DOMRect(256, y + height - 56, 768, 40), attributes={'role': 'toolbar'})
+		for label in ('Like', 'Comment', 'Share'):
+			button = self.element(
+				actions, 'button', DOMRect(256 + len(label) * 40, y + height - 52, 80, 32), attributes={'aria-label': label}, cursor='pointer'
+			)
+			svg = self.element(button, 'svg', DOMRect(260, y + height - 48, 16, 16))
+			self.element(svg, 'path', DOMRect(260, y + height - 48, 16, 16))
+
+		if index % 5 == 0:
+			self.element(card, 'input', DOMRect(256, y + height - 12, 600, 10), attributes={'type': 'text', 'placeholder': 'Reply'})
+		if index % 11 == 0:
+			# web component with an open shadow root
+			host = self.element(card, 'my-widget', DOMRect(700, y + 8, 300, 40))
+			shadow_root = self.node(host, NodeType.DOCUMENT_FRAGMENT_NODE, '#document-fragment')
+			shadow_root.shadow_root_type = 'open'
+			self.element(shadow_root, 'button', DOMRect(710, y + 12, 80, 30), attributes={'id': f'w{index}'}, cursor='pointer')
+		if index % 17 == 0:
+			# hidden element that is only kept because of its aria attributes
+			self.element(card, 'div', None, attributes={'aria-hidden': 'true'})
+		if index % 23 == 0:
+			# same-origin iframe with its own document
+			iframe = self.element(card, 'iframe', DOMRect(256, y + 100, 400, 60), attributes={'src': '/embed'})
+			frame_document = self.node(None, NodeType.DOCUMENT_NODE, '#document')
+			frame_document.parent_node = iframe
+			iframe.content_document = frame_document
+			frame_html = self.element(frame_document, 'html', DOMRect(256, y + 100, 400, 60))
+			frame_body = self.element(frame_html, 'body', DOMRect(256, y + 100, 400, 60))
+			self.element(frame_body, 'a', DOMRect(260, y + 110, 100, 20), attributes={'href': '/embedded'}, cursor='pointer')
+
+		return height
+
+
+def generate_feed_page(num_nodes: int, seed: int = 42) -> EnhancedDOMTreeNode:
+	"""Build a feed page with roughly `num_nodes` enhanced nodes."""
+	builder = SyntheticPageBuilder(seed)
+	document, body = builder.document()
+	builder.element(body, 'nav', DOMRect(0, 0, VIEWPORT_WIDTH, 64), attributes={'role': 'navigation'}, opaque=True)
+	feed = builder.element(body, 'main', DOMRect(240, 80, 800, VIEWPORT_HEIGHT))
+
+	y = 80.0
+	index = 0
+	while builder.node_count < num_nodes:
+		y += builder.card(feed, y, index) + 16
+		index += 1
+
+	document.refresh_identity_hashes()
+	return document
+
+
+def generate_deep_page(depth: int, seed: int = 42) -> EnhancedDOMTreeNode:
+	"""Build a page with a chain of `depth` nested divs (deeper than the default recursion limit)."""
+	builder = SyntheticPageBuilder(seed)
+	document, body = builder.document()
+	parent = body
+	for level in range(depth):
+		parent = builder.element(parent, 'div', DOMRect(level % 100, level, 400, 20), attributes={'class': f'level-{level % 10}'})
+		if level % 50 == 0:
+			builder.element(parent, 'button', DOMRect(level % 100, level, 80, 20), cursor='pointer')
+	builder.text(parent, 'deepest text', DOMRect(0, depth, 100, 20))
+
+	document.refresh_identity_hashes()
+	return document
+
+
+def run_serializer(root: EnhancedDOMTreeNode, repeat: int) -> tuple[dict[str, float], int, int]:
+	"""Serialize `repeat` times, returns (median seconds per stage, interactive elements, llm representation length)."""
+	timings: dict[str, list[float]] = {}
+	selector_map_size = text_length = 0
+	for _ in range(repeat):
+		start = time.perf_counter()
+		serialized_dom_state, timing_info = DOMTreeSerializer(root).serialize_accessible_elements()
+		text_length = len(serialized_dom_state.llm_representation())
+		timing_info = {**timing_info, 'serialize_and_render_total': time.perf_counter() - start}
+		selector_map_size = len(serialized_dom_state.selector_map)
+		for stage, seconds in timing_info.items():
+			timings.setdefault(stage, []).append(seconds)
+
+	return {stage: statistics.median(values) for stage, values in timings.items()}, selector_map_size, text_length
+
+
+def print_timings(name: str, timings: dict[str, float], selector_map_size: int, text_length: int) -> None:
+	print(f'\n{name}: {selector_map_size} interactive elements, {text_length} chars')
+	for stage, seconds in timings.items():
+		print(f'  {stage:<40} {seconds * 1000:10.2f} ms')
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 50_000])
+	parser.add_argument('--depth', type=int, default=5_000, help='nesting depth of the deep page (0 to skip)')
+	parser.add_argument('--repeat', type=int, default=3)
+	args = parser.parse_args()
+
+	for size in args.sizes:
+		root = generate_feed_page(size)
+		print_timings(f'feed page, {size} nodes', *run_serializer(root, args.repeat))
+
+	if args.depth:
+		root = generate_deep_page(args.depth)
+		print_timings(f'deep page, depth {args.depth}', *run_serializer(root, args.repeat))
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,271 @@
+"""
+Recorded CDP page snapshots for running the DOM pipeline offline.
+
+A recording keeps the raw CDP responses that `DomService._get_all_trees` collects for every target of a page
+(`DOMSnapshot.captureSnapshot`, `DOM.getDocument`, the merged `Accessibility.getFullAXTree` nodes and the device
+pixel ratio), plus the target and frame info needed for cross-origin iframes. `ReplayBrowserSession` serves
+them back through the small part of the `BrowserSession` / CDP client API that `DomService` uses, so
+`get_dom_tree`, `get_serialized_dom_tree` and the serializers run exactly as they would against Chrome.
+
+File format (JSON, gzip-compressed if the file name ends with `.gz`):
+
+	{
+		"version": 1,
+		"url": "https://example.com/",
+		"title": "Example Domain",
+		"viewport": {"width": 1280, "height": 1100},
+		"main_target_id": "<target id>",
+		"targets": {
+			"<target id>": {"snapshot": {...}, "dom_tree": {...}, "ax_tree": {...}, "device_pixel_ratio": 1.0}
+		},
+		"target_infos": [...],  # Target.getTargets()['targetInfos']
+		"frames": {...}  # BrowserSession.get_all_frames()[0]
+	}
+"""
+
+import gzip
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any
+
+from cdp_use.cdp.accessibility.commands import GetFullAXTreeReturns
+from cdp_use.cdp.dom.commands import GetDocumentReturns
+from cdp_use.cdp.domsnapshot.commands import CaptureSnapshotReturns
+from cdp_use.cdp.target.types import TargetID, TargetInfo
+
+if TYPE_CHECKING:
+	from browser_use.browser.session import BrowserSession
+
+logger = logging.getLogger(__name__)
+
+RECORDING_FORMAT_VERSION = 1
+
+
+@dataclass
+class RecordedTarget:
+	"""Raw CDP responses of one target, as returned by `DomService._get_all_trees`."""
+
+	snapshot: CaptureSnapshotReturns
+	dom_tree: GetDocumentReturns
+	ax_tree: GetFullAXTreeReturns
+	device_pixel_ratio: float = 1.0
+
+
+@dataclass
+class RecordedPage:
+	"""A page recorded for offline replay, see the module docstring for the file format."""
+
+	url: str
+	main_target_id: TargetID
+	targets: dict[TargetID, RecordedTarget]
+	title: str = ''
+	viewport: dict[str, int] = field(default_factory=lambda: {'width': 1280, 'height': 1100})
+	target_infos: list[TargetInfo] = field(default_factory=list)
+	frames: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+	@property
+	def total_nodes(self) -> int:
+		"""Number of snapshot nodes over all targets and documents."""
+		return sum(
+			len(document['nodes'].get('backendNodeId', []))
+			for target in self.targets.values()
+			for document in target.snapshot['documents']
+		)
+
+	def to_dict(self) -> dict[str, Any]:
+		return {
+			'version': RECORDING_FORMAT_VERSION,
+			'url': self.url,
+			'title': self.title,
+			'viewport': self.viewport,
+			'main_target_id': self.main_target_id,
+			'targets': {
+				target_id: {
+					'snapshot': target.snapshot,
+					'dom_tree': target.dom_tree,
+					'ax_tree': target.ax_tree,
+					'device_pixel_ratio': target.device_pixel_ratio,
+				}
+				for target_id, target in self.targets.items()
+			},
+			'target_infos': self.target_infos,
+			'frames': self.frames,
+		}
+
+	@classmethod
+	def from_dict(cls, data: dict[str, Any]) -> 'RecordedPage':
+		version = data.get('version')
+		if version != RECORDING_FORMAT_VERSION:
+			raise ValueError(f'Unsupported page recording version {version!r} (expected {RECORDING_FORMAT_VERSION})')
+
+		return cls(
+			url=data['url'],
+			title=data.get('title', ''),
+			viewport=data.get('viewport') or {'width': 1280, 'height': 1100},
+			main_target_id=data['main_target_id'],
+			targets={target_id: RecordedTarget(**target) for target_id, target in data['targets'].items()},
+			target_infos=data.get('target_infos', []),
+			frames=data.get('frames', {}),
+		)
+
+	def save(self, path: str | Path) -> Path:
+		path = Path(path)
+		path.parent.mkdir(parents=True, exist_ok=True)
+		payload = json.dumps(self.to_dict(), separators=(',', ':')).encode()
+		path.write_bytes(gzip.compress(payload) if path.suffix == '.gz' else payload)
+		return path
+
+	@classmethod
+	def load(cls, path: str | Path) -> 'RecordedPage':
+		path = Path(path)
+		payload = path.read_bytes()
+		if path.suffix == '.gz':
+			payload = gzip.decompress(payload)
+		return cls.from_dict(json.loads(payload))
+
+
+async def record_page(
+	browser_session: 'BrowserSession', target_id: TargetID | None = None, cross_origin_iframes: bool = True
+) -> RecordedPage:
+	"""Record the CDP responses the DOM pipeline needs for the current (or given) page of a live browser session."""
+	from browser_use.dom.service import DomService
+
+	dom_service = DomService(browser_session)
+	target_id = target_id or browser_session.current_target_id
+	assert target_id is not None, 'No target to record'
+
+	target_infos = (await browser_session.cdp_client.send.Target.getTargets())['targetInfos']
+	frames, _ = await browser_session.get_all_frames()
+
+	target_ids = [target_id]
+	if cross_origin_iframes:
+		known_targets = {target_info['targetId'] for target_info in target_infos}
+		for frame_info in frames.values():
+			frame_target_id = frame_info.get('frameTargetId')
+			if frame_info.get('isCrossOrigin') and frame_target_id in known_targets and frame_target_id not in target_ids:
+				target_ids.append(frame_target_id)
+
+	targets: dict[TargetID, RecordedTarget] = {}
+	for recorded_target_id in target_ids:
+		trees = await dom_service._get_all_trees(recorded_target_id)
+		targets[recorded_target_id] = RecordedTarget(
+			snapshot=trees.snapshot,
+			dom_tree=trees.dom_tree,
+			ax_tree=trees.ax_tree,
+			device_pixel_ratio=trees.device_pixel_ratio,
+		)
+
+	main_target_info = next((t for t in target_infos if t['targetId'] == target_id), None)
+	return RecordedPage(
+		url=main_target_info['url'] if main_target_info else '',
+		title=main_target_info['title'] if main_target_info else '',
+		main_target_id=target_id,
+		targets=targets,
+		target_infos=[t for t in target_infos if t['targetId'] in targets],
+		frames=frames,
+	)
+
+
+class _NoopEventRegistry:
+	"""Accepts CDP event handler registrations (recordings never emit events)."""
+
+	def __getattr__(self, method: str):
+		def register(handler: Any) -> None:
+			pass
+
+		return register
+
+
+class ReplayCDPClient:
+	"""Answers the CDP commands `DomService` sends from a `RecordedPage`."""
+
+	def __init__(self, page: RecordedPage):
+		self.page = page
+		self.send = SimpleNamespace(
+			Accessibility=SimpleNamespace(getFullAXTree=self._get_full_ax_tree),
+			DOM=SimpleNamespace(getDocument=self._get_document, enable=self._noop),
+			DOMSnapshot=SimpleNamespace(captureSnapshot=self._capture_snapshot),
+			Page=SimpleNamespace(getFrameTree=self._get_frame_tree, getLayoutMetrics=self._get_layout_metrics),
+			Runtime=SimpleNamespace(evaluate=self._evaluate),
+			Target=SimpleNamespace(getTargets=self._get_targets),
+		)
+		self.register = SimpleNamespace(DOM=_NoopEventRegistry())
+
+	def _target(self, session_id: str | None) -> RecordedTarget:
+		target_id = ReplayBrowserSession.target_id_for_session(session_id) if session_id else self.page.main_target_id
+		return self.page.targets[target_id]
+
+	async def _noop(self, params: Any = None, session_id: str | None = None) -> dict[str, Any]:
+		return {}
+
+	async def _capture_snapshot(self, params: Any = None, session_id: str | None = None) -> CaptureSnapshotReturns:
+		# shallow copy: DomService replaces (truncates) the documents list of the response
+		return dict(self._target(session_id).snapshot)  # type: ignore[return-value]
+
+	async def _get_document(self, params: Any = None, session_id: str | None = None) -> GetDocumentReturns:
+		return self._target(session_id).dom_tree
+
+	async def _get_full_ax_tree(self, params: Any = None, session_id: str | None = None) -> GetFullAXTreeReturns:
+		# the recording holds the AX nodes of all frames merged, served once for the single replayed frame
+		return self._target(session_id).ax_tree
+
+	async def _get_frame_tree(self, params: Any = None, session_id: str | None = None) -> dict[str, Any]:
+		return {'frameTree': {'frame': {'id': f'replay-frame-{session_id}'}}}
+
+	async def _get_layout_metrics(self, params: Any = None, session_id: str | None = None) -> dict[str, Any]:
+		width = self.page.viewport['width']
+		height = self.page.viewport['height']
+		device_pixel_ratio = self._target(session_id).device_pixel_ratio
+		return {
+			'visualViewport': {'clientWidth': width * device_pixel_ratio, 'clientHeight': height * device_pixel_ratio},
+			'cssVisualViewport': {'clientWidth': width, 'clientHeight': height},
+			'cssLayoutViewport': {'clientWidth': width, 'clientHeight': height},
+		}
+
+	async def _evaluate(self, params: Any = None, session_id: str | None = None) -> dict[str, Any]:
+		# readyState / iframe scroll position probes: nothing to report for a recording
+		return {'result': {'value': {}}}
+
+	async def _get_targets(self, params: Any = None, session_id: str | None = None) -> dict[str, Any]:
+		return {'targetInfos': self.page.target_infos}
+
+
+class ReplayBrowserSession:
+	"""Stand-in for `BrowserSession` that replays a `RecordedPage`, for `DomService` and the markdown extractor.
+
+	Only implements what the DOM pipeline touches: the CDP client, CDP sessions per target, frames and the current URL.
+	"""
+
+	def __init__(self, page: RecordedPage, logger: logging.Logger | None = None):
+		self.page = page
+		self.logger = logger or logging.getLogger(__name__)
+		self.cdp_client = ReplayCDPClient(page)
+		self.current_target_id: TargetID = page.main_target_id
+		self.agent_focus = self._session(page.main_target_id)
+		self._cached_browser_state_summary = None
+
+	@staticmethod
+	def session_id_for_target(target_id: TargetID) -> str:
+		return f'replay-{target_id}'
+
+	@staticmethod
+	def target_id_for_session(session_id: str) -> TargetID:
+		return session_id.removeprefix('replay-')
+
+	def _session(self, target_id: TargetID) -> SimpleNamespace:
+		return SimpleNamespace(target_id=target_id, session_id=self.session_id_for_target(target_id), cdp_client=self.cdp_client)
+
+	async def get_or_create_cdp_session(self, target_id: TargetID | None = None, focus: bool = True) -> SimpleNamespace:
+		target_id = target_id or self.current_target_id
+		if target_id not in self.page.targets:
+			raise ValueError(f'Target {target_id} is not part of the recording')
+		return self._session(target_id)
+
+	async def get_all_frames(self) -> tuple[dict[str, dict[str, Any]], dict[str, str]]:
+		return self.page.frames, {}
+
+	async def get_current_page_url(self) -> str:
+		return self.page.url
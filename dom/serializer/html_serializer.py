@@ -1,7 +1,32 @@
 # @file purpose: Serializes enhanced DOM trees to HTML format including shadow roots
 
+from collections.abc import Iterator
+
 from browser_use.dom.views import EnhancedDOMTreeNode, NodeType
 
+# Elements that never contain content
+SKIPPED_ELEMENTS = {'style', 'script', 'head', 'meta', 'link', 'title'}
+
+VOID_ELEMENTS = {
+	'area',
+	'base',
+	'br',
+	'col',
+	'embed',
+	'hr',
+	'img',
+	'input',
+	'link',
+	'meta',
+	'param',
+	'source',
+	'track',
+	'wbr',
+}
+
+# Elements that serialize_chunks keeps in one fragment, their markdown depends on the whole element
+ATOMIC_CHUNK_TAGS = {'table', 'ol', 'ul', 'dl', 'pre'}
+
 
 class HTMLSerializer:
 	"""Serializes enhanced DOM trees back to HTML format.
@@ -66,58 +91,14 @@ class HTMLSerializer:
 			parts = []
 			tag_name = node.tag_name.lower()
 
-			# Skip non-content elements
-			if tag_name in {'style', 'script', 'head', 'meta', 'link', 'title'}:
+			if self._should_skip_element(node, tag_name):
 				return ''
 
-			# Skip code tags with display:none - these often contain JSON state for SPAs
-			if tag_name == 'code' and node.attributes:
-				style = node.attributes.get('style', '')
-				# Check if element is hidden (display:none) - likely JSON data
-				if 'display:none' in style.replace(' ', '') or 'display: none' in style:
-					return ''
-				# Also check for bpr-guid IDs (LinkedIn's JSON data pattern)
-				element_id = node.attributes.get('id', '')
-				if 'bpr-guid' in element_id or 'data' in element_id or 'state' in element_id:
-					return ''
-
-			# Skip base64 inline images - these are usually placeholders or tracking pixels
-			if tag_name == 'img' and node.attributes:
-				src = node.attributes.get('src', '')
-				if src.startswith('data:image/'):
-					return ''
-
-			# Opening tag
-			parts.append(f'<{tag_name}')
-
-			# Add attributes
-			if node.attributes:
-				attrs = self._serialize_attributes(node.attributes)
-				if attrs:
-					parts.append(' ' + attrs)
-
-			# Handle void elements (self-closing)
-			void_elements = {
-				'area',
-				'base',
-				'br',
-				'col',
-				'embed',
-				'hr',
-				'img',
-				'input',
-				'link',
-				'meta',
-				'param',
-				'source',
-				'track',
-				'wbr',
-			}
-			if tag_name in void_elements:
-				parts.append(' />')
-				return ''.join(parts)
-
-			parts.append('>')
+			# Opening tag, void elements (self-closing) have no content
+			if tag_name in VOID_ELEMENTS:
+				return self._opening_tag(node, tag_name, self_closing=True)
+
+			parts.append(self._opening_tag(node, tag_name))
 
 			# Handle iframe content document
 			if tag_name in {'iframe', 'frame'} and node.content_document:
@@ -159,6 +140,141 @@ class HTMLSerializer:
 			# Unknown node type - skip
 			return ''
 
+	def _should_skip_element(self, node: EnhancedDOMTreeNode, tag_name: str) -> bool:
+		"""Whether an element (and its subtree) is left out of the HTML."""
+		# Skip non-content elements
+		if tag_name in SKIPPED_ELEMENTS:
+			return True
+
+		# Skip code tags with display:none - these often contain JSON state for SPAs
+		if tag_name == 'code' and node.attributes:
+			style = node.attributes.get('style', '')
+			# Check if element is hidden (display:none) - likely JSON data
+			if 'display:none' in style.replace(' ', '') or 'display: none' in style:
+				return True
+			# Also check for bpr-guid IDs (LinkedIn's JSON data pattern)
+			element_id = node.attributes.get('id', '')
+			if 'bpr-guid' in element_id or 'data' in element_id or 'state' in element_id:
+				return True
+
+		# Skip base64 inline images - these are usually placeholders or tracking pixels
+		if tag_name == 'img' and node.attributes:
+			src = node.attributes.get('src', '')
+			if src.startswith('data:image/'):
+				return True
+
+		return False
+
+	def _opening_tag(self, node: EnhancedDOMTreeNode, tag_name: str, self_closing: bool = False) -> str:
+		"""Opening tag of an element including its serialized attributes."""
+		attrs = self._serialize_attributes(node.attributes) if node.attributes else ''
+		return f'<{tag_name}{" " + attrs if attrs else ""}{" />" if self_closing else ">"}'
+
+	def _content_children(self, node: EnhancedDOMTreeNode) -> list[EnhancedDOMTreeNode]:
+		"""Nodes serialized inside `node`, in the same order as `serialize` visits them."""
+		if node.node_type == NodeType.DOCUMENT_NODE:
+			return node.children_and_shadow_roots
+		if node.node_type == NodeType.DOCUMENT_FRAGMENT_NODE:
+			return node.children
+		if node.node_type != NodeType.ELEMENT_NODE:
+			return []
+
+		tag_name = node.tag_name.lower()
+		if tag_name in VOID_ELEMENTS or self._should_skip_element(node, tag_name):
+			return []
+		if tag_name in {'iframe', 'frame'} and node.content_document:
+			return node.content_document.children_nodes or []
+		return (node.shadow_roots or []) + node.children
+
+	def _estimate_sizes(self, root: EnhancedDOMTreeNode) -> dict[int, int]:
+		"""Approximate serialized length of every subtree (by node id()), without building any HTML."""
+		sizes: dict[int, int] = {}
+		stack: list[tuple[EnhancedDOMTreeNode, bool]] = [(root, False)]
+		while stack:
+			node, children_done = stack.pop()
+			if not children_done:
+				stack.append((node, True))
+				stack.extend((child, False) for child in self._content_children(node))
+				continue
+
+			size = sum(sizes[id(child)] for child in self._content_children(node))
+			if node.node_type == NodeType.TEXT_NODE:
+				size = len(node.node_value or '')
+			elif node.node_type == NodeType.ELEMENT_NODE:
+				tag_name = node.tag_name.lower()
+				if not self._should_skip_element(node, tag_name):
+					attributes_size = sum(len(key) + len(value or '') + 4 for key, value in (node.attributes or {}).items())
+					size += 2 * len(tag_name) + 5 + attributes_size
+			elif node.node_type == NodeType.DOCUMENT_FRAGMENT_NODE:
+				size += 40
+			sizes[id(node)] = size
+		return sizes
+
+	def fingerprint(self, root: EnhancedDOMTreeNode) -> int:
+		"""Cheap hash of everything `serialize` reads from the tree: structure, tags, attributes and text.
+
+		Two trees with the same fingerprint serialize to the same HTML (barring hash collisions), so it can key caches
+		of serialized content. Only valid within one process (uses the builtin `hash`).
+		"""
+		fingerprint = 0
+		stack: list[tuple[EnhancedDOMTreeNode, int]] = [(root, 0)]
+		while stack:
+			node, depth = stack.pop()
+			attributes = tuple(node.attributes.items()) if node.attributes else None
+			fingerprint = hash((fingerprint, depth, node.node_type, node.node_name, node.node_value, node.shadow_root_type, attributes))
+			stack.extend((child, depth + 1) for child in reversed(self._content_children(node)))
+		return fingerprint
+
+	def serialize_chunks(self, node: EnhancedDOMTreeNode, max_chars: int = 30000) -> Iterator[str]:
+		"""Serialize the tree as a stream of self-contained HTML fragments of up to about `max_chars` each.
+
+		Consecutive siblings are batched into one fragment. A subtree that is too large is split between its
+		children, and every fragment taken from inside it is wrapped in the opening and closing tags of its
+		ancestors. Tables, lists and preformatted blocks are never split (they can exceed `max_chars`): a split
+		table would lose its header row and a split ordered list its numbering once converted to markdown.
+		The fragments hold the text of `serialize`, without ever holding the HTML of the whole page in memory.
+		"""
+		sizes = self._estimate_sizes(node)
+		yield from self._serialize_chunks(node, max_chars, sizes, '', '')
+
+	def _serialize_chunks(
+		self, node: EnhancedDOMTreeNode, max_chars: int, sizes: dict[int, int], prefix: str, suffix: str
+	) -> Iterator[str]:
+		if (
+			sizes[id(node)] <= max_chars
+			or not self._content_children(node)
+			or (node.node_type == NodeType.ELEMENT_NODE and node.tag_name.lower() in ATOMIC_CHUNK_TAGS)
+		):
+			html = self.serialize(node)
+			if html:
+				yield prefix + html + suffix
+			return
+
+		if node.node_type == NodeType.ELEMENT_NODE:
+			tag_name = node.tag_name.lower()
+			prefix += self._opening_tag(node, tag_name)
+			suffix = f'</{tag_name}>' + suffix
+
+		batch: list[str] = []
+		batch_size = 0
+		for child in self._content_children(node):
+			child_size = sizes[id(child)]
+			if batch and batch_size + child_size > max_chars:
+				yield prefix + ''.join(batch) + suffix
+				batch, batch_size = [], 0
+
+			if child_size > max_chars:
+				yield from self._serialize_chunks(child, max_chars, sizes, prefix, suffix)
+				continue
+
+			child_html = self.serialize(child)
+			if child_html:
+				batch.append(child_html)
+				batch_size += child_size
+
+		if batch:
+			yield prefix + ''.join(batch) + suffix
+
 	def _serialize_attributes(self, attributes: dict[str, str]) -> str:
 		"""Serialize element attributes to HTML attribute string.
 
@@ -1,3 +1,4 @@
+import math
 from collections import defaultdict
 from dataclasses import dataclass
 
@@ -128,18 +129,139 @@ class RectUnionPure:
 		return True
 
 
+class RectUnionGrid(RectUnionPure):
+	"""
+	Same disjoint rectangle union as `RectUnionPure`, backed by a uniform grid spatial index.
+
+	Every stored rectangle is registered in the grid cells its closed box touches, so `contains` and `add`
+	only split against rectangles near the query instead of scanning the whole union. Splits only copy
+	existing coordinates, so the covered area (and every `contains` answer) is exactly the one of `RectUnionPure`.
+	Rectangles spanning too many cells (page-sized backgrounds) or with non-finite coordinates are kept in
+	a small list that every query checks.
+	"""
+
+	__slots__ = ('cell_size', 'max_cells_per_rect', '_cells', '_global_ids')
+
+	def __init__(self, cell_size: float = 256.0, max_cells_per_rect: int = 1024):
+		super().__init__()
+		self.cell_size = cell_size
+		self.max_cells_per_rect = max_cells_per_rect
+		self._cells: dict[tuple[int, int], list[int]] = defaultdict(list)
+		self._global_ids: list[int] = []
+
+	def _cell_range(self, r: Rect) -> tuple[int, int, int, int] | None:
+		"""Inclusive cell index range touched by the closed box of r, None if r can't be indexed."""
+		if not (math.isfinite(r.x1) and math.isfinite(r.y1) and math.isfinite(r.x2) and math.isfinite(r.y2)):
+			return None
+		cx1 = math.floor(r.x1 / self.cell_size)
+		cy1 = math.floor(r.y1 / self.cell_size)
+		cx2 = math.floor(r.x2 / self.cell_size)
+		cy2 = math.floor(r.y2 / self.cell_size)
+		if cx2 < cx1 or cy2 < cy1:
+			return None
+		return cx1, cy1, cx2, cy2
+
+	def _candidate_ids(self, r: Rect) -> list[int] | range:
+		"""Ids of stored rectangles that may touch r, ascending (= insertion order)."""
+		cell_range = self._cell_range(r)
+		if cell_range is None or (cell_range[2] - cell_range[0] + 1) * (cell_range[3] - cell_range[1] + 1) > len(self._rects):
+			# cheaper (or only possible) to look at everything
+			return range(len(self._rects))
+
+		cx1, cy1, cx2, cy2 = cell_range
+		ids = set(self._global_ids)
+		cells = self._cells
+		for cx in range(cx1, cx2 + 1):
+			for cy in range(cy1, cy2 + 1):
+				cell = cells.get((cx, cy))
+				if cell:
+					ids.update(cell)
+		return sorted(ids)
+
+	def _index(self, rect_id: int, r: Rect) -> None:
+		cell_range = self._cell_range(r)
+		if cell_range is None:
+			self._global_ids.append(rect_id)
+			return
+
+		cx1, cy1, cx2, cy2 = cell_range
+		if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > self.max_cells_per_rect:
+			self._global_ids.append(rect_id)
+			return
+
+		for cx in range(cx1, cx2 + 1):
+			for cy in range(cy1, cy2 + 1):
+				self._cells[(cx, cy)].append(rect_id)
+
+	def _uncovered_pieces(self, r: Rect, stop_at_first: bool) -> list[Rect]:
+		"""
+		Return the parts of r that are not covered by the union (only the first one if stop_at_first).
+
+		Each piece is split by the first stored rectangle (in insertion order) that touches it, and its
+		sub-pieces only look at later rectangles - the same splits `RectUnionPure` does rectangle by
+		rectangle, but depth-first, so an uncovered piece ends the search immediately.
+		"""
+		# Everything a sub-piece can touch also touches r, so the index is queried once per call
+		rects = self._rects
+		candidates = [rects[rect_id] for rect_id in self._candidate_ids(r)]
+		uncovered: list[Rect] = []
+		stack: list[tuple[Rect, int]] = [(r, 0)]
+
+		while stack:
+			piece, start = stack.pop()
+
+			hit: Rect | None = None
+			hit_pos = start
+			for hit_pos in range(start, len(candidates)):
+				s = candidates[hit_pos]
+				# like RectUnionPure, only `contains` drops zero-area pieces lying on a border, `add` keeps them
+				if (stop_at_first and s.contains(piece)) or piece.intersects(s):
+					hit = s
+					break
+
+			if hit is None:
+				uncovered.append(piece)
+				if stop_at_first:
+					break
+			elif not (stop_at_first and hit.contains(piece)):
+				# reversed, so pieces come out in the same order RectUnionPure stores them
+				stack.extend((sub_piece, hit_pos + 1) for sub_piece in reversed(self._split_diff(piece, hit)))
+
+		return uncovered
+
+	# -----------------------------------------------------------------
+	def contains(self, r: Rect) -> bool:
+		if not self._rects:
+			return False
+		return not self._uncovered_pieces(r, stop_at_first=True)
+
+	# -----------------------------------------------------------------
+	def add(self, r: Rect) -> bool:
+		if self.contains(r):
+			return False
+
+		for piece in self._uncovered_pieces(r, stop_at_first=False):
+			self._index(len(self._rects), piece)
+			self._rects.append(piece)
+		return True
+
+
 class PaintOrderRemover:
 	"""
 	Calculates which elements should be removed based on the paint order parameter.
 	"""
 
-	def __init__(self, root: SimplifiedNode):
+	def __init__(self, root: SimplifiedNode, rect_union_factory: type[RectUnionPure] = RectUnionGrid):
 		self.root = root
+		self.rect_union_factory = rect_union_factory
 
 	def calculate_paint_order(self) -> None:
 		all_simplified_nodes_with_paint_order: list[SimplifiedNode] = []
 
-		def collect_paint_order(node: SimplifiedNode) -> None:
+		# pre-order traversal with an explicit stack (deeply nested pages would hit the recursion limit)
+		stack = [self.root]
+		while stack:
+			node = stack.pop()
 			if (
 				node.original_node.snapshot_node
 				and node.original_node.snapshot_node.paint_order is not None
@@ -147,10 +269,7 @@ class PaintOrderRemover:
 			):
 				all_simplified_nodes_with_paint_order.append(node)
 
-			for child in node.children:
-				collect_paint_order(child)
-
-		collect_paint_order(self.root)
+			stack.extend(reversed(node.children))
 
 		grouped_by_paint_order: defaultdict[int, list[SimplifiedNode]] = defaultdict(list)
 
@@ -158,9 +277,10 @@ class PaintOrderRemover:
 			if node.original_node.snapshot_node and node.original_node.snapshot_node.paint_order is not None:
 				grouped_by_paint_order[node.original_node.snapshot_node.paint_order].append(node)
 
-		rect_union = RectUnionPure()
+		rect_union = self.rect_union_factory()
 
-		for paint_order, nodes in sorted(grouped_by_paint_order.items(), key=lambda x: -x[0]):
+		sorted_groups = sorted(grouped_by_paint_order.items(), key=lambda x: -x[0])
+		for group_index, (paint_order, nodes) in enumerate(sorted_groups):
 			rects_to_add = []
 
 			for node in nodes:
@@ -191,6 +311,10 @@ class PaintOrderRemover:
 
 				rects_to_add.append(rect)
 
+			# Nothing is painted below the last group, so growing the union for it (usually the page background) is wasted work
+			if group_index == len(sorted_groups) - 1:
+				break
+
 			for rect in rects_to_add:
 				rect_union.add(rect)
 
@@ -1,5 +1,10 @@
 # @file purpose: Serializes enhanced DOM trees to string format for LLM consumption
 
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from typing import Any
 
 from browser_use.dom.serializer.clickable_elements import ClickableElementDetector
@@ -11,6 +16,7 @@ from browser_use.dom.views import (
 	EnhancedDOMTreeNode,
 	NodeType,
 	PropagatingBounds,
+	SelectorMapDiff,
 	SerializedDOMState,
 	SimplifiedNode,
 )
@@ -38,6 +44,28 @@ SVG_ELEMENTS = {
 }
 
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class _SimplifyFrame:
+	"""Pending node of the stack-based `_create_simplified_tree` traversal."""
+
+	node: EnhancedDOMTreeNode
+	kind: str
+	"""'document', 'fragment', 'frame' or 'element', decides how the children results are combined"""
+	children: list[EnhancedDOMTreeNode] = field(default_factory=list)
+	next_child: int = 0
+	simplified: SimplifiedNode | None = None
+	"""Node under construction (for documents: the first simplified child)"""
+	has_meaningful_child: bool = False
+
+	# element nodes only
+	is_visible: Any = None
+	is_scrollable: Any = None
+	is_shadow_host: bool = False
+
+
 class DOMTreeSerializer:
 	"""Serializes enhanced DOM trees to string format."""
 
@@ -56,6 +84,14 @@ class DOMTreeSerializer:
 	]
 	DEFAULT_CONTAINMENT_THRESHOLD = 0.99  # 99% containment by default
 
+	# Stages slower than this (in seconds) are logged, to spot pathological pages
+	STAGE_TIME_BUDGETS = {
+		'create_simplified_tree': 0.5,
+		'calculate_paint_order': 0.5,
+		'optimize_filter_and_assign_indices': 0.25,
+		'selector_map_diff': 0.05,
+	}
+
 	def __init__(
 		self,
 		root_node: EnhancedDOMTreeNode,
@@ -68,6 +104,9 @@ class DOMTreeSerializer:
 		self._interactive_counter = 1
 		self._selector_map: DOMSelectorMap = {}
 		self._previous_cached_selector_map = previous_cached_state.selector_map if previous_cached_state else None
+		self._previous_backend_node_ids: set[int] = set()
+		# id() of simplified nodes that survive tree optimization, marked bottom-up while the tree is created
+		self._meaningful_nodes: set[int] = set()
 		# Add timing tracking
 		self.timing_info: dict[str, float] = {}
 		# Cache for clickable element detection to avoid redundant calls
@@ -95,8 +134,16 @@ class DOMTreeSerializer:
 			return None
 
 	def serialize_accessible_elements(self) -> tuple[SerializedDOMState, dict[str, float]]:
-		import time
+		"""Run the serialization pipeline.
 
+		Every stage is a stack-based traversal (no recursion, so deeply nested pages don't hit the recursion limit):
+
+		1. `_create_simplified_tree`: build the simplified tree and mark the nodes that tree optimization keeps
+		2. `PaintOrderRemover`: mark elements hidden below others (needs the complete, unoptimized tree)
+		3. `_optimize_filter_and_assign_indices`: drop the unmarked nodes, apply bounding box filtering and
+		   assign interactive indices in one pre-order pass over the kept nodes
+		4. `SelectorMapDiff.compute`: diff against the previous selector map
+		"""
 		start_total = time.time()
 
 		# Reset state
@@ -104,45 +151,49 @@ class DOMTreeSerializer:
 		self._selector_map = {}
 		self._semantic_groups = []
 		self._clickable_cache = {}  # Clear cache for new serialization
+		self._meaningful_nodes = set()
+		if self._previous_cached_selector_map:
+			self._previous_backend_node_ids = {node.backend_node_id for node in self._previous_cached_selector_map.values()}
 
-		# Step 1: Create simplified tree (includes clickable element detection)
-		start_step1 = time.time()
-		simplified_tree = self._create_simplified_tree(self.root_node)
-		end_step1 = time.time()
-		self.timing_info['create_simplified_tree'] = end_step1 - start_step1
+		# Step 1: Create simplified tree (also marks the nodes tree optimization keeps)
+		with self._time_stage('create_simplified_tree'):
+			simplified_tree = self._create_simplified_tree(self.root_node)
 
 		# Step 2: Remove elements based on paint order
-		start_step3 = time.time()
-		if self.paint_order_filtering and simplified_tree:
-			PaintOrderRemover(simplified_tree).calculate_paint_order()
-		end_step3 = time.time()
-		self.timing_info['calculate_paint_order'] = end_step3 - start_step3
-
-		# Step 3: Optimize tree (remove unnecessary parents)
-		start_step2 = time.time()
-		optimized_tree = self._optimize_tree(simplified_tree)
-		end_step2 = time.time()
-		self.timing_info['optimize_tree'] = end_step2 - start_step2
-
-		# Step 3: Apply bounding box filtering (NEW)
-		if self.enable_bbox_filtering and optimized_tree:
-			start_step3 = time.time()
-			filtered_tree = self._apply_bounding_box_filtering(optimized_tree)
-			end_step3 = time.time()
-			self.timing_info['bbox_filtering'] = end_step3 - start_step3
-		else:
-			filtered_tree = optimized_tree
-
-		# Step 4: Assign interactive indices to clickable elements
-		start_step4 = time.time()
-		self._assign_interactive_indices_and_mark_new_nodes(filtered_tree)
-		end_step4 = time.time()
-		self.timing_info['assign_interactive_indices'] = end_step4 - start_step4
+		with self._time_stage('calculate_paint_order'):
+			if self.paint_order_filtering and simplified_tree:
+				PaintOrderRemover(simplified_tree).calculate_paint_order()
+
+		# Step 3: Optimize tree, apply bounding box filtering and assign interactive indices
+		with self._time_stage('optimize_filter_and_assign_indices'):
+			filtered_tree = self._optimize_filter_and_assign_indices(simplified_tree)
+
+		# Step 4: Diff against the previous selector map (reused by the agent instead of re-hashing elements)
+		selector_map_diff = None
+		if self._previous_cached_selector_map is not None:
+			with self._time_stage('selector_map_diff'):
+				selector_map_diff = SelectorMapDiff.compute(self._previous_cached_selector_map, self._selector_map)
 
 		end_total = time.time()
 		self.timing_info['serialize_accessible_elements_total'] = end_total - start_total
 
-		return SerializedDOMState(_root=filtered_tree, selector_map=self._selector_map), self.timing_info
+		return (
+			SerializedDOMState(_root=filtered_tree, selector_map=self._selector_map, selector_map_diff=selector_map_diff),
+			self.timing_info,
+		)
+
+	@contextmanager
+	def _time_stage(self, stage: str) -> Iterator[None]:
+		"""Record the duration of a pipeline stage in `timing_info` and log it if it exceeds its budget."""
+		start = time.time()
+		try:
+			yield
+		finally:
+			elapsed = time.time() - start
+			self.timing_info[stage] = elapsed
+			budget = self.STAGE_TIME_BUDGETS.get(stage)
+			if budget is not None and elapsed > budget:
+				logger.debug(f'DOM serialization stage {stage} took {elapsed:.3f}s (budget {budget:.3f}s)')
 
 	def _add_compound_components(self, simplified: SimplifiedNode, node: EnhancedDOMTreeNode) -> None:
 		"""Enhance compound controls with information from their child components."""
@@ -427,8 +478,6 @@ class DOMTreeSerializer:
 	def _is_interactive_cached(self, node: EnhancedDOMTreeNode) -> bool:
 		"""Cached version of clickable element detection to avoid redundant calls."""
 		if node.node_id not in self._clickable_cache:
-			import time
-
 			start_time = time.time()
 			result = ClickableElementDetector.is_interactive(node)
 			end_time = time.time()
@@ -441,29 +490,69 @@ class DOMTreeSerializer:
 
 		return self._clickable_cache[node.node_id]
 
-	def _create_simplified_tree(self, node: EnhancedDOMTreeNode, depth: int = 0) -> SimplifiedNode | None:
-		"""Step 1: Create a simplified tree with enhanced element detection."""
+	def _create_simplified_tree(self, node: EnhancedDOMTreeNode) -> SimplifiedNode | None:
+		"""Step 1: Create a simplified tree with enhanced element detection.
 
+		Post-order traversal with an explicit stack: `_enter_simplified_node` decides whether a node needs its
+		children, the children results are collected on its frame and `_exit_simplified_node` builds the result.
+		Nodes that tree optimization keeps are marked on the way up (see `_mark_if_meaningful`).
+		"""
+		entered = self._enter_simplified_node(node)
+		if not isinstance(entered, _SimplifyFrame):
+			if entered is not None:
+				self._mark_if_meaningful(entered, has_meaningful_child=False)
+			return entered
+
+		stack = [entered]
+		while True:
+			frame = stack[-1]
+			if frame.next_child < len(frame.children):
+				child = frame.children[frame.next_child]
+				frame.next_child += 1
+				entered = self._enter_simplified_node(child)
+				if isinstance(entered, _SimplifyFrame):
+					stack.append(entered)
+					continue
+				result = entered
+				if result is not None:
+					self._mark_if_meaningful(result, has_meaningful_child=False)
+			else:
+				stack.pop()
+				result = self._exit_simplified_node(frame)
+				if result is not None and frame.kind != 'document':
+					self._mark_if_meaningful(result, frame.has_meaningful_child)
+				if not stack:
+					return result
+				frame = stack[-1]
+
+			# hand the child result to its parent frame
+			if result is None:
+				continue
+			if frame.kind == 'document':
+				# documents only keep their first simplified child
+				frame.simplified = result
+				frame.next_child = len(frame.children)
+			else:
+				assert frame.simplified is not None
+				frame.simplified.children.append(result)
+				if id(result) in self._meaningful_nodes:
+					frame.has_meaningful_child = True
+
+	def _enter_simplified_node(self, node: EnhancedDOMTreeNode) -> _SimplifyFrame | SimplifiedNode | None:
+		"""Return a frame if the node needs its children processed, otherwise the final result for the node."""
 		if node.node_type == NodeType.DOCUMENT_NODE:
 			# for all cldren including shadow roots
-			for child in node.children_and_shadow_roots:
-				simplified_child = self._create_simplified_tree(child, depth + 1)
-				if simplified_child:
-					return simplified_child
-
-			return None
+			return _SimplifyFrame(node=node, kind='document', children=node.children_and_shadow_roots)
 
 		if node.node_type == NodeType.DOCUMENT_FRAGMENT_NODE:
 			# ENHANCED shadow DOM processing - always include shadow content
-			simplified = SimplifiedNode(original_node=node, children=[])
-			for child in node.children_and_shadow_roots:
-				simplified_child = self._create_simplified_tree(child, depth + 1)
-				if simplified_child:
-					simplified.children.append(simplified_child)
-
-			# Always return shadow DOM fragments, even if children seem empty
-			# Shadow DOM often contains the actual interactive content in SPAs
-			return simplified if simplified.children else SimplifiedNode(original_node=node, children=[])
+			# (always returned, even if children seem empty - shadow DOM often contains the actual interactive content in SPAs)
+			return _SimplifyFrame(
+				node=node,
+				kind='fragment',
+				children=node.children_and_shadow_roots,
+				simplified=SimplifiedNode(original_node=node, children=[]),
+			)
 
 		elif node.node_type == NodeType.ELEMENT_NODE:
 			# Skip non-content elements
@@ -476,19 +565,20 @@ class DOMTreeSerializer:
 
 			if node.node_name == 'IFRAME' or node.node_name == 'FRAME':
 				if node.content_document:
-					simplified = SimplifiedNode(original_node=node, children=[])
-					for child in node.content_document.children_nodes or []:
-						simplified_child = self._create_simplified_tree(child, depth + 1)
-						if simplified_child is not None:
-							simplified.children.append(simplified_child)
-					return simplified
+					return _SimplifyFrame(
+						node=node,
+						kind='frame',
+						children=node.content_document.children_nodes or [],
+						simplified=SimplifiedNode(original_node=node, children=[]),
+					)
 
 			is_visible = node.is_visible
 			is_scrollable = node.is_actually_scrollable
-			has_shadow_content = bool(node.children_and_shadow_roots)
+			children_and_shadow_roots = node.children_and_shadow_roots
+			has_shadow_content = bool(children_and_shadow_roots)
 
 			# ENHANCED SHADOW DOM DETECTION: Include shadow hosts even if not visible
-			is_shadow_host = any(child.node_type == NodeType.DOCUMENT_FRAGMENT_NODE for child in node.children_and_shadow_roots)
+			is_shadow_host = any(child.node_type == NodeType.DOCUMENT_FRAGMENT_NODE for child in children_and_shadow_roots)
 
 			# Override visibility for elements with validation attributes
 			if not is_visible and node.attributes:
@@ -498,25 +588,16 @@ class DOMTreeSerializer:
 
 			# Include if visible, scrollable, has children, or is shadow host
 			if is_visible or is_scrollable or has_shadow_content or is_shadow_host:
-				simplified = SimplifiedNode(original_node=node, children=[], is_shadow_host=is_shadow_host)
-
-				# Process ALL children including shadow roots with enhanced logging
-				for child in node.children_and_shadow_roots:
-					simplified_child = self._create_simplified_tree(child, depth + 1)
-					if simplified_child:
-						simplified.children.append(simplified_child)
-
-				# COMPOUND CONTROL PROCESSING: Add virtual components for compound controls
-				self._add_compound_components(simplified, node)
-
-				# SHADOW DOM SPECIAL CASE: Always include shadow hosts even if not visible
-				# Many SPA frameworks (React, Vue) render content in shadow DOM
-				if is_shadow_host and simplified.children:
-					return simplified
-
-				# Return if meaningful or has meaningful children
-				if is_visible or is_scrollable or simplified.children:
-					return simplified
+				# Process ALL children including shadow roots
+				return _SimplifyFrame(
+					node=node,
+					kind='element',
+					children=children_and_shadow_roots,
+					simplified=SimplifiedNode(original_node=node, children=[], is_shadow_host=is_shadow_host),
+					is_visible=is_visible,
+					is_scrollable=is_scrollable,
+					is_shadow_host=is_shadow_host,
+				)
 
 		elif node.node_type == NodeType.TEXT_NODE:
 			# Include meaningful text nodes
@@ -526,97 +607,101 @@ class DOMTreeSerializer:
 
 		return None
 
-	def _optimize_tree(self, node: SimplifiedNode | None) -> SimplifiedNode | None:
-		"""Step 2: Optimize tree structure."""
-		if not node:
-			return None
+	def _exit_simplified_node(self, frame: _SimplifyFrame) -> SimplifiedNode | None:
+		"""Build the result for a node once all its children were processed."""
+		if frame.kind != 'element':
+			return frame.simplified
 
-		# Process children
-		optimized_children = []
-		for child in node.children:
-			optimized_child = self._optimize_tree(child)
-			if optimized_child:
-				optimized_children.append(optimized_child)
+		simplified = frame.simplified
+		assert simplified is not None
 
-		node.children = optimized_children
+		# COMPOUND CONTROL PROCESSING: Add virtual components for compound controls
+		self._add_compound_components(simplified, frame.node)
+
+		# SHADOW DOM SPECIAL CASE: Always include shadow hosts even if not visible
+		# Many SPA frameworks (React, Vue) render content in shadow DOM
+		if frame.is_shadow_host and simplified.children:
+			return simplified
+
+		# Return if meaningful or has meaningful children
+		if frame.is_visible or frame.is_scrollable or simplified.children:
+			return simplified
+
+		return None
 
-		# Keep meaningful nodes
+	def _mark_if_meaningful(self, node: SimplifiedNode, has_meaningful_child: bool) -> None:
+		"""Tree optimization: keep visible, scrollable and text nodes, and nodes with meaningful children."""
 		is_visible = node.original_node.snapshot_node and node.original_node.is_visible
 
 		if (
 			is_visible  # Keep all visible nodes
 			or node.original_node.is_actually_scrollable
 			or node.original_node.node_type == NodeType.TEXT_NODE
-			or node.children
+			or has_meaningful_child
 		):
-			return node
+			self._meaningful_nodes.add(id(node))
 
-		return None
-
-	def _collect_interactive_elements(self, node: SimplifiedNode, elements: list[SimplifiedNode]) -> None:
-		"""Recursively collect interactive elements that are also visible."""
-		is_interactive = self._is_interactive_cached(node.original_node)
-		is_visible = node.original_node.snapshot_node and node.original_node.is_visible
+	def _optimize_filter_and_assign_indices(self, root: SimplifiedNode | None) -> SimplifiedNode | None:
+		"""Step 3: Optimize the tree, apply bounding box filtering and assign interactive indices in a single pass.
 
-		# Only collect elements that are both interactive AND visible
-		if is_interactive and is_visible:
-			elements.append(node)
-
-		for child in node.children:
-			self._collect_interactive_elements(child, elements)
+		Pre-order traversal with an explicit stack over the nodes marked in step 1: unmarked children are dropped,
+		bounds propagate to the kept descendants and interactive indices are assigned in document order.
+		"""
+		if not root or id(root) not in self._meaningful_nodes:
+			return None
 
-	def _assign_interactive_indices_and_mark_new_nodes(self, node: SimplifiedNode | None) -> None:
-		"""Assign interactive indices to clickable elements that are also visible."""
-		if not node:
-			return
+		excluded_count = 0
+		# (node, active bounds, depth)
+		stack: list[tuple[SimplifiedNode, PropagatingBounds | None, int]] = [(root, None, 0)]
+		while stack:
+			node, active_bounds, depth = stack.pop()
+			node.children = [child for child in node.children if id(child) in self._meaningful_nodes]
 
-		# Skip assigning index to excluded nodes, or ignored by paint order
-		if not node.excluded_by_parent and not node.ignored_by_paint_order:
-			# Regular interactive element assignment (including enhanced compound controls)
-			is_interactive_assign = self._is_interactive_cached(node.original_node)
-			is_visible = node.original_node.snapshot_node and node.original_node.is_visible
+			propagate_bounds = active_bounds
+			if self.enable_bbox_filtering:
+				propagate_bounds = self._filter_node_by_bounds(node, active_bounds, depth)
+				excluded_count += node.excluded_by_parent
+			self._assign_interactive_index_and_mark_new_node(node)
 
-			# Only add to selector map if element is both interactive AND visible
-			if is_interactive_assign and is_visible:
-				# Mark node as interactive
-				node.is_interactive = True
-				# Store backend_node_id in selector map (model outputs backend_node_id)
-				self._selector_map[node.original_node.backend_node_id] = node.original_node
-				self._interactive_counter += 1
+			for child in reversed(node.children):
+				stack.append((child, propagate_bounds, depth + 1))
 
-				# Mark compound components as new for visibility
-				if node.is_compound_component:
-					node.is_new = True
-				elif self._previous_cached_selector_map:
-					# Check if node is new for regular elements
-					previous_backend_node_ids = {node.backend_node_id for node in self._previous_cached_selector_map.values()}
-					if node.original_node.backend_node_id not in previous_backend_node_ids:
-						node.is_new = True
-
-		# Process children
-		for child in node.children:
-			self._assign_interactive_indices_and_mark_new_nodes(child)
-
-	def _apply_bounding_box_filtering(self, node: SimplifiedNode | None) -> SimplifiedNode | None:
-		"""Filter children contained within propagating parent bounds."""
-		if not node:
-			return None
+		if excluded_count > 0:
+			logger.debug(f'BBox filtering excluded {excluded_count} nodes')
 
-		# Start with no active bounds
-		self._filter_tree_recursive(node, active_bounds=None, depth=0)
+		return root
 
-		# Log statistics
-		excluded_count = self._count_excluded_nodes(node)
-		if excluded_count > 0:
-			import logging
+	def _assign_interactive_index_and_mark_new_node(self, node: SimplifiedNode) -> None:
+		"""Assign an interactive index to a clickable element that is also visible."""
+		# Skip assigning index to excluded nodes, or ignored by paint order
+		if node.excluded_by_parent or node.ignored_by_paint_order:
+			return
 
-			logging.debug(f'BBox filtering excluded {excluded_count} nodes')
+		# Regular interactive element assignment (including enhanced compound controls)
+		is_interactive_assign = self._is_interactive_cached(node.original_node)
+		is_visible = node.original_node.snapshot_node and node.original_node.is_visible
 
-		return node
+		# Only add to selector map if element is both interactive AND visible
+		if is_interactive_assign and is_visible:
+			# Mark node as interactive
+			node.is_interactive = True
+			# Store backend_node_id in selector map (model outputs backend_node_id)
+			self._selector_map[node.original_node.backend_node_id] = node.original_node
+			self._interactive_counter += 1
+
+			# Mark compound components as new for visibility
+			if node.is_compound_component:
+				node.is_new = True
+			elif self._previous_cached_selector_map:
+				# Check if node is new for regular elements
+				if node.original_node.backend_node_id not in self._previous_backend_node_ids:
+					node.is_new = True
 
-	def _filter_tree_recursive(self, node: SimplifiedNode, active_bounds: PropagatingBounds | None = None, depth: int = 0):
+	def _filter_node_by_bounds(
+		self, node: SimplifiedNode, active_bounds: PropagatingBounds | None, depth: int
+	) -> PropagatingBounds | None:
 		"""
-		Recursively filter tree with bounding box propagation.
+		Bounding box filtering for one node, returns the bounds to propagate to its children.
 		Bounds propagate to ALL descendants until overridden.
 		"""
 
@@ -644,12 +729,8 @@ class DOMTreeSerializer:
 					depth=depth,
 				)
 
-		# Propagate to ALL children
 		# Use new_bounds if this node starts propagation, otherwise continue with active_bounds
-		propagate_bounds = new_bounds if new_bounds else active_bounds
-
-		for child in node.children:
-			self._filter_tree_recursive(child, propagate_bounds, depth + 1)
+		return new_bounds if new_bounds else active_bounds
 
 	def _should_exclude_child(self, node: SimplifiedNode, active_bounds: PropagatingBounds) -> bool:
 		"""
@@ -728,14 +809,6 @@ class DOMTreeSerializer:
 		containment_ratio = intersection_area / child_area
 		return containment_ratio >= threshold
 
-	def _count_excluded_nodes(self, node: SimplifiedNode, count: int = 0) -> int:
-		"""Count how many nodes were excluded (for debugging)."""
-		if hasattr(node, 'excluded_by_parent') and node.excluded_by_parent:
-			count += 1
-		for child in node.children:
-			count = self._count_excluded_nodes(child, count)
-		return count
-
 	def _is_propagating_element(self, attributes: dict[str, str | None]) -> bool:
 		"""
 		Check if an element should propagate bounds based on attributes.
@@ -752,31 +825,55 @@ class DOMTreeSerializer:
 
 	@staticmethod
 	def serialize_tree(node: SimplifiedNode | None, include_attributes: list[str], depth: int = 0) -> str:
-		"""Serialize the optimized tree to string format."""
+		"""Serialize the optimized tree to string format.
+
+		Depth-first with an explicit stack of nodes and pending closing lines, so deeply nested pages don't hit
+		the recursion limit.
+		"""
 		if not node:
 			return ''
 
+		formatted_text: list[str] = []
+		stack: list[tuple[SimplifiedNode, int] | str] = [(node, depth)]
+		while stack:
+			item = stack.pop()
+			if isinstance(item, str):
+				formatted_text.append(item)
+				continue
+
+			current, current_depth = item
+			children_depth, closing_line = DOMTreeSerializer._serialize_node(
+				current, include_attributes, current_depth, formatted_text
+			)
+			if children_depth is None:
+				continue
+			if closing_line is not None:
+				stack.append(closing_line)
+			for child in reversed(current.children):
+				stack.append((child, children_depth))
+
+		return '\n'.join(formatted_text)
+
+	@staticmethod
+	def _serialize_node(
+		node: SimplifiedNode, include_attributes: list[str], depth: int, formatted_text: list[str]
+	) -> tuple[int | None, str | None]:
+		"""Append the lines of a single node.
+
+		Returns the depth its children are serialized at (None to skip the children) and an optional line to
+		emit after all children.
+		"""
 		# Skip rendering excluded nodes, but process their children
-		if hasattr(node, 'excluded_by_parent') and node.excluded_by_parent:
-			formatted_text = []
-			for child in node.children:
-				child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, depth)
-				if child_text:
-					formatted_text.append(child_text)
-			return '\n'.join(formatted_text)
-
-		formatted_text = []
+		if node.excluded_by_parent:
+			return depth, None
+
 		depth_str = depth * '\t'
 		next_depth = depth
 
 		if node.original_node.node_type == NodeType.ELEMENT_NODE:
 			# Skip displaying nodes marked as should_display=False
 			if not node.should_display:
-				for child in node.children:
-					child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, depth)
-					if child_text:
-						formatted_text.append(child_text)
-				return '\n'.join(formatted_text)
+				return depth, None
 
 			# Special handling for SVG elements - show the tag but collapse children
 			if node.original_node.tag_name.lower() == 'svg':
@@ -802,7 +899,7 @@ class DOMTreeSerializer:
 				line += ' /> <!-- SVG content collapsed -->'
 				formatted_text.append(line)
 				# Don't process children for SVG
-				return '\n'.join(formatted_text)
+				return None, None
 
 			# Add element if clickable, scrollable, or iframe
 			is_any_scrollable = node.original_node.is_actually_scrollable or node.original_node.is_scrollable
@@ -907,15 +1004,8 @@ class DOMTreeSerializer:
 
 			next_depth += 1
 
-			# Process shadow DOM children
-			for child in node.children:
-				child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, next_depth)
-				if child_text:
-					formatted_text.append(child_text)
-
-			# Close shadow DOM indicator
-			if node.children:  # Only show close if we had content
-				formatted_text.append(f'{depth_str}Shadow End')
+			# Process shadow DOM children, then close the shadow DOM indicator (only if we had content)
+			return next_depth, f'{depth_str}Shadow End' if node.children else None
 
 		elif node.original_node.node_type == NodeType.TEXT_NODE:
 			# Include visible text
@@ -930,13 +1020,7 @@ class DOMTreeSerializer:
 				formatted_text.append(f'{depth_str}{clean_text}')
 
 		# Process children (for non-shadow elements)
-		if node.original_node.node_type != NodeType.DOCUMENT_FRAGMENT_NODE:
-			for child in node.children:
-				child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, next_depth)
-				if child_text:
-					formatted_text.append(child_text)
-
-		return '\n'.join(formatted_text)
+		return next_depth, None
 
 	@staticmethod
 	def _build_attributes_string(node: EnhancedDOMTreeNode, include_attributes: list[str], text: str) -> str:
@@ -1,17 +1,25 @@
 import asyncio
+import copy
 import logging
 import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 from cdp_use.cdp.accessibility.commands import GetFullAXTreeReturns
 from cdp_use.cdp.accessibility.types import AXNode
+from cdp_use.cdp.dom.commands import GetDocumentReturns
 from cdp_use.cdp.dom.types import Node
 from cdp_use.cdp.target import TargetID
 
+from browser_use.config import CONFIG
 from browser_use.dom.enhanced_snapshot import (
 	REQUIRED_COMPUTED_STYLES,
 	build_snapshot_lookup,
+	rank_documents_by_viewport,
+	viewport_priority,
 )
+from browser_use.dom.mutations import DOMMutationJournal
 from browser_use.dom.serializer.serializer import DOMTreeSerializer
 from browser_use.dom.views import (
 	CurrentPageTargets,
@@ -30,6 +38,39 @@ if TYPE_CHECKING:
 
 # Note: iframe limits are now configurable via BrowserProfile.max_iframes and BrowserProfile.max_iframe_depth
 
+# Seconds to wait for the CDP requests of a DOM capture, and for the retry of the ones that timed out
+DOM_CAPTURE_TIMEOUT = 10.0
+DOM_CAPTURE_RETRY_TIMEOUT = 2.0
+
+# Cheap change probe for a document: a random document id and a MutationObserver counter (both installed on first
+# use, so a navigation resets them) plus the scroll position and viewport size, all of which change the captured trees.
+# It runs in an isolated world of its own, so page scripts can neither see nor clobber its state and observer.
+_DOCUMENT_STATE_PROBE = """
+(() => {
+	let state = globalThis.documentState;
+	if (!state) {
+		state = globalThis.documentState = {id: Math.random().toString(36).slice(2), mutations: 0};
+		new MutationObserver(records => { state.mutations += records.length; }).observe(document, {
+			subtree: true, childList: true, attributes: true, characterData: true
+		});
+	}
+	return [state.id, state.mutations, Math.round(window.scrollX), Math.round(window.scrollY), window.innerWidth, window.innerHeight].join(':');
+})()
+"""
+_DOCUMENT_STATE_WORLD = 'browser_use_document_state'
+
+# Isolated world of the probe per CDP session: ((frame id, loader id), execution context id), most recent last
+_document_state_worlds: OrderedDict[str, tuple[tuple[str, str], int]] = OrderedDict()
+_DOCUMENT_STATE_WORLDS_MAX = 64
+
+
+@dataclass
+class _CachedFrameTrees:
+	"""Raw trees of a cross-origin iframe document and the probe state they were captured at."""
+
+	state: str
+	trees: TargetAllTrees
+
 
 class DomService:
 	"""
@@ -50,6 +91,10 @@ class DomService:
 		paint_order_filtering: bool = True,
 		max_iframes: int = 100,
 		max_iframe_depth: int = 5,
+		incremental_snapshots: bool | None = None,
+		max_incremental_mutations: int = 1000,
+		max_concurrent_iframe_captures: int = 4,
+		iframe_cache_size: int = 32,
 	):
 		self.browser_session = browser_session
 		self.logger = logger or browser_session.logger
@@ -58,11 +103,31 @@ class DomService:
 		self.max_iframes = max_iframes
 		self.max_iframe_depth = max_iframe_depth
 
+		# Incremental mode: keep the previous tree per target and patch it from DOM mutation events
+		self.incremental_snapshots = (
+			CONFIG.BROWSER_USE_INCREMENTAL_SNAPSHOTS if incremental_snapshots is None else incremental_snapshots
+		)
+		self.max_incremental_mutations = max_incremental_mutations
+		self._mutation_journals: dict[TargetID, DOMMutationJournal] = {}
+
+		# Cross-origin iframes are captured concurrently, and reused while their document has not changed
+		self._iframe_capture_semaphore = asyncio.Semaphore(max_concurrent_iframe_captures)
+		self.iframe_cache_size = iframe_cache_size
+		self._iframe_cache: OrderedDict[tuple[str, str], _CachedFrameTrees] = OrderedDict()
+		"""(frame id, loader id) -> trees of the cross-origin iframe document"""
+		self._iframe_capture_counts: dict[str, int] = {}
+
+		self.cdp_timing: dict[str, float] = {}
+		"""CDP timing and node counts of the last top-level `get_dom_tree` call"""
+
 	async def __aenter__(self):
 		return self
 
 	async def __aexit__(self, exc_type, exc_value, traceback):
-		pass  # no need to cleanup anything, browser_session auto handles cleaning up session cache
+		# browser_session auto handles cleaning up session cache, we only stop listening for DOM mutations
+		for journal in self._mutation_journals.values():
+			journal.unsubscribe()
+		self._mutation_journals.clear()
 
 	async def _get_targets_for_page(self, target_id: TargetID | None = None) -> CurrentPageTargets:
 		"""Get the target info for a specific page.
@@ -288,7 +353,46 @@ class DomService:
 
 		return {'nodes': merged_nodes}
 
-	async def _get_all_trees(self, target_id: TargetID) -> TargetAllTrees:
+	async def _get_mutation_journal(self, target_id: TargetID) -> DOMMutationJournal | None:
+		"""Get the mutation journal for a target in incremental mode, (re)subscribing when the CDP session changed."""
+		if not self.incremental_snapshots:
+			return None
+
+		cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target_id, focus=False)
+		journal = self._mutation_journals.get(target_id)
+		if journal is None or journal.session_id != cdp_session.session_id:
+			if journal is not None:
+				journal.unsubscribe()
+			journal = DOMMutationJournal(target_id, cdp_session.session_id, max_mutations=self.max_incremental_mutations)
+			journal.subscribe(cdp_session.cdp_client)
+			self._mutation_journals[target_id] = journal
+
+		return journal
+
+	async def _get_document(self, cdp_session, journal: DOMMutationJournal | None = None) -> GetDocumentReturns:
+		"""Get the full DOM tree, or the journal's cached tree if it can still be patched."""
+		if journal is None:
+			return await cdp_session.cdp_client.send.DOM.getDocument(
+				params={'depth': -1, 'pierce': True}, session_id=cdp_session.session_id
+			)
+
+		if journal.can_patch:
+			return {'root': journal.root}
+
+		# Full fetch: the DOM agent must be enabled to receive mutation events for the returned nodes
+		journal.begin_capture()
+		await cdp_session.cdp_client.send.DOM.enable(session_id=cdp_session.session_id)
+		dom_tree = await cdp_session.cdp_client.send.DOM.getDocument(
+			params={'depth': -1, 'pierce': True}, session_id=cdp_session.session_id
+		)
+		journal.reset(dom_tree['root'])
+		return dom_tree
+
+	async def _get_all_trees(self, target_id: TargetID, journal: DOMMutationJournal | None = None) -> TargetAllTrees:
+		"""Fetch snapshot, DOM tree and AX tree of a target.
+
+		If `journal` can patch its cached tree, `DOM.getDocument` is skipped and the journal's root is returned instead.
+		"""
 		cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target_id, focus=False)
 
 		# Wait for the page to be ready first
@@ -353,9 +457,7 @@ class DomService:
 			)
 
 		def create_dom_tree_request():
-			return cdp_session.cdp_client.send.DOM.getDocument(
-				params={'depth': -1, 'pierce': True}, session_id=cdp_session.session_id
-			)
+			return self._get_document(cdp_session, journal)
 
 		start = time.time()
 
@@ -368,7 +470,7 @@ class DomService:
 		}
 
 		# Wait for all tasks with timeout
-		done, pending = await asyncio.wait(tasks.values(), timeout=10.0)
+		done, pending = await asyncio.wait(tasks.values(), timeout=DOM_CAPTURE_TIMEOUT)
 
 		# Retry any failed or timed out tasks
 		if pending:
@@ -389,7 +491,9 @@ class DomService:
 					tasks[key] = retry_map[task]()
 
 			# Wait again with shorter timeout
-			done2, pending2 = await asyncio.wait([t for t in tasks.values() if not t.done()], timeout=2.0)
+			done2, pending2 = await asyncio.wait(
+				[t for t in tasks.values() if not t.done()], timeout=DOM_CAPTURE_RETRY_TIMEOUT
+			)
 
 			if pending2:
 				for task in pending2:
@@ -423,12 +527,13 @@ class DomService:
 		# DEBUG: Log snapshot info and limit documents to prevent explosion
 		if snapshot and 'documents' in snapshot:
 			original_doc_count = len(snapshot['documents'])
-			# Limit to max_iframes documents to prevent iframe explosion
+			# Limit to max_iframes documents to prevent iframe explosion, keeping the iframes most visible in the viewport
 			if original_doc_count > self.max_iframes:
 				self.logger.warning(
-					f'⚠️ Limiting processing of {original_doc_count} iframes on page to only first {self.max_iframes} to prevent crashes!'
+					f'⚠️ Limiting processing of {original_doc_count} iframes on page to the {self.max_iframes} most visible ones to prevent crashes!'
 				)
-				snapshot['documents'] = snapshot['documents'][: self.max_iframes]
+				kept_documents = sorted(rank_documents_by_viewport(snapshot)[: self.max_iframes])
+				snapshot['documents'] = [snapshot['documents'][i] for i in kept_documents]
 
 			total_nodes = sum(len(doc.get('nodes', [])) for doc in snapshot['documents'])
 			self.logger.debug(f'🔍 DEBUG: Snapshot contains {len(snapshot["documents"])} frames with {total_nodes} total nodes')
@@ -447,6 +552,121 @@ class DomService:
 			cdp_timing=cdp_timing,
 		)
 
+	@staticmethod
+	async def get_document_state(cdp_session, frame: dict | None = None) -> str:
+		"""Opaque token of a target's document state (document identity, DOM mutation count, scroll and viewport).
+
+		The token changes whenever the document is replaced, mutated or scrolled, so it tells whether DOM trees
+		captured at an earlier token are still current. `frame` is the target's main frame from `Page.getFrameTree`,
+		fetched if not given. Raises if the target cannot evaluate scripts.
+		"""
+		cdp_client, session_id = cdp_session.cdp_client, cdp_session.session_id
+		if frame is None:
+			frame = (await cdp_client.send.Page.getFrameTree(session_id=session_id))['frameTree']['frame']
+		document = (frame['id'], frame.get('loaderId', ''))
+
+		async def create_world() -> int:
+			created = await cdp_client.send.Page.createIsolatedWorld(
+				params={'frameId': frame['id'], 'worldName': _DOCUMENT_STATE_WORLD}, session_id=session_id
+			)
+			_document_state_worlds[session_id] = (document, created['executionContextId'])
+			while len(_document_state_worlds) > _DOCUMENT_STATE_WORLDS_MAX:
+				_document_state_worlds.popitem(last=False)
+			return created['executionContextId']
+
+		async def evaluate(context_id: int) -> str:
+			probe = await cdp_client.send.Runtime.evaluate(
+				params={'expression': _DOCUMENT_STATE_PROBE, 'returnByValue': True, 'contextId': context_id},
+				session_id=session_id,
+			)
+			return str(probe.get('result', {}).get('value'))
+
+		world = _document_state_worlds.get(session_id)
+		if world is None or world[0] != document:
+			return await evaluate(await create_world())
+		_document_state_worlds.move_to_end(session_id)
+		try:
+			return await evaluate(world[1])
+		except Exception:
+			# the world went away with its document (e.g. a restore from the back/forward cache), so make a new one
+			return await evaluate(await create_world())
+
+	async def _get_iframe_trees(self, target_id: TargetID) -> TargetAllTrees:
+		"""Capture the trees of a cross-origin iframe target, reusing the last capture if its document is unchanged.
+
+		Captures share a semaphore so at most `max_concurrent_iframe_captures` of them hit the browser at once. The
+		cache is keyed by frame id and loader id (a new document gets a new loader id) and validated with
+		`get_document_state`, which catches DOM mutations and scrolling within the same document.
+		"""
+		async with self._iframe_capture_semaphore:
+			cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target_id, focus=False)
+			state = None
+			cache_key = None
+			try:
+				frame_tree = await cdp_session.cdp_client.send.Page.getFrameTree(session_id=cdp_session.session_id)
+				frame = frame_tree['frameTree']['frame']
+				cache_key = (frame['id'], frame.get('loaderId', ''))
+				state = await self.get_document_state(cdp_session, frame)
+			except Exception as e:
+				self.logger.debug(f'Failed to probe iframe target {target_id} for changes: {e}')
+
+			cached = self._iframe_cache.get(cache_key) if cache_key else None
+			if cached is not None and state is not None and cached.state == state:
+				self._iframe_cache.move_to_end(cache_key)  # type: ignore[arg-type]
+				self._iframe_capture_counts['iframe_targets_cached'] = self._iframe_capture_counts.get('iframe_targets_cached', 0) + 1
+				return cached.trees
+
+			# the state is read before capturing, so changes during the capture invalidate the entry on the next probe
+			trees = await self._get_all_trees(target_id)
+			self._iframe_capture_counts['iframe_targets_captured'] = self._iframe_capture_counts.get('iframe_targets_captured', 0) + 1
+
+			if cache_key and state is not None:
+				# an older document of the same frame can never be reused
+				for key in [key for key in self._iframe_cache if key[0] == cache_key[0]]:
+					del self._iframe_cache[key]
+				self._iframe_cache[cache_key] = _CachedFrameTrees(state=state, trees=trees)
+				while len(self._iframe_cache) > self.iframe_cache_size:
+					self._iframe_cache.popitem(last=False)
+			return trees
+
+	async def _attach_cross_origin_iframes(
+		self, pending_iframes: list[tuple[EnhancedDOMTreeNode, str, DOMRect, tuple[float, float]]], iframe_depth: int
+	) -> None:
+		"""Build the content documents of cross-origin iframes concurrently, most visible iframes first."""
+		all_frames, _ = await self.browser_session.get_all_frames()
+		targets = await self.browser_session.cdp_client.send.Target.getTargets()
+		target_ids = {target_info['targetId'] for target_info in targets['targetInfos']}
+
+		async def attach(iframe_node: EnhancedDOMTreeNode, frame_id: str, total_frame_offset: DOMRect) -> None:
+			frame_info = all_frames.get(frame_id)
+			iframe_target_id = frame_info.get('frameTargetId') if frame_info else None
+			# if target actually exists in one of the frames, just recursively build the dom tree for it
+			if not iframe_target_id or iframe_target_id not in target_ids:
+				return
+
+			self.logger.debug(f'Getting content document for iframe {frame_id} at depth {iframe_depth + 1}')
+			try:
+				content_document = await self.get_dom_tree(
+					target_id=iframe_target_id,
+					# TODO: experiment with this values -> not sure whether the whole cross origin iframe should be ALWAYS included as soon as some part of it is visible or not.
+					# Current config: if the cross origin iframe is AT ALL visible, then just include everything inside of it!
+					# initial_html_frames=updated_html_frames,
+					initial_total_frame_offset=total_frame_offset,
+					iframe_depth=iframe_depth + 1,
+				)
+			except Exception as e:
+				self.logger.warning(f'Failed to capture cross-origin iframe {frame_id}: {type(e).__name__}: {e}')
+				return
+
+			iframe_node.content_document = content_document
+			iframe_node.content_document.parent_node = iframe_node
+
+		# tasks queue on the capture semaphore in creation order, so sorting schedules the most visible iframes first
+		pending_iframes.sort(key=lambda pending_iframe: pending_iframe[3])
+		await asyncio.gather(
+			*(attach(iframe_node, frame_id, total_frame_offset) for iframe_node, frame_id, total_frame_offset, _ in pending_iframes)
+		)
+
 	@observe_debug(ignore_input=True, ignore_output=True, name='get_dom_tree')
 	async def get_dom_tree(
 		self,
@@ -464,13 +684,61 @@ class DomService:
 			iframe_depth: Current depth of iframe nesting to prevent infinite recursion
 		"""
 
-		trees = await self._get_all_trees(target_id)
+		if iframe_depth == 0:
+			self._iframe_capture_counts = {'iframe_targets_captured': 0, 'iframe_targets_cached': 0}
+
+		journal = await self._get_mutation_journal(target_id)
+		if iframe_depth > 0 and journal is None:
+			trees = await self._get_iframe_trees(target_id)
+		else:
+			trees = await self._get_all_trees(target_id, journal=journal)
 
 		dom_tree = trees.dom_tree
 		ax_tree = trees.ax_tree
 		snapshot = trees.snapshot
 		device_pixel_ratio = trees.device_pixel_ratio
 
+		# Incremental mode: reuse enhanced nodes of the previous build that were not touched by any mutation
+		reusable_nodes: dict[int, EnhancedDOMTreeNode] = {}
+		if journal is not None:
+			is_patch = bool(journal.enhanced_nodes)
+			journal_in_sync = journal.apply_pending()
+			snapshot_backend_node_ids = {
+				backend_node_id
+				for document in snapshot['documents']
+				for backend_node_id in document['nodes'].get('backendNodeId', [])
+			}
+			tree_backend_node_ids = journal.tree_backend_node_ids()
+			untracked_snapshot_nodes = len(snapshot_backend_node_ids - tree_backend_node_ids)
+			stale_tree_nodes = len(tree_backend_node_ids - snapshot_backend_node_ids)
+
+			if is_patch and (
+				not journal_in_sync
+				or untracked_snapshot_nodes > journal.untracked_snapshot_nodes
+				or stale_tree_nodes > journal.stale_tree_nodes
+			):
+				# Missed or unappliable mutations (or navigation) -> fall back to a full rebuild
+				journal.invalidate('DOM tree out of sync with snapshot')
+				cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target_id, focus=False)
+				dom_tree = await self._get_document(cdp_session, journal)
+				journal.apply_pending()
+				is_patch = False
+				tree_backend_node_ids = journal.tree_backend_node_ids()
+				untracked_snapshot_nodes = len(snapshot_backend_node_ids - tree_backend_node_ids)
+				stale_tree_nodes = len(tree_backend_node_ids - snapshot_backend_node_ids)
+
+			if is_patch:
+				reusable_nodes = journal.enhanced_nodes
+			else:
+				# New baseline: differences between the two node sets that are expected (pseudo elements etc.)
+				journal.untracked_snapshot_nodes = untracked_snapshot_nodes
+				journal.stale_tree_nodes = stale_tree_nodes
+			dirty_node_ids = journal.dirty_node_ids
+		else:
+			dirty_node_ids = set()
+
+		node_counts = {'dom_nodes_reused': 0, 'dom_nodes_patched': 0, 'dom_nodes_rebuilt': 0}
+
 		ax_tree_lookup: dict[int, AXNode] = {
 			ax_node['backendDOMNodeId']: ax_node for ax_node in ax_tree['nodes'] if 'backendDOMNodeId' in ax_node
 		}
@@ -481,6 +749,9 @@ class DomService:
 		# Parse snapshot data with everything calculated upfront
 		snapshot_lookup = build_snapshot_lookup(snapshot, device_pixel_ratio)
 
+		# Cross-origin iframes to capture once this target's tree is built: (iframe node, frame id, frame offset, priority)
+		pending_iframes: list[tuple[EnhancedDOMTreeNode, str, DOMRect, tuple[float, float]]] = []
+
 		async def _construct_enhanced_node(
 			node: Node, html_frames: list[EnhancedDOMTreeNode] | None, total_frame_offset: DOMRect | None
 		) -> EnhancedDOMTreeNode:
@@ -540,27 +811,51 @@ class DomService:
 					height=snapshot_data.bounds.height,
 				)
 
-			dom_tree_node = EnhancedDOMTreeNode(
-				node_id=node['nodeId'],
-				backend_node_id=node['backendNodeId'],
-				node_type=NodeType(node['nodeType']),
-				node_name=node['nodeName'],
-				node_value=node['nodeValue'],
-				attributes=attributes or {},
-				is_scrollable=node.get('isScrollable', None),
-				frame_id=node.get('frameId', None),
-				session_id=self.browser_session.agent_focus.session_id if self.browser_session.agent_focus else None,
-				target_id=target_id,
-				content_document=None,
-				shadow_root_type=shadow_root_type,
-				shadow_roots=None,
-				parent_node=None,
-				children_nodes=None,
-				ax_node=enhanced_ax_node,
-				snapshot_node=snapshot_data,
-				is_visible=None,
-				absolute_position=absolute_position,
-			)
+			session_id = self.browser_session.agent_focus.session_id if self.browser_session.agent_focus else None
+
+			reusable_node = reusable_nodes.get(node['nodeId'])
+			if (
+				reusable_node is not None
+				and reusable_node.backend_node_id == node['backendNodeId']
+				and node['nodeId'] not in dirty_node_ids
+			):
+				# Unchanged since the last build: copy it and only refresh layout, AX and navigation data. The previous
+				# tree stays intact, it is still referenced by the previous state's selector map.
+				dom_tree_node = copy.copy(reusable_node)
+				dom_tree_node.session_id = session_id
+				dom_tree_node.content_document = None
+				dom_tree_node.shadow_roots = None
+				dom_tree_node.parent_node = None
+				dom_tree_node.children_nodes = None
+				dom_tree_node.ax_node = enhanced_ax_node
+				dom_tree_node.snapshot_node = snapshot_data
+				dom_tree_node.is_visible = None
+				dom_tree_node.absolute_position = absolute_position
+				dom_tree_node._compound_children = []
+				node_counts['dom_nodes_reused'] += 1
+			else:
+				dom_tree_node = EnhancedDOMTreeNode(
+					node_id=node['nodeId'],
+					backend_node_id=node['backendNodeId'],
+					node_type=NodeType(node['nodeType']),
+					node_name=node['nodeName'],
+					node_value=node['nodeValue'],
+					attributes=attributes or {},
+					is_scrollable=node.get('isScrollable', None),
+					frame_id=node.get('frameId', None),
+					session_id=session_id,
+					target_id=target_id,
+					content_document=None,
+					shadow_root_type=shadow_root_type,
+					shadow_roots=None,
+					parent_node=None,
+					children_nodes=None,
+					ax_node=enhanced_ax_node,
+					snapshot_node=snapshot_data,
+					is_visible=None,
+					absolute_position=absolute_position,
+				)
+				node_counts['dom_nodes_patched' if reusable_nodes else 'dom_nodes_rebuilt'] += 1
 
 			enhanced_dom_tree_node_lookup[node['nodeId']] = dom_tree_node
 
@@ -683,41 +978,41 @@ class DomService:
 					else:
 						self.logger.debug('Skipping invisible cross-origin iframe')
 
-					if should_process_iframe:
-						# Use get_all_frames to find the iframe's target
-						frame_id = node.get('frameId', None)
-						if frame_id:
-							all_frames, _ = await self.browser_session.get_all_frames()
-							frame_info = all_frames.get(frame_id)
-							iframe_document_target = None
-							if frame_info and frame_info.get('frameTargetId'):
-								# Get the target info for this iframe
-								targets = await self.browser_session.cdp_client.send.Target.getTargets()
-								iframe_document_target = next(
-									(t for t in targets['targetInfos'] if t['targetId'] == frame_info['frameTargetId']), None
-								)
-						else:
-							iframe_document_target = None
-						# if target actually exists in one of the frames, just recursively build the dom tree for it
-						if iframe_document_target:
-							self.logger.debug(
-								f'Getting content document for iframe {node.get("frameId", None)} at depth {iframe_depth + 1}'
+					frame_id = node.get('frameId', None)
+					if should_process_iframe and frame_id:
+						# captured concurrently with the other cross-origin iframes after the tree is built, most visible first
+						viewport = DOMRect(0, 0, float('inf'), float('inf'))
+						if updated_html_frames and updated_html_frames[0].snapshot_node:
+							viewport_rects = updated_html_frames[0].snapshot_node.clientRects
+							if viewport_rects:
+								viewport = DOMRect(0, 0, viewport_rects.width, viewport_rects.height)
+						priority = viewport_priority(dom_tree_node.absolute_position or DOMRect(0, 0, 0, 0), viewport)
+						pending_iframes.append(
+							(
+								dom_tree_node,
+								frame_id,
+								DOMRect(total_frame_offset.x, total_frame_offset.y, total_frame_offset.width, total_frame_offset.height),
+								priority,
 							)
-							content_document = await self.get_dom_tree(
-								target_id=iframe_document_target.get('targetId'),
-								# TODO: experiment with this values -> not sure whether the whole cross origin iframe should be ALWAYS included as soon as some part of it is visible or not.
-								# Current config: if the cross origin iframe is AT ALL visible, then just include everything inside of it!
-								# initial_html_frames=updated_html_frames,
-								initial_total_frame_offset=total_frame_offset,
-								iframe_depth=iframe_depth + 1,
-							)
-
-							dom_tree_node.content_document = content_document
-							dom_tree_node.content_document.parent_node = dom_tree_node
+						)
 
 			return dom_tree_node
 
 		enhanced_dom_tree_node = await _construct_enhanced_node(dom_tree['root'], initial_html_frames, initial_total_frame_offset)
+		if pending_iframes:
+			await self._attach_cross_origin_iframes(pending_iframes, iframe_depth)
+		if iframe_depth == 0:
+			# once the whole tree (including cross-origin iframes) is linked up
+			enhanced_dom_tree_node.refresh_identity_hashes()
+
+		if journal is not None:
+			journal.enhanced_nodes = enhanced_dom_tree_node_lookup
+			journal.dirty_node_ids = set()
+
+		trees.cdp_timing.update({key: float(count) for key, count in node_counts.items()})
+		if iframe_depth == 0:
+			trees.cdp_timing.update({key: float(count) for key, count in self._iframe_capture_counts.items()})
+			self.cdp_timing = trees.cdp_timing
 
 		return enhanced_dom_tree_node
 
@@ -744,7 +1039,7 @@ class DomService:
 		serialize_total_timing = {'serialize_dom_tree_total': end - start}
 
 		# Combine all timing info
-		all_timing = {**serializer_timing, **serialize_total_timing}
+		all_timing = {**self.cdp_timing, **serializer_timing, **serialize_total_timing}
 
 		return serialized_dom_state, enhanced_dom_tree, all_timing
 
@@ -1,4 +1,5 @@
 import hashlib
+import sys
 from dataclasses import asdict, dataclass, field
 from enum import Enum
 from typing import Any
@@ -11,6 +12,7 @@ from cdp_use.cdp.domsnapshot.commands import CaptureSnapshotReturns
 from cdp_use.cdp.target.types import SessionID, TargetID, TargetInfo
 from uuid_extensions import uuid7str
 
+from browser_use.config import CONFIG
 from browser_use.dom.utils import cap_text_length
 from browser_use.observability import observe_debug
 
@@ -120,6 +122,16 @@ STATIC_ATTRIBUTES = {
 	'aria-placeholder',
 }
 
+LEGACY_ELEMENT_HASH = CONFIG.BROWSER_USE_LEGACY_ELEMENT_HASH
+"""Use the original SHA-256 element hashes, e.g. to rerun histories recorded before the cached 64-bit hashes"""
+
+_ROOT_BRANCH_HASH = 0
+
+
+def _hash64(value: str) -> int:
+	"""Fast 64-bit hash of a string (BLAKE2b with an 8 byte digest)."""
+	return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), 'big')
+
 
 @dataclass
 class CurrentPageTargets:
@@ -380,6 +392,10 @@ class EnhancedDOMTreeNode:
 
 	uuid: str = field(default_factory=uuid7str)
 
+	# Identity hashes, set top-down by `refresh_identity_hashes()` or lazily on first use
+	_branch_hash: int | None = field(default=None, init=False, repr=False, compare=False)
+	_element_hash: int | None = field(default=None, init=False, repr=False, compare=False)
+
 	@property
 	def parent(self) -> 'EnhancedDOMTreeNode | None':
 		return self.parent_node
@@ -751,25 +767,85 @@ class EnhancedDOMTreeNode:
 
 		TODO: migrate this to use only backendNodeId + current SessionId
 		"""
+		if LEGACY_ELEMENT_HASH:
+			return self.legacy_element_hash()
+
+		if self._element_hash is None:
+			self._element_hash = _hash64(f'{self._get_branch_hash():016x}|{self._static_attributes_string()}')
+		return self._element_hash
+
+	def parent_branch_hash(self) -> int:
+		"""
+		Hash the element based on its parent branch path.
+		"""
+		if LEGACY_ELEMENT_HASH:
+			return self.legacy_parent_branch_hash()
+
+		return self._get_branch_hash()
+
+	def refresh_identity_hashes(self) -> None:
+		"""Recompute the cached hashes of this node and all its descendants, top-down from the parent's branch hash."""
+		parent_hash = self.parent_node._get_branch_hash() if self.parent_node is not None else _ROOT_BRANCH_HASH
+		stack: list[tuple[EnhancedDOMTreeNode, int]] = [(self, parent_hash)]
+		while stack:
+			node, parent_hash = stack.pop()
+			node._branch_hash = node._derive_branch_hash(parent_hash)
+			node._element_hash = None
+
+			if node.content_document is not None:
+				stack.append((node.content_document, node._branch_hash))
+			for child in node.shadow_roots or ():
+				stack.append((child, node._branch_hash))
+			for child in node.children_nodes or ():
+				stack.append((child, node._branch_hash))
+
+	def _derive_branch_hash(self, parent_hash: int) -> int:
+		# only element nodes are part of the branch path, other nodes share the hash of their parent
+		if self.node_type != NodeType.ELEMENT_NODE:
+			return parent_hash
+		return _hash64(f'{parent_hash:016x}/{self.tag_name}')
+
+	def _get_branch_hash(self) -> int:
+		"""Cached branch hash, computed for this node and any uncached ancestors if needed."""
+		uncached: list[EnhancedDOMTreeNode] = []
+		current: EnhancedDOMTreeNode | None = self
+		while current is not None and current._branch_hash is None:
+			uncached.append(current)
+			current = current.parent_node
+
+		branch_hash = current._branch_hash if current is not None else _ROOT_BRANCH_HASH
+		assert branch_hash is not None
+		for node in reversed(uncached):
+			branch_hash = node._derive_branch_hash(branch_hash)
+			node._branch_hash = branch_hash
+		return branch_hash
+
+	def _static_attributes_string(self) -> str:
+		return ''.join(f'{k}={v}' for k, v in sorted((k, v) for k, v in self.attributes.items() if k in STATIC_ATTRIBUTES))
+
+	def legacy_element_hash(self) -> int:
+		"""
+		Original SHA-256 based element hash, i.e. what `hash(element)` returned before the cached 64-bit hashes.
+		"""
 
 		# Get parent branch path
 		parent_branch_path = self._get_parent_branch_path()
 		parent_branch_path_string = '/'.join(parent_branch_path)
 
-		attributes_string = ''.join(
-			f'{k}={v}' for k, v in sorted((k, v) for k, v in self.attributes.items() if k in STATIC_ATTRIBUTES)
-		)
+		attributes_string = self._static_attributes_string()
 
 		# Combine both for final hash
 		combined_string = f'{parent_branch_path_string}|{attributes_string}'
 		element_hash = hashlib.sha256(combined_string.encode()).hexdigest()
 
 		# Convert to int for __hash__ return type - use first 16 chars and convert from hex to int
-		return int(element_hash[:16], 16)
+		value = int(element_hash[:16], 16)
+		# hash() reduces __hash__ results that don't fit into a Py_ssize_t, apply the same so stored hashes compare equal
+		return value if value <= sys.maxsize else hash(value)
 
-	def parent_branch_hash(self) -> int:
+	def legacy_parent_branch_hash(self) -> int:
 		"""
-		Hash the element based on its parent branch path and attributes.
+		Original SHA-256 based parent branch hash.
 		"""
 		parent_branch_path = self._get_parent_branch_path()
 		parent_branch_path_string = '/'.join(parent_branch_path)
@@ -794,6 +870,63 @@ class EnhancedDOMTreeNode:
 DOMSelectorMap = dict[int, EnhancedDOMTreeNode]
 
 
+@dataclass(slots=True)
+class SelectorMapDiff:
+	"""Interactive elements that appeared, disappeared or stayed between two consecutive selector maps."""
+
+	added: set[int]
+	"""Backend node ids of elements that match nothing in the previous selector map"""
+	removed: set[int]
+	"""Backend node ids (of the previous selector map) of elements that match nothing in the current one"""
+	unchanged: set[int]
+	"""Backend node ids present in both selector maps"""
+	rerendered: dict[int, int]
+	"""Current backend node id -> previous backend node id, for elements with a new node but the same element hash"""
+
+	@property
+	def new_backend_node_ids(self) -> set[int]:
+		"""Backend node ids that were not in the previous selector map (the `*[` elements in the LLM representation)"""
+		return self.added | self.rerendered.keys()
+
+	@property
+	def has_changes(self) -> bool:
+		return bool(self.added or self.removed or self.rerendered)
+
+	@classmethod
+	def compute(cls, previous: DOMSelectorMap, current: DOMSelectorMap) -> 'SelectorMapDiff':
+		"""Diff two selector maps in one linear pass.
+
+		Elements are matched by backend node id first. Only the leftovers on both sides are hashed,
+		to recognize elements that were re-rendered into a new node.
+		"""
+		previous_backend_node_ids = {node.backend_node_id for node in previous.values()}
+		current_backend_node_ids = {node.backend_node_id for node in current.values()}
+
+		unchanged = current_backend_node_ids & previous_backend_node_ids
+		candidates_added = current_backend_node_ids - unchanged
+		candidates_removed = previous_backend_node_ids - unchanged
+
+		rerendered: dict[int, int] = {}
+		if candidates_added and candidates_removed:
+			removed_by_hash: dict[int, int] = {}
+			for node in previous.values():
+				if node.backend_node_id in candidates_removed:
+					removed_by_hash.setdefault(node.element_hash, node.backend_node_id)
+
+			for node in current.values():
+				if node.backend_node_id in candidates_added:
+					previous_backend_node_id = removed_by_hash.pop(node.element_hash, None)
+					if previous_backend_node_id is not None:
+						rerendered[node.backend_node_id] = previous_backend_node_id
+
+		return cls(
+			added=candidates_added - rerendered.keys(),
+			removed=candidates_removed - set(rerendered.values()),
+			unchanged=unchanged,
+			rerendered=rerendered,
+		)
+
+
 @dataclass
 class SerializedDOMState:
 	_root: SimplifiedNode | None
@@ -801,6 +934,9 @@ class SerializedDOMState:
 
 	selector_map: DOMSelectorMap
 
+	selector_map_diff: SelectorMapDiff | None = None
+	"""Diff against the previous state's selector map, None if there was no previous state"""
+
 	@observe_debug(ignore_input=True, ignore_output=True, name='llm_representation')
 	def llm_representation(
 		self,
@@ -1,12 +1,14 @@
 import asyncio
+import logging
 import re
 import shutil
+import threading
 from abc import ABC, abstractmethod
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Any
+from typing import Any, ClassVar
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, computed_field
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
@@ -14,6 +16,21 @@ from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
 INVALID_FILENAME_ERROR_MESSAGE = 'Error: Invalid filename format. Must be alphanumeric with supported extension.'
 DEFAULT_FILE_SYSTEM_PATH = 'browseruse_agent_data'
 
+logger = logging.getLogger(__name__)
+
+# Guards the in-memory content and unflushed changes of all files against the I/O worker thread
+_file_state_lock = threading.RLock()
+_file_io_executor: ThreadPoolExecutor | None = None
+
+
+def _get_file_io_executor() -> ThreadPoolExecutor:
+	"""Single I/O worker shared by all file systems, so writes of a file land on disk in the order they were made"""
+	global _file_io_executor
+	with _file_state_lock:
+		if _file_io_executor is None:
+			_file_io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='browser_use_file_io')
+		return _file_io_executor
+
 
 class FileSystemError(Exception):
 	"""Custom exception for file system operations that should be shown to LLM"""
@@ -22,10 +39,37 @@ class FileSystemError(Exception):
 
 
 class BaseFile(BaseModel, ABC):
-	"""Base class for all file types"""
+	"""Base class for all file types
+
+	Content is kept as a list of chunks, so appends don't copy the whole content (chunks are joined on read).
+	Changes since the last flush are tracked, so appends reach the disk as appends instead of full rewrites.
+	"""
 
 	name: str
-	content: str = ''
+
+	supports_append: ClassVar[bool] = True  # False for formats that must be re-rendered as a whole on every change
+	write_behind: ClassVar[bool] = True  # False to wait for the disk write (and surface its errors) on every change
+
+	_chunks: list[str] = PrivateAttr(default_factory=list)
+	_unflushed_chunks: list[str] = PrivateAttr(default_factory=list)
+	_needs_rewrite: bool = PrivateAttr(default=False)
+
+	def __init__(self, content: str = '', **data: Any):
+		super().__init__(**data)
+		self._chunks = [content] if content else []
+
+	@computed_field
+	@property
+	def content(self) -> str:
+		with _file_state_lock:
+			if len(self._chunks) > 1:
+				self._chunks = [''.join(self._chunks)]
+			return self._chunks[0] if self._chunks else ''
+
+	@content.setter
+	def content(self, content: str) -> None:
+		with _file_state_lock:
+			self._chunks = [content] if content else []
 
 	# --- Subclass must define this ---
 	@property
@@ -40,21 +84,53 @@ class BaseFile(BaseModel, ABC):
 
 	def append_file_content(self, content: str) -> None:
 		"""Append content to internal content"""
-		self.update_content(self.content + content)
+		with _file_state_lock:
+			self._chunks.append(content)
+			if self.supports_append and not self._needs_rewrite:
+				self._unflushed_chunks.append(content)
+			else:
+				self._needs_rewrite = True
 
 	# --- These are shared and implemented here ---
 
 	def update_content(self, content: str) -> None:
-		self.content = content
+		with _file_state_lock:
+			self.content = content
+			self._needs_rewrite = True
+			self._unflushed_chunks = []
 
-	def sync_to_disk_sync(self, path: Path) -> None:
+	@property
+	def has_unflushed_changes(self) -> bool:
+		return self._needs_rewrite or bool(self._unflushed_chunks)
+
+	def sync_to_disk_sync(self, path: Path, content: str | None = None) -> None:
+		"""Rewrite the file on disk, with `content` if given (a snapshot) or the current content"""
 		file_path = path / self.full_name
-		file_path.write_text(self.content)
+		file_path.write_text(self.content if content is None else content)
+
+	def flush_sync(self, path: Path) -> None:
+		"""Write the changes made since the last flush: appended chunks in append mode, anything else as a full rewrite"""
+		with _file_state_lock:
+			needs_rewrite, unflushed_chunks = self._needs_rewrite, self._unflushed_chunks
+			# the content that goes with the cleared flags, later appends are left for the next flush
+			content = self.content if needs_rewrite else None
+			self._needs_rewrite, self._unflushed_chunks = False, []
+
+		try:
+			if needs_rewrite:
+				self.sync_to_disk_sync(path, content)
+			elif unflushed_chunks:
+				with open(path / self.full_name, 'a') as f:
+					f.write(''.join(unflushed_chunks))
+		except Exception:
+			# the file on disk is in an unknown state now, rewrite it completely on the next flush
+			with _file_state_lock:
+				self._needs_rewrite = True
+				self._unflushed_chunks = []
+			raise
 
 	async def sync_to_disk(self, path: Path) -> None:
-		file_path = path / self.full_name
-		with ThreadPoolExecutor() as executor:
-			await asyncio.get_event_loop().run_in_executor(executor, lambda: file_path.write_text(self.content))
+		await asyncio.wrap_future(_get_file_io_executor().submit(self.flush_sync, path))
 
 	async def write(self, content: str, path: Path) -> None:
 		self.write_file_content(content)
@@ -123,11 +199,15 @@ class JsonlFile(BaseFile):
 class PdfFile(BaseFile):
 	"""PDF file implementation"""
 
+	# rendered as a whole, and rendering errors are reported to the model
+	supports_append = False
+	write_behind = False
+
 	@property
 	def extension(self) -> str:
 		return 'pdf'
 
-	def sync_to_disk_sync(self, path: Path) -> None:
+	def sync_to_disk_sync(self, path: Path, content: str | None = None) -> None:
 		file_path = path / self.full_name
 		try:
 			# Create PDF document
@@ -138,7 +218,7 @@ class PdfFile(BaseFile):
 			# Convert markdown content to simple text and add to PDF
 			# For basic implementation, we'll treat content as plain text
 			# This avoids the AGPL license issue while maintaining functionality
-			content_lines = self.content.split('\n')
+			content_lines = (self.content if content is None else content).split('\n')
 
 			for line in content_lines:
 				if line.strip():
@@ -159,10 +239,6 @@ class PdfFile(BaseFile):
 		except Exception as e:
 			raise FileSystemError(f"Error: Could not write to file '{self.full_name}'. {str(e)}")
 
-	async def sync_to_disk(self, path: Path) -> None:
-		with ThreadPoolExecutor() as executor:
-			await asyncio.get_event_loop().run_in_executor(executor, lambda: self.sync_to_disk_sync(path))
-
 
 class FileSystemState(BaseModel):
 	"""Serializable state of the file system"""
@@ -173,7 +249,11 @@ class FileSystemState(BaseModel):
 
 
 class FileSystem:
-	"""Enhanced file system with in-memory storage and multiple file type support"""
+	"""Enhanced file system with in-memory storage and multiple file type support
+
+	Disk writes are write-behind: changes are applied in memory and queued on a shared I/O worker, where queued writes
+	of the same file coalesce. `flush()` waits until everything is on disk.
+	"""
 
 	def __init__(self, base_dir: str | Path, create_default_files: bool = True):
 		# Handle the Path conversion before calling super().__init__
@@ -197,12 +277,58 @@ class FileSystem:
 		}
 
 		self.files = {}
+		self._pending_syncs: dict[str, Future[None]] = {}  # full filename -> latest queued or running disk write
 		if create_default_files:
 			self.default_files = ['todo.md']
 			self._create_default_files()
 
 		self.extracted_content_count = 0
 
+	def _schedule_sync(self, full_filename: str, file_obj: BaseFile) -> Future[None]:
+		"""Queue a disk write of the file's unflushed changes, unless a queued write will pick them up anyway"""
+		future = self._pending_syncs.get(full_filename)
+		if future is not None and not future.running() and not future.done():
+			return future
+
+		future = _get_file_io_executor().submit(file_obj.flush_sync, self.data_dir)
+		future.add_done_callback(lambda f: self._log_sync_error(full_filename, f))
+		self._pending_syncs[full_filename] = future
+		return future
+
+	@staticmethod
+	def _log_sync_error(full_filename: str, future: Future[None]) -> None:
+		if not future.cancelled() and (error := future.exception()) is not None:
+			logger.error(f"💾 Could not write file '{full_filename}' to disk: {error}")
+
+	async def _sync(self, full_filename: str, file_obj: BaseFile) -> None:
+		future = self._schedule_sync(full_filename, file_obj)
+		if not file_obj.write_behind:
+			await asyncio.wrap_future(future)
+
+	def _schedule_flush(self) -> list[Future[None]]:
+		"""Queue writes of all unflushed changes (failed writes are retried as full rewrites), return all pending writes"""
+		for full_filename, file_obj in self.files.items():
+			if file_obj.has_unflushed_changes:
+				self._schedule_sync(full_filename, file_obj)
+		return list(self._pending_syncs.values())
+
+	def _forget_done_syncs(self) -> None:
+		self._pending_syncs = {name: future for name, future in self._pending_syncs.items() if not future.done()}
+
+	async def flush(self) -> None:
+		"""Wait until all pending writes are on disk, without blocking the event loop (errors are logged, not raised)"""
+		await asyncio.gather(*(asyncio.wrap_future(future) for future in self._schedule_flush()), return_exceptions=True)
+		self._forget_done_syncs()
+
+	def flush_blocking(self) -> None:
+		"""Same as `flush`, for callers outside the event loop: blocks the calling thread until the writes are done"""
+		wait(self._schedule_flush())
+		self._forget_done_syncs()
+
+	async def close(self) -> None:
+		"""Flush all pending writes"""
+		await self.flush()
+
 	def get_allowed_extensions(self) -> list[str]:
 		"""Get allowed extensions"""
 		return list(self._file_types.keys())
@@ -331,7 +457,8 @@ class FileSystem:
 				self.files[full_filename] = file_obj  # Use full filename as key
 
 			# Use file-specific write method
-			await file_obj.write(content, self.data_dir)
+			file_obj.write_file_content(content)
+			await self._sync(full_filename, file_obj)
 			return f'Data written to file {full_filename} successfully.'
 		except FileSystemError as e:
 			return str(e)
@@ -348,7 +475,8 @@ class FileSystem:
 			return f"File '{full_filename}' not found."
 
 		try:
-			await file_obj.append(content, self.data_dir)
+			file_obj.append_file_content(content)
+			await self._sync(full_filename, file_obj)
 			return f'Data appended to file {full_filename} successfully.'
 		except FileSystemError as e:
 			return str(e)
@@ -370,7 +498,8 @@ class FileSystem:
 		try:
 			content = file_obj.read()
 			content = content.replace(old_str, new_str)
-			await file_obj.write(content, self.data_dir)
+			file_obj.write_file_content(content)
+			await self._sync(full_filename, file_obj)
 			return f'Successfully replaced all occurrences of "{old_str}" with "{new_str}" in file {full_filename}'
 		except FileSystemError as e:
 			return str(e)
@@ -382,8 +511,9 @@ class FileSystem:
 		initial_filename = f'extracted_content_{self.extracted_content_count}'
 		extracted_filename = f'{initial_filename}.md'
 		file_obj = MarkdownFile(name=initial_filename)
-		await file_obj.write(content, self.data_dir)
+		file_obj.write_file_content(content)
 		self.files[extracted_filename] = file_obj
+		await self._sync(extracted_filename, file_obj)
 		self.extracted_content_count += 1
 		return extracted_filename
 
@@ -477,6 +607,8 @@ class FileSystem:
 
 	def nuke(self) -> None:
 		"""Delete the file system directory"""
+		# pending writes would recreate files in the deleted directory
+		self.flush_blocking()
 		shutil.rmtree(self.data_dir)
 
 	@classmethod
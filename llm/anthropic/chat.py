@@ -1,5 +1,5 @@
 import json
-from collections.abc import Mapping
+from collections.abc import AsyncIterator, Mapping
 from dataclasses import dataclass
 from typing import Any, TypeVar, overload
 
@@ -24,7 +24,7 @@ from browser_use.llm.base import BaseChatModel
 from browser_use.llm.exceptions import ModelProviderError, ModelRateLimitError
 from browser_use.llm.messages import BaseMessage
 from browser_use.llm.schema import SchemaOptimizer
-from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeUsage
+from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeStreamChunk, ChatInvokeUsage
 
 T = TypeVar('T', bound=BaseModel)
 
@@ -124,6 +124,27 @@ class ChatAnthropic(BaseChatModel):
 		)
 		return usage
 
+	def _get_output_tool(self, output_format: type[BaseModel]) -> tuple[ToolParam, ToolChoiceToolParam]:
+		"""A tool that represents the output format, and the tool choice that forces the model to use it."""
+		tool_name = output_format.__name__
+		schema = SchemaOptimizer.create_optimized_json_schema(output_format)
+
+		# Remove title from schema if present (Anthropic doesn't like it in parameters)
+		if 'title' in schema:
+			del schema['title']
+
+		tool = ToolParam(
+			name=tool_name,
+			description=f'Extract information in the format of {tool_name}',
+			input_schema=schema,
+			cache_control=CacheControlEphemeralParam(type='ephemeral'),
+		)
+
+		# Force the model to use this tool
+		tool_choice = ToolChoiceToolParam(type='tool', name=tool_name)
+
+		return tool, tool_choice
+
 	@overload
 	async def ainvoke(self, messages: list[BaseMessage], output_format: None = None) -> ChatInvokeCompletion[str]: ...
 
@@ -171,23 +192,7 @@ class ChatAnthropic(BaseChatModel):
 
 			else:
 				# Use tool calling for structured output
-				# Create a tool that represents the output format
-				tool_name = output_format.__name__
-				schema = SchemaOptimizer.create_optimized_json_schema(output_format)
-
-				# Remove title from schema if present (Anthropic doesn't like it in parameters)
-				if 'title' in schema:
-					del schema['title']
-
-				tool = ToolParam(
-					name=tool_name,
-					description=f'Extract information in the format of {tool_name}',
-					input_schema=schema,
-					cache_control=CacheControlEphemeralParam(type='ephemeral'),
-				)
-
-				# Force the model to use this tool
-				tool_choice = ToolChoiceToolParam(type='tool', name=tool_name)
+				tool, tool_choice = self._get_output_tool(output_format)
 
 				response = await self.get_client().messages.create(
 					model=self.model,
@@ -232,11 +237,58 @@ class ChatAnthropic(BaseChatModel):
 				# If no tool use block found, raise an error
 				raise ValueError('Expected tool use in response but none found')
 
-		except APIConnectionError as e:
-			raise ModelProviderError(message=e.message, model=self.name) from e
-		except RateLimitError as e:
-			raise ModelRateLimitError(message=e.message, model=self.name) from e
-		except APIStatusError as e:
-			raise ModelProviderError(message=e.message, status_code=e.status_code, model=self.name) from e
 		except Exception as e:
-			raise ModelProviderError(message=str(e), model=self.name) from e
+			raise self._provider_error(e) from e
+
+	async def astream(self, messages: list[BaseMessage], output_format: type[T]) -> AsyncIterator[ChatInvokeStreamChunk]:
+		"""
+		Stream the structured output of the model as pieces of its JSON (see browser_use.llm.streaming).
+
+		The output is the input of the forced output tool, streamed as `input_json_delta` events.
+
+		Args:
+			messages: List of chat messages
+			output_format: Pydantic model class of the structured output
+
+		Yields:
+			The generated text, the usage and stop reason with the last chunk
+		"""
+		anthropic_messages, system_prompt = AnthropicMessageSerializer.serialize_messages(messages)
+		tool, tool_choice = self._get_output_tool(output_format)
+
+		try:
+			stream = await self.get_client().messages.create(
+				model=self.model,
+				messages=anthropic_messages,
+				tools=[tool],
+				system=system_prompt or omit,
+				tool_choice=tool_choice,
+				stream=True,
+				**self._get_client_params_for_invoke(),
+			)
+
+			message: Message | None = None
+			async for event in stream:
+				if event.type == 'message_start':
+					message = event.message
+				elif event.type == 'content_block_delta' and event.delta.type == 'input_json_delta':
+					yield ChatInvokeStreamChunk(text=event.delta.partial_json)
+				elif event.type == 'message_delta' and message is not None:
+					# input tokens are reported with message_start, the output tokens grow until the end
+					message.usage.output_tokens = event.usage.output_tokens
+					message.stop_reason = event.delta.stop_reason
+
+			if message is not None:
+				yield ChatInvokeStreamChunk(usage=self._get_usage(message), stop_reason=message.stop_reason)
+
+		except Exception as e:
+			raise self._provider_error(e) from e
+
+	def _provider_error(self, e: Exception) -> ModelProviderError:
+		if isinstance(e, APIConnectionError):
+			return ModelProviderError(message=e.message, model=self.name)
+		if isinstance(e, RateLimitError):
+			return ModelRateLimitError(message=e.message, model=self.name)
+		if isinstance(e, APIStatusError):
+			return ModelProviderError(message=e.message, status_code=e.status_code, model=self.name)
+		return ModelProviderError(message=str(e), model=self.name)
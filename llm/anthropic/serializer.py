@@ -16,6 +16,7 @@ from browser_use.llm.messages import (
 	BaseMessage,
 	ContentPartImageParam,
 	ContentPartTextParam,
+	ImageURL,
 	SupportedImageMediaType,
 	SystemMessage,
 	UserMessage,
@@ -33,14 +34,9 @@ class AnthropicMessageSerializer:
 		return url.startswith('data:image/')
 
 	@staticmethod
-	def _parse_base64_url(url: str) -> tuple[SupportedImageMediaType, str]:
-		"""Parse a base64 data URL to extract media type and data."""
-		# Format: data:image/jpeg;base64,<data>
-		if not url.startswith('data:'):
-			raise ValueError(f'Invalid base64 URL: {url}')
-
-		header, data = url.split(',', 1)
-		media_type = header.split(';')[0].replace('data:', '')
+	def _parse_base64_url(image_url: ImageURL) -> tuple[SupportedImageMediaType, str]:
+		"""Parse a base64 data URL to extract media type and data (split once per image, see `ImageURL.data_url_parts`)."""
+		media_type, data = image_url.data_url_parts()
 
 		# Ensure it's a supported media type
 		supported_types = ['image/jpeg', 'image/png', 'image/gif', 'image/webp']
@@ -57,6 +53,11 @@ class AnthropicMessageSerializer:
 			return CacheControlEphemeralParam(type='ephemeral')
 		return None
 
+	@staticmethod
+	def _has_part_cache_breakpoints(content: str | list) -> bool:
+		"""Whether the content marks its own cache breakpoints (only those text parts get cache_control then)."""
+		return not isinstance(content, str) and any(part.type == 'text' and part.cache for part in content)
+
 	@staticmethod
 	def _serialize_content_part_text(part: ContentPartTextParam, use_cache: bool) -> TextBlockParam:
 		"""Convert a text content part to Anthropic's TextBlockParam."""
@@ -71,7 +72,7 @@ class AnthropicMessageSerializer:
 
 		if AnthropicMessageSerializer._is_base64_image(url):
 			# Handle base64 encoded images
-			media_type, data = AnthropicMessageSerializer._parse_base64_url(url)
+			media_type, data = AnthropicMessageSerializer._parse_base64_url(part.image_url)
 			return ImageBlockParam(
 				source=Base64ImageSourceParam(
 					data=data,
@@ -97,10 +98,13 @@ class AnthropicMessageSerializer:
 			else:
 				return content
 
+		part_breakpoints = AnthropicMessageSerializer._has_part_cache_breakpoints(content)
 		serialized_blocks: list[TextBlockParam] = []
 		for part in content:
 			if part.type == 'text':
-				serialized_blocks.append(AnthropicMessageSerializer._serialize_content_part_text(part, use_cache))
+				serialized_blocks.append(
+					AnthropicMessageSerializer._serialize_content_part_text(part, use_cache and (part.cache or not part_breakpoints))
+				)
 
 		return serialized_blocks
 
@@ -116,10 +120,13 @@ class AnthropicMessageSerializer:
 			else:
 				return content
 
+		part_breakpoints = AnthropicMessageSerializer._has_part_cache_breakpoints(content)
 		serialized_blocks: list[TextBlockParam | ImageBlockParam] = []
 		for part in content:
 			if part.type == 'text':
-				serialized_blocks.append(AnthropicMessageSerializer._serialize_content_part_text(part, use_cache))
+				serialized_blocks.append(
+					AnthropicMessageSerializer._serialize_content_part_text(part, use_cache and (part.cache or not part_breakpoints))
+				)
 			elif part.type == 'image_url':
 				serialized_blocks.append(AnthropicMessageSerializer._serialize_content_part_image(part))
 
@@ -170,8 +177,13 @@ class AnthropicMessageSerializer:
 		handled separately as the system parameter in the API call, not as a message.
 		If a SystemMessage is passed here, it will be converted to a user message.
 		"""
+		return AnthropicMessageSerializer._serialize(message, use_cache=message.cache)
+
+	@staticmethod
+	def _serialize(message: BaseMessage, use_cache: bool) -> MessageParam | SystemMessage:
+		"""Serialize a message, with `use_cache` instead of `message.cache` (so the message isn't copied to change it)."""
 		if isinstance(message, UserMessage):
-			content = AnthropicMessageSerializer._serialize_content(message.content, use_cache=message.cache)
+			content = AnthropicMessageSerializer._serialize_content(message.content, use_cache=use_cache)
 			return MessageParam(role='user', content=content)
 
 		elif isinstance(message, SystemMessage):
@@ -190,14 +202,14 @@ class AnthropicMessageSerializer:
 						TextBlockParam(
 							text=message.content,
 							type='text',
-							cache_control=AnthropicMessageSerializer._serialize_cache_control(message.cache),
+							cache_control=AnthropicMessageSerializer._serialize_cache_control(use_cache),
 						)
 					)
 				else:
 					# Process content parts (text and refusal)
 					for part in message.content:
 						if part.type == 'text':
-							blocks.append(AnthropicMessageSerializer._serialize_content_part_text(part, use_cache=message.cache))
+							blocks.append(AnthropicMessageSerializer._serialize_content_part_text(part, use_cache=use_cache))
 						# # Note: Anthropic doesn't have a specific refusal block type,
 						# # so we convert refusals to text blocks
 						# elif part.type == 'refusal':
@@ -205,9 +217,7 @@ class AnthropicMessageSerializer:
 
 			# Add tool use blocks if present
 			if message.tool_calls:
-				tool_blocks = AnthropicMessageSerializer._serialize_tool_calls_to_content(
-					message.tool_calls, use_cache=message.cache
-				)
+				tool_blocks = AnthropicMessageSerializer._serialize_tool_calls_to_content(message.tool_calls, use_cache=use_cache)
 				blocks.extend(tool_blocks)
 
 			# If no content or tool calls, add empty text block
@@ -215,13 +225,13 @@ class AnthropicMessageSerializer:
 			if not blocks:
 				blocks.append(
 					TextBlockParam(
-						text='', type='text', cache_control=AnthropicMessageSerializer._serialize_cache_control(message.cache)
+						text='', type='text', cache_control=AnthropicMessageSerializer._serialize_cache_control(use_cache)
 					)
 				)
 
 			# If caching is enabled or we have multiple blocks, return blocks as-is
 			# Otherwise, simplify single text blocks to plain string
-			if message.cache or len(blocks) > 1:
+			if use_cache or len(blocks) > 1:
 				content = blocks
 			else:
 				# Only simplify when no caching and single block
@@ -239,6 +249,14 @@ class AnthropicMessageSerializer:
 		else:
 			raise ValueError(f'Unknown message type: {type(message)}')
 
+	@staticmethod
+	def _last_cache_index(messages: list[NonSystemMessage]) -> int:
+		"""Index of the last message with cache=True, -1 if there is none."""
+		for i in range(len(messages) - 1, -1, -1):
+			if messages[i].cache:
+				return i
+		return -1
+
 	@staticmethod
 	def _clean_cache_messages(messages: list[NonSystemMessage]) -> list[NonSystemMessage]:
 		"""Clean cache settings so only the last cache=True message remains cached.
@@ -252,27 +270,12 @@ class AnthropicMessageSerializer:
 		Returns:
 			List of messages with cleaned cache settings
 		"""
-		if not messages:
-			return messages
-
-		# Create a copy to avoid modifying the original
-		cleaned_messages = [msg.model_copy(deep=True) for msg in messages]
+		last_cache_index = AnthropicMessageSerializer._last_cache_index(messages)
 
-		# Find the last message with cache=True
-		last_cache_index = -1
-		for i in range(len(cleaned_messages) - 1, -1, -1):
-			if cleaned_messages[i].cache:
-				last_cache_index = i
-				break
-
-		# If we found a cached message, disable cache for all others
-		if last_cache_index != -1:
-			for i, msg in enumerate(cleaned_messages):
-				if i != last_cache_index and msg.cache:
-					# Set cache to False for all messages except the last cached one
-					msg.cache = False
-
-		return cleaned_messages
+		# Shallow copies of the messages that change only, the originals are left untouched
+		return [
+			msg.model_copy(update={'cache': False}) if msg.cache and i != last_cache_index else msg for i, msg in enumerate(messages)
+		]
 
 	@staticmethod
 	def serialize_messages(messages: list[BaseMessage]) -> tuple[list[MessageParam], list[TextBlockParam] | str | None]:
@@ -282,8 +285,6 @@ class AnthropicMessageSerializer:
 		    A tuple of (messages, system_message) where system_message is extracted
 		    from any SystemMessage in the list.
 		"""
-		messages = [m.model_copy(deep=True) for m in messages]
-
 		# Separate system messages from normal messages
 		normal_messages: list[NonSystemMessage] = []
 		system_message: SystemMessage | None = None
@@ -294,13 +295,13 @@ class AnthropicMessageSerializer:
 			else:
 				normal_messages.append(message)
 
-		# Clean cache messages so only the last cache=True message remains cached
-		normal_messages = AnthropicMessageSerializer._clean_cache_messages(normal_messages)
+		# Only the last cache=True message remains cached (see _clean_cache_messages), without copying the messages
+		last_cache_index = AnthropicMessageSerializer._last_cache_index(normal_messages)
 
 		# Serialize normal messages
 		serialized_messages: list[MessageParam] = []
-		for message in normal_messages:
-			serialized_messages.append(AnthropicMessageSerializer.serialize(message))
+		for i, message in enumerate(normal_messages):
+			serialized_messages.append(AnthropicMessageSerializer._serialize(message, use_cache=i == last_cache_index))  # type: ignore[arg-type]
 
 		# Serialize system message
 		serialized_system_message: list[TextBlockParam] | str | None = None
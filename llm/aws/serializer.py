@@ -1,4 +1,3 @@
-import base64
 import json
 import re
 from typing import Any, overload
@@ -9,6 +8,7 @@ from browser_use.llm.messages import (
 	ContentPartImageParam,
 	ContentPartRefusalParam,
 	ContentPartTextParam,
+	ImageURL,
 	SystemMessage,
 	ToolCall,
 	UserMessage,
@@ -31,16 +31,12 @@ class AWSBedrockMessageSerializer:
 		)
 
 	@staticmethod
-	def _parse_base64_url(url: str) -> tuple[str, bytes]:
-		"""Parse a base64 data URL to extract format and raw bytes."""
-		# Format: data:image/jpeg;base64,<data>
-		if not url.startswith('data:'):
-			raise ValueError(f'Invalid base64 URL: {url}')
-
-		header, data = url.split(',', 1)
+	def _parse_base64_url(image_url: ImageURL) -> tuple[str, bytes]:
+		"""Extract format and raw bytes of a base64 data URL (decoded once per image, see `ImageURL.data_bytes`)."""
+		media_type, _ = image_url.data_url_parts()
 
 		# Extract format from mime type
-		mime_match = re.search(r'image/(\w+)', header)
+		mime_match = re.search(r'image/(\w+)', media_type)
 		if mime_match:
 			format_name = mime_match.group(1).lower()
 			# Map common formats
@@ -51,7 +47,7 @@ class AWSBedrockMessageSerializer:
 
 		# Decode base64 data
 		try:
-			image_bytes = base64.b64decode(data)
+			image_bytes = image_url.data_bytes()
 		except Exception as e:
 			raise ValueError(f'Failed to decode base64 image data: {e}')
 
@@ -99,7 +95,7 @@ class AWSBedrockMessageSerializer:
 
 		if AWSBedrockMessageSerializer._is_base64_image(url):
 			# Handle base64 encoded images
-			image_format, image_bytes = AWSBedrockMessageSerializer._parse_base64_url(url)
+			image_format, image_bytes = AWSBedrockMessageSerializer._parse_base64_url(part.image_url)
 		elif AWSBedrockMessageSerializer._is_url_image(url):
 			# Download and convert URL images
 			image_format, image_bytes = AWSBedrockMessageSerializer._download_and_convert_image(url)
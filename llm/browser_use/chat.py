@@ -189,7 +189,11 @@ class ChatBrowserUse(BaseChatModel):
 		"""Serialize a message to JSON format."""
 		# Handle Union types by checking the actual message type
 		msg_dict = message.model_dump()
+		content = msg_dict['content']
+		if isinstance(content, list):
+			# part cache breakpoints only steer local prompt caching, they are not part of the API format
+			content = [{key: value for key, value in part.items() if key != 'cache'} for part in content]
 		return {
 			'role': msg_dict['role'],
-			'content': msg_dict['content'],
+			'content': content,
 		}
@@ -0,0 +1,225 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Literal, TypeVar, overload
+
+import anyio
+from pydantic import BaseModel
+
+from browser_use.config import CONFIG
+from browser_use.llm.base import BaseChatModel
+from browser_use.llm.exceptions import ModelCacheMissError
+from browser_use.llm.messages import BaseMessage
+from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeUsage
+
+T = TypeVar('T', bound=BaseModel)
+
+logger = logging.getLogger(__name__)
+
+CacheMode = Literal['record', 'replay', 'passthrough']
+
+# attributes of the wrapped model that change its responses and are part of the cache key (if the model has them)
+SAMPLING_PARAMS = (
+	'temperature',
+	'top_p',
+	'top_k',
+	'seed',
+	'max_tokens',
+	'max_completion_tokens',
+	'max_output_tokens',
+	'frequency_penalty',
+	'presence_penalty',
+	'reasoning_effort',
+	'thinking_budget',
+	'stop',
+)
+
+
+def default_cache_path() -> Path:
+	return CONFIG.XDG_CACHE_HOME / 'browseruse' / 'llm_responses.sqlite3'
+
+
+class LLMResponseStore:
+	"""SQLite store of serialized LLM responses by request key, evicting the least recently used beyond `max_bytes`.
+
+	Safe to share between threads and processes (WAL journal), e.g. parallel eval runs recording into one file.
+	"""
+
+	def __init__(self, path: str | Path, max_bytes: int = 512 * 1024 * 1024):
+		self.path = Path(path)
+		self.max_bytes = max_bytes
+		self.path.parent.mkdir(parents=True, exist_ok=True)
+
+		self._lock = threading.Lock()
+		self._connection = sqlite3.connect(self.path, check_same_thread=False, timeout=30.0, isolation_level=None)
+		self._connection.execute('PRAGMA journal_mode=WAL')
+		self._connection.execute('PRAGMA synchronous=NORMAL')
+		self._connection.execute(
+			'CREATE TABLE IF NOT EXISTS responses ('
+			'key TEXT PRIMARY KEY, model TEXT NOT NULL, response TEXT NOT NULL, size INTEGER NOT NULL, '
+			'created_at REAL NOT NULL, last_used_at REAL NOT NULL)'
+		)
+		self._connection.execute('CREATE INDEX IF NOT EXISTS responses_last_used_at ON responses (last_used_at)')
+
+	def get(self, key: str) -> str | None:
+		with self._lock:
+			row = self._connection.execute('SELECT response FROM responses WHERE key = ?', (key,)).fetchone()
+			if row is None:
+				return None
+			self._connection.execute('UPDATE responses SET last_used_at = ? WHERE key = ?', (time.time(), key))
+			return row[0]
+
+	def put(self, key: str, model: str, response: str) -> None:
+		size = len(response.encode())
+		now = time.time()
+		with self._lock:
+			self._connection.execute(
+				'INSERT OR REPLACE INTO responses (key, model, response, size, created_at, last_used_at) VALUES (?, ?, ?, ?, ?, ?)',
+				(key, model, response, size, now, now),
+			)
+			self._evict()
+
+	def _evict(self) -> None:
+		(total_bytes,) = self._connection.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()
+		if total_bytes <= self.max_bytes:
+			return
+
+		evicted = 0
+		rows = self._connection.execute('SELECT key, size FROM responses ORDER BY last_used_at').fetchall()
+		# keep at least the most recent response, even if it alone exceeds the limit
+		for key, size in rows[:-1]:
+			if total_bytes <= self.max_bytes:
+				break
+			self._connection.execute('DELETE FROM responses WHERE key = ?', (key,))
+			total_bytes -= size
+			evicted += 1
+		logger.debug(f'LLM response cache exceeded {self.max_bytes} bytes, evicted {evicted} responses')
+
+	def __len__(self) -> int:
+		with self._lock:
+			return self._connection.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+	def clear(self) -> None:
+		with self._lock:
+			self._connection.execute('DELETE FROM responses')
+
+	def close(self) -> None:
+		with self._lock:
+			self._connection.close()
+
+
+@dataclass
+class ChatCached(BaseChatModel):
+	"""
+	Caches the responses of another model on disk, for reproducible (and free) reruns of eval tasks and benchmarks.
+
+	Requests are keyed by a hash of the serialized messages, the model, the output schema and the model's sampling
+	parameters. Modes:
+	- 'record': answer from the cache, call the model on a miss and store its response
+	- 'replay': only answer from the cache, a miss raises ModelCacheMissError (no network access)
+	- 'passthrough': always call the model, the cache is neither read nor written
+
+	Replayed responses carry the usage of the recorded call, so token accounting matches the recorded run.
+	"""
+
+	llm: BaseChatModel
+	mode: CacheMode = 'record'
+	path: str | Path | None = None
+	max_bytes: int = 512 * 1024 * 1024
+
+	hits: int = field(default=0, init=False)
+	misses: int = field(default=0, init=False)
+	store: LLMResponseStore = field(init=False, repr=False)
+
+	def __post_init__(self) -> None:
+		if self.mode not in ('record', 'replay', 'passthrough'):
+			raise ValueError(f"mode must be 'record', 'replay' or 'passthrough', got {self.mode!r}")
+		self.model = self.llm.model
+		self.store = LLMResponseStore(self.path or default_cache_path(), max_bytes=self.max_bytes)
+
+	# Static
+	@property
+	def provider(self) -> str:
+		return self.llm.provider
+
+	@property
+	def name(self) -> str:
+		return self.llm.name
+
+	def cache_key(self, messages: list[BaseMessage], output_format: type[BaseModel] | None, **kwargs: Any) -> str:
+		"""Canonical hash of everything that determines the response"""
+		request = {
+			'provider': self.llm.provider,
+			'model': str(self.llm.model),
+			'params': {name: getattr(self.llm, name) for name in SAMPLING_PARAMS if getattr(self.llm, name, None) is not None},
+			'kwargs': kwargs,
+			'output_schema': output_format.model_json_schema() if output_format is not None else None,
+			'messages': [message.model_dump(mode='json') for message in messages],
+		}
+		canonical = json.dumps(request, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+		return hashlib.sha256(canonical.encode()).hexdigest()
+
+	@staticmethod
+	def _serialize(response: ChatInvokeCompletion) -> str:
+		completion = response.completion
+		return json.dumps(
+			{
+				'completion': completion.model_dump(mode='json') if isinstance(completion, BaseModel) else completion,
+				'thinking': response.thinking,
+				'redacted_thinking': response.redacted_thinking,
+				'usage': response.usage.model_dump(mode='json') if response.usage else None,
+				'stop_reason': response.stop_reason,
+			}
+		)
+
+	@staticmethod
+	def _deserialize(data: str, output_format: type[T] | None) -> ChatInvokeCompletion:
+		entry = json.loads(data)
+		completion = output_format.model_validate(entry['completion']) if output_format is not None else entry['completion']
+		return ChatInvokeCompletion(
+			completion=completion,
+			thinking=entry['thinking'],
+			redacted_thinking=entry['redacted_thinking'],
+			usage=ChatInvokeUsage.model_validate(entry['usage']) if entry['usage'] else None,
+			stop_reason=entry['stop_reason'],
+		)
+
+	@overload
+	async def ainvoke(self, messages: list[BaseMessage], output_format: None = None) -> ChatInvokeCompletion[str]: ...
+
+	@overload
+	async def ainvoke(self, messages: list[BaseMessage], output_format: type[T]) -> ChatInvokeCompletion[T]: ...
+
+	async def ainvoke(
+		self, messages: list[BaseMessage], output_format: type[T] | None = None, **kwargs: Any
+	) -> ChatInvokeCompletion[T] | ChatInvokeCompletion[str]:
+		if self.mode == 'passthrough':
+			return await self.llm.ainvoke(messages, output_format, **kwargs)
+
+		key = self.cache_key(messages, output_format, **kwargs)
+		cached = await anyio.to_thread.run_sync(self.store.get, key)
+		if cached is not None:
+			try:
+				response = self._deserialize(cached, output_format)
+				self.hits += 1
+				return response
+			except Exception as e:
+				# e.g. recorded with an older version of the output model
+				logger.debug(f'Discarding cached response {key[:12]} of {self.name}: {type(e).__name__}: {e}')
+
+		self.misses += 1
+		if self.mode == 'replay':
+			raise ModelCacheMissError(
+				f'No recorded response of {self.name} for this request (key {key[:12]}) in {self.store.path}',
+				cache_key=key,
+				model=self.name,
+			)
+
+		response = await self.llm.ainvoke(messages, output_format, **kwargs)
+		await anyio.to_thread.run_sync(self.store.put, key, self.name, self._serialize(response))
+		return response
@@ -37,6 +37,9 @@ class CerebrasMessageSerializer:
 			return ''
 		if isinstance(content, str):
 			return content
+		if all(part.type == 'text' for part in content):
+			# text-only models reject content arrays, and text parts carry nothing beyond their text
+			return '\n'.join(part.text for part in content)
 		serialized: list[dict[str, Any]] = []
 		for part in content:
 			if part.type == 'text':
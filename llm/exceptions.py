@@ -27,3 +27,13 @@ class ModelRateLimitError(ModelProviderError):
 		model: str | None = None,
 	):
 		super().__init__(message, status_code, model)
+
+
+class ModelCacheMissError(ModelError):
+	"""Exception raised when a cached model in replay mode has no recorded response for a request."""
+
+	def __init__(self, message: str, cache_key: str, model: str | None = None):
+		super().__init__(message)
+		self.message = message
+		self.cache_key = cache_key
+		self.model = model
@@ -2,6 +2,7 @@ import asyncio
 import json
 import logging
 import time
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from typing import Any, Literal, TypeVar, overload
 
@@ -14,9 +15,9 @@ from pydantic import BaseModel
 from browser_use.llm.base import BaseChatModel
 from browser_use.llm.exceptions import ModelProviderError
 from browser_use.llm.google.serializer import GoogleMessageSerializer
-from browser_use.llm.messages import BaseMessage
+from browser_use.llm.messages import BaseMessage, ContentPartTextParam
 from browser_use.llm.schema import SchemaOptimizer
-from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeUsage
+from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeStreamChunk, ChatInvokeUsage
 
 T = TypeVar('T', bound=BaseModel)
 
@@ -169,31 +170,8 @@ class ChatGoogle(BaseChatModel):
 
 		return usage
 
-	@overload
-	async def ainvoke(self, messages: list[BaseMessage], output_format: None = None) -> ChatInvokeCompletion[str]: ...
-
-	@overload
-	async def ainvoke(self, messages: list[BaseMessage], output_format: type[T]) -> ChatInvokeCompletion[T]: ...
-
-	async def ainvoke(
-		self, messages: list[BaseMessage], output_format: type[T] | None = None
-	) -> ChatInvokeCompletion[T] | ChatInvokeCompletion[str]:
-		"""
-		Invoke the model with the given messages.
-
-		Args:
-			messages: List of chat messages
-			output_format: Optional Pydantic model class for structured output
-
-		Returns:
-			Either a string response or an instance of output_format
-		"""
-
-		# Serialize messages to Google format with the include_system_in_user flag
-		contents, system_instruction = GoogleMessageSerializer.serialize_messages(
-			messages, include_system_in_user=self.include_system_in_user
-		)
-
+	def _get_config(self, system_instruction: Any) -> types.GenerateContentConfigDict:
+		"""Generation config of a request, the user-provided config with the model settings applied."""
 		# Build config dictionary starting with user-provided config
 		config: types.GenerateContentConfigDict = {}
 		if self.config:
@@ -224,6 +202,53 @@ class ChatGoogle(BaseChatModel):
 		if self.max_output_tokens is not None:
 			config['max_output_tokens'] = self.max_output_tokens
 
+		return config
+
+	def _add_json_instruction(self, messages: list[BaseMessage], output_format: type[BaseModel]) -> list[BaseMessage]:
+		"""Ask for JSON in a copy of the last message, for models without native JSON mode."""
+		modified_messages = list(messages)
+		if not modified_messages:
+			return modified_messages
+
+		json_instruction = f'\n\nPlease respond with a valid JSON object that matches this schema: {SchemaOptimizer.create_optimized_json_schema(output_format)}'
+		content = modified_messages[-1].content
+		if isinstance(content, str):
+			content = content + json_instruction
+		elif content is not None:
+			# state messages are lists of content parts (text, and images with vision)
+			content = list(content) + [ContentPartTextParam(text=json_instruction)]
+		else:
+			return modified_messages
+		modified_messages[-1] = modified_messages[-1].model_copy(update={'content': content})
+		return modified_messages
+
+	@overload
+	async def ainvoke(self, messages: list[BaseMessage], output_format: None = None) -> ChatInvokeCompletion[str]: ...
+
+	@overload
+	async def ainvoke(self, messages: list[BaseMessage], output_format: type[T]) -> ChatInvokeCompletion[T]: ...
+
+	async def ainvoke(
+		self, messages: list[BaseMessage], output_format: type[T] | None = None
+	) -> ChatInvokeCompletion[T] | ChatInvokeCompletion[str]:
+		"""
+		Invoke the model with the given messages.
+
+		Args:
+			messages: List of chat messages
+			output_format: Optional Pydantic model class for structured output
+
+		Returns:
+			Either a string response or an instance of output_format
+		"""
+
+		# Serialize messages to Google format with the include_system_in_user flag
+		contents, system_instruction = GoogleMessageSerializer.serialize_messages(
+			messages, include_system_in_user=self.include_system_in_user
+		)
+
+		config = self._get_config(system_instruction)
+
 		async def _make_api_call():
 			start_time = time.time()
 			self.logger.debug(f'🚀 Starting API call to {self.model}')
@@ -333,13 +358,8 @@ class ChatGoogle(BaseChatModel):
 					else:
 						# Fallback: Request JSON in the prompt for models without native JSON mode
 						self.logger.debug(f'🔄 Using fallback JSON mode for {output_format.__name__}')
-						# Create a copy of messages to modify
-						modified_messages = [m.model_copy(deep=True) for m in messages]
-
-						# Add JSON instruction to the last message
-						if modified_messages and isinstance(modified_messages[-1].content, str):
-							json_instruction = f'\n\nPlease respond with a valid JSON object that matches this schema: {SchemaOptimizer.create_optimized_json_schema(output_format)}'
-							modified_messages[-1].content += json_instruction
+						# Add JSON instruction to a copy of the last message (the others are serialized as they are)
+						modified_messages = self._add_json_instruction(messages, output_format)
 
 						# Re-serialize with modified messages
 						fallback_contents, fallback_system = GoogleMessageSerializer.serialize_messages(
@@ -408,46 +428,94 @@ class ChatGoogle(BaseChatModel):
 			return await _make_api_call()
 
 		except Exception as e:
-			# Handle specific Google API errors with enhanced diagnostics
-			error_message = str(e)
-			status_code: int | None = None
-
-			# Enhanced timeout error handling
-			if 'timeout' in error_message.lower() or 'cancelled' in error_message.lower():
-				if isinstance(e, asyncio.CancelledError) or 'CancelledError' in str(type(e)):
-					enhanced_message = 'Gemini API request was cancelled (likely timeout). '
-					enhanced_message += 'This suggests the API is taking too long to respond. '
-					enhanced_message += (
-						'Consider: 1) Reducing input size, 2) Using a different model, 3) Checking network connectivity.'
-					)
-					error_message = enhanced_message
-					status_code = 504  # Gateway timeout
-					self.logger.error(f'🕐 Timeout diagnosis: Model: {self.model}')
-				else:
-					status_code = 408  # Request timeout
-			# Check if this is a rate limit error
-			elif any(
-				indicator in error_message.lower()
-				for indicator in ['rate limit', 'resource exhausted', 'quota exceeded', 'too many requests', '429']
-			):
-				status_code = 429
-			elif any(
-				indicator in error_message.lower()
-				for indicator in ['service unavailable', 'internal server error', 'bad gateway', '503', '502', '500']
+			raise self._provider_error(e) from e
+
+	async def astream(self, messages: list[BaseMessage], output_format: type[T]) -> AsyncIterator[ChatInvokeStreamChunk]:
+		"""
+		Stream the structured output of the model as pieces of its JSON (see browser_use.llm.streaming).
+
+		Models without native JSON mode (`supports_structured_output=False`) are asked for JSON in the prompt, the
+		streamed text may then wrap the JSON object in a markdown code block.
+
+		Args:
+			messages: List of chat messages
+			output_format: Pydantic model class of the structured output
+
+		Yields:
+			The generated text, the usage and stop reason with the last chunk
+		"""
+		if not self.supports_structured_output:
+			messages = self._add_json_instruction(messages, output_format)
+		contents, system_instruction = GoogleMessageSerializer.serialize_messages(
+			messages, include_system_in_user=self.include_system_in_user
+		)
+		config = self._get_config(system_instruction)
+		if self.supports_structured_output:
+			config['response_mime_type'] = 'application/json'
+			config['response_schema'] = self._fix_gemini_schema(SchemaOptimizer.create_gemini_optimized_schema(output_format))
+
+		try:
+			last_response: types.GenerateContentResponse | None = None
+			async for response in await self.get_client().aio.models.generate_content_stream(
+				model=self.model,
+				contents=contents,  # type: ignore
+				config=config,
 			):
-				status_code = 503
-
-			# Try to extract status code if available
-			if hasattr(e, 'response'):
-				response_obj = getattr(e, 'response', None)
-				if response_obj and hasattr(response_obj, 'status_code'):
-					status_code = getattr(response_obj, 'status_code', None)
-
-			raise ModelProviderError(
-				message=error_message,
-				status_code=status_code or 502,  # Use default if None
-				model=self.name,
-			) from e
+				last_response = response
+				yield ChatInvokeStreamChunk(text=response.text or '')
+
+			# usage metadata and finish reason are complete in the last response
+			if last_response is not None:
+				yield ChatInvokeStreamChunk(
+					usage=self._get_usage(last_response), stop_reason=self._get_stop_reason(last_response)
+				)
+
+		except Exception as e:
+			self.logger.error(f'💥 Streaming API call failed: {type(e).__name__}: {e}')
+			raise self._provider_error(e) from e
+
+	def _provider_error(self, e: BaseException) -> ModelProviderError:
+		"""Map an error of the Google API to a ModelProviderError with the closest status code."""
+		# Handle specific Google API errors with enhanced diagnostics
+		error_message = str(e)
+		status_code: int | None = None
+
+		# Enhanced timeout error handling
+		if 'timeout' in error_message.lower() or 'cancelled' in error_message.lower():
+			if isinstance(e, asyncio.CancelledError) or 'CancelledError' in str(type(e)):
+				enhanced_message = 'Gemini API request was cancelled (likely timeout). '
+				enhanced_message += 'This suggests the API is taking too long to respond. '
+				enhanced_message += (
+					'Consider: 1) Reducing input size, 2) Using a different model, 3) Checking network connectivity.'
+				)
+				error_message = enhanced_message
+				status_code = 504  # Gateway timeout
+				self.logger.error(f'🕐 Timeout diagnosis: Model: {self.model}')
+			else:
+				status_code = 408  # Request timeout
+		# Check if this is a rate limit error
+		elif any(
+			indicator in error_message.lower()
+			for indicator in ['rate limit', 'resource exhausted', 'quota exceeded', 'too many requests', '429']
+		):
+			status_code = 429
+		elif any(
+			indicator in error_message.lower()
+			for indicator in ['service unavailable', 'internal server error', 'bad gateway', '503', '502', '500']
+		):
+			status_code = 503
+
+		# Try to extract status code if available
+		if hasattr(e, 'response'):
+			response_obj = getattr(e, 'response', None)
+			if response_obj and hasattr(response_obj, 'status_code'):
+				status_code = getattr(response_obj, 'status_code', None)
+
+		return ModelProviderError(
+			message=error_message,
+			status_code=status_code or 502,  # Use default if None
+			model=self.name,
+		)
 
 	def _fix_gemini_schema(self, schema: dict[str, Any]) -> dict[str, Any]:
 		"""
@@ -1,5 +1,3 @@
-import base64
-
 from google.genai.types import Content, ContentListUnion, Part
 
 from browser_use.llm.messages import (
@@ -34,8 +32,6 @@ class GoogleMessageSerializer:
 		    - system_message: System instruction string or None
 		"""
 
-		messages = [m.model_copy(deep=True) for m in messages]
-
 		formatted_messages: ContentListUnion = []
 		system_message: str | None = None
 		system_parts: list[str] = []
@@ -76,40 +72,31 @@ class GoogleMessageSerializer:
 			# Initialize message parts
 			message_parts: list[Part] = []
 
-			# If this is the first user message and we have system parts, prepend them
+			# Extract content and create parts normally
+			if isinstance(message.content, str):
+				# Regular text content
+				message_parts = [Part.from_text(text=message.content)]
+			elif message.content is not None:
+				# Handle Iterable of content parts
+				for part in message.content:
+					if part.type == 'text':
+						message_parts.append(Part.from_text(text=part.text))
+					elif part.type == 'refusal':
+						message_parts.append(Part.from_text(text=f'[Refusal] {part.refusal}'))
+					elif part.type == 'image_url':
+						# Handle images (data URL decoded once per image, the bytes are shared between calls)
+						image_part = Part.from_bytes(data=part.image_url.data_bytes(), mime_type='image/jpeg')
+
+						message_parts.append(image_part)
+
+			# If this is the first user message and we have system parts, prepend them to its parts
 			if include_system_in_user and system_parts and role == 'user' and not formatted_messages:
 				system_text = '\n\n'.join(system_parts)
 				if isinstance(message.content, str):
-					message_parts.append(Part.from_text(text=f'{system_text}\n\n{message.content}'))
+					message_parts = [Part.from_text(text=f'{system_text}\n\n{message.content}')]
 				else:
-					# Add system text as the first part
-					message_parts.append(Part.from_text(text=system_text))
+					message_parts.insert(0, Part.from_text(text=system_text))
 				system_parts = []  # Clear after using
-			else:
-				# Extract content and create parts normally
-				if isinstance(message.content, str):
-					# Regular text content
-					message_parts = [Part.from_text(text=message.content)]
-				elif message.content is not None:
-					# Handle Iterable of content parts
-					for part in message.content:
-						if part.type == 'text':
-							message_parts.append(Part.from_text(text=part.text))
-						elif part.type == 'refusal':
-							message_parts.append(Part.from_text(text=f'[Refusal] {part.refusal}'))
-						elif part.type == 'image_url':
-							# Handle images
-							url = part.image_url.url
-
-							# Format: data:image/jpeg;base64,<data>
-							header, data = url.split(',', 1)
-							# Decode base64 to bytes
-							image_bytes = base64.b64decode(data)
-
-							# Add image part
-							image_part = Part.from_bytes(data=image_bytes, mime_type='image/jpeg')
-
-							message_parts.append(image_part)
 
 			# Create the Content object
 			if message_parts:
@@ -45,6 +45,9 @@ class GroqMessageSerializer:
 		"""Serialize content for user messages (text and images allowed)."""
 		if isinstance(content, str):
 			return content
+		if all(part.type == 'text' for part in content):
+			# text-only models reject content arrays, and text parts carry nothing beyond their text
+			return '\n'.join(part.text for part in content if part.type == 'text')
 
 		serialized_parts: list[ChatCompletionContentPartTextParam | ChatCompletionContentPartImageParam] = []
 		for part in content:
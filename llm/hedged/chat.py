@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, TypeVar, overload
+
+from pydantic import BaseModel
+
+from browser_use.llm.base import BaseChatModel
+from browser_use.llm.messages import BaseMessage
+from browser_use.llm.views import ChatInvokeCompletion
+
+T = TypeVar('T', bound=BaseModel)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ChatHedged(BaseChatModel):
+	"""
+	Hedges the requests of a primary model with a backup model (e.g. the same model at another provider).
+
+	Every request goes to the primary. If it hasn't answered after a percentile of its recent latencies (or failed),
+	the same request is sent to the backup, the first valid response wins and the other request is cancelled.
+
+	Registering the wrapper with a TokenCost registers the primary and the backup instead, so the usage of every
+	completed call is recorded under its own model. Cancelled requests report no usage.
+	"""
+
+	primary: BaseChatModel
+	backup: BaseChatModel
+
+	# send the backup request once the primary takes longer than this percentile of its recent latencies
+	hedge_percentile: float = 0.9
+	# hedge delay while fewer than min_samples latencies were observed
+	initial_hedge_delay: float = 10.0
+	min_hedge_delay: float = 1.0
+	max_hedge_delay: float | None = None
+	latency_window: int = 50
+	min_samples: int = 10
+
+	hedged_requests: int = field(default=0, init=False)
+	backup_wins: int = field(default=0, init=False)
+	_latencies: deque[float] = field(init=False, repr=False)
+
+	def __post_init__(self) -> None:
+		if not 0 < self.hedge_percentile < 1:
+			raise ValueError(f'hedge_percentile must be between 0 and 1, got {self.hedge_percentile}')
+		self.model = self.primary.model
+		self._latencies = deque(maxlen=self.latency_window)
+
+	# Static
+	@property
+	def provider(self) -> str:
+		return self.primary.provider
+
+	@property
+	def name(self) -> str:
+		return self.primary.name
+
+	@property
+	def inner_llms(self) -> list[BaseChatModel]:
+		"""Models whose usage is tracked instead of the wrapper's (see TokenCost.register_llm)"""
+		return [self.primary, self.backup]
+
+	@property
+	def hedge_delay(self) -> float:
+		"""Seconds to wait for the primary before sending the backup request"""
+		if len(self._latencies) < self.min_samples:
+			return self.initial_hedge_delay
+
+		# nearest-rank percentile of the recent primary latencies
+		latencies = sorted(self._latencies)
+		delay = latencies[max(0, math.ceil(self.hedge_percentile * len(latencies)) - 1)]
+		delay = max(delay, self.min_hedge_delay)
+		if self.max_hedge_delay is not None:
+			delay = min(delay, self.max_hedge_delay)
+		return delay
+
+	@overload
+	async def ainvoke(self, messages: list[BaseMessage], output_format: None = None) -> ChatInvokeCompletion[str]: ...
+
+	@overload
+	async def ainvoke(self, messages: list[BaseMessage], output_format: type[T]) -> ChatInvokeCompletion[T]: ...
+
+	async def ainvoke(
+		self, messages: list[BaseMessage], output_format: type[T] | None = None, **kwargs: Any
+	) -> ChatInvokeCompletion[T] | ChatInvokeCompletion[str]:
+		start = time.monotonic()
+		primary = asyncio.create_task(self.primary.ainvoke(messages, output_format, **kwargs))
+		pending: set[asyncio.Task] = {primary}
+		errors: list[BaseException] = []
+		backup: asyncio.Task | None = None
+
+		try:
+			done, _ = await asyncio.wait(pending, timeout=self.hedge_delay)
+			if primary in done and primary.exception() is None:
+				self._latencies.append(time.monotonic() - start)
+				return primary.result()
+
+			if primary in done:
+				pending.discard(primary)
+				errors.append(primary.exception())  # type: ignore[arg-type]
+				logger.debug(f'Primary model {self.primary.name} failed, sending request to {self.backup.name}')
+			else:
+				logger.debug(
+					f'Primary model {self.primary.name} slower than {time.monotonic() - start:.1f}s, '
+					f'hedging with {self.backup.name}'
+				)
+			self.hedged_requests += 1
+			backup = asyncio.create_task(self.backup.ainvoke(messages, output_format, **kwargs))
+			pending.add(backup)
+
+			while pending:
+				done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+				# prefer the primary if both finished in the same iteration
+				for task in sorted(done, key=lambda t: t is not primary):
+					if task.exception() is not None:
+						errors.append(task.exception())  # type: ignore[arg-type]
+						continue
+					if task is backup:
+						self.backup_wins += 1
+					else:
+						self._latencies.append(time.monotonic() - start)
+					return task.result()
+
+			# both failed, raise the error of the primary (or of the backup if the primary never failed)
+			raise errors[0]
+		finally:
+			if backup is not None and not primary.done():
+				# the primary lost after running this long: keeping it as a (lower bound) sample stops the
+				# percentile from drifting down to the latencies of the fast responses only
+				self._latencies.append(time.monotonic() - start)
+			for task in pending:
+				task.cancel()
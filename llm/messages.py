@@ -3,9 +3,11 @@ This implementation is based on the OpenAI types, while removing all the parts t
 """
 
 # region - Content parts
+import base64
 from typing import Literal, Union
 
 from openai import BaseModel
+from pydantic import PrivateAttr
 
 
 def _truncate(text: str, max_length: int = 50) -> str:
@@ -29,6 +31,11 @@ def _format_image_url(url: str, max_length: int = 50) -> str:
 class ContentPartTextParam(BaseModel):
 	text: str
 	type: Literal['text'] = 'text'
+	cache: bool = False
+	"""Cache breakpoint after this part (for prompt caching of a stable message prefix).
+
+	Only used when the message itself is cached. If no part of a cached message sets it, every part is cached.
+	"""
 
 	def __str__(self) -> str:
 		return f'Text: {_truncate(self.text)}'
@@ -63,6 +70,37 @@ class ImageURL(BaseModel):
 	# needed for Anthropic
 	media_type: SupportedImageMediaType = 'image/jpeg'
 
+	# parsed / decoded data URL, keyed by the url object so reassigning `url` invalidates it
+	_data_url_parts: tuple[str, str, str] | None = PrivateAttr(default=None)
+	_data_bytes: tuple[str, bytes] | None = PrivateAttr(default=None)
+
+	@property
+	def is_data_url(self) -> bool:
+		return self.url.startswith('data:')
+
+	def data_url_parts(self) -> tuple[str, str]:
+		"""Media type and base64 payload of a data URL (`data:image/png;base64,<data>`).
+
+		Split once per image, so serializing the same message history again does not re-slice every screenshot.
+		"""
+		cached = self._data_url_parts
+		if cached is None or cached[0] is not self.url:
+			if not self.is_data_url:
+				raise ValueError(f'Not a data URL: {_format_image_url(self.url)}')
+			header, data = self.url.split(',', 1)
+			cached = (self.url, header.split(';')[0].removeprefix('data:'), data)
+			self._data_url_parts = cached
+		return cached[1], cached[2]
+
+	def data_bytes(self) -> bytes:
+		"""Decoded image bytes of a data URL, decoded once and shared by every serialization of this image."""
+		cached = self._data_bytes
+		if cached is None or cached[0] is not self.url:
+			_, data = self.data_url_parts()
+			cached = (self.url, base64.b64decode(data))
+			self._data_bytes = cached
+		return cached[1]
+
 	def __str__(self) -> str:
 		url_display = _format_image_url(self.url)
 		return f'🖼️  Image[{self.media_type}, detail={self.detail}]: {url_display}'
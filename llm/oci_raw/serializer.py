@@ -47,16 +47,8 @@ class OCIRawMessageSerializer:
 	@staticmethod
 	def _create_image_content(part: ContentPartImageParam) -> ImageContent:
 		"""Convert ContentPartImageParam to OCI ImageContent."""
-		url = part.image_url.url
-
-		if OCIRawMessageSerializer._is_base64_image(url):
-			# Handle base64 encoded images - OCI expects data URLs as-is
-			image_url = ImageUrl(url=url)
-		else:
-			# Handle regular URLs
-			image_url = ImageUrl(url=url)
-
-		return ImageContent(image_url=image_url)
+		# OCI expects data URLs as-is, so both data and regular URLs are passed by reference without re-encoding
+		return ImageContent(image_url=ImageUrl(url=part.image_url.url))
 
 	@staticmethod
 	def serialize_messages(messages: list[BaseMessage]) -> list[Message]:
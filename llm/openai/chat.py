@@ -1,10 +1,10 @@
-from collections.abc import Iterable, Mapping
+from collections.abc import AsyncIterator, Iterable, Mapping
 from dataclasses import dataclass, field
 from typing import Any, Literal, TypeVar, overload
 
 import httpx
 from openai import APIConnectionError, APIStatusError, AsyncOpenAI, RateLimitError
-from openai.types.chat import ChatCompletionContentPartTextParam
+from openai.types.chat import ChatCompletionContentPartTextParam, ChatCompletionMessageParam
 from openai.types.chat.chat_completion import ChatCompletion
 from openai.types.shared.chat_model import ChatModel
 from openai.types.shared_params.reasoning_effort import ReasoningEffort
@@ -16,7 +16,7 @@ from browser_use.llm.exceptions import ModelProviderError
 from browser_use.llm.messages import BaseMessage
 from browser_use.llm.openai.serializer import OpenAIMessageSerializer
 from browser_use.llm.schema import SchemaOptimizer
-from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeUsage
+from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeStreamChunk, ChatInvokeUsage
 
 T = TypeVar('T', bound=BaseModel)
 
@@ -138,6 +138,57 @@ class ChatOpenAI(BaseChatModel):
 
 		return usage
 
+	def _get_model_params(self) -> dict[str, Any]:
+		"""Sampling and request parameters of the chat completion request."""
+		model_params: dict[str, Any] = {}
+
+		if self.temperature is not None:
+			model_params['temperature'] = self.temperature
+
+		if self.frequency_penalty is not None:
+			model_params['frequency_penalty'] = self.frequency_penalty
+
+		if self.max_completion_tokens is not None:
+			model_params['max_completion_tokens'] = self.max_completion_tokens
+
+		if self.top_p is not None:
+			model_params['top_p'] = self.top_p
+
+		if self.seed is not None:
+			model_params['seed'] = self.seed
+
+		if self.service_tier is not None:
+			model_params['service_tier'] = self.service_tier
+
+		if self.reasoning_models and any(str(m).lower() in str(self.model).lower() for m in self.reasoning_models):
+			model_params['reasoning_effort'] = self.reasoning_effort
+			del model_params['temperature']
+			del model_params['frequency_penalty']
+
+		return model_params
+
+	def _get_response_format(
+		self, output_format: type[BaseModel], openai_messages: list[ChatCompletionMessageParam]
+	) -> JSONSchema:
+		"""JSON schema of the structured output, also added to the system message with `add_schema_to_system_prompt`."""
+		response_format: JSONSchema = {
+			'name': 'agent_output',
+			'strict': True,
+			'schema': SchemaOptimizer.create_optimized_json_schema(output_format),
+		}
+
+		# Add JSON schema to system prompt if requested
+		if self.add_schema_to_system_prompt and openai_messages and openai_messages[0]['role'] == 'system':
+			schema_text = f'\n<json_schema>\n{response_format}\n</json_schema>'
+			if isinstance(openai_messages[0]['content'], str):
+				openai_messages[0]['content'] += schema_text
+			elif isinstance(openai_messages[0]['content'], Iterable):
+				openai_messages[0]['content'] = list(openai_messages[0]['content']) + [
+					ChatCompletionContentPartTextParam(text=schema_text, type='text')
+				]
+
+		return response_format
+
 	@overload
 	async def ainvoke(self, messages: list[BaseMessage], output_format: None = None) -> ChatInvokeCompletion[str]: ...
 
@@ -161,30 +212,7 @@ class ChatOpenAI(BaseChatModel):
 		openai_messages = OpenAIMessageSerializer.serialize_messages(messages)
 
 		try:
-			model_params: dict[str, Any] = {}
-
-			if self.temperature is not None:
-				model_params['temperature'] = self.temperature
-
-			if self.frequency_penalty is not None:
-				model_params['frequency_penalty'] = self.frequency_penalty
-
-			if self.max_completion_tokens is not None:
-				model_params['max_completion_tokens'] = self.max_completion_tokens
-
-			if self.top_p is not None:
-				model_params['top_p'] = self.top_p
-
-			if self.seed is not None:
-				model_params['seed'] = self.seed
-
-			if self.service_tier is not None:
-				model_params['service_tier'] = self.service_tier
-
-			if self.reasoning_models and any(str(m).lower() in str(self.model).lower() for m in self.reasoning_models):
-				model_params['reasoning_effort'] = self.reasoning_effort
-				del model_params['temperature']
-				del model_params['frequency_penalty']
+			model_params = self._get_model_params()
 
 			if output_format is None:
 				# Return string response
@@ -202,21 +230,7 @@ class ChatOpenAI(BaseChatModel):
 				)
 
 			else:
-				response_format: JSONSchema = {
-					'name': 'agent_output',
-					'strict': True,
-					'schema': SchemaOptimizer.create_optimized_json_schema(output_format),
-				}
-
-				# Add JSON schema to system prompt if requested
-				if self.add_schema_to_system_prompt and openai_messages and openai_messages[0]['role'] == 'system':
-					schema_text = f'\n<json_schema>\n{response_format}\n</json_schema>'
-					if isinstance(openai_messages[0]['content'], str):
-						openai_messages[0]['content'] += schema_text
-					elif isinstance(openai_messages[0]['content'], Iterable):
-						openai_messages[0]['content'] = list(openai_messages[0]['content']) + [
-							ChatCompletionContentPartTextParam(text=schema_text, type='text')
-						]
+				response_format = self._get_response_format(output_format, openai_messages)
 
 				# Return structured response
 				response = await self.get_client().chat.completions.create(
@@ -243,21 +257,60 @@ class ChatOpenAI(BaseChatModel):
 					stop_reason=response.choices[0].finish_reason if response.choices else None,
 				)
 
-		except RateLimitError as e:
+		except Exception as e:
+			raise self._provider_error(e) from e
+
+	async def astream(self, messages: list[BaseMessage], output_format: type[T]) -> AsyncIterator[ChatInvokeStreamChunk]:
+		"""
+		Stream the structured output of the model as pieces of its JSON (see browser_use.llm.streaming).
+
+		Args:
+			messages: List of chat messages
+			output_format: Pydantic model class of the structured output
+
+		Yields:
+			The generated text, the usage and stop reason with the last chunk
+		"""
+		openai_messages = OpenAIMessageSerializer.serialize_messages(messages)
+
+		try:
+			stream = await self.get_client().chat.completions.create(
+				model=self.model,
+				messages=openai_messages,
+				response_format=ResponseFormatJSONSchema(
+					json_schema=self._get_response_format(output_format, openai_messages), type='json_schema'
+				),
+				stream=True,
+				stream_options={'include_usage': True},
+				**self._get_model_params(),
+			)
+			async for chunk in stream:
+				choice = chunk.choices[0] if chunk.choices else None
+				yield ChatInvokeStreamChunk(
+					text=choice.delta.content or '' if choice else '',
+					usage=self._get_usage(chunk) if chunk.usage else None,  # type: ignore[arg-type]
+					stop_reason=choice.finish_reason if choice else None,
+				)
+
+		except Exception as e:
+			raise self._provider_error(e) from e
+
+	def _provider_error(self, e: Exception) -> ModelProviderError:
+		if isinstance(e, RateLimitError):
 			error_message = e.response.json().get('error', {})
 			error_message = (
 				error_message.get('message', 'Unknown model error') if isinstance(error_message, dict) else error_message
 			)
-			raise ModelProviderError(
+			return ModelProviderError(
 				message=error_message,
 				status_code=e.response.status_code,
 				model=self.name,
-			) from e
+			)
 
-		except APIConnectionError as e:
-			raise ModelProviderError(message=str(e), model=self.name) from e
+		if isinstance(e, APIConnectionError):
+			return ModelProviderError(message=str(e), model=self.name)
 
-		except APIStatusError as e:
+		if isinstance(e, APIStatusError):
 			try:
 				error_message = e.response.json().get('error', {})
 			except Exception:
@@ -265,11 +318,10 @@ class ChatOpenAI(BaseChatModel):
 			error_message = (
 				error_message.get('message', 'Unknown model error') if isinstance(error_message, dict) else error_message
 			)
-			raise ModelProviderError(
+			return ModelProviderError(
 				message=error_message,
 				status_code=e.response.status_code,
 				model=self.name,
-			) from e
+			)
 
-		except Exception as e:
-			raise ModelProviderError(message=str(e), model=self.name) from e
+		return ModelProviderError(message=str(e), model=self.name)
@@ -0,0 +1,133 @@
+"""
+Benchmark the provider message serializers on an agent-like message history.
+
+Builds a history of `--messages` messages (system prompt, alternating state / model output messages) where the
+last `--screenshots` state messages carry a base64 screenshot, then serializes it with every provider serializer
+whose SDK is installed. Prints the median time and the peak memory allocated per `serialize_messages` call, once
+for the first call (data URLs are parsed / decoded) and once for repeated calls on the same messages (as on
+retries, fallback models or hedged requests), next to the cost of the deep copy the serializers used to start with.
+
+Usage:
+	python -m browser_use.llm.playground.serializer_benchmark [--messages 30] [--screenshots 5] [--repeat 20]
+"""
+
+import argparse
+import base64
+import importlib
+import random
+import statistics
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from browser_use.llm.messages import (
+	AssistantMessage,
+	BaseMessage,
+	ContentPartImageParam,
+	ContentPartTextParam,
+	ImageURL,
+	SystemMessage,
+	UserMessage,
+)
+
+# (name, module, class, method) of the serializers to benchmark, skipped if the provider SDK is not installed
+SERIALIZERS = [
+	('anthropic', 'browser_use.llm.anthropic.serializer', 'AnthropicMessageSerializer', 'serialize_messages'),
+	('openai', 'browser_use.llm.openai.serializer', 'OpenAIMessageSerializer', 'serialize_messages'),
+	('google', 'browser_use.llm.google.serializer', 'GoogleMessageSerializer', 'serialize_messages'),
+	('aws', 'browser_use.llm.aws.serializer', 'AWSBedrockMessageSerializer', 'serialize_messages'),
+	('oci_raw', 'browser_use.llm.oci_raw.serializer', 'OCIRawMessageSerializer', 'serialize_messages'),
+]
+
+
+def build_history(num_messages: int, num_screenshots: int, screenshot_bytes: int, seed: int = 42) -> list[BaseMessage]:
+	"""System prompt plus alternating state / model output messages, the last state messages with screenshots."""
+	rng = random.Random(seed)
+	messages: list[BaseMessage] = [SystemMessage(content='You are a browser automation agent. ' * 200, cache=True)]
+
+	num_state_messages = num_messages // 2
+	for index in range(num_messages - 1):
+		if index % 2 == 1:
+			messages.append(
+				AssistantMessage(content=f'{{"evaluation_previous_goal": "step {index} ok", "action": [{{"click": {{"index": {index}}}}}]}}')
+			)
+			continue
+
+		state_index = index // 2
+		content: list[ContentPartTextParam | ContentPartImageParam] = [
+			ContentPartTextParam(text=f'<browser_state>\n' + f'[{state_index}]<button>Element {state_index}</button>\n' * 150),
+		]
+		if state_index >= num_state_messages - num_screenshots:
+			screenshot = base64.b64encode(rng.randbytes(screenshot_bytes)).decode()
+			content.append(ContentPartImageParam(image_url=ImageURL(url=f'data:image/png;base64,{screenshot}', media_type='image/png')))
+		messages.append(UserMessage(content=content, cache=index == num_messages - 2))
+
+	return messages
+
+
+def fresh_copy(messages: list[BaseMessage]) -> list[BaseMessage]:
+	"""Copy of the history without the parsed / decoded data URLs, as the serializers see it on the first call."""
+	copied = [m.model_copy(deep=True) for m in messages]
+	for message in copied:
+		if isinstance(message.content, list):
+			for part in message.content:
+				if part.type == 'image_url':
+					part.image_url._data_url_parts = part.image_url._data_bytes = None
+	return copied
+
+
+def measure(function: Callable[[Any], Any], repeat: int, setup: Callable[[], Any] = lambda: None) -> tuple[float, float]:
+	"""Median seconds and KiB allocated per call of `function(setup())` (the setup is not measured).
+
+	Allocations are traced in separate runs, tracing slows the calls down.
+	"""
+	seconds: list[float] = []
+	for _ in range(repeat):
+		argument = setup()
+		start = time.perf_counter()
+		function(argument)
+		seconds.append(time.perf_counter() - start)
+
+	allocated: list[float] = []
+	for _ in range(min(repeat, 5)):
+		argument = setup()
+		tracemalloc.start()
+		function(argument)
+		_, peak = tracemalloc.get_traced_memory()
+		tracemalloc.stop()
+		allocated.append(peak / 1024)
+
+	return statistics.median(seconds), statistics.median(allocated)
+
+
+def print_row(name: str, seconds: float, kib: float) -> None:
+	print(f'  {name:<32} {seconds * 1000:10.3f} ms {kib:12.1f} KiB')
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--messages', type=int, default=30)
+	parser.add_argument('--screenshots', type=int, default=5)
+	parser.add_argument('--screenshot-kib', type=int, default=300, help='raw size of each screenshot')
+	parser.add_argument('--repeat', type=int, default=20)
+	args = parser.parse_args()
+
+	messages = build_history(args.messages, args.screenshots, args.screenshot_kib * 1024)
+	print(f'{len(messages)} messages, {args.screenshots} screenshots of {args.screenshot_kib} KiB')
+	print(f'  {"":<32} {"time":>13} {"allocated":>16}')
+
+	print_row('deep copy (old serializer prelude)', *measure(lambda _: [m.model_copy(deep=True) for m in messages], args.repeat))
+
+	for name, module_name, class_name, method_name in SERIALIZERS:
+		try:
+			serializer = getattr(getattr(importlib.import_module(module_name), class_name), method_name)
+		except ImportError as e:
+			print(f'  {name:<32} skipped ({e.name} not installed)')
+			continue
+
+		print_row(f'{name} first call', *measure(serializer, args.repeat, setup=lambda: fresh_copy(messages)))
+		print_row(f'{name} repeated call', *measure(serializer, args.repeat, setup=lambda: messages))
+
+if __name__ == '__main__':
+	main()
@@ -2,10 +2,16 @@
 Utilities for creating optimized Pydantic schemas for LLM usage.
 """
 
+import threading
+import weakref
 from typing import Any
 
 from pydantic import BaseModel
 
+# optimized schemas by model class, so the agent's output model is not re-optimized on every LLM call
+_optimized_schema_cache: weakref.WeakKeyDictionary[type[BaseModel], dict[str, Any]] = weakref.WeakKeyDictionary()
+_optimized_schema_cache_lock = threading.Lock()
+
 
 class SchemaOptimizer:
 	@staticmethod
@@ -14,12 +20,25 @@ class SchemaOptimizer:
 		Create the most optimized schema by flattening all $ref/$defs while preserving
 		FULL descriptions and ALL action definitions. Also ensures OpenAI strict mode compatibility.
 
+		The schema is computed once per model class. Callers get their own top-level dict (so they can drop
+		e.g. 'title'), nested parts are shared and must not be modified.
+
 		Args:
 			model: The Pydantic model to optimize
 
 		Returns:
 			Optimized schema with all $refs resolved and strict mode compatibility
 		"""
+		with _optimized_schema_cache_lock:
+			cached = _optimized_schema_cache.get(model)
+		if cached is None:
+			cached = SchemaOptimizer._optimize_json_schema(model)
+			with _optimized_schema_cache_lock:
+				_optimized_schema_cache[model] = cached
+		return dict(cached)
+
+	@staticmethod
+	def _optimize_json_schema(model: type[BaseModel]) -> dict[str, Any]:
 		# Generate original schema
 		original_schema = model.model_json_schema()
 
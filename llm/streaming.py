@@ -0,0 +1,194 @@
+"""
+Streaming structured output: the items of a list field of the output model, validated as soon as each one is complete.
+
+A chat model supports streaming if it implements `astream(messages, output_format)`, an async iterator of
+`ChatInvokeStreamChunk` that carry the JSON of the structured output in pieces (ChatOpenAI, ChatAnthropic and
+ChatGoogle do). `StructuredOutputStream` feeds the pieces to an `IncrementalJSONArrayParser`, validates each completed
+item of the list field (e.g. every action of the agent output) and, once the model is done, the whole output.
+"""
+
+import asyncio
+import json
+import time
+from collections.abc import AsyncIterator
+from typing import Any, Generic, TypeVar, get_args
+
+from pydantic import BaseModel
+
+from browser_use.llm.base import BaseChatModel
+from browser_use.llm.exceptions import ModelProviderError
+from browser_use.llm.messages import BaseMessage
+from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeUsage
+
+T = TypeVar('T', bound=BaseModel)
+
+
+def supports_streaming(llm: BaseChatModel) -> bool:
+	"""Whether the model can stream structured output (implements `astream`)"""
+	return callable(getattr(llm, 'astream', None))
+
+
+class IncrementalJSONArrayParser:
+	"""
+	Finds the items of an array field of a JSON object while the JSON is still being generated.
+
+	`feed` returns the JSON text of every item the new text completed. Only the structure of the JSON is tracked
+	(strings, escapes and nesting), parsing the items is left to the caller. Items must be objects or arrays, text
+	before and after the top-level object (e.g. a markdown code fence) is ignored.
+	"""
+
+	def __init__(self, field: str):
+		self.field = field
+		self.text = ''
+		self.object_start: int | None = None
+		self.object_end: int | None = None
+
+		self._position = 0
+		self._depth = 0
+		self._in_string = False
+		self._escaped = False
+		self._string_start = 0
+		self._expect_key = False
+		self._key: str | None = None
+		self._in_array = False
+		self._item_start: int | None = None
+
+	@property
+	def object_text(self) -> str | None:
+		"""The top-level JSON object, once it is complete"""
+		if self.object_start is None or self.object_end is None:
+			return None
+		return self.text[self.object_start : self.object_end]
+
+	def feed(self, text: str) -> list[str]:
+		self.text += text
+		items: list[str] = []
+
+		while self._position < len(self.text) and self.object_end is None:
+			char = self.text[self._position]
+
+			if self._in_string:
+				if self._escaped:
+					self._escaped = False
+				elif char == '\\':
+					self._escaped = True
+				elif char == '"':
+					self._in_string = False
+					if self._depth == 1 and self._expect_key:
+						self._key = json.loads(self.text[self._string_start : self._position + 1])
+			elif self._depth == 0:
+				# anything before the top-level object
+				if char == '{':
+					self.object_start = self._position
+					self._depth = 1
+					self._expect_key = True
+			elif char == '"':
+				self._in_string = True
+				self._string_start = self._position
+			elif char in '{[':
+				if self._in_array and self._depth == 2:
+					self._item_start = self._position
+				elif self._depth == 1 and char == '[' and self._key == self.field:
+					self._in_array = True
+				self._depth += 1
+			elif char in '}]':
+				self._depth -= 1
+				if self._in_array and self._depth == 2 and self._item_start is not None:
+					items.append(self.text[self._item_start : self._position + 1])
+					self._item_start = None
+				elif self._in_array and self._depth == 1:
+					self._in_array = False
+				elif self._depth == 0:
+					self.object_end = self._position + 1
+			elif self._depth == 1 and char == ',':
+				self._expect_key = True
+			elif self._depth == 1 and char == ':':
+				self._expect_key = False
+
+			self._position += 1
+
+		return items
+
+
+class StructuredOutputStream(Generic[T]):
+	"""
+	Streams the structured output of a model, yielding the validated items of one of its list fields as they complete.
+
+	The stream starts reading the model's response right away (create it inside the running event loop), so the
+	caller can work on the first items while the model is still generating the rest:
+
+		stream = StructuredOutputStream(llm, messages, AgentOutput, 'action')
+		async for action in stream.items():
+			...
+		response = await stream.completion()  # the whole validated output, with usage and stop reason
+	"""
+
+	def __init__(
+		self,
+		llm: BaseChatModel,
+		messages: list[BaseMessage],
+		output_format: type[T],
+		items_field: str,
+		timeout: float | None = None,
+	):
+		if not supports_streaming(llm):
+			raise ValueError(f'Model {llm.name} does not support streaming (no astream method)')
+		(self.item_type,) = get_args(output_format.model_fields[items_field].annotation)
+
+		self.llm = llm
+		self.messages = messages
+		self.output_format = output_format
+		self.parser = IncrementalJSONArrayParser(items_field)
+		self.started_at = time.monotonic()
+		self.first_item_seconds: float | None = None  # seconds from the request to the first validated item
+
+		self._items: asyncio.Queue[Any] = asyncio.Queue()
+		self._task = asyncio.create_task(asyncio.wait_for(self._read(), timeout), name=f'stream_{llm.name}')
+		# marks the end of the items, also if the stream failed, timed out or was cancelled
+		self._task.add_done_callback(lambda _: self._items.put_nowait(None))
+
+	async def _read(self) -> ChatInvokeCompletion[T]:
+		usage: ChatInvokeUsage | None = None
+		stop_reason: str | None = None
+		async for chunk in self.llm.astream(self.messages, self.output_format):  # type: ignore[attr-defined]
+			for item_json in self.parser.feed(chunk.text):
+				item = self.item_type.model_validate_json(item_json)
+				if self.first_item_seconds is None:
+					self.first_item_seconds = time.monotonic() - self.started_at
+				self._items.put_nowait(item)
+			usage = chunk.usage or usage
+			stop_reason = chunk.stop_reason or stop_reason
+
+		object_text = self.parser.object_text
+		if object_text is None:
+			raise ModelProviderError(
+				message=f'Failed to parse structured output from streamed response: {self.parser.text[:200]!r}',
+				status_code=500,
+				model=self.llm.name,
+			)
+		completion = self.output_format.model_validate_json(object_text)
+		return ChatInvokeCompletion(completion=completion, usage=usage, stop_reason=stop_reason)
+
+	@property
+	def timed_out(self) -> bool:
+		"""Whether the response took longer than `timeout` (tells the stream's TimeoutError apart from the caller's)"""
+		return self._task.done() and not self._task.cancelled() and isinstance(self._task.exception(), TimeoutError)
+
+	async def items(self) -> AsyncIterator[Any]:
+		"""The validated items in order, raises the error of the stream if it failed (single consumer)"""
+		while (item := await self._items.get()) is not None:
+			yield item
+		await self._task
+
+	async def completion(self) -> ChatInvokeCompletion[T]:
+		"""Wait for the end of the response, the whole output validated with `output_format`"""
+		return await self._task
+
+	async def aclose(self) -> None:
+		"""Stop reading the response (e.g. the step was interrupted)"""
+		if not self._task.done():
+			self._task.cancel()
+		try:
+			await self._task
+		except (asyncio.CancelledError, Exception):
+			pass
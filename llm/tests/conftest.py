@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from browser_use.llm.exceptions import ModelProviderError
+from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeStreamChunk, ChatInvokeUsage
+
+
+class FakeChatModel:
+	"""Chat model that answers from a script instead of an API, for tests that must run offline.
+
+	`ainvoke` sleeps for the next of `latencies` and answers with the model name, structured answers are built from
+	`{'text': <model name>, 'steps': [<call number>]}`. `astream` streams `chunks` as the response text.
+	"""
+
+	_verified_api_keys = False
+
+	def __init__(
+		self,
+		model: str = 'fake-model',
+		latencies: list[float] | None = None,
+		fail: bool = False,
+		temperature: float | None = 0.2,
+		chunks: list[str] | None = None,
+		chunk_delay: float = 0.0,
+		fail_after_chunks: int | None = None,
+	):
+		self.model = model
+		self.latencies = latencies or [0.0]
+		self.fail = fail
+		self.temperature = temperature
+		self.chunks = chunks or []
+		self.chunk_delay = chunk_delay
+		self.fail_after_chunks = fail_after_chunks
+		self.calls = 0
+		self.cancelled = 0
+
+	@property
+	def provider(self) -> str:
+		return 'fake'
+
+	@property
+	def name(self) -> str:
+		return self.model
+
+	@property
+	def usage(self) -> ChatInvokeUsage:
+		return ChatInvokeUsage(
+			prompt_tokens=100,
+			prompt_cached_tokens=20,
+			prompt_cache_creation_tokens=None,
+			prompt_image_tokens=None,
+			completion_tokens=10,
+			total_tokens=110,
+		)
+
+	async def ainvoke(self, messages, output_format=None, **kwargs):
+		latency = self.latencies[min(self.calls, len(self.latencies) - 1)]
+		self.calls += 1
+		try:
+			await asyncio.sleep(latency)
+		except asyncio.CancelledError:
+			self.cancelled += 1
+			raise
+		if self.fail:
+			raise ModelProviderError(f'{self.model} failed', model=self.model)
+
+		answer = {'text': self.model, 'steps': [self.calls]}
+		completion = self.model if output_format is None else output_format.model_validate(answer)
+		return ChatInvokeCompletion(completion=completion, usage=self.usage, stop_reason='end_turn')
+
+	async def astream(self, messages, output_format):
+		self.calls += 1
+		for i, chunk in enumerate(self.chunks):
+			if self.fail_after_chunks is not None and i == self.fail_after_chunks:
+				raise ModelProviderError('stream broke', model=self.model)
+			await asyncio.sleep(self.chunk_delay)
+			yield ChatInvokeStreamChunk(text=chunk)
+		yield ChatInvokeStreamChunk(usage=self.usage, stop_reason='end_turn')
+
+
+@pytest.fixture
+def fake_llm():
+	"""Factory of offline chat models, e.g. `fake_llm('primary', latencies=[0.01])`"""
+	return FakeChatModel
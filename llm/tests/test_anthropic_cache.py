@@ -262,6 +262,41 @@ class TestAnthropicCache:
 		for msg in cleaned_messages:
 			assert not msg.cache
 
+	def test_part_cache_breakpoints(self):
+		"""Test that text parts marked with cache=True are the only cache breakpoints of a cached message."""
+		user_message = UserMessage(
+			content=[
+				ContentPartTextParam(text='<user_request>task</user_request>', cache=True),
+				ContentPartTextParam(text='step 1'),
+				ContentPartTextParam(text='step 2', cache=True),
+				ContentPartTextParam(text='browser state'),
+			],
+			cache=True,
+		)
+
+		messages, _ = AnthropicMessageSerializer.serialize_messages([user_message])
+		blocks = messages[0]['content']
+		assert isinstance(blocks, list)
+		assert [bool(block.get('cache_control')) for block in blocks] == [True, False, True, False]
+
+		# Part breakpoints are dropped with the message cache when a later message is cached
+		messages, _ = AnthropicMessageSerializer.serialize_messages([user_message, UserMessage(content='later', cache=True)])
+		blocks = messages[0]['content']
+		assert isinstance(blocks, list)
+		assert not any(block.get('cache_control') for block in blocks)
+
+	def test_serialize_messages_leaves_messages_untouched(self):
+		"""Test that cache cleaning doesn't modify the input messages."""
+		first = UserMessage(content='First user message', cache=True)
+		last = UserMessage(content='Last user message', cache=True)
+
+		AnthropicMessageSerializer.serialize_messages([first, last])
+		cleaned_messages = AnthropicMessageSerializer._clean_cache_messages([first, last])
+
+		assert first.cache and last.cache
+		assert not cleaned_messages[0].cache
+		assert cleaned_messages[1] is last
+
 	def test_max_4_cache_blocks(self):
 		"""Test that the max number of cache blocks is 4."""
 		agent = Agent(task='Hello, world!', llm=ChatAnthropic(''))
@@ -286,5 +321,7 @@ if __name__ == '__main__':
 	test_instance.test_cache_cleaning_last_message_only()
 	test_instance.test_cache_cleaning_with_system_message()
 	test_instance.test_cache_cleaning_no_cached_messages()
+	test_instance.test_part_cache_breakpoints()
+	test_instance.test_serialize_messages_leaves_messages_untouched()
 	test_instance.test_max_4_cache_blocks()
 	print('All cache tests passed!')
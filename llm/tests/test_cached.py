@@ -0,0 +1,58 @@
+import pytest
+from pydantic import BaseModel
+
+from browser_use.llm.cached.chat import ChatCached
+from browser_use.llm.exceptions import ModelCacheMissError
+from browser_use.llm.messages import SystemMessage, UserMessage
+
+
+class Answer(BaseModel):
+	text: str
+	steps: list[int]
+
+
+def messages(question: str):
+	return [SystemMessage(content='You answer questions.'), UserMessage(content=question)]
+
+
+@pytest.mark.asyncio
+async def test_record_then_replay(fake_llm, tmp_path):
+	path = tmp_path / 'cache.sqlite3'
+	llm = fake_llm()
+
+	recorder = ChatCached(llm=llm, path=path)
+	first = await recorder.ainvoke(messages('a'), Answer)
+	again = await recorder.ainvoke(messages('a'), Answer)
+	text = await recorder.ainvoke(messages('a'))
+	assert llm.calls == 2  # structured and text requests are cached separately
+	assert again.completion == first.completion and again.usage == first.usage
+	assert again.stop_reason == 'end_turn'
+	assert recorder.hits == 1 and recorder.misses == 2
+
+	replayer = ChatCached(llm=llm, path=path, mode='replay')
+	assert (await replayer.ainvoke(messages('a'))).completion == text.completion
+	with pytest.raises(ModelCacheMissError):
+		await replayer.ainvoke(messages('b'), Answer)
+
+	# sampling params of the wrapped model are part of the key
+	llm.temperature = 1.0
+	with pytest.raises(ModelCacheMissError):
+		await replayer.ainvoke(messages('a'), Answer)
+	assert llm.calls == 2
+
+	passthrough = ChatCached(llm=llm, path=path, mode='passthrough')
+	assert (await passthrough.ainvoke(messages('a'), Answer)).completion.steps == [3]
+
+
+@pytest.mark.asyncio
+async def test_size_eviction(fake_llm, tmp_path):
+	llm = fake_llm()
+	cached = ChatCached(llm=llm, path=tmp_path / 'cache.sqlite3', max_bytes=2000)
+
+	for i in range(50):
+		await cached.ainvoke(messages(f'question {i}'), Answer)
+	# the most recent responses are kept
+	calls = llm.calls
+	await cached.ainvoke(messages('question 49'), Answer)
+	assert llm.calls == calls
+	assert 0 < len(cached.store) < 50
@@ -0,0 +1,34 @@
+from pydantic import BaseModel
+
+from browser_use.llm.google.chat import ChatGoogle
+from browser_use.llm.google.serializer import GoogleMessageSerializer
+from browser_use.llm.messages import ContentPartTextParam, SystemMessage, UserMessage
+
+
+class Answer(BaseModel):
+	text: str
+
+
+STATE_MESSAGE = UserMessage(content=[ContentPartTextParam(text='<browser_state>...</browser_state>')])
+
+
+def test_system_text_is_prepended_to_list_content():
+	contents, system_instruction = GoogleMessageSerializer.serialize_messages(
+		[SystemMessage(content='You are a browser agent.'), STATE_MESSAGE], include_system_in_user=True
+	)
+
+	assert system_instruction is None
+	parts = contents[0].parts  # type: ignore[index, union-attr]
+	assert [part.text for part in parts] == ['You are a browser agent.', '<browser_state>...</browser_state>']
+
+
+def test_json_instruction_is_appended_to_list_content():
+	llm = ChatGoogle(model='gemma-3-27b-it', supports_structured_output=False)
+
+	messages = llm._add_json_instruction([STATE_MESSAGE], Answer)
+
+	assert isinstance(messages[-1].content, list)
+	assert messages[-1].content[0].text == '<browser_state>...</browser_state>'  # type: ignore[union-attr]
+	assert 'valid JSON object' in messages[-1].content[-1].text  # type: ignore[union-attr]
+	# the original message is left as it is
+	assert len(STATE_MESSAGE.content) == 1
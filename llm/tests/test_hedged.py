@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+from pydantic import BaseModel
+
+from browser_use.llm.exceptions import ModelProviderError
+from browser_use.llm.hedged.chat import ChatHedged
+from browser_use.llm.messages import UserMessage
+from browser_use.tokens.service import TokenCost
+
+
+class Answer(BaseModel):
+	text: str
+
+
+MESSAGES = [UserMessage(content='hi')]
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_is_not_hedged(fake_llm):
+	primary = fake_llm('primary', latencies=[0.01])
+	backup = fake_llm('backup', latencies=[0.01])
+	llm = ChatHedged(primary=primary, backup=backup, initial_hedge_delay=0.5)
+
+	result = await llm.ainvoke(MESSAGES, Answer)
+
+	assert result.completion.text == 'primary'
+	assert backup.calls == 0 and llm.hedged_requests == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_and_cancelled(fake_llm):
+	# 10 fast calls to learn the latency distribution, then a stuck primary
+	primary = fake_llm('primary', latencies=[0.01] * 10 + [5.0])
+	backup = fake_llm('backup', latencies=[0.02])
+	llm = ChatHedged(primary=primary, backup=backup, min_hedge_delay=0.05, initial_hedge_delay=1.0)
+	token_cost = TokenCost()
+	token_cost.register_llm(llm)
+
+	for _ in range(10):
+		assert (await llm.ainvoke(MESSAGES, Answer)).completion.text == 'primary'
+	assert llm.hedge_delay == 0.05
+
+	start = asyncio.get_running_loop().time()
+	result = await llm.ainvoke(MESSAGES, Answer)
+	assert asyncio.get_running_loop().time() - start < 0.5
+	await asyncio.sleep(0)
+	summary = await token_cost.get_usage_summary()
+
+	assert result.completion.text == 'backup'
+	assert primary.cancelled == 1
+	assert llm.hedged_requests == 1 and llm.backup_wins == 1
+	# usage of both models is tracked, the wrapper itself is not counted
+	assert summary.by_model['primary'].invocations == 10
+	assert summary.by_model['backup'].invocations == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_primary_falls_back_and_both_failing_raises(fake_llm):
+	primary = fake_llm('primary', latencies=[0.01], fail=True)
+	backup = fake_llm('backup', latencies=[0.01])
+	llm = ChatHedged(primary=primary, backup=backup, initial_hedge_delay=5.0)
+	assert (await llm.ainvoke(MESSAGES, Answer)).completion.text == 'backup'
+
+	backup.fail = True
+	with pytest.raises(ModelProviderError, match='primary failed'):
+		await llm.ainvoke(MESSAGES, Answer)
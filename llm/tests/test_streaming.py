@@ -0,0 +1,101 @@
+import json
+
+import pytest
+from pydantic import BaseModel
+
+from browser_use.llm.exceptions import ModelProviderError
+from browser_use.llm.messages import UserMessage
+from browser_use.llm.streaming import IncrementalJSONArrayParser, StructuredOutputStream, supports_streaming
+
+
+class Step(BaseModel):
+	name: str
+	args: dict[str, str] = {}
+
+
+class Plan(BaseModel):
+	thinking: str
+	steps: list[Step]
+
+
+PLAN = Plan(
+	thinking='tricky "quotes" and {braces} [brackets] \\ in "steps": [',
+	steps=[Step(name='click', args={'selector': 'a[href="/x"]'}), Step(name='type', args={'text': '}]{["\\n'}), Step(name='done')],
+)
+
+
+MESSAGES = [UserMessage(content='hi')]
+
+
+def test_parser_finds_items_at_every_split_point():
+	text = f'```json\n{PLAN.model_dump_json()}\n```'
+	expected = [step.model_dump_json() for step in PLAN.steps]
+
+	for split in range(len(text) + 1):
+		parser = IncrementalJSONArrayParser('steps')
+		items = parser.feed(text[:split]) + parser.feed(text[split:])
+		assert [Step.model_validate_json(item).model_dump_json() for item in items] == expected
+		assert parser.object_text is not None
+		assert Plan.model_validate_json(parser.object_text) == PLAN
+
+
+def test_parser_ignores_other_fields_and_nested_arrays():
+	parser = IncrementalJSONArrayParser('steps')
+	text = json.dumps({'other': [{'name': 'no'}], 'nested': {'steps': [{'name': 'no'}]}, 'steps': [{'name': 'yes'}]})
+	assert [json.loads(item) for item in parser.feed(text)] == [{'name': 'yes'}]
+
+
+def chunks_of(text: str, size: int = 8) -> list[str]:
+	return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_items_before_the_output_is_complete(fake_llm):
+	llm = fake_llm(chunks=chunks_of(PLAN.model_dump_json()), chunk_delay=0.005)
+	assert supports_streaming(llm)
+
+	stream = StructuredOutputStream(llm, MESSAGES, Plan, 'steps')
+	names = []
+	async for step in stream.items():
+		names.append(step.name)
+		if len(names) == 1:
+			# the first step arrives while the model is still generating
+			assert not stream._task.done()
+	response = await stream.completion()
+
+	assert names == ['click', 'type', 'done']
+	assert response.completion == PLAN
+	assert response.usage is not None and response.usage.total_tokens == 110
+	assert response.stop_reason == 'end_turn'
+	assert stream.first_item_seconds is not None
+
+
+async def collect(llm) -> list[str]:
+	stream = StructuredOutputStream(llm, MESSAGES, Plan, 'steps')
+	try:
+		return [step.name async for step in stream.items()]
+	finally:
+		await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_stream_errors_are_raised_from_items(fake_llm):
+	chunks = chunks_of(PLAN.model_dump_json())
+
+	with pytest.raises(ModelProviderError, match='stream broke'):
+		await collect(fake_llm(chunks=chunks, fail_after_chunks=len(chunks) - 2))
+
+	# a truncated response has no complete output to validate
+	with pytest.raises(ModelProviderError, match='Failed to parse structured output'):
+		await collect(fake_llm(chunks=chunks[:-2]))
+
+
+@pytest.mark.asyncio
+async def test_stream_timeout_is_told_apart_from_other_timeouts(fake_llm):
+	llm = fake_llm(chunks=chunks_of(PLAN.model_dump_json()), chunk_delay=0.05)
+
+	stream = StructuredOutputStream(llm, MESSAGES, Plan, 'steps', timeout=0.1)
+	with pytest.raises(TimeoutError):
+		async for _ in stream.items():
+			pass
+	assert stream.timed_out
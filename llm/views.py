@@ -46,3 +46,18 @@ class ChatInvokeCompletion(BaseModel, Generic[T]):
 
 	stop_reason: str | None = None
 	"""The reason the model stopped generating. Common values: 'end_turn', 'max_tokens', 'stop_sequence'."""
+
+
+class ChatInvokeStreamChunk(BaseModel):
+	"""
+	A part of a streamed chat model response (see `browser_use.llm.streaming`).
+	"""
+
+	text: str = ''
+	"""The text generated since the previous chunk (with structured output: the next piece of the JSON)."""
+
+	usage: ChatInvokeUsage | None = None
+	"""The usage of the response, only set once the provider reported it (usually on the last chunk)."""
+
+	stop_reason: str | None = None
+	"""The reason the model stopped generating, only set on the last chunk."""
@@ -1,52 +1,276 @@
 """
 Screenshot storage service for browser-use agents.
+
+Screenshots are stored content-addressed: the file name is derived from the digest of the screenshot, so identical
+screenshots of consecutive steps share one file and history items only hold the path, which is resolved lazily
+(see `load_screenshot`). Optionally near-identical screenshots are deduplicated by perceptual hash, and screenshots
+are re-encoded to WebP or AVIF to save disk space.
 """
 
+import asyncio
 import base64
+import hashlib
+import io
+import logging
+import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
+from typing import TYPE_CHECKING, Literal
 
 import anyio
 
 from browser_use.observability import observe_debug
 
+if TYPE_CHECKING:
+	from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+ScreenshotFormat = Literal['png', 'webp', 'avif']
+
+SCREENSHOT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+PERCEPTUAL_HASH_SIZE = 16  # 256-bit hashes
+
+
+class ScreenshotCache:
+	"""Thread-safe LRU of base64 screenshots keyed by file path, bounded by the total size of the cached strings.
+
+	Entries are validated against the file's mtime and size, so rewritten files (e.g. legacy `step_N.png` paths of a
+	reused agent directory) are never served stale.
+	"""
+
+	def __init__(self, max_bytes: int = SCREENSHOT_CACHE_MAX_BYTES):
+		self.max_bytes = max_bytes
+		self.total_bytes = 0
+		self._entries: OrderedDict[str, tuple[tuple[int, int], str]] = OrderedDict()
+		self._lock = threading.Lock()
+
+	def get(self, path: str, signature: tuple[int, int]) -> str | None:
+		with self._lock:
+			entry = self._entries.get(path)
+			if entry is None or entry[0] != signature:
+				return None
+			self._entries.move_to_end(path)
+			return entry[1]
+
+	def put(self, path: str, signature: tuple[int, int], screenshot_b64: str) -> None:
+		if len(screenshot_b64) > self.max_bytes:
+			return
+		with self._lock:
+			previous = self._entries.pop(path, None)
+			if previous is not None:
+				self.total_bytes -= len(previous[1])
+			self._entries[path] = (signature, screenshot_b64)
+			self.total_bytes += len(screenshot_b64)
+			while self.total_bytes > self.max_bytes:
+				_, (_, evicted) = self._entries.popitem(last=False)
+				self.total_bytes -= len(evicted)
+
+	def clear(self) -> None:
+		with self._lock:
+			self._entries.clear()
+			self.total_bytes = 0
+
+
+# shared by all agents of the process, so history.screenshots(), GIF creation and reruns reuse loaded screenshots
+screenshot_cache = ScreenshotCache()
+
+
+def _file_signature(path: Path) -> tuple[int, int] | None:
+	try:
+		stat = path.stat()
+	except OSError:
+		return None
+	return stat.st_mtime_ns, stat.st_size
+
+
+def load_screenshot(screenshot_path: str | None) -> str | None:
+	"""Resolve a stored screenshot path to its base64 data, through the shared in-memory LRU."""
+	if not screenshot_path:
+		return None
+
+	path = Path(screenshot_path)
+	signature = _file_signature(path)
+	if signature is None:
+		return None
+
+	cached = screenshot_cache.get(screenshot_path, signature)
+	if cached is not None:
+		return cached
+
+	try:
+		screenshot_b64 = base64.b64encode(path.read_bytes()).decode('utf-8')
+	except OSError:
+		return None
+	screenshot_cache.put(screenshot_path, signature, screenshot_b64)
+	return screenshot_b64
+
+
+def _image_extension(data: bytes) -> str:
+	"""File extension for encoded image bytes (screenshots are stored as received unless re-encoded)."""
+	if data.startswith(b'\xff\xd8'):
+		return '.jpg'
+	if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+		return '.webp'
+	return '.png'
+
+
+def perceptual_hash(image: 'Image.Image', hash_size: int = PERCEPTUAL_HASH_SIZE) -> int:
+	"""Difference hash (dHash) of `hash_size`² bits: brightness comparisons of adjacent cells of a downscaled image."""
+	from PIL import Image
+
+	width = hash_size + 1
+	pixels = list(image.convert('L').resize((width, hash_size), Image.Resampling.BILINEAR).getdata())
+	value = 0
+	for row in range(hash_size):
+		for column in range(hash_size):
+			value = (value << 1) | (pixels[row * width + column] > pixels[row * width + column + 1])
+	return value
+
 
 class ScreenshotService:
-	"""Simple screenshot storage service that saves screenshots to disk"""
+	"""Content-addressed screenshot store that saves each distinct screenshot to disk once"""
+
+	def __init__(
+		self,
+		agent_directory: str | Path,
+		image_format: ScreenshotFormat = 'png',
+		quality: int = 80,
+		perceptual_dedup_distance: int | None = None,
+	):
+		"""Initialize with agent directory path
 
-	def __init__(self, agent_directory: str | Path):
-		"""Initialize with agent directory path"""
+		Args:
+			image_format: 'png' stores screenshots as received, 'webp' / 'avif' re-encode them lossily with `quality`
+			perceptual_dedup_distance: reuse a stored screenshot whose perceptual hash differs in at most this many of
+				256 bits (e.g. 4 for a blinking cursor); None only deduplicates byte-identical screenshots.
+				This is lossy: edits of a few characters of small text usually don't change the hash at all
+		"""
 		self.agent_directory = Path(agent_directory) if isinstance(agent_directory, str) else agent_directory
+		self.image_format = image_format
+		self.quality = quality
+		self.perceptual_dedup_distance = perceptual_dedup_distance
+
+		if self._needs_image_processing:
+			try:
+				import PIL  # noqa: F401
+			except ImportError:
+				logger.warning('📸 Pillow is not installed, storing screenshots as received without perceptual dedup')
+				self.image_format = 'png'
+				self.perceptual_dedup_distance = None
 
 		# Create screenshots subdirectory
 		self.screenshots_dir = self.agent_directory / 'screenshots'
 		self.screenshots_dir.mkdir(parents=True, exist_ok=True)
 
+		self._paths_by_digest: dict[str, str] = {}
+		self._perceptual_hashes: list[tuple[int, str]] = []
+		self._lock = asyncio.Lock()
+
+		self.stored_count = 0
+		self.deduplicated_count = 0
+		self.bytes_written = 0
+
+	@property
+	def _needs_image_processing(self) -> bool:
+		return self.image_format != 'png' or self.perceptual_dedup_distance is not None
+
+	def _open_image(self, screenshot_data: bytes) -> tuple['Image.Image', int | None]:
+		"""Decode the screenshot and compute its perceptual hash (runs in a worker thread)."""
+		from PIL import Image
+
+		image = Image.open(io.BytesIO(screenshot_data))
+		image.load()
+		return image, perceptual_hash(image) if self.perceptual_dedup_distance is not None else None
+
+	def _encode_image(self, image: 'Image.Image') -> bytes:
+		"""Re-encode the screenshot in the configured lossy format (runs in a worker thread)."""
+		buffer = io.BytesIO()
+		image.convert('RGB').save(buffer, format=self.image_format.upper(), quality=self.quality)
+		return buffer.getvalue()
+
+	def _find_similar(self, image_hash: int) -> str | None:
+		assert self.perceptual_dedup_distance is not None
+		for stored_hash, stored_path in reversed(self._perceptual_hashes):
+			if (stored_hash ^ image_hash).bit_count() <= self.perceptual_dedup_distance:
+				return stored_path
+		return None
+
 	@observe_debug(ignore_input=True, ignore_output=True, name='store_screenshot')
 	async def store_screenshot(self, screenshot_b64: str, step_number: int) -> str:
-		"""Store screenshot to disk and return the full path as string"""
-		screenshot_filename = f'step_{step_number}.png'
-		screenshot_path = self.screenshots_dir / screenshot_filename
-
-		# Decode base64 and save to disk
+		"""Store screenshot to disk (once per distinct screenshot) and return the full path as string"""
 		screenshot_data = base64.b64decode(screenshot_b64)
+		digest = hashlib.sha256(screenshot_data).hexdigest()[:32]
+
+		async with self._lock:
+			if (existing_path := self._paths_by_digest.get(digest)) is not None:
+				self.deduplicated_count += 1
+				return existing_path
 
-		async with await anyio.open_file(screenshot_path, 'wb') as f:
-			await f.write(screenshot_data)
+			image = image_hash = None
+			if self._needs_image_processing:
+				try:
+					image, image_hash = await anyio.to_thread.run_sync(self._open_image, screenshot_data)
+				except Exception as e:
+					logger.debug(f'📸 Could not decode screenshot of step {step_number}, storing it as received: {e}')
 
-		return str(screenshot_path)
+			if image_hash is not None and (similar_path := self._find_similar(image_hash)) is not None:
+				self._paths_by_digest[digest] = similar_path
+				self.deduplicated_count += 1
+				return similar_path
+
+			stored_data = screenshot_data
+			extension = _image_extension(screenshot_data)
+			if image is not None and self.image_format != 'png':
+				try:
+					stored_data = await anyio.to_thread.run_sync(self._encode_image, image)
+					extension = f'.{self.image_format}'
+				except Exception as e:
+					logger.warning(f'📸 Could not encode screenshots as {self.image_format}, storing them as received: {e}')
+					self.image_format = 'png'
+
+			screenshot_path = self.screenshots_dir / f'{digest}{extension}'
+			if not screenshot_path.exists():
+				# write to a temporary file first, so concurrent readers never see a partial screenshot
+				temp_path = screenshot_path.with_suffix(f'{extension}.tmp')
+				async with await anyio.open_file(temp_path, 'wb') as f:
+					await f.write(stored_data)
+				os.replace(temp_path, screenshot_path)
+				self.bytes_written += len(stored_data)
+
+			path_str = str(screenshot_path)
+			self._paths_by_digest[digest] = path_str
+			if image_hash is not None:
+				self._perceptual_hashes.append((image_hash, path_str))
+			self.stored_count += 1
+
+		if stored_data is screenshot_data:
+			# the next access (GIF, history.screenshots()) would just re-encode the same bytes
+			signature = _file_signature(screenshot_path)
+			if signature is not None:
+				screenshot_cache.put(path_str, signature, screenshot_b64)
+		return path_str
 
 	@observe_debug(ignore_input=True, ignore_output=True, name='get_screenshot_from_disk')
 	async def get_screenshot(self, screenshot_path: str) -> str | None:
-		"""Load screenshot from disk path and return as base64"""
+		"""Load screenshot from disk path (or the in-memory cache) and return as base64"""
 		if not screenshot_path:
 			return None
 
 		path = Path(screenshot_path)
-		if not path.exists():
+		signature = _file_signature(path)
+		if signature is None:
 			return None
 
+		cached = screenshot_cache.get(screenshot_path, signature)
+		if cached is not None:
+			return cached
+
 		# Load from disk and encode to base64
 		async with await anyio.open_file(path, 'rb') as f:
 			screenshot_data = await f.read()
 
-		return base64.b64encode(screenshot_data).decode('utf-8')
+		screenshot_b64 = base64.b64encode(screenshot_data).decode('utf-8')
+		screenshot_cache.put(screenshot_path, signature, screenshot_b64)
+		return screenshot_b64
@@ -0,0 +1,129 @@
+"""
+Benchmark CloudSync event shipping against a local keep-alive endpoint.
+
+Sends `--events` step events with a random `--screenshot-kib` screenshot each, once with one request (and client)
+per event as events used to be sent, and once through CloudSync batching with and without gzip. Prints events per
+second, requests, connections and bytes on the wire for each.
+
+Usage:
+	python -m browser_use.sync.playground.cloud_sync_benchmark [--events 300] [--screenshot-kib 60]
+"""
+
+import argparse
+import asyncio
+import base64
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from bubus import BaseEvent
+
+from browser_use.sync.service import CloudSync
+
+
+class StepEvent(BaseEvent):
+	step: int
+	screenshot: str
+	user_id: str = ''
+
+
+class CountingEndpoint:
+	"""Keep-alive HTTP/1.1 server that only counts what is POSTed to it"""
+
+	def __init__(self):
+		self.requests = 0
+		self.connections = 0
+		self.wire_bytes = 0
+		self._server: asyncio.Server | None = None
+
+	@property
+	def url(self) -> str:
+		assert self._server is not None
+		host, port = self._server.sockets[0].getsockname()[:2]
+		return f'http://{host}:{port}'
+
+	def reset(self) -> None:
+		self.requests = self.connections = self.wire_bytes = 0
+
+	async def __aenter__(self) -> 'CountingEndpoint':
+		self._server = await asyncio.start_server(self._handle_connection, '127.0.0.1', 0)
+		return self
+
+	async def __aexit__(self, *args) -> None:
+		assert self._server is not None
+		self._server.close()
+
+	async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+		self.connections += 1
+		try:
+			while await reader.readline():
+				headers = {}
+				while (line := await reader.readline()) not in (b'\r\n', b''):
+					name, _, value = line.decode().partition(':')
+					headers[name.strip().lower()] = value.strip()
+				body = await reader.readexactly(int(headers.get('content-length', 0)))
+				self.requests += 1
+				self.wire_bytes += len(body)
+				writer.write(b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}')
+				await writer.drain()
+		except (ConnectionError, asyncio.IncompleteReadError):
+			pass
+		finally:
+			writer.close()
+
+
+def make_events(count: int, screenshot_bytes: int, seed: int = 42) -> list[StepEvent]:
+	screenshot = base64.b64encode(random.Random(seed).randbytes(screenshot_bytes)).decode()
+	return [StepEvent(step=step, screenshot=screenshot) for step in range(count)]
+
+
+def print_row(name: str, events: int, seconds: float, endpoint: CountingEndpoint) -> None:
+	print(
+		f'  {name:<24} {events / seconds:10.0f} events/s {endpoint.requests:8} requests {endpoint.connections:6} connections'
+		f' {endpoint.wire_bytes / 1024 / 1024:10.1f} MiB'
+	)
+
+
+async def run(num_events: int, screenshot_bytes: int, spool_dir: Path) -> None:
+	events = make_events(num_events, screenshot_bytes)
+	print(f'{num_events} events with {screenshot_bytes // 1024} KiB screenshots')
+
+	async with CountingEndpoint() as endpoint:
+		start = time.perf_counter()
+		for event in events:
+			async with httpx.AsyncClient() as client:
+				await client.post(f'{endpoint.url}/api/v1/events', json={'events': [event.model_dump(mode='json')]})
+		print_row('one request per event', num_events, time.perf_counter() - start, endpoint)
+
+		for name, compress_min_bytes in (('batched, gzip', 32 * 1024), ('batched, uncompressed', None)):
+			endpoint.reset()
+			cloud_sync = CloudSync(
+				base_url=endpoint.url,
+				allow_session_events_for_auth=True,
+				compress_min_bytes=compress_min_bytes,
+				spool_dir=spool_dir,
+			)
+			start = time.perf_counter()
+			for event in events:
+				await cloud_sync.handle_event(event)
+			await cloud_sync.close()
+			print_row(name, num_events, time.perf_counter() - start, endpoint)
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--events', type=int, default=300)
+	parser.add_argument('--screenshot-kib', type=int, default=60, help='raw size of each screenshot')
+	args = parser.parse_args()
+
+	with tempfile.TemporaryDirectory() as tmp_dir:
+		os.environ['BROWSER_USE_CLOUD_SYNC'] = 'true'
+		os.environ['BROWSER_USE_CONFIG_DIR'] = str(Path(tmp_dir) / 'config')
+		asyncio.run(run(args.events, args.screenshot_kib * 1024, Path(tmp_dir) / 'spool'))
+
+
+if __name__ == '__main__':
+	main()
@@ -1,22 +1,60 @@
 """
 Cloud sync service for sending events to the Browser Use cloud.
+
+Events are queued by `handle_event` and shipped by a background batcher over one pooled keep-alive connection:
+a batch is sent when it reaches `batch_max_events` / `batch_max_bytes` or `batch_interval` seconds after its first
+event. Large batches (screenshots) are gzip-compressed. Batches that can't be delivered (endpoint unreachable,
+5xx, rate limited) are spooled to disk and replayed, in order, before the next batch, also by later processes.
 """
 
+import asyncio
+import gzip
+import hashlib
+import json
 import logging
+import os
+import time
+from pathlib import Path
 
+import anyio
 import httpx
 from bubus import BaseEvent
+from uuid_extensions import uuid7str
 
 from browser_use.config import CONFIG
 from browser_use.sync.auth import TEMP_USER_ID, DeviceAuthClient
 
 logger = logging.getLogger(__name__)
 
+# status codes after which a batch is worth retrying later, any other error response drops the batch
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
 
 class CloudSync:
 	"""Service for syncing events to the Browser Use cloud"""
 
-	def __init__(self, base_url: str | None = None, allow_session_events_for_auth: bool = False):
+	def __init__(
+		self,
+		base_url: str | None = None,
+		allow_session_events_for_auth: bool = False,
+		http_client: httpx.AsyncClient | None = None,
+		batch_max_events: int = 50,
+		batch_max_bytes: int = 4 * 1024 * 1024,
+		batch_interval: float = 1.0,
+		compress_min_bytes: int | None = 32 * 1024,
+		spool_dir: str | Path | None = None,
+		spool_max_bytes: int = 100 * 1024 * 1024,
+	):
+		"""
+		Args:
+			http_client: client to send events with, by default one pooled client is created and closed by `close()`
+			batch_max_events / batch_max_bytes / batch_interval: a batch is sent when it holds this many events or
+				serialized bytes, or this many seconds after its first event was queued
+			compress_min_bytes: gzip request bodies of at least this size, None disables compression
+			spool_dir: where undeliverable batches are kept until they can be replayed, defaults to a directory per
+				API URL in the browser-use config dir
+			spool_max_bytes: oldest spooled batches are dropped beyond this size
+		"""
 		# Backend API URL for all API requests - can be passed directly or defaults to env var
 		self.base_url = base_url or CONFIG.BROWSER_USE_CLOUD_API_URL
 		self.auth_client = DeviceAuthClient(base_url=self.base_url)
@@ -26,8 +64,37 @@ class CloudSync:
 		# Check if cloud sync is actually enabled - if not, we should remain silent
 		self.enabled = CONFIG.BROWSER_USE_CLOUD_SYNC
 
+		self.batch_max_events = batch_max_events
+		self.batch_max_bytes = batch_max_bytes
+		self.batch_interval = batch_interval
+		self.compress_min_bytes = compress_min_bytes
+		self.spool_max_bytes = spool_max_bytes
+		if spool_dir is None:
+			url_digest = hashlib.sha256(self.base_url.rstrip('/').encode()).hexdigest()[:12]
+			spool_dir = CONFIG.BROWSER_USE_CONFIG_DIR / 'events' / 'spool' / url_digest
+		self.spool_dir = Path(spool_dir)
+
+		self._http_client = http_client
+		self._owns_http_client = http_client is None
+		self._client_loop: asyncio.AbstractEventLoop | None = None
+
+		# serialized events waiting for the batcher
+		self._pending: list[bytes] = []
+		self._pending_bytes = 0
+		self._first_pending_at = 0.0
+		self._batch_ready = asyncio.Event()
+		self._send_lock = asyncio.Lock()
+		self._batcher_task: asyncio.Task | None = None
+		self._batcher_loop: asyncio.AbstractEventLoop | None = None
+		# None until the spool directory was checked for batches of earlier runs
+		self._spool_has_batches: bool | None = None
+
+		self.events_sent = 0
+		self.requests_sent = 0
+		self.events_spooled = 0
+
 	async def handle_event(self, event: BaseEvent) -> None:
-		"""Handle an event by sending it to the cloud"""
+		"""Handle an event by queueing it for the cloud"""
 		try:
 			# If cloud sync is disabled, don't handle any events
 			if not self.enabled:
@@ -55,10 +122,8 @@ class CloudSync:
 			logger.error(f'Failed to handle {event.event_type} event: {type(e).__name__}: {e}', exc_info=True)
 
 	async def _send_event(self, event: BaseEvent) -> None:
-		"""Send event to cloud API"""
+		"""Serialize the event and queue it for the next batch"""
 		try:
-			headers = {}
-
 			# Override user_id only if it's not already set to a specific value
 			# This allows CLI and other code to explicitly set temp user_id when needed
 			if self.auth_client and self.auth_client.is_authenticated:
@@ -71,38 +136,191 @@ class CloudSync:
 				if not hasattr(event, 'user_id') or not getattr(event, 'user_id', None):
 					setattr(event, 'user_id', TEMP_USER_ID)
 
-			# Add auth headers if available
-			if self.auth_client:
-				headers.update(self.auth_client.get_headers())
-
-			# Send event (batch format with direct BaseEvent serialization)
-			async with httpx.AsyncClient() as client:
-				# Serialize event and add device_id to all events
-				event_data = event.model_dump(mode='json')
-				if self.auth_client and self.auth_client.device_id:
-					event_data['device_id'] = self.auth_client.device_id
-
-				response = await client.post(
-					f'{self.base_url.rstrip("/")}/api/v1/events',
-					json={'events': [event_data]},
-					headers=headers,
-					timeout=10.0,
-				)
-
-				if response.status_code >= 400:
-					# Log error but don't raise - we want to fail silently
-					logger.debug(
-						f'Failed to send sync event: POST {response.request.url} {response.status_code} - {response.text}'
-					)
+			# Serialize event and add device_id to all events
+			event_data = event.model_dump(mode='json')
+			if self.auth_client and self.auth_client.device_id:
+				event_data['device_id'] = self.auth_client.device_id
+
+			self._enqueue(json.dumps(event_data, separators=(',', ':')).encode())
+		except Exception as e:
+			logger.debug(f'Unexpected error queueing event {event}: {type(e).__name__}: {e}')
+
+	def _enqueue(self, serialized_event: bytes) -> None:
+		loop = asyncio.get_running_loop()
+		if self._batcher_loop is not loop:
+			# primitives of a previous event loop (e.g. an earlier asyncio.run()) can't be awaited in this one
+			self._batch_ready = asyncio.Event()
+			self._send_lock = asyncio.Lock()
+			self._batcher_task = None
+			self._batcher_loop = loop
+
+		if not self._pending:
+			self._first_pending_at = time.monotonic()
+		self._pending.append(serialized_event)
+		self._pending_bytes += len(serialized_event)
+		if len(self._pending) >= self.batch_max_events or self._pending_bytes >= self.batch_max_bytes:
+			self._batch_ready.set()
+
+		if self._batcher_task is None or self._batcher_task.done():
+			self._batcher_task = asyncio.create_task(self._run_batcher(), name='cloud_sync_batcher')
+
+	def _take_batch(self) -> list[bytes]:
+		batch: list[bytes] = []
+		batch_bytes = 0
+		for serialized_event in self._pending:
+			if batch and (len(batch) >= self.batch_max_events or batch_bytes + len(serialized_event) > self.batch_max_bytes):
+				break
+			batch.append(serialized_event)
+			batch_bytes += len(serialized_event)
+
+		del self._pending[: len(batch)]
+		self._pending_bytes -= batch_bytes
+		self._first_pending_at = time.monotonic()
+		if len(self._pending) < self.batch_max_events and self._pending_bytes < self.batch_max_bytes:
+			self._batch_ready.clear()
+		return batch
+
+	async def _run_batcher(self) -> None:
+		"""Ship queued events in batches until the queue stays empty"""
+		while self._pending:
+			timeout = self._first_pending_at + self.batch_interval - time.monotonic()
+			if timeout > 0:
+				try:
+					await asyncio.wait_for(self._batch_ready.wait(), timeout)
+				except TimeoutError:
+					pass
+			async with self._send_lock:
+				if self._pending:
+					await self._send_batch(self._take_batch())
+
+	async def flush(self) -> None:
+		"""Send all queued events now (undeliverable ones end up in the spool)"""
+		async with self._send_lock:
+			while self._pending:
+				await self._send_batch(self._take_batch())
+
+	async def close(self) -> None:
+		"""Flush queued events, stop the batcher and close the HTTP client if it was created here"""
+		await self.flush()
+		if self._batcher_task is not None and not self._batcher_task.done():
+			self._batcher_task.cancel()
+			try:
+				await self._batcher_task
+			except asyncio.CancelledError:
+				pass
+		self._batcher_task = None
+		if self._owns_http_client and self._http_client is not None:
+			await self._http_client.aclose()
+			self._http_client = None
+
+	def _get_http_client(self) -> httpx.AsyncClient:
+		"""The pooled client, recreated if it belongs to another (closed) event loop"""
+		loop = asyncio.get_running_loop()
+		if self._owns_http_client and (self._http_client is None or self._client_loop is not loop):
+			self._http_client = httpx.AsyncClient(
+				timeout=10.0, limits=httpx.Limits(max_connections=4, max_keepalive_connections=4, keepalive_expiry=60.0)
+			)
+			self._client_loop = loop
+		assert self._http_client is not None
+		return self._http_client
+
+	async def _send_batch(self, batch: list[bytes]) -> None:
+		"""Send a batch after any spooled batches, spooling it if it can't be delivered now"""
+		if self._spool_has_batches is not False and not await self._replay_spool():
+			# keep the order of events: nothing is sent before the spooled batches got through
+			await self._spool_batch(batch)
+			return
+
+		if not await self._post_batch(batch):
+			await self._spool_batch(batch)
+
+	async def _post_batch(self, batch: list[bytes]) -> bool:
+		"""POST a batch of serialized events, False if it should be retried later"""
+		body = b'{"events":[' + b','.join(batch) + b']}'
+		headers = {'Content-Type': 'application/json'}
+		# Add auth headers if available
+		if self.auth_client:
+			headers.update(self.auth_client.get_headers())
+		if self.compress_min_bytes is not None and len(body) >= self.compress_min_bytes:
+			# screenshots are base64 of already compressed images, the fastest level saves almost as much
+			body = await anyio.to_thread.run_sync(lambda: gzip.compress(body, compresslevel=1))
+			headers['Content-Encoding'] = 'gzip'
+
+		try:
+			response = await self._get_http_client().post(
+				f'{self.base_url.rstrip("/")}/api/v1/events', content=body, headers=headers
+			)
+			self.requests_sent += 1
 		except httpx.TimeoutException:
-			logger.debug(f'Event send timed out after 10 seconds: {event}')
-		except httpx.ConnectError as e:
-			# logger.warning(f'⚠️ Failed to connect to cloud service at {self.base_url}: {e}')
-			pass
+			logger.debug(f'Sending {len(batch)} sync events timed out after 10 seconds')
+			return False
+		except httpx.ConnectError:
+			return False
 		except httpx.HTTPError as e:
-			logger.debug(f'HTTP error sending event {event}: {type(e).__name__}: {e}')
+			logger.debug(f'HTTP error sending {len(batch)} sync events: {type(e).__name__}: {e}')
+			return False
+		except Exception as e:
+			logger.debug(f'Unexpected error sending {len(batch)} sync events: {type(e).__name__}: {e}')
+			return True
+
+		if response.status_code == 415 and 'Content-Encoding' in headers:
+			# the endpoint doesn't accept compressed bodies, send uncompressed from now on
+			self.compress_min_bytes = None
+			return await self._post_batch(batch)
+		if response.status_code in RETRYABLE_STATUS_CODES:
+			logger.debug(f'Sync endpoint unavailable, spooling events: POST {response.request.url} {response.status_code}')
+			return False
+		if response.status_code >= 400:
+			# Log error but don't raise - we want to fail silently
+			logger.debug(f'Failed to send sync events: POST {response.request.url} {response.status_code} - {response.text}')
+		else:
+			self.events_sent += len(batch)
+		return True
+
+	async def _spool_batch(self, batch: list[bytes]) -> None:
+		"""Keep an undeliverable batch on disk (one event per line), dropping the oldest batches beyond the limit"""
+		try:
+			await anyio.Path(self.spool_dir).mkdir(parents=True, exist_ok=True)
+			# uuid7 names sort chronologically, so batches are replayed in order
+			spool_file = self.spool_dir / f'{uuid7str()}.jsonl'
+			temp_file = spool_file.with_suffix('.tmp')
+			await anyio.Path(temp_file).write_bytes(b'\n'.join(batch) + b'\n')
+			os.replace(temp_file, spool_file)
+			self._spool_has_batches = True
+			self.events_spooled += len(batch)
+
+			spooled = sorted(self.spool_dir.glob('*.jsonl'))
+			spooled_bytes = sum(f.stat().st_size for f in spooled)
+			for old_file in spooled[:-1]:
+				if spooled_bytes <= self.spool_max_bytes:
+					break
+				spooled_bytes -= old_file.stat().st_size
+				old_file.unlink(missing_ok=True)
+				logger.debug(f'Sync event spool exceeds {self.spool_max_bytes} bytes, dropped {old_file.name}')
 		except Exception as e:
-			logger.debug(f'Unexpected error sending event {event}: {type(e).__name__}: {e}')
+			logger.debug(f'Failed to spool {len(batch)} sync events: {type(e).__name__}: {e}')
+
+	async def _replay_spool(self) -> bool:
+		"""Send the spooled batches oldest first, False if the endpoint is still unreachable"""
+		try:
+			spooled = sorted(self.spool_dir.glob('*.jsonl'))
+		except OSError:
+			spooled = []
+
+		for spool_file in spooled:
+			try:
+				batch = (await anyio.Path(spool_file).read_bytes()).splitlines()
+			except OSError:
+				continue
+			if batch and not await self._post_batch(batch):
+				self._spool_has_batches = True
+				return False
+			spool_file.unlink(missing_ok=True)
+			if batch:
+				logger.debug(f'Replayed {len(batch)} spooled sync events')
+
+		self._spool_has_batches = False
+		return True
 
 	# async def _update_wal_user_ids(self, session_id: str) -> None:
 	# 	"""Update user IDs in WAL file after authentication"""
@@ -0,0 +1,153 @@
+"""
+Test CloudSync event shipping against a local mock endpoint.
+
+Checks that events are sent in size-bounded, gzip-compressed batches over one pooled connection, and that
+undeliverable batches are spooled and replayed in order. Throughput is measured by
+`browser_use.sync.playground.cloud_sync_benchmark`.
+"""
+
+import asyncio
+import base64
+import gzip
+import json
+import random
+
+import pytest
+from bubus import BaseEvent
+
+from browser_use.sync.service import CloudSync
+
+
+class MockStepEvent(BaseEvent):
+	step: int
+	screenshot: str
+	user_id: str = ''
+
+
+class MockEventsEndpoint:
+	"""Minimal keep-alive HTTP/1.1 server that records the events POSTed to it"""
+
+	def __init__(self):
+		self.status_code = 200
+		self.events: list[dict] = []
+		self.requests = 0
+		self.connections = 0
+		self.payloads: list[tuple[int, int, int, bool]] = []
+		"""(events, bytes on the wire, JSON bytes, gzip-encoded) of every accepted POST"""
+		self._server: asyncio.Server | None = None
+
+	@property
+	def url(self) -> str:
+		assert self._server is not None
+		host, port = self._server.sockets[0].getsockname()[:2]
+		return f'http://{host}:{port}'
+
+	async def __aenter__(self) -> 'MockEventsEndpoint':
+		self._server = await asyncio.start_server(self._handle_connection, '127.0.0.1', 0)
+		return self
+
+	async def __aexit__(self, *args) -> None:
+		assert self._server is not None
+		self._server.close()
+
+	async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+		self.connections += 1
+		try:
+			while request_line := await reader.readline():
+				headers = {}
+				while (line := await reader.readline()) not in (b'\r\n', b''):
+					name, _, value = line.decode().partition(':')
+					headers[name.strip().lower()] = value.strip()
+				body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+				self.requests += 1
+				if self.status_code == 200 and request_line.startswith(b'POST /api/v1/events'):
+					compressed = headers.get('content-encoding') == 'gzip'
+					payload = gzip.decompress(body) if compressed else body
+					events = json.loads(payload)['events']
+					self.events.extend(events)
+					self.payloads.append((len(events), len(body), len(payload), compressed))
+
+				writer.write(f'HTTP/1.1 {self.status_code} Status\r\nContent-Length: 2\r\n\r\n{{}}'.encode())
+				await writer.drain()
+		except (ConnectionError, asyncio.IncompleteReadError):
+			pass
+		finally:
+			writer.close()
+
+
+def make_events(count: int, screenshot_bytes: int) -> list[MockStepEvent]:
+	rng = random.Random(42)
+	screenshot = base64.b64encode(rng.randbytes(screenshot_bytes)).decode()
+	return [MockStepEvent(step=step, screenshot=screenshot) for step in range(count)]
+
+
+@pytest.fixture
+def make_cloud_sync(monkeypatch, tmp_path):
+	"""Factory of CloudSync services with their config and spool directories in `tmp_path`"""
+	monkeypatch.setenv('BROWSER_USE_CLOUD_SYNC', 'true')
+	monkeypatch.setenv('BROWSER_USE_CONFIG_DIR', str(tmp_path / 'config'))
+
+	def make(base_url: str, **kwargs) -> CloudSync:
+		return CloudSync(base_url=base_url, allow_session_events_for_auth=True, spool_dir=tmp_path / 'spool', **kwargs)
+
+	return make
+
+
+@pytest.mark.asyncio
+async def test_events_are_batched_and_compressed(make_cloud_sync):
+	num_events = 300
+
+	async with MockEventsEndpoint() as endpoint:
+		cloud_sync = make_cloud_sync(endpoint.url, batch_max_events=50, batch_max_bytes=1_000_000)
+		for event in make_events(num_events, screenshot_bytes=60_000):
+			await cloud_sync.handle_event(event)
+		await cloud_sync.close()
+
+		assert [event['step'] for event in endpoint.events] == list(range(num_events))
+		assert cloud_sync.events_sent == num_events
+		# all batches share the pooled connection and are bounded by `batch_max_bytes`, not one request per event
+		assert endpoint.connections == 1
+		assert endpoint.requests == cloud_sync.requests_sent == len(endpoint.payloads)
+		batch_size = endpoint.payloads[0][0]
+		assert 1 < batch_size < 50
+		assert [payload[0] for payload in endpoint.payloads[:-1]] == [batch_size] * (len(endpoint.payloads) - 1)
+		assert len(endpoint.payloads) == -(-num_events // batch_size)
+		for _, wire_bytes, json_bytes, compressed in endpoint.payloads:
+			assert json_bytes <= cloud_sync.batch_max_bytes + 100
+			assert compressed and wire_bytes < json_bytes
+
+		endpoint.events.clear()
+		endpoint.payloads.clear()
+		cloud_sync = make_cloud_sync(endpoint.url, batch_max_events=50, compress_min_bytes=None)
+		for event in make_events(num_events, screenshot_bytes=100):
+			await cloud_sync.handle_event(event)
+		await cloud_sync.close()
+
+		# small events are batched by count, and bodies are sent as they are when compression is off
+		assert len(endpoint.events) == num_events
+		assert [payload[0] for payload in endpoint.payloads] == [50] * (num_events // 50)
+		assert not any(compressed or wire_bytes != json_bytes for _, wire_bytes, json_bytes, compressed in endpoint.payloads)
+
+
+@pytest.mark.asyncio
+async def test_spool_and_replay(make_cloud_sync, tmp_path):
+	async with MockEventsEndpoint() as endpoint:
+		endpoint.status_code = 503
+		cloud_sync = make_cloud_sync(endpoint.url, batch_max_events=5)
+		for event in make_events(12, screenshot_bytes=100):
+			await cloud_sync.handle_event(event)
+		await cloud_sync.close()
+
+		assert endpoint.events == []
+		assert cloud_sync.events_spooled == 12
+		assert len(list((tmp_path / 'spool').glob('*.jsonl'))) == 3
+
+		# a later run replays the spooled batches before its own events
+		endpoint.status_code = 200
+		cloud_sync = make_cloud_sync(endpoint.url)
+		await cloud_sync.handle_event(MockStepEvent(step=12, screenshot=''))
+		await cloud_sync.close()
+
+		assert [event['step'] for event in endpoint.events] == list(range(13))
+		assert list((tmp_path / 'spool').glob('*.jsonl')) == []
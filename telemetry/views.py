@@ -95,3 +95,26 @@ class CLITelemetryEvent(BaseTelemetryEvent):
 	error_message: str | None = None
 
 	name: str = 'cli_event'
+
+
+@dataclass
+class BatchRunTelemetryEvent(BaseTelemetryEvent):
+	"""Telemetry event for a BatchRunner run"""
+
+	version: str
+	agent_type: str | None  # 'code' for CodeAgent, None for regular Agent
+	model_providers: Sequence[str]
+	pool_size: int
+	max_concurrency: int
+	total_tasks: int
+	succeeded: int
+	failed: int
+	wall_seconds: float
+	tasks_per_minute: float
+	latency_p50_seconds: float
+	latency_p90_seconds: float
+	latency_p99_seconds: float
+	total_tokens: int
+	total_cost: float
+
+	name: str = 'batch_run_event'
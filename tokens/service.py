@@ -3,11 +3,17 @@ Token cost service that tracks LLM token usage and costs.
 
 Fetches pricing data from LiteLLM repository and caches it for 1 day.
 Automatically tracks token usage when LLMs are registered and invoked.
+
+Usage is aggregated as it is recorded: every entry is priced once and added to running per-model totals and to a
+per-model rollup of time buckets, so summaries don't depend on the length of the usage history, which can be bounded.
 """
 
 import asyncio
+import bisect
 import logging
 import os
+from collections import deque
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
@@ -45,6 +51,47 @@ def xdg_cache_home() -> Path:
 	return default
 
 
+@dataclass
+class _UsageTotals:
+	"""Running token and cost totals of one model, overall or within one time bucket"""
+
+	prompt_tokens: int = 0
+	prompt_cached_tokens: int = 0
+	completion_tokens: int = 0
+	invocations: int = 0
+	prompt_cost: float = 0.0
+	prompt_cached_cost: float = 0.0
+	completion_cost: float = 0.0
+	cost: float = 0.0
+
+	def add_usage(self, usage: ChatInvokeUsage) -> None:
+		self.prompt_tokens += usage.prompt_tokens
+		self.prompt_cached_tokens += usage.prompt_cached_tokens or 0
+		self.completion_tokens += usage.completion_tokens
+		self.invocations += 1
+
+	def add_cost(self, cost: TokenCostCalculated) -> None:
+		self.prompt_cost += cost.prompt_cost
+		self.prompt_cached_cost += cost.prompt_read_cached_cost or 0
+		self.completion_cost += cost.completion_cost
+		self.cost += cost.total_cost
+
+	def add_entry(self, entry: TokenUsageEntry) -> None:
+		self.add_usage(entry.usage)
+		if entry.cost:
+			self.add_cost(entry.cost)
+
+	def merge(self, other: '_UsageTotals') -> None:
+		self.prompt_tokens += other.prompt_tokens
+		self.prompt_cached_tokens += other.prompt_cached_tokens
+		self.completion_tokens += other.completion_tokens
+		self.invocations += other.invocations
+		self.prompt_cost += other.prompt_cost
+		self.prompt_cached_cost += other.prompt_cached_cost
+		self.completion_cost += other.completion_cost
+		self.cost += other.cost
+
+
 class TokenCost:
 	"""Service for tracking token usage and calculating costs"""
 
@@ -52,15 +99,45 @@ class TokenCost:
 	CACHE_DURATION = timedelta(days=1)
 	PRICING_URL = 'https://raw.githubusercontent.com/BerriAI/litellm/main/model_prices_and_context_window.json'
 
-	def __init__(self, include_cost: bool = False):
+	def __init__(
+		self,
+		include_cost: bool = False,
+		max_history_entries: int | None = None,
+		bucket_size: timedelta = timedelta(minutes=1),
+		bucket_retention: timedelta = timedelta(days=7),
+	):
+		"""
+		Args:
+			max_history_entries: keep only the most recent entries in `usage_history` (summaries still cover all usage)
+			bucket_size: resolution of the rollup answering `get_usage_summary(since=...)` once the entries around
+				`since` have left the history
+			bucket_retention: how far back `since` queries are answered, older buckets are dropped
+		"""
 		self.include_cost = include_cost or os.getenv('BROWSER_USE_CALCULATE_COST', 'false').lower() == 'true'
 
-		self.usage_history: list[TokenUsageEntry] = []
+		self.max_history_entries = max_history_entries
+		self.usage_history: list[TokenUsageEntry] | deque[TokenUsageEntry] = (
+			deque(maxlen=max_history_entries) if max_history_entries else []
+		)
 		self.registered_llms: dict[str, BaseChatModel] = {}
 		self._pricing_data: dict[str, Any] | None = None
+		self._model_pricing: dict[str, ModelPricing | None] = {}
 		self._initialized = False
 		self._cache_dir = xdg_cache_home() / self.CACHE_DIR_NAME
 
+		self._bucket_seconds = bucket_size.total_seconds()
+		self._retained_buckets = max(1, int(bucket_retention / bucket_size))
+		self._reset_aggregates()
+
+	def _reset_aggregates(self) -> None:
+		self._totals_by_model: dict[str, _UsageTotals] = {}
+		# bucket index -> model -> totals, in chronological order
+		self._buckets: dict[int, dict[str, _UsageTotals]] = {}
+		self._buckets_dropped = False
+		self._evicted_entries = 0
+		# entries recorded before the pricing data was loaded, priced on the next summary or usage log
+		self._unpriced_entries: list[TokenUsageEntry] = []
+
 	async def initialize(self) -> None:
 		"""Initialize the service by loading pricing data"""
 		if not self._initialized:
@@ -157,6 +234,7 @@ class TokenCost:
 			logger.debug(f'Error fetching pricing data: {e}')
 			# Fall back to empty pricing data
 			self._pricing_data = {}
+		self._model_pricing.clear()
 
 	async def get_model_pricing(self, model_name: str) -> ModelPricing | None:
 		"""Get pricing information for a specific model"""
@@ -164,6 +242,15 @@ class TokenCost:
 		if not self._initialized:
 			await self.initialize()
 
+		return self._lookup_model_pricing(model_name)
+
+	def _lookup_model_pricing(self, model_name: str) -> ModelPricing | None:
+		"""Pricing of a model from the loaded pricing data, looked up once per model"""
+		if model_name not in self._model_pricing:
+			self._model_pricing[model_name] = self._find_model_pricing(model_name)
+		return self._model_pricing[model_name]
+
+	def _find_model_pricing(self, model_name: str) -> ModelPricing | None:
 		# Check custom pricing first
 		if model_name in CUSTOM_MODEL_PRICING:
 			data = CUSTOM_MODEL_PRICING[model_name]
@@ -204,6 +291,10 @@ class TokenCost:
 		if data is None:
 			return None
 
+		return self._cost_from_pricing(data, usage)
+
+	@staticmethod
+	def _cost_from_pricing(data: ModelPricing, usage: ChatInvokeUsage) -> TokenCostCalculated:
 		uncached_prompt_tokens = usage.prompt_tokens - (usage.prompt_cached_tokens or 0)
 
 		return TokenCostCalculated(
@@ -225,17 +316,64 @@ class TokenCost:
 		)
 
 	def add_usage(self, model: str, usage: ChatInvokeUsage) -> TokenUsageEntry:
-		"""Add token usage entry to history (without calculating cost)"""
+		"""Add token usage entry to history and to the running aggregates, priced if the pricing data is loaded"""
 		entry = TokenUsageEntry(
 			model=model,
 			timestamp=datetime.now(),
 			usage=usage,
 		)
 
+		if self.max_history_entries and len(self.usage_history) == self.max_history_entries:
+			self._evicted_entries += 1
 		self.usage_history.append(entry)
 
+		self._totals_by_model.setdefault(model, _UsageTotals()).add_usage(usage)
+		bucket = self._buckets.get(bucket_index := self._bucket_index(entry.timestamp))
+		if bucket is None:
+			bucket = self._buckets[bucket_index] = {}
+			self._drop_expired_buckets(bucket_index)
+		bucket.setdefault(model, _UsageTotals()).add_usage(usage)
+
+		if self.include_cost:
+			if self._initialized:
+				self._price_entry(entry)
+			else:
+				self._unpriced_entries.append(entry)
+
 		return entry
 
+	def _bucket_index(self, timestamp: datetime) -> int:
+		return int(timestamp.timestamp() // self._bucket_seconds)
+
+	def _drop_expired_buckets(self, current_index: int) -> None:
+		while self._buckets:
+			oldest_index = next(iter(self._buckets))
+			if oldest_index > current_index - self._retained_buckets:
+				break
+			del self._buckets[oldest_index]
+			self._buckets_dropped = True
+
+	def _price_entry(self, entry: TokenUsageEntry) -> None:
+		"""Price an entry once and add its cost to the aggregates"""
+		pricing = self._lookup_model_pricing(entry.model)
+		if pricing is None:
+			return
+
+		entry.cost = self._cost_from_pricing(pricing, entry.usage)
+		self._totals_by_model[entry.model].add_cost(entry.cost)
+		if (bucket := self._buckets.get(self._bucket_index(entry.timestamp))) is not None:
+			bucket[entry.model].add_cost(entry.cost)
+
+	async def _price_pending_entries(self) -> None:
+		if not self.include_cost:
+			return
+		if not self._initialized:
+			await self.initialize()
+
+		pending, self._unpriced_entries = self._unpriced_entries, []
+		for entry in pending:
+			self._price_entry(entry)
+
 	# async def _log_non_usage_llm(self, llm: BaseChatModel) -> None:
 	# 	"""Log non-usage to the logger"""
 	# 	C_CYAN = '\033[96m'
@@ -247,6 +385,7 @@ class TokenCost:
 		"""Log usage to the logger"""
 		if not self._initialized:
 			await self.initialize()
+		await self._price_pending_entries()
 
 		# ANSI color codes
 		C_CYAN = '\033[96m'
@@ -255,8 +394,8 @@ class TokenCost:
 		C_BLUE = '\033[94m'
 		C_RESET = '\033[0m'
 
-		# Always get cost breakdown for token details (even if not showing costs)
-		cost = await self.calculate_cost(model, usage.usage)
+		# Cost breakdown for token details, priced when the entry was recorded
+		cost = usage.cost
 
 		# Build input tokens breakdown
 		input_part = self._build_input_tokens_display(usage.usage, cost)
@@ -330,6 +469,14 @@ class TokenCost:
 
 		self.registered_llms[instance_id] = llm
 
+		# wrappers that call other models (e.g. ChatHedged) track the usage of each inner call under its own model,
+		# a backup request that was sent next to the primary shows up as extra usage of the backup model
+		inner_llms: list[BaseChatModel] | None = getattr(llm, 'inner_llms', None)
+		if inner_llms:
+			for inner_llm in inner_llms:
+				self.register_llm(inner_llm)
+			return llm
+
 		# Store the original method
 		original_ainvoke = llm.ainvoke
 		# Store reference to self for use in the closure
@@ -362,89 +509,101 @@ class TokenCost:
 
 	def get_usage_tokens_for_model(self, model: str) -> ModelUsageTokens:
 		"""Get usage tokens for a specific model"""
-		filtered_usage = [u for u in self.usage_history if u.model == model]
+		totals = self._totals_by_model.get(model) or _UsageTotals()
 
 		return ModelUsageTokens(
 			model=model,
-			prompt_tokens=sum(u.usage.prompt_tokens for u in filtered_usage),
-			prompt_cached_tokens=sum(u.usage.prompt_cached_tokens or 0 for u in filtered_usage),
-			completion_tokens=sum(u.usage.completion_tokens for u in filtered_usage),
-			total_tokens=sum(u.usage.prompt_tokens + u.usage.completion_tokens for u in filtered_usage),
+			prompt_tokens=totals.prompt_tokens,
+			prompt_cached_tokens=totals.prompt_cached_tokens,
+			completion_tokens=totals.completion_tokens,
+			total_tokens=totals.prompt_tokens + totals.completion_tokens,
 		)
 
 	async def get_usage_summary(self, model: str | None = None, since: datetime | None = None) -> UsageSummary:
-		"""Get summary of token usage and costs (costs calculated on-the-fly)"""
-		filtered_usage = self.usage_history
+		"""Get summary of token usage and costs from the running aggregates
 
-		if model:
-			filtered_usage = [u for u in filtered_usage if u.model == model]
-
-		if since:
-			filtered_usage = [u for u in filtered_usage if u.timestamp >= since]
-
-		if not filtered_usage:
-			return UsageSummary(
-				total_prompt_tokens=0,
-				total_prompt_cost=0.0,
-				total_prompt_cached_tokens=0,
-				total_prompt_cached_cost=0.0,
-				total_completion_tokens=0,
-				total_completion_cost=0.0,
-				total_tokens=0,
-				total_cost=0.0,
-				entry_count=0,
-			)
+		`since` is answered from the time-bucketed rollup: exactly while the history still holds the entries of the
+		bucket containing `since`, otherwise with the resolution of one bucket (the whole bucket is included), and
+		counting from the oldest retained bucket if `since` lies before the bucket retention.
+		"""
+		await self._price_pending_entries()
 
-		# Calculate totals
-		total_prompt = sum(u.usage.prompt_tokens for u in filtered_usage)
-		total_completion = sum(u.usage.completion_tokens for u in filtered_usage)
-		total_tokens = total_prompt + total_completion
-		total_prompt_cached = sum(u.usage.prompt_cached_tokens or 0 for u in filtered_usage)
-		models = list({u.model for u in filtered_usage})
+		totals_by_model = self._totals_by_model if since is None else self._totals_since(since)
+		if model:
+			totals_by_model = {model: totals_by_model[model]} if model in totals_by_model else {}
 
-		# Calculate per-model stats with record-by-record cost calculation
 		model_stats: dict[str, ModelUsageStats] = {}
-		total_prompt_cost = 0.0
-		total_completion_cost = 0.0
-		total_prompt_cached_cost = 0.0
-
-		for entry in filtered_usage:
-			if entry.model not in model_stats:
-				model_stats[entry.model] = ModelUsageStats(model=entry.model)
-
-			stats = model_stats[entry.model]
-			stats.prompt_tokens += entry.usage.prompt_tokens
-			stats.completion_tokens += entry.usage.completion_tokens
-			stats.total_tokens += entry.usage.prompt_tokens + entry.usage.completion_tokens
-			stats.invocations += 1
+		for model_name, totals in totals_by_model.items():
+			if not totals.invocations:
+				continue
+			total_tokens = totals.prompt_tokens + totals.completion_tokens
+			model_stats[model_name] = ModelUsageStats(
+				model=model_name,
+				prompt_tokens=totals.prompt_tokens,
+				prompt_cached_tokens=totals.prompt_cached_tokens,
+				completion_tokens=totals.completion_tokens,
+				total_tokens=total_tokens,
+				cost=totals.cost,
+				invocations=totals.invocations,
+				average_tokens_per_invocation=total_tokens / totals.invocations,
+			)
 
-			if self.include_cost:
-				# Calculate cost record by record using the updated calculate_cost function
-				cost = await self.calculate_cost(entry.model, entry.usage)
-				if cost:
-					stats.cost += cost.total_cost
-					total_prompt_cost += cost.prompt_cost
-					total_completion_cost += cost.completion_cost
-					total_prompt_cached_cost += cost.prompt_read_cached_cost or 0
-
-		# Calculate averages
-		for stats in model_stats.values():
-			if stats.invocations > 0:
-				stats.average_tokens_per_invocation = stats.total_tokens / stats.invocations
+		summary = _UsageTotals()
+		for model_name in model_stats:
+			summary.merge(totals_by_model[model_name])
 
 		return UsageSummary(
-			total_prompt_tokens=total_prompt,
-			total_prompt_cost=total_prompt_cost,
-			total_prompt_cached_tokens=total_prompt_cached,
-			total_prompt_cached_cost=total_prompt_cached_cost,
-			total_completion_tokens=total_completion,
-			total_completion_cost=total_completion_cost,
-			total_tokens=total_tokens,
-			total_cost=total_prompt_cost + total_completion_cost + total_prompt_cached_cost,
-			entry_count=len(filtered_usage),
+			total_prompt_tokens=summary.prompt_tokens,
+			total_prompt_cost=summary.prompt_cost,
+			total_prompt_cached_tokens=summary.prompt_cached_tokens,
+			total_prompt_cached_cost=summary.prompt_cached_cost,
+			total_completion_tokens=summary.completion_tokens,
+			total_completion_cost=summary.completion_cost,
+			total_tokens=summary.prompt_tokens + summary.completion_tokens,
+			total_cost=summary.prompt_cost + summary.completion_cost + summary.prompt_cached_cost,
+			entry_count=summary.invocations,
 			by_model=model_stats,
 		)
 
+	def _totals_since(self, since: datetime) -> dict[str, _UsageTotals]:
+		"""Per-model totals of the usage recorded at or after `since`"""
+		if not self._buckets:
+			return {}
+
+		since_index = self._bucket_index(since)
+		if since_index < next(iter(self._buckets)) and not self._buckets_dropped:
+			return self._totals_by_model
+
+		totals: dict[str, _UsageTotals] = {}
+
+		def add_bucket(bucket: dict[str, _UsageTotals]) -> None:
+			for model_name, bucket_totals in bucket.items():
+				if model_name in totals:
+					totals[model_name].merge(bucket_totals)
+				else:
+					totals[model_name] = replace(bucket_totals)
+
+		for index in reversed(self._buckets):
+			if index <= since_index:
+				break
+			add_bucket(self._buckets[index])
+
+		if (boundary_bucket := self._buckets.get(since_index)) is not None:
+			bucket_start = datetime.fromtimestamp(since_index * self._bucket_seconds)
+			history = self.usage_history
+			if history and (not self._evicted_entries or history[0].timestamp <= bucket_start):
+				# the history still holds the whole bucket, count exactly the entries from `since` on
+				bucket_end = datetime.fromtimestamp((since_index + 1) * self._bucket_seconds)
+				for position in range(bisect.bisect_left(history, since, key=lambda e: e.timestamp), len(history)):
+					entry = history[position]
+					if entry.timestamp >= bucket_end:
+						break
+					totals.setdefault(entry.model, _UsageTotals()).add_entry(entry)
+			else:
+				add_bucket(boundary_bucket)
+
+		return totals
+
 	def _format_tokens(self, tokens: int) -> str:
 		"""Format token count with k suffix for thousands"""
 		if tokens >= 1000000000:
@@ -457,7 +616,7 @@ class TokenCost:
 
 	async def log_usage_summary(self) -> None:
 		"""Log a comprehensive usage summary per model with colors and nice formatting"""
-		if not self.usage_history:
+		if not self._totals_by_model:
 			return
 
 		summary = await self.get_usage_summary()
@@ -504,18 +663,9 @@ class TokenCost:
 
 			# Format cost display (only if cost tracking is enabled)
 			if self.include_cost:
-				# Calculate per-model costs on-the-fly
-				total_model_cost = 0.0
-				model_prompt_cost = 0.0
-				model_completion_cost = 0.0
-
-				# Calculate costs for this model
-				for entry in self.usage_history:
-					if entry.model == model:
-						cost = await self.calculate_cost(entry.model, entry.usage)
-						if cost:
-							model_prompt_cost += cost.prompt_cost
-							model_completion_cost += cost.completion_cost
+				model_totals = self._totals_by_model[model]
+				model_prompt_cost = model_totals.prompt_cost
+				model_completion_cost = model_totals.completion_cost
 
 				total_model_cost = model_prompt_cost + model_completion_cost
 
@@ -536,6 +686,7 @@ class TokenCost:
 				f'  🤖 {C_CYAN}{model}{C_RESET}: {C_BLUE}{model_total_fmt} tokens{C_RESET}{cost_part} | '
 				f'⬅️ {prompt_part} | ➡️ {completion_part} | '
 				f'📞 {stats.invocations} calls | 📈 {avg_tokens_fmt}/call'
+				+ (f' | 💾 {stats.prompt_cache_hit_ratio:.0%} cached' if stats.prompt_cached_tokens else '')
 			)
 
 	async def get_cost_by_model(self) -> dict[str, ModelUsageStats]:
@@ -544,8 +695,9 @@ class TokenCost:
 		return summary.by_model
 
 	def clear_history(self) -> None:
-		"""Clear usage history"""
-		self.usage_history = []
+		"""Clear usage history and the aggregates"""
+		self.usage_history = deque(maxlen=self.max_history_entries) if self.max_history_entries else []
+		self._reset_aggregates()
 
 	async def refresh_pricing_data(self) -> None:
 		"""Force refresh of pricing data from GitHub"""
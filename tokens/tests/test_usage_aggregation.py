@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from browser_use.llm.views import ChatInvokeUsage
+from browser_use.tokens import service as token_service
+from browser_use.tokens.service import TokenCost
+
+PRICING_DATA = {
+	'model-a': {'input_cost_per_token': 1e-6, 'output_cost_per_token': 4e-6, 'cache_read_input_token_cost': 1e-7},
+	'model-b': {'input_cost_per_token': 3e-6, 'output_cost_per_token': 1.5e-5},
+}
+
+
+class FakeClock(datetime):
+	current = datetime(2025, 1, 1, 12, 0, 0)
+
+	@classmethod
+	def now(cls, tz=None):
+		return cls.current
+
+
+def record(tc: TokenCost, count: int) -> list[tuple[datetime, str, ChatInvokeUsage]]:
+	"""Record `count` usages 7 seconds apart, alternating between two models"""
+	records = []
+	for i in range(count):
+		FakeClock.current += timedelta(seconds=7)
+		model = 'model-a' if i % 3 else 'model-b'
+		usage = ChatInvokeUsage(
+			prompt_tokens=1000 + i,
+			prompt_cached_tokens=500 if i % 2 else None,
+			prompt_cache_creation_tokens=None,
+			prompt_image_tokens=None,
+			completion_tokens=50 + i % 10,
+			total_tokens=1050 + i + i % 10,
+		)
+		tc.add_usage(model, usage)
+		records.append((FakeClock.current, model, usage))
+	return records
+
+
+async def rescan(tc: TokenCost, records, model=None, since=None) -> tuple[int, int, float]:
+	"""Entry count, total tokens and total cost by pricing every matching record"""
+	matching = [r for r in records if (model is None or r[1] == model) and (since is None or r[0] >= since)]
+	total_cost = 0.0
+	for _, model_name, usage in matching:
+		cost = await tc.calculate_cost(model_name, usage)
+		assert cost is not None
+		total_cost += cost.prompt_cost + cost.completion_cost + (cost.prompt_read_cached_cost or 0)
+	return len(matching), sum(u.prompt_tokens + u.completion_tokens for _, _, u in matching), total_cost
+
+
+@pytest.fixture
+def make_token_cost(monkeypatch):
+	"""Factory of TokenCost services on the fake clock with fixed pricing"""
+	monkeypatch.setattr(token_service, 'datetime', FakeClock)
+
+	def make(**kwargs) -> TokenCost:
+		tc = TokenCost(include_cost=True, **kwargs)
+		tc._pricing_data = PRICING_DATA
+		tc._initialized = True
+		return tc
+
+	return make
+
+
+@pytest.mark.asyncio
+async def test_summary_matches_rescan(make_token_cost):
+	tc = make_token_cost()
+	records = record(tc, 300)
+
+	start = records[0][0]
+	for model in (None, 'model-a', 'model-b'):
+		for since in (None, start - timedelta(hours=1), start + timedelta(seconds=250), records[-1][0]):
+			summary = await tc.get_usage_summary(model=model, since=since)
+			count, tokens, cost = await rescan(tc, records, model, since)
+			assert summary.entry_count == count
+			assert summary.total_tokens == tokens
+			assert abs(summary.total_cost - cost) < 1e-9
+			assert sum(stats.invocations for stats in summary.by_model.values()) == count
+
+	tokens_a = tc.get_usage_tokens_for_model('model-a')
+	assert tokens_a.total_tokens == sum(u.prompt_tokens + u.completion_tokens for _, m, u in records if m == 'model-a')
+
+
+@pytest.mark.asyncio
+async def test_bounded_history(make_token_cost):
+	tc = make_token_cost(max_history_entries=20)
+	records = record(tc, 300)
+
+	assert len(tc.usage_history) == 20
+
+	# totals still cover the evicted entries
+	summary = await tc.get_usage_summary()
+	assert summary.entry_count == 300
+
+	# within the history, `since` is exact
+	since = records[-5][0] - timedelta(seconds=1)
+	assert (await tc.get_usage_summary(since=since)).entry_count == 5
+
+	# before the history, `since` has the resolution of one bucket
+	since = records[100][0]
+	bucket_start = datetime.fromtimestamp(since.timestamp() // 60 * 60)
+	expected = sum(1 for r in records if r[0] >= bucket_start)
+	assert (await tc.get_usage_summary(since=since)).entry_count == expected
+
+	tc.clear_history()
+	assert (await tc.get_usage_summary()).entry_count == 0
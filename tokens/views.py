@@ -8,14 +8,6 @@ from browser_use.llm.views import ChatInvokeUsage
 T = TypeVar('T', bound=BaseModel)
 
 
-class TokenUsageEntry(BaseModel):
-	"""Single token usage entry"""
-
-	model: str
-	timestamp: datetime
-	usage: ChatInvokeUsage
-
-
 class TokenCostCalculated(BaseModel):
 	"""Token cost"""
 
@@ -46,6 +38,16 @@ class TokenCostCalculated(BaseModel):
 		)
 
 
+class TokenUsageEntry(BaseModel):
+	"""Single token usage entry"""
+
+	model: str
+	timestamp: datetime
+	usage: ChatInvokeUsage
+	cost: TokenCostCalculated | None = None
+	"""Set once when the entry is priced (only with cost tracking and known pricing)."""
+
+
 class ModelPricing(BaseModel):
 	"""Pricing information for a model"""
 
@@ -73,12 +75,18 @@ class ModelUsageStats(BaseModel):
 
 	model: str
 	prompt_tokens: int = 0
+	prompt_cached_tokens: int = 0
 	completion_tokens: int = 0
 	total_tokens: int = 0
 	cost: float = 0.0
 	invocations: int = 0
 	average_tokens_per_invocation: float = 0.0
 
+	@property
+	def prompt_cache_hit_ratio(self) -> float:
+		"""Share of the prompt tokens served from the provider's prompt cache"""
+		return self.prompt_cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
 
 class ModelUsageTokens(BaseModel):
 	"""Usage tokens for a single model"""
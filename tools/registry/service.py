@@ -36,6 +36,8 @@ class Registry(Generic[Context]):
 		self.registry = ActionRegistry()
 		self.telemetry = ProductTelemetry()
 		self.exclude_actions = exclude_actions if exclude_actions is not None else []
+		# compiled action models by the set of available action names, cleared whenever an action is registered
+		self._action_model_cache: dict[frozenset[str], type[ActionModel]] = {}
 
 	def _get_special_param_types(self) -> dict[str, type | UnionType | None]:
 		"""Get the expected types for special parameters from SpecialActionParameters"""
@@ -300,6 +302,8 @@ class Registry(Generic[Context]):
 				domains=final_domains,
 			)
 			self.registry.actions[func.__name__] = action
+			self.registry.clear_domain_index()
+			self._action_model_cache.clear()
 
 			# Return the normalized function so it can be called with kwargs
 			return normalized_func
@@ -481,30 +485,32 @@ class Registry(Generic[Context]):
 
 		Each action model contains only the specific action being used,
 		rather than all actions with most set to None.
-		"""
-		from typing import Union
 
+		Models are compiled once per set of available actions, so calling this on every page change is cheap
+		and returns the same class as long as the same actions are available.
+		"""
 		# Filter actions based on page_url if provided:
 		#   if page_url is None, only include actions with no filters
-		#   if page_url is provided, only include actions that match the URL
+		#   if page_url is provided, only include actions that match the URL (resolved through the domain index)
+		url_filtered_names = set(self.registry.get_filtered_action_names(page_url)) if page_url is not None else set()
 
 		available_actions: dict[str, RegisteredAction] = {}
 		for name, action in self.registry.actions.items():
 			if include_actions is not None and name not in include_actions:
 				continue
+			if action.domains is None or name in url_filtered_names:
+				available_actions[name] = action
 
-			# If no page_url provided, only include actions with no filters
-			if page_url is None:
-				if action.domains is None:
-					available_actions[name] = action
-				continue
+		cache_key = frozenset(available_actions)
+		if (cached_model := self._action_model_cache.get(cache_key)) is not None:
+			return cached_model
 
-			# Check domain filter if present
-			domain_is_allowed = self.registry._match_domains(action.domains, page_url)
+		result_model = self._compile_action_model(available_actions)
+		self._action_model_cache[cache_key] = result_model
+		return result_model
 
-			# Include action if domain filter matches
-			if domain_is_allowed:
-				available_actions[name] = action
+	def _compile_action_model(self, available_actions: dict[str, RegisteredAction]) -> type[ActionModel]:
+		from typing import Union
 
 		# Create individual action models for each action
 		individual_action_models: list[type[BaseModel]] = []
@@ -1,7 +1,8 @@
 from collections.abc import Callable
 from typing import TYPE_CHECKING, Any
+from urllib.parse import urlparse
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, PrivateAttr
 
 from browser_use.browser import BrowserSession
 from browser_use.filesystem.file_system import FileSystem
@@ -84,11 +85,49 @@ class ActionModel(BaseModel):
 			action_params.index = index
 
 
+# distinct (scheme, hostname) pairs whose domain-filtered actions are remembered by an ActionRegistry
+DOMAIN_INDEX_MAX_ORIGINS = 1024
+
+
 class ActionRegistry(BaseModel):
 	"""Model representing the action registry"""
 
 	actions: dict[str, RegisteredAction] = {}
 
+	# domain filters only look at the scheme and hostname of a URL, so the filtered actions available on a URL are
+	# resolved once per (scheme, hostname); cleared whenever an action is registered
+	_domain_index: dict[tuple[str, str], list[str]] = PrivateAttr(default_factory=dict)
+
+	def clear_domain_index(self) -> None:
+		self._domain_index.clear()
+
+	def get_filtered_action_names(self, url: str) -> list[str]:
+		"""Names of the actions with domain filters that match the URL, in registration order"""
+		if not url:
+			return [name for name, action in self.actions.items() if action.domains is not None]
+
+		from browser_use.utils import is_new_tab_page
+
+		try:
+			parsed_url = urlparse(url)
+			origin = (parsed_url.scheme.lower(), (parsed_url.hostname or '').lower())
+		except ValueError:
+			return []
+		if is_new_tab_page(url):
+			return []
+
+		names = self._domain_index.get(origin)
+		if names is None:
+			if len(self._domain_index) >= DOMAIN_INDEX_MAX_ORIGINS:
+				self._domain_index.clear()
+			names = [
+				name
+				for name, action in self.actions.items()
+				if action.domains is not None and self._match_domains(action.domains, url)
+			]
+			self._domain_index[origin] = names
+		return names
+
 	@staticmethod
 	def _match_domains(domains: list[str] | None, url: str) -> bool:
 		"""
@@ -129,15 +168,10 @@ class ActionRegistry(BaseModel):
 			return '\n'.join(action.prompt_description() for action in self.actions.values() if action.domains is None)
 
 		# only include filtered actions for the current page URL
-		filtered_actions = []
-		for action in self.actions.values():
-			if not action.domains:
-				# skip actions with no filters, they are already included in the system prompt
-				continue
-
-			# Check domain filter
-			if self._match_domains(action.domains, page_url):
-				filtered_actions.append(action)
+		# (actions with no filters are skipped, they are already included in the system prompt)
+		filtered_actions = [
+			self.actions[name] for name in self.get_filtered_action_names(page_url) if self.actions[name].domains
+		]
 
 		return '\n'.join(action.prompt_description() for action in filtered_actions)
 
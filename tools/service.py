@@ -371,7 +371,8 @@ class Tools(Generic[Context]):
 						# The path should be just the filename for FileSystem files
 						file_obj = file_system.get_file(params.path)
 						if file_obj:
-							# File is managed by FileSystem, construct the full path
+							# File is managed by FileSystem, construct the full path (written to disk first)
+							await file_system.flush()
 							file_system_path = str(file_system.get_dir() / params.path)
 							params = UploadFileAction(index=params.index, path=file_system_path)
 						else:
@@ -549,6 +550,10 @@ class Tools(Generic[Context]):
 				await event
 				await event.event_result(raise_if_any=False, raise_if_none=False)  # Don't raise on errors
 
+				from browser_use.dom.markdown_extractor import markdown_cache
+
+				markdown_cache.evict_target(target_id)
+
 				memory = f'Closed tab #{params.tab_id}'
 				logger.info(f'🗑️  {memory}')
 				return ActionResult(
@@ -570,7 +575,7 @@ class Tools(Generic[Context]):
 		# This action is temporarily disabled as it needs refactoring to use events
 
 		@self.registry.action(
-			"""LLM extracts structured data from page markdown. Use when: on right page, know what to extract, haven't called before on same page+query. Can't get interactive elements. Set extract_links=True for URLs. Use start_from_char if truncated. If fails, use find_text/scroll instead.""",
+			"""LLM extracts structured data from page markdown. Use when: on right page, know what to extract, haven't called before on same page+query. Can't get interactive elements. Set extract_links=True for URLs. Use start_from_char if truncated (a char offset into the page's filtered markdown, as given in the truncation note). If fails, use find_text/scroll instead.""",
 		)
 		async def extract(
 			query: str,
@@ -581,63 +586,9 @@ class Tools(Generic[Context]):
 			start_from_char: int = 0,
 		):
 			# Constants
-			MAX_CHAR_LIMIT = 30000
-
-			# Extract clean markdown using the unified method
-			try:
-				from browser_use.dom.markdown_extractor import extract_clean_markdown
-
-				content, content_stats = await extract_clean_markdown(
-					browser_session=browser_session, extract_links=extract_links
-				)
-			except Exception as e:
-				raise RuntimeError(f'Could not extract clean markdown: {type(e).__name__}')
-
-			# Original content length for processing
-			final_filtered_length = content_stats['final_filtered_chars']
-
-			if start_from_char > 0:
-				if start_from_char >= len(content):
-					return ActionResult(
-						error=f'start_from_char ({start_from_char}) exceeds content length ({len(content)}). Content has {final_filtered_length} characters after filtering.'
-					)
-				content = content[start_from_char:]
-				content_stats['started_from_char'] = start_from_char
-
-			# Smart truncation with context preservation
-			truncated = False
-			if len(content) > MAX_CHAR_LIMIT:
-				# Try to truncate at a natural break point (paragraph, sentence)
-				truncate_at = MAX_CHAR_LIMIT
-
-				# Look for paragraph break within last 500 chars of limit
-				paragraph_break = content.rfind('\n\n', MAX_CHAR_LIMIT - 500, MAX_CHAR_LIMIT)
-				if paragraph_break > 0:
-					truncate_at = paragraph_break
-				else:
-					# Look for sentence break within last 200 chars of limit
-					sentence_break = content.rfind('.', MAX_CHAR_LIMIT - 200, MAX_CHAR_LIMIT)
-					if sentence_break > 0:
-						truncate_at = sentence_break + 1
-
-				content = content[:truncate_at]
-				truncated = True
-				next_start = (start_from_char or 0) + truncate_at
-				content_stats['truncated_at_char'] = truncate_at
-				content_stats['next_start_char'] = next_start
-
-			# Add content statistics to the result
-			original_html_length = content_stats['original_html_chars']
-			initial_markdown_length = content_stats['initial_markdown_chars']
-			chars_filtered = content_stats['filtered_chars_removed']
-
-			stats_summary = f"""Content processed: {original_html_length:,} HTML chars → {initial_markdown_length:,} initial markdown → {final_filtered_length:,} filtered markdown"""
-			if start_from_char > 0:
-				stats_summary += f' (started from char {start_from_char:,})'
-			if truncated:
-				stats_summary += f' → {len(content):,} final chars (truncated, use start_from_char={content_stats["next_start_char"]} to continue)'
-			elif chars_filtered > 0:
-				stats_summary += f' (filtered {chars_filtered:,} chars of noise)'
+			MAX_CHAR_LIMIT = 30000  # markdown per LLM call
+			MAX_CHUNKS = 10  # chunks extracted in one action, the rest can be reached with start_from_char
+			MAX_CONCURRENT_CHUNK_EXTRACTIONS = 4
 
 			system_prompt = """
 You are an expert at extracting data from the markdown of a webpage.
@@ -660,18 +611,162 @@ You will be given a query and the markdown of a webpage that has been filtered t
 </output>
 """.strip()
 
-			prompt = f'<query>\n{query}\n</query>\n\n<content_stats>\n{stats_summary}\n</content_stats>\n\n<webpage_content>\n{content}\n</webpage_content>'
+			merge_system_prompt = """
+You are an expert at combining data extracted from a webpage.
 
-			try:
+<input>
+You will be given a query and the results of extracting information relevant to that query from consecutive parts of the same webpage, in page order.
+</input>
+
+<instructions>
+- Merge the partial results into a single answer to the query.
+- Keep ALL relevant information from every part and preserve the page order of listed items, drop exact duplicates.
+- Ignore parts that report the information is unavailable, unless no part contains it.
+- Do not make up information that is not in the partial results.
+</instructions>
+
+<output>
+- Your output should present ALL the information relevant to the query in a concise way.
+- Do not answer in conversational format - directly output the relevant information or that the information is unavailable.
+</output>
+""".strip()
+
+			async def ask_llm(system: str, prompt: str) -> str:
 				response = await asyncio.wait_for(
-					page_extraction_llm.ainvoke([SystemMessage(content=system_prompt), UserMessage(content=prompt)]),
+					page_extraction_llm.ainvoke([SystemMessage(content=system), UserMessage(content=prompt)]),
 					timeout=120.0,
 				)
+				return response.completion
 
-				current_url = await browser_session.get_current_page_url()
-				extracted_content = (
-					f'<url>\n{current_url}\n</url>\n<query>\n{query}\n</query>\n<result>\n{response.completion}\n</result>'
-				)
+			# Map: long pages are streamed as markdown chunks straight from the DOM tree and extracted concurrently
+			semaphore = asyncio.Semaphore(MAX_CONCURRENT_CHUNK_EXTRACTIONS)
+			chunk_tasks: list[asyncio.Task[str]] = []
+			chunk_ranges: list[tuple[int, int]] = []
+
+			async def extract_chunk(part: int, chunk_start: int, chunk: str) -> str:
+				try:
+					part_summary = f'Part {part} of the page: chars {chunk_start:,}-{chunk_start + len(chunk):,} of the filtered markdown'
+					prompt = f'<query>\n{query}\n</query>\n\n<content_stats>\n{part_summary}\n</content_stats>\n\n<webpage_content>\n{chunk}\n</webpage_content>'
+					return await ask_llm(system_prompt, prompt)
+				finally:
+					semaphore.release()
+
+			async def start_chunk_extraction(chunk_start: int, chunk: str) -> None:
+				# Wait for a free slot before taking more chunks, so at most a few chunks are held in memory
+				await semaphore.acquire()
+				chunk_ranges.append((chunk_start, chunk_start + len(chunk)))
+				chunk_tasks.append(asyncio.create_task(extract_chunk(len(chunk_ranges), chunk_start, chunk)))
+
+			async def cancel_chunk_extractions() -> None:
+				# wait for the cancelled tasks, so none of them is left running (or failing) unobserved
+				for task in chunk_tasks:
+					task.cancel()
+				await asyncio.gather(*chunk_tasks, return_exceptions=True)
+
+			from browser_use.dom.markdown_extractor import stream_clean_markdown
+
+			content_stats: dict = {}
+			# The first chunk is held back until a second one shows up: a page that fits in one chunk keeps the single-call prompt
+			first_chunk: tuple[int, str] | None = None
+			offset = 0
+			truncated = False
+			markdown_stream = stream_clean_markdown(
+				browser_session, extract_links=extract_links, chunk_chars=MAX_CHAR_LIMIT, content_stats=content_stats
+			)
+			try:
+				async for chunk in markdown_stream:
+					chunk_start, offset = offset, offset + len(chunk)
+					if offset <= start_from_char:
+						continue
+					if chunk_start < start_from_char:
+						chunk, chunk_start = chunk[start_from_char - chunk_start :], start_from_char
+
+					if len(chunk_tasks) + (first_chunk is not None) >= MAX_CHUNKS:
+						truncated = True
+						content_stats['next_start_char'] = chunk_start
+						break
+
+					if first_chunk is None and not chunk_tasks:
+						first_chunk = (chunk_start, chunk)
+						continue
+					if first_chunk is not None:
+						await start_chunk_extraction(*first_chunk)
+						first_chunk = None
+					await start_chunk_extraction(chunk_start, chunk)
+			except BaseException as e:
+				await cancel_chunk_extractions()
+				if not isinstance(e, Exception):
+					raise
+				raise RuntimeError(f'Could not extract clean markdown: {type(e).__name__}')
+			finally:
+				await markdown_stream.aclose()
+
+			final_filtered_length = content_stats['final_filtered_chars']
+			if start_from_char > 0:
+				if first_chunk is None and not chunk_tasks:
+					return ActionResult(
+						error=f'start_from_char ({start_from_char}) exceeds content length ({final_filtered_length}). Content has {final_filtered_length} characters after filtering.'
+					)
+				content_stats['started_from_char'] = start_from_char
+
+			# Add content statistics to the result
+			original_html_length = content_stats['original_html_chars']
+			initial_markdown_length = content_stats['initial_markdown_chars']
+			chars_filtered = content_stats['filtered_chars_removed']
+
+			# when truncated, the counts cover the part of the page that was converted before the conversion stopped
+			stats_summary = f"""Content processed: {original_html_length:,} HTML chars → {initial_markdown_length:,} initial markdown → {final_filtered_length:,} filtered markdown"""
+			if start_from_char > 0:
+				stats_summary += f' (started from char {start_from_char:,})'
+			if truncated:
+				final_chars = content_stats['next_start_char'] - start_from_char
+				stats_summary += f' → {final_chars:,} final chars in {MAX_CHUNKS} chunks (truncated, use start_from_char={content_stats["next_start_char"]} to continue)'
+			elif chars_filtered > 0:
+				stats_summary += f' (filtered {chars_filtered:,} chars of noise)'
+
+			try:
+				if not chunk_tasks:
+					# Single chunk (or empty page): one extraction call over the whole content
+					content = first_chunk[1] if first_chunk else ''
+					prompt = f'<query>\n{query}\n</query>\n\n<content_stats>\n{stats_summary}\n</content_stats>\n\n<webpage_content>\n{content}\n</webpage_content>'
+					result = await ask_llm(system_prompt, prompt)
+				else:
+					try:
+						partial_results = list(await asyncio.gather(*chunk_tasks))
+					except BaseException:
+						await cancel_chunk_extractions()
+						raise
+					logger.debug(f'📄 Extracted {len(partial_results)} chunks of {final_filtered_length:,} chars concurrently, merging')
+
+					# Reduce: merge the partial results, in several rounds if they do not fit in one call
+					part_ranges = chunk_ranges
+					while len(partial_results) > 1:
+						batches: list[list[int]] = [[]]
+						batch_chars = 0
+						for i, partial_result in enumerate(partial_results):
+							if batches[-1] and batch_chars + len(partial_result) > MAX_CHAR_LIMIT:
+								batches.append([])
+								batch_chars = 0
+							batches[-1].append(i)
+							batch_chars += len(partial_result)
+						if len(batches) == len(partial_results):
+							# every partial result fills a call on its own, merging would not shrink anything
+							break
+
+						merge_prompts = []
+						for batch in batches:
+							parts = '\n\n'.join(
+								f'<part chars="{part_ranges[i][0]}-{part_ranges[i][1]}">\n{partial_results[i]}\n</part>' for i in batch
+							)
+							merge_prompts.append(
+								f'<query>\n{query}\n</query>\n\n<content_stats>\n{stats_summary}\n</content_stats>\n\n<partial_results>\n{parts}\n</partial_results>'
+							)
+						part_ranges = [(part_ranges[batch[0]][0], part_ranges[batch[-1]][1]) for batch in batches]
+						partial_results = list(await asyncio.gather(*(ask_llm(merge_system_prompt, prompt) for prompt in merge_prompts)))
+					result = '\n\n'.join(partial_results)
+
+				current_url = content_stats.get('url') or await browser_session.get_current_page_url()
+				extracted_content = f'<url>\n{current_url}\n</url>\n<query>\n{query}\n</query>\n<result>\n{result}\n</result>'
 
 				# Simple memory handling
 				MAX_MEMORY_LENGTH = 1000
@@ -1490,7 +1585,8 @@ class CodeAgentTools(Tools[Context]):
 							# The path should be just the filename for FileSystem files
 							file_obj = file_system.get_file(params.path)
 							if file_obj:
-								# File is managed by FileSystem, construct the full path
+								# File is managed by FileSystem, construct the full path (written to disk first)
+								await file_system.flush()
 								file_system_path = str(file_system.get_dir() / params.path)
 								params = UploadFileAction(index=params.index, path=file_system_path)
 							else: